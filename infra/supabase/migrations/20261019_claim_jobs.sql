@@ -0,0 +1,99 @@
+-- =====================================================
+-- claim_jobs: 작업 일괄 클레임
+--
+-- 목적: PC Agent 작업 폴링을 단일 트랜잭션 RPC로 처리
+-- 기존: 기기당 SELECT pending LIMIT 1 → start_job UPDATE
+--       → 100대 PC 기준 폴링당 100회 이상 HTTP 왕복
+--       → SELECT와 UPDATE 사이에 다른 Agent가 같은 작업을 가져갈 수 있음
+-- 변경: claim_jobs() 한 번 호출로 idle 기기 N대에 작업 N개를 원자적으로 배정
+--
+-- 규칙:
+--   - 대상 기기: 요청 목록 중 해당 PC 소속, status = 'idle', 실행 중 작업 없음
+--   - 기기 지정 작업(device_id 설정됨)을 먼저 배정, 남은 기기는 미지정 작업으로 채움
+--   - 기기/작업 모두 FOR UPDATE SKIP LOCKED, 잠그는 것은 실제로 배정할 행만 (LIMIT 안에서 잠금)
+--     → 동시에 클레임하는 다른 Agent는 대기 없이 다음 행을 가져감
+--     → 배정하지 않을 행을 잠가서 다른 Agent가 건너뛰게 만들지 않음
+--   - 배정된 작업은 running으로 전환 (started_at 기록)
+-- =====================================================
+
+CREATE INDEX IF NOT EXISTS idx_jobs_pending_unassigned
+ON jobs(created_at ASC)
+WHERE status = 'pending' AND device_id IS NULL;
+
+-- =====================================================
+-- claim_jobs: idle 기기에 대기 작업 일괄 배정
+--
+-- 파라미터:
+--   p_pc_id      - 워크스테이션 ID (NULL이면 소속 검사 생략)
+--   p_device_ids - 후보 기기 ID 목록 (우선순위 순)
+--   p_limit      - 최대 배정 수 (NULL이면 기기 수)
+--
+-- 반환: 배정된 jobs 행 (device_id 포함)
+-- =====================================================
+CREATE OR REPLACE FUNCTION claim_jobs(
+    p_pc_id TEXT,
+    p_device_ids TEXT[],
+    p_limit INTEGER DEFAULT NULL
+)
+RETURNS SETOF jobs AS $$
+    WITH locked_devices AS (
+        SELECT d.id, array_position(p_device_ids, d.id::TEXT) AS pos
+        FROM devices d
+        WHERE d.id::TEXT = ANY(p_device_ids)
+          AND (p_pc_id IS NULL OR d.pc_id = p_pc_id)
+          AND d.status = 'idle'
+          AND NOT EXISTS (
+              SELECT 1 FROM jobs r WHERE r.device_id = d.id AND r.status = 'running'
+          )
+        ORDER BY pos
+        LIMIT COALESCE(p_limit, cardinality(p_device_ids))
+        FOR UPDATE OF d SKIP LOCKED
+    ),
+    -- 기기 지정 작업: 기기별 가장 오래된 pending 1개만 잠금
+    assigned AS (
+        SELECT j.id, j.device_id
+        FROM locked_devices l
+        CROSS JOIN LATERAL (
+            SELECT jj.id, jj.device_id
+            FROM jobs jj
+            WHERE jj.status = 'pending' AND jj.device_id = l.id
+            ORDER BY jj.created_at, jj.id
+            LIMIT 1
+            FOR UPDATE OF jj SKIP LOCKED
+        ) j
+    ),
+    -- 지정 작업이 없는 기기는 미지정 작업으로 채움 (오래된 순)
+    free_devices AS (
+        SELECT l.id, row_number() OVER (ORDER BY l.pos) AS rn
+        FROM locked_devices l
+        WHERE l.id NOT IN (SELECT device_id FROM assigned)
+    ),
+    free_locked AS (
+        SELECT j.id, j.created_at
+        FROM jobs j
+        WHERE j.status = 'pending' AND j.device_id IS NULL
+        ORDER BY j.created_at, j.id
+        LIMIT (SELECT count(*) FROM free_devices)
+        FOR UPDATE OF j SKIP LOCKED
+    ),
+    free_jobs AS (
+        SELECT id, row_number() OVER (ORDER BY created_at, id) AS rn
+        FROM free_locked
+    ),
+    pairs AS (
+        SELECT id AS job_id, device_id FROM assigned
+        UNION ALL
+        SELECT f.id, d.id FROM free_jobs f JOIN free_devices d USING (rn)
+    )
+    UPDATE jobs j
+    SET
+        device_id = p.device_id,
+        status = 'running',
+        started_at = now()
+    FROM pairs p
+    WHERE j.id = p.job_id AND j.status = 'pending'
+    RETURNING j.*;
+$$ LANGUAGE sql SECURITY DEFINER;
+
+COMMENT ON FUNCTION claim_jobs IS
+'PC Agent 일괄 작업 클레임. idle 기기와 pending 작업을 SKIP LOCKED로 잠그고 한 문장에서 배정, 배정된 작업 반환.';
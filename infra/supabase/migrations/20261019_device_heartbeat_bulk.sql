@@ -0,0 +1,79 @@
+-- =====================================================
+-- heartbeat_devices: 디바이스 일괄 하트비트
+--
+-- 목적: PC Agent 하트비트 라운드를 단일 RPC로 처리
+-- 기존: 기기당 SELECT status + UPDATE (+ 미등록 시 UPSERT)
+--       → 100대 PC 기준 라운드당 200회 이상 HTTP 왕복
+-- 변경: heartbeat_devices() 한 번 호출로 전체 시리얼 처리
+--
+-- 규칙:
+--   - last_seen은 항상 갱신
+--   - busy 상태는 유지 (작업 중 상태 덮어쓰기 방지)
+--   - 그 외 상태는 idle로 설정
+--   - pc_id는 등록 시에만 기록 (잘못된 PC의 하트비트가 기기 소속을 옮기지 않음)
+--   - 미등록 시리얼은 같은 문장에서 자동 등록
+-- =====================================================
+
+-- DeviceSync가 사용하는 컬럼 보장
+ALTER TABLE devices ADD COLUMN IF NOT EXISTS pc_id VARCHAR(50);
+ALTER TABLE devices ADD COLUMN IF NOT EXISTS last_seen TIMESTAMP WITH TIME ZONE;
+ALTER TABLE devices ADD COLUMN IF NOT EXISTS last_health JSONB;
+
+CREATE INDEX IF NOT EXISTS idx_devices_pc_id ON devices(pc_id);
+
+-- =====================================================
+-- heartbeat_devices: 일괄 하트비트 + 자동 등록
+--
+-- 반환 outcome:
+--   updated    - 기존 기기, idle로 갱신
+--   busy       - 기존 기기, busy 상태 유지
+--   registered - 미등록 기기, 새로 등록
+-- =====================================================
+CREATE OR REPLACE FUNCTION heartbeat_devices(
+    p_pc_id TEXT,
+    p_serials TEXT[],
+    p_health JSONB DEFAULT '{}'::jsonb
+)
+RETURNS TABLE (
+    serial_number TEXT,
+    outcome TEXT,
+    status TEXT
+) AS $$
+    WITH input AS (
+        SELECT DISTINCT s AS serial
+        FROM unnest(p_serials) AS s
+        WHERE s IS NOT NULL AND s <> ''
+    ),
+    -- 조건부 UPDATE: busy는 유지, 나머지는 idle
+    updated AS (
+        UPDATE devices d
+        SET
+            last_seen = now(),
+            status = CASE WHEN d.status = 'busy' THEN d.status ELSE 'idle' END,
+            last_health = COALESCE(p_health -> d.serial_number, d.last_health)
+        FROM input i
+        WHERE d.serial_number = i.serial
+        RETURNING d.serial_number::TEXT AS serial, d.status::TEXT AS status
+    ),
+    -- UPDATE 대상이 아니었던 시리얼은 신규 등록
+    -- (동시 등록 경합은 ON CONFLICT로 흡수)
+    inserted AS (
+        INSERT INTO devices (serial_number, pc_id, status, last_seen, last_health)
+        SELECT i.serial, p_pc_id, 'idle', now(), p_health -> i.serial
+        FROM input i
+        WHERE NOT EXISTS (SELECT 1 FROM updated u WHERE u.serial = i.serial)
+        ON CONFLICT (serial_number) DO UPDATE SET last_seen = EXCLUDED.last_seen
+        RETURNING devices.serial_number::TEXT AS serial, devices.status::TEXT AS status
+    )
+    SELECT
+        u.serial,
+        CASE WHEN u.status = 'busy' THEN 'busy' ELSE 'updated' END,
+        u.status
+    FROM updated u
+    UNION ALL
+    SELECT n.serial, 'registered', n.status
+    FROM inserted n;
+$$ LANGUAGE sql SECURITY DEFINER;
+
+COMMENT ON FUNCTION heartbeat_devices IS
+'PC Agent 일괄 하트비트. busy 상태 보존 조건부 UPDATE + 미등록 시리얼 자동 등록, 시리얼별 결과 반환.';
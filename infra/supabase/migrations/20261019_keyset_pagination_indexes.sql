@@ -0,0 +1,23 @@
+-- =============================================================================
+-- Keyset Pagination Indexes
+--
+-- 로그/이력 조회를 limit/offset에서 (created_at, id) 키셋 페이지네이션으로 전환
+-- → 정렬 컬럼 뒤에 id를 붙인 복합 인덱스로 다음 페이지 시작 위치를 바로 탐색
+--   (같은 시각의 행은 id로 순서 고정)
+-- =============================================================================
+
+-- monitoring_logs: GET /api/monitoring/logs, /api/monitoring/logs/export
+CREATE INDEX IF NOT EXISTS idx_monitoring_logs_created_id
+ON api.monitoring_logs(created_at DESC, id DESC);
+
+-- persona_activity_logs: 검색 기록 페이지 / 검색 프로필 집계 (오래된 순 순회)
+CREATE INDEX IF NOT EXISTS idx_activity_logs_persona_type_created_id
+ON persona_activity_logs(persona_id, activity_type, created_at DESC, id DESC);
+
+-- execution_logs: created_at 컬럼이 없으므로 completed_at 기준
+CREATE INDEX IF NOT EXISTS idx_execution_logs_completed_id
+ON execution_logs(completed_at DESC, id DESC);
+
+-- workload_logs: 워크로드별 로그 조회
+CREATE INDEX IF NOT EXISTS idx_workload_logs_workload_created_id
+ON workload_logs(workload_id, created_at DESC, id DESC);
@@ -0,0 +1,40 @@
+-- =============================================================================
+-- process_heartbeats_bulk: HEARTBEAT 일괄 처리
+--
+-- Cloud Gateway가 노드 HEARTBEAT를 모아서 DB 왕복 1회로 처리
+-- → 노드별 process_heartbeat(상태 갱신 + 디바이스 스냅샷 + Pull-based Push)를
+--   같은 순서로 호출하고 결과 배열을 반환 (각 결과에 node_id 포함)
+-- → process_heartbeat의 EXCEPTION 블록 덕분에 한 노드의 실패가 배치 전체를
+--   롤백하지 않음 (해당 노드 결과만 success=false)
+--
+-- 입력: [{node_id, status, resources, device_snapshot, active_tasks,
+--         ws_session_id, queue_depth}, ...]
+-- =============================================================================
+
+CREATE OR REPLACE FUNCTION process_heartbeats_bulk(p_heartbeats JSONB)
+RETURNS JSONB AS $$
+BEGIN
+    RETURN (
+        SELECT COALESCE(
+            jsonb_agg(
+                process_heartbeat(
+                    hb->>'node_id',
+                    hb->>'status',
+                    hb->'resources',
+                    hb->'device_snapshot',
+                    COALESCE((hb->>'active_tasks')::INTEGER, 0),
+                    hb->>'ws_session_id',
+                    COALESCE((hb->>'queue_depth')::INTEGER, 0)
+                ) || jsonb_build_object('node_id', hb->>'node_id')
+                ORDER BY idx
+            ),
+            '[]'::jsonb
+        )
+        FROM jsonb_array_elements(COALESCE(p_heartbeats, '[]'::jsonb))
+            WITH ORDINALITY AS t(hb, idx)
+    );
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+COMMENT ON FUNCTION process_heartbeats_bulk IS
+'HEARTBEAT 일괄 처리. 노드별 process_heartbeat 결과 배열(node_id 포함)을 반환.';
@@ -13,6 +13,11 @@ Protocol v1.0:
 2. HEARTBEAT (30초) → HEARTBEAT_ACK + pending commands
 3. COMMAND 실행 → RESULT
 
+Protocol v2.0 (HELLO payload.protocol로 제안, 게이트웨이가 HELLO_ACK로 확정):
+- msgpack 바이너리 프레임 (양쪽에 msgpack이 있을 때, 없으면 JSON)
+- HEARTBEAT 디바이스 스냅샷은 마지막 ACK 버전 대비 델타
+- 저장소의 shared/node_protocol.py 사용 (없으면 v1만)
+
 "복잡한 생각은 버려라." - Orion
 """
 
@@ -28,6 +33,7 @@ import subprocess
 import sys
 import uuid
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import List, Optional
 
 try:
@@ -44,6 +50,13 @@ try:
 except ImportError:
     PSUTIL_AVAILABLE = False
 
+# 프로토콜 v2 코덱 (저장소 루트의 shared 패키지, 없으면 v1만 사용)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+try:
+    from shared import node_protocol
+except ImportError:
+    node_protocol = None
+
 
 # ============================================================
 # Configuration
@@ -67,6 +80,10 @@ class Config:
     HEARTBEAT_INTERVAL = 30  # 초
     COMMAND_TIMEOUT = 300  # 초
     HELLO_TIMEOUT = 10  # 초
+    PROTOCOL_V2 = os.getenv("NODE_PROTOCOL_V2", "true").lower() == "true"  # v2 제안
+    WS_COMPRESSION = (
+        os.getenv("NODE_WS_COMPRESSION", "true").lower() == "true"
+    )  # permessage-deflate
 
     # Reconnection
     RECONNECT_MIN_DELAY = 1  # 초
@@ -194,6 +211,8 @@ def build_hello(node_id: str, secret_key: str = None) -> dict:
         "capabilities": ["youtube", "tiktok", "adb", "tap", "swipe"],
         "device_count": 0,  # 나중에 업데이트
     }
+    if Config.PROTOCOL_V2 and node_protocol is not None:
+        payload["protocol"] = node_protocol.hello_offer()
 
     message = {
         "version": Config.PROTOCOL_VERSION,
@@ -212,19 +231,26 @@ def build_hello(node_id: str, secret_key: str = None) -> dict:
 
 
 def build_heartbeat(
-    status: str, device_snapshot: list, resources: dict, active_tasks: int = 0, queue_depth: int = 0
+    status: str,
+    device_snapshot: list,
+    resources: dict,
+    active_tasks: int = 0,
+    queue_depth: int = 0,
+    snapshot_fields: dict = None,
 ) -> dict:
-    """HEARTBEAT 메시지 빌드"""
-    return build_message(
-        "HEARTBEAT",
-        {
-            "status": status,
-            "device_snapshot": device_snapshot,
-            "resources": resources,
-            "active_tasks": active_tasks,
-            "queue_depth": queue_depth,
-        },
-    )
+    """
+    HEARTBEAT 메시지 빌드
+
+    snapshot_fields: v2 스냅샷 필드 (SnapshotEncoder.encode 결과) - 있으면 device_snapshot 대신 사용
+    """
+    payload = {
+        "status": status,
+        "resources": resources,
+        "active_tasks": active_tasks,
+        "queue_depth": queue_depth,
+    }
+    payload.update(snapshot_fields or {"device_snapshot": device_snapshot})
+    return build_message("HEARTBEAT", payload)
 
 
 def build_result(
@@ -430,6 +456,8 @@ class NodeRunner:
         self._ws = None
         self._connected = False
         self._session_id = None
+        self._codec = None  # v2 협상 시 FrameCodec (None = v1 JSON)
+        self._snapshots = None  # v2 스냅샷 델타 시 SnapshotEncoder
         self._reconnect_delay = Config.RECONNECT_MIN_DELAY
         self._should_run = True
 
@@ -471,6 +499,7 @@ class NodeRunner:
                 ping_interval=20,
                 ping_timeout=10,
                 max_size=10 * 1024 * 1024,  # 10MB
+                compression="deflate" if Config.WS_COMPRESSION else None,
             ) as ws:
                 self._ws = ws
                 self._connected = True
@@ -506,6 +535,21 @@ class NodeRunner:
             self._connected = False
             self._ws = None
             self._session_id = None
+            self._codec = None
+            self._snapshots = None
+
+    async def _send(self, message: dict):
+        """메시지 전송 (v2: 협상된 인코딩, v1: JSON)"""
+        if self._codec is not None:
+            await self._ws.send(self._codec.encode(message))
+        else:
+            await self._ws.send(json.dumps(message))
+
+    def _decode(self, frame) -> dict:
+        """프레임 → 메시지 (바이너리는 msgpack)"""
+        if self._codec is not None:
+            return self._codec.decode(frame)
+        return json.loads(frame)
 
     async def _do_hello(self) -> bool:
         """HELLO 핸드셰이크"""
@@ -528,8 +572,22 @@ class NodeRunner:
             return False
 
         if response.get("type") == "HELLO_ACK":
-            self._session_id = response.get("payload", {}).get("session_id")
-            logger.info(f"✅ Gateway 연결 성공 (session={self._session_id})")
+            ack_payload = response.get("payload", {})
+            self._session_id = ack_payload.get("session_id")
+
+            # 프로토콜 v2 확정 여부 (게이트웨이가 protocol을 돌려주지 않으면 v1)
+            protocol = ack_payload.get("protocol")
+            if protocol and node_protocol is not None:
+                self._codec = node_protocol.FrameCodec(protocol.get("encoding", "json"))
+                if protocol.get("snapshot_deltas"):
+                    self._snapshots = node_protocol.SnapshotEncoder()
+
+            label = (
+                f"{protocol['version']}/{self._codec.encoding}"
+                if self._codec
+                else Config.PROTOCOL_VERSION
+            )
+            logger.info(f"✅ Gateway 연결 성공 (session={self._session_id}, protocol={label})")
             return True
 
         elif response.get("type") == "ERROR":
@@ -565,16 +623,18 @@ class NodeRunner:
                 else:
                     self._status = "READY"
 
-                # HEARTBEAT 메시지 생성
+                # HEARTBEAT 메시지 생성 (v2: 마지막 ACK 버전 대비 델타)
+                devices = self.laixi.get_device_snapshot()
                 heartbeat = build_heartbeat(
                     status=self._status,
-                    device_snapshot=self.laixi.get_device_snapshot(),
+                    device_snapshot=devices,
                     resources=get_system_resources(),
                     active_tasks=self._active_tasks,
                     queue_depth=self._task_queue.qsize(),
+                    snapshot_fields=self._snapshots.encode(devices) if self._snapshots else None,
                 )
 
-                await self._ws.send(json.dumps(heartbeat))
+                await self._send(heartbeat)
                 logger.debug(f"→ HEARTBEAT ({self.laixi.device_count}대, {self._status})")
 
             except asyncio.CancelledError:
@@ -586,12 +646,19 @@ class NodeRunner:
         """메시지 수신 및 처리"""
         async for message in self._ws:
             try:
-                data = json.loads(message)
+                data = self._decode(message)
                 msg_type = data.get("type")
                 msg_payload = data.get("payload", {})
 
                 # HEARTBEAT_ACK (Pull-based Push)
                 if msg_type == "HEARTBEAT_ACK":
+                    # v2 스냅샷 기준 갱신 / 재전송 요청
+                    if self._snapshots is not None:
+                        if msg_payload.get("device_snapshot_resync"):
+                            self._snapshots.reset()
+                        elif "device_snapshot_version" in msg_payload:
+                            self._snapshots.ack(msg_payload["device_snapshot_version"])
+
                     commands = msg_payload.get("commands", [])
                     if commands:
                         logger.info(f"← HEARTBEAT_ACK + {len(commands)}개 명령")
@@ -616,8 +683,8 @@ class NodeRunner:
                 else:
                     logger.warning(f"알 수 없는 메시지: {msg_type}")
 
-            except json.JSONDecodeError:
-                logger.error("JSON 파싱 실패")
+            except ValueError:
+                logger.error("메시지 파싱 실패")
 
     async def _command_processor(self):
         """명령 큐 처리 (순차 실행)"""
@@ -725,7 +792,7 @@ class NodeRunner:
         )
 
         if self._connected and self._ws:
-            await self._ws.send(json.dumps(result))
+            await self._send(result)
             logger.info(
                 f"→ RESULT: {result_status} ({summary['success_count']}/{summary['total_devices']})"
             )
@@ -0,0 +1,135 @@
+"""
+노드 브로드캐스트 벤치마크
+
+시뮬레이션 노드 N개에 같은 COMMAND를 보낼 때 첫 노드와 마지막 노드의 전달 시각 차이(skew) 측정
+
+시뮬레이션:
+- 노드마다 전송 지연 = 기본 지연(--latency-ms) ± 지터
+- --stalled개 노드는 --stall-ms 동안 전송이 멈춤 (느린 TCP / 꽉 찬 송신 버퍼)
+
+비교:
+- sequential - 이전 구현 (노드마다 json 직렬화 + send를 순서대로 await)
+- parallel   - shared.fanout.send_all (직렬화 1회 + 동시 전송 + 노드별 timeout)
+
+측정 항목:
+- skew     : 마지막 정상 노드 전달 시각 - 첫 노드 전달 시각
+- total    : 브로드캐스트 호출 전체 시간
+- timeouts : timeout 처리된 노드 수
+
+실행 방법:
+    python scripts/bench_broadcast.py                         # 100, 600 노드
+    python scripts/bench_broadcast.py --nodes 600 --stalled 3 --stall-ms 2000
+    python scripts/bench_broadcast.py --timeout 0.5
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from shared.fanout import SENT, encode, send_all
+
+COMMAND = {
+    "type": "COMMAND",
+    "payload": {
+        "command_id": "bench",
+        "command_type": "WATCH_VIDEO",
+        "target": {"type": "ALL_DEVICES"},
+        "params": {"video_url": "https://youtu.be/dQw4w9WgXcQ", "min_watch_seconds": 60},
+        "priority": "HIGH",
+        "timeout_seconds": 120,
+    },
+}
+
+
+class SimulatedNode:
+    """전송 지연을 흉내 내고 전달 시각을 기록하는 WebSocket"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.delivered_at = None
+
+    async def send_text(self, frame: str):
+        await asyncio.sleep(self.delay)
+        self.delivered_at = time.perf_counter()
+
+    async def send_json(self, message: dict):
+        await self.send_text(json.dumps(message))
+
+
+def make_nodes(count: int, latency: float, stalled: int, stall: float) -> Dict[str, SimulatedNode]:
+    rng = random.Random(count)
+    nodes = {
+        f"node_{i:03d}": SimulatedNode(max(0.0, rng.gauss(latency, latency / 3)))
+        for i in range(count)
+    }
+    for node_id in rng.sample(list(nodes), min(stalled, count)):
+        nodes[node_id].delay = stall
+    return nodes
+
+
+async def sequential(nodes: Dict[str, SimulatedNode], timeout: float) -> Dict[str, str]:
+    """이전 구현: for node_id in targets: await pool.send_to_node(...)"""
+    results = {}
+    for node_id, node in nodes.items():
+        await node.send_json(COMMAND)
+        results[node_id] = SENT
+    return results
+
+
+async def parallel(nodes: Dict[str, SimulatedNode], timeout: float) -> Dict[str, str]:
+    return await send_all(
+        {node_id: node.send_text for node_id, node in nodes.items()}, encode(COMMAND), timeout
+    )
+
+
+async def run(mode, count: int, args) -> List[str]:
+    nodes = make_nodes(count, args.latency_ms / 1000, args.stalled, args.stall_ms / 1000)
+    started = time.perf_counter()
+    results = await mode(nodes, args.timeout)
+    total = time.perf_counter() - started
+
+    delivered = sorted(
+        node.delivered_at
+        for node_id, node in nodes.items()
+        if results.get(node_id) == SENT and node.delivered_at is not None
+    )
+    skew = delivered[-1] - delivered[0] if delivered else 0.0
+    timeouts = sum(1 for outcome in results.values() if outcome != SENT)
+    return [
+        f"{count:>6}",
+        f"{mode.__name__:<10}",
+        f"{skew * 1000:>10.1f}",
+        f"{total * 1000:>10.1f}",
+        f"{timeouts:>8}",
+    ]
+
+
+async def main(args):
+    print(
+        f"latency={args.latency_ms}ms stalled={args.stalled} x {args.stall_ms}ms "
+        f"timeout={args.timeout}s"
+    )
+    print(f"{'nodes':>6}  {'mode':<10}  {'skew(ms)':>10}  {'total(ms)':>10}  {'timeouts':>8}")
+    for count in args.nodes:
+        for mode in (sequential, parallel):
+            if mode is sequential and args.skip_sequential:
+                continue
+            print("  ".join(await run(mode, count, args)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, nargs="+", default=[100, 600])
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="노드별 평균 전송 지연")
+    parser.add_argument("--stalled", type=int, default=2, help="전송이 멈추는 노드 수")
+    parser.add_argument("--stall-ms", type=float, default=1000, help="멈춘 노드의 전송 지연")
+    parser.add_argument("--timeout", type=float, default=0.25, help="parallel 노드별 timeout")
+    parser.add_argument("--skip-sequential", action="store_true")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,129 @@
+"""
+캐시 코덱 벤치마크
+
+shared.cache_codec의 직렬화/압축 조합별 페이로드 크기와 인코딩/디코딩 시간을 측정
+
+페이로드:
+1. node_health - OOB NodeHealth 1개 (메트릭 히스토리 20개 포함, dataclasses.asdict)
+2. fleet       - 노드 N개의 NodeHealth 맵 (대시보드 전체 조회)
+3. devices     - HEARTBEAT device_snapshot (노드 1개의 기기 목록)
+
+설치되지 않은 패키지(orjson, msgpack, zstandard, lz4)의 조합은 건너뜀
+(JSON 디코딩은 설정과 무관하게 orjson이 있으면 orjson 사용 → json/orjson 디코딩 시간이 같음)
+
+실행 방법:
+    python scripts/bench_cache_codecs.py
+    python scripts/bench_cache_codecs.py --nodes 200 --devices 600 --repeat 2000
+"""
+
+import argparse
+import dataclasses
+import importlib.util
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from shared.cache_codec import COMPRESSIONS, SERIALIZERS, CacheCodec
+
+
+def _load_health_collector():
+    # services/api/api 패키지는 import 시 설정(Supabase 키)을 요구하므로 파일만 직접 로드
+    path = ROOT / "services/api/api/services/oob/health_collector.py"
+    spec = importlib.util.spec_from_file_location("bench_health_collector", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_node_health(hc, index: int) -> Dict[str, Any]:
+    health = hc.NodeHealth(node_id=f"node_{index:03d}", tailscale_ip=f"100.64.0.{index % 250}")
+    started = datetime.now(timezone.utc)
+    for i in range(health.max_history):
+        health.update_metrics(
+            hc.NodeMetrics(
+                node_heartbeat_age_sec=1.5 + i % 7,
+                device_count_adb=58 + i % 3,
+                device_count_expected=60,
+                adb_server_ok=True,
+                ws_connected=True,
+                box_tcp_ok=True,
+                uptime_sec=86_400 + i * 30,
+                laixi_connected=True,
+                cpu_usage_pct=31.4 + i,
+                memory_usage_pct=62.5,
+                collected_at=started - timedelta(seconds=30 * i),
+            )
+        )
+    return dataclasses.asdict(health)
+
+
+def make_device_snapshot(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "slot": i + 1,
+            "serial": f"R58M{i:08d}",
+            "status": "busy" if i % 3 == 0 else "idle",
+            "battery_level": 40 + i % 60,
+            "current_task": f"watch:{i % 17}" if i % 3 == 0 else None,
+        }
+        for i in range(count)
+    ]
+
+
+def _time_per_op(repeat: int, fn: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def bench(payload: Any, repeat: int) -> List[Tuple[str, int, float, float]]:
+    rows = []
+    for serializer in SERIALIZERS:
+        for compression in COMPRESSIONS:
+            try:
+                codec = CacheCodec(serializer, compression, threshold=0)
+            except ImportError:
+                continue
+            data = codec.dumps(payload)
+            encode = _time_per_op(repeat, lambda: codec.dumps(payload))
+            decode = _time_per_op(repeat, lambda: codec.loads(data))
+            rows.append((codec.name, len(data), encode, decode))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="캐시 코덱 크기/속도 비교")
+    parser.add_argument("--nodes", type=int, default=100, help="fleet 페이로드 노드 수")
+    parser.add_argument("--devices", type=int, default=60, help="노드당 기기 수")
+    parser.add_argument("--repeat", type=int, default=500, help="측정 반복 횟수")
+    args = parser.parse_args()
+
+    hc = _load_health_collector()
+    payloads = {
+        "node_health": make_node_health(hc, 0),
+        "fleet": {f"node_{i:03d}": make_node_health(hc, i) for i in range(args.nodes)},
+        "devices": make_device_snapshot(args.devices),
+    }
+
+    for name, payload in payloads.items():
+        # 큰 페이로드는 반복 횟수를 줄여 측정 시간을 맞춤
+        repeat = max(5, args.repeat // args.nodes) if name == "fleet" else args.repeat
+        rows = bench(payload, repeat)
+        baseline = rows[0][1]
+
+        print(f"\n[{name}] (반복 {repeat}회)")
+        print(f"{'코덱':<16} {'크기(B)':>10} {'비율':>7} {'인코딩(us)':>12} {'디코딩(us)':>12}")
+        print("-" * 62)
+        for codec_name, size, encode, decode in rows:
+            ratio = size / baseline
+            print(f"{codec_name:<16} {size:>10,} {ratio:>6.0%} {encode:>12.1f} {decode:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
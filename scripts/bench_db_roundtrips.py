@@ -0,0 +1,232 @@
+"""
+DB 왕복 벤치마크 (오프라인)
+
+shared.local_supabase 위에서 실제 리포지토리 코드를 실행하여
+작업별 PostgREST 왕복 수와 벽시계 시간을 측정
+
+시나리오:
+1. heartbeat - 기기별 DeviceSync.heartbeat() vs heartbeat_many()
+2. batch     - 배치 1회의 DB 작업 (그룹 조회 → busy → 명령 기록 → idle → 결과 기록)
+3. claim     - 기기별 get_pending_job() + start_job() vs claim_jobs()
+
+실행 방법:
+    python scripts/bench_db_roundtrips.py                          # 전체, 100대, 20ms
+    python scripts/bench_db_roundtrips.py --scenario claim --devices 300
+    python scripts/bench_db_roundtrips.py --latency 0.05 --jitter 0.01
+
+주입 지연은 왕복당 고정 비용이므로 왕복 수 x 지연이 벽시계 시간의 대부분을 차지
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from shared.device_registry import DeviceRegistry
+from shared.local_supabase import LocalSupabase, use_local_supabase
+from shared.supabase_client import DeviceSync, JobSync
+
+# loguru 출력은 측정에 방해가 되므로 경고 이상만 표시 (shared 모듈 import 이후 설정)
+try:
+    from loguru import logger
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+except ImportError:
+    pass
+
+PC_ID = 1
+
+Result = Tuple[str, str, int, float]
+
+
+def _serial(i: int) -> str:
+    return f"R58M{i:08d}"
+
+
+def _seed_devices(db: LocalSupabase, count: int) -> None:
+    now = datetime.now(timezone.utc).isoformat()
+    db.seed(
+        "devices",
+        [
+            {
+                "serial_number": _serial(i),
+                "hierarchy_id": f"WS01-PB{i // 20 + 1:02d}-S{i % 20 + 1:02d}",
+                "workstation_id": "WS01",
+                "device_group": "A" if i % 2 == 0 else "B",
+                "pc_id": PC_ID,
+                "status": "idle",
+                "last_seen": now,
+            }
+            for i in range(count)
+        ],
+    )
+
+
+async def _measure(
+    db: LocalSupabase, scenario: str, variant: str, run: Callable[[], Awaitable[None]]
+) -> Result:
+    db.stats.reset()
+    started = time.perf_counter()
+    await run()
+    return scenario, variant, db.stats.total, time.perf_counter() - started
+
+
+# =============================================================================
+# 시나리오
+# =============================================================================
+
+
+async def bench_heartbeat(devices: int, latency: float, jitter: float) -> List[Result]:
+    results = []
+    serials = [_serial(i) for i in range(devices)]
+
+    with use_local_supabase(latency=latency, jitter=jitter) as db:
+        _seed_devices(db, devices)
+        sync = DeviceSync(pc_id=PC_ID)
+
+        async def per_device():
+            for serial in serials:
+                await sync.heartbeat(serial)
+
+        async def bulk():
+            await sync.heartbeat_many(serials)
+
+        results.append(await _measure(db, "heartbeat", "heartbeat() x N", per_device))
+        results.append(await _measure(db, "heartbeat", "heartbeat_many()", bulk))
+
+    return results
+
+
+async def bench_batch(devices: int, latency: float, jitter: float) -> List[Result]:
+    # 워크로드 스키마/엔진은 이 시나리오에서만 필요
+    from shared.schemas.workload import (
+        BatchResult,
+        CommandStatus,
+        DeviceBatchResult,
+        WorkloadCycleResult,
+    )
+    from shared.workload_engine import WorkloadEngine
+
+    results = []
+
+    with use_local_supabase(latency=latency, jitter=jitter) as db:
+        _seed_devices(db, devices)
+        db.seed("videos", [{"title": "benchmark", "url": "https://youtu.be/x"}])
+        registry = DeviceRegistry()
+        engine = WorkloadEngine(registry=registry, executor=object())
+
+        async def cycle():
+            group_a, group_b = await registry.get_batch_groups()
+            serials = [d.serial_number for d in group_a]
+            started = datetime.now(timezone.utc)
+
+            await registry.set_devices_busy(serials)
+            for serial in serials:
+                await registry.update_device_command(serial, command="watch", result="success")
+            await registry.set_devices_idle(serials)
+
+            batch = BatchResult(
+                batch_number=1,
+                batch_group="A",
+                total_devices=len(serials),
+                success_count=len(serials),
+                started_at=started,
+                device_results=[
+                    DeviceBatchResult(
+                        device_id=serial,
+                        device_hierarchy_id=serial,
+                        status=CommandStatus.SUCCESS,
+                        watch_time_seconds=60,
+                        started_at=started,
+                    )
+                    for serial in serials
+                ],
+            )
+            await engine._record_cycle_result(
+                "bench",
+                "1",
+                WorkloadCycleResult(
+                    video_id="1",
+                    batch_results=[batch],
+                    total_success=len(serials),
+                    started_at=started,
+                ),
+            )
+
+        results.append(await _measure(db, "batch", "배치 1회 (그룹 A)", cycle))
+
+    return results
+
+
+async def bench_claim(devices: int, latency: float, jitter: float) -> List[Result]:
+    results = []
+
+    for variant in ("get_pending_job() + start_job() x N", "claim_jobs()"):
+        with use_local_supabase(latency=latency, jitter=jitter) as db:
+            _seed_devices(db, devices)
+            db.seed("videos", [{"title": "benchmark"}])
+            db.seed(
+                "jobs",
+                [{"video_id": 1, "device_id": i + 1, "status": "pending"} for i in range(devices)],
+            )
+            jobs = JobSync(pc_id=PC_ID)
+            device_ids = list(range(1, devices + 1))
+
+            async def per_device():
+                for device_id in device_ids:
+                    job = await jobs.get_pending_job(device_id)
+                    if job:
+                        await jobs.start_job(job["id"])
+
+            async def bulk():
+                await jobs.claim_jobs(device_ids)
+
+            run = bulk if variant == "claim_jobs()" else per_device
+            results.append(await _measure(db, "claim", variant, run))
+
+    return results
+
+
+SCENARIOS = {"heartbeat": bench_heartbeat, "batch": bench_batch, "claim": bench_claim}
+
+
+# =============================================================================
+# 메인
+# =============================================================================
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="로컬 Supabase 대체 클라이언트 DB 왕복 벤치마크")
+    parser.add_argument("--scenario", choices=[*SCENARIOS, "all"], default="all")
+    parser.add_argument("--devices", type=int, default=100, help="기기 수 (기본 100)")
+    parser.add_argument("--latency", type=float, default=0.02, help="왕복 지연 초 (기본 0.02)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="지연 난수 상한 초 (기본 0)")
+    args = parser.parse_args()
+
+    names = list(SCENARIOS) if args.scenario == "all" else [args.scenario]
+
+    print(
+        f"기기 {args.devices}대, 왕복 지연 {args.latency * 1000:.0f}ms (+{args.jitter * 1000:.0f}ms)"
+    )
+    print(f"{'시나리오':<10} {'방식':<40} {'왕복':>6} {'시간(ms)':>10}")
+    print("-" * 70)
+
+    for name in names:
+        try:
+            rows = await SCENARIOS[name](args.devices, args.latency, args.jitter)
+        except ImportError as e:
+            # batch는 워크로드 스키마/엔진이 필요 (트리에 없는 모듈이 있으면 건너뜀)
+            print(f"{name:<10} (건너뜀 - import 실패: {e})")
+            continue
+        for scenario, variant, trips, elapsed in rows:
+            print(f"{scenario:<10} {variant:<40} {trips:>6} {elapsed * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
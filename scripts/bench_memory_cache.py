@@ -0,0 +1,113 @@
+"""
+MemoryBackend 마이크로벤치마크
+
+shared.cache.MemoryBackend의 get/set 처리량을 키 수별로 측정
+
+측정 항목:
+1. fill       - 빈 캐시에 max_size개 키 set
+2. get (hit)  - 가득 찬 캐시에서 임의 키 get
+3. set (evict) - 가득 찬 캐시에 새 키 set (매번 LRU 제거 발생)
+
+--legacy 옵션은 이전 구현(용량 초과 시 expires_at 전체 스캔 + 전역 asyncio.Lock + 벽시계)을
+같은 조건으로 측정하여 비교 (1M 키는 제거 1회가 전체 스캔이므로 10k에서만 권장)
+
+실행 방법:
+    python scripts/bench_memory_cache.py                   # 10k, 1M
+    python scripts/bench_memory_cache.py --sizes 10000 --legacy
+    python scripts/bench_memory_cache.py --ops 200000
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from shared.cache import CacheBackend, MemoryBackend
+
+
+class LegacyMemoryBackend(CacheBackend):
+    """비교용 이전 MemoryBackend (O(n) 제거 스캔)"""
+
+    def __init__(self, max_size: int = 10000):
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        self._max_size = max_size
+        self._lock = asyncio.Lock()
+
+    async def get(self, key: str) -> Optional[Any]:
+        async with self._lock:
+            entry = self._cache.get(key)
+            if entry:
+                if entry["expires_at"] > datetime.now(timezone.utc).timestamp():
+                    return entry["value"]
+                del self._cache[key]
+            return None
+
+    async def set(self, key: str, value: Any, ttl: int = 60) -> bool:
+        async with self._lock:
+            if len(self._cache) >= self._max_size:
+                oldest_key = min(self._cache.keys(), key=lambda k: self._cache[k]["expires_at"])
+                del self._cache[oldest_key]
+            self._cache[key] = {
+                "value": value,
+                "expires_at": datetime.now(timezone.utc).timestamp() + ttl,
+            }
+            return True
+
+
+async def _throughput(ops: int, op: Callable[[int], Awaitable[Any]]) -> float:
+    started = time.perf_counter()
+    for i in range(ops):
+        await op(i)
+    return ops / (time.perf_counter() - started)
+
+
+async def bench(backend: CacheBackend, size: int, ops: int, evict_ops: int) -> List[float]:
+    value = {"status": "idle", "battery": 80}
+    keys = [f"device:status:{i}" for i in range(size)]
+    picks = [random.choice(keys) for _ in range(ops)]
+
+    async def fill(i: int):
+        await backend.set(keys[i], value, ttl=300)
+
+    async def get(i: int):
+        await backend.get(picks[i])
+
+    async def evict(i: int):
+        await backend.set(f"new:{i}", value, ttl=300)
+
+    return [
+        await _throughput(size, fill),
+        await _throughput(ops, get),
+        await _throughput(evict_ops, evict),
+    ]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="MemoryBackend get/set 처리량 측정")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000])
+    parser.add_argument("--ops", type=int, default=100_000, help="get/evict 측정 횟수")
+    parser.add_argument("--legacy", action="store_true", help="이전 구현과 비교")
+    args = parser.parse_args()
+
+    print(f"{'구현':<8} {'키 수':>10} {'fill ops/s':>14} {'get ops/s':>14} {'evict ops/s':>14}")
+    print("-" * 64)
+
+    for size in args.sizes:
+        backends = [("current", MemoryBackend(max_size=size, sweep_interval=0), args.ops)]
+        if args.legacy:
+            # 이전 구현은 제거 1회가 O(n)이므로 측정 횟수를 줄임
+            backends.append(("legacy", LegacyMemoryBackend(max_size=size), min(args.ops, 2_000)))
+
+        for name, backend, evict_ops in backends:
+            fill, get, evict = await bench(backend, size, args.ops, evict_ops)
+            print(f"{name:<8} {size:>10,} {fill:>14,.0f} {get:>14,.0f} {evict:>14,.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
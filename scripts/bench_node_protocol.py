@@ -0,0 +1,186 @@
+"""
+노드 프로토콜 벤치마크 (HEARTBEAT 1회당 전송 바이트 + CPU)
+
+노드 1대 (기본 디바이스 100대)가 HEARTBEAT를 연속으로 보낼 때 프로토콜별 비교
+
+비교:
+- v1/json         - 이전 구현 (device_snapshot 전체, json.dumps / json.loads)
+- v2/json         - shared.node_protocol JSON 프레임 + 마지막 ACK 버전 대비 델타
+- v2/msgpack      - msgpack 바이너리 프레임 + 델타 (msgpack 설치 시)
+- v2/msgpack-full - msgpack 바이너리 프레임, 델타 없음 (msgpack 설치 시)
+
+시뮬레이션:
+- 디바이스 필드는 노드 러너 스냅샷과 동일 (slot, serial, status, battery_level)
+- HEARTBEAT마다 --churn 비율의 디바이스 상태/배터리가 바뀜
+- 매 HEARTBEAT는 ACK됨 (델타 기준 = 직전 HEARTBEAT)
+
+측정 항목 (HEARTBEAT 1회 평균):
+- raw      : 프레임 크기
+- deflate  : permessage-deflate 후 크기 (연결 단위 압축 컨텍스트 유지, window bits 12)
+- node     : 노드 측 스냅샷 델타 + 직렬화 CPU (µs)
+- gateway  : 게이트웨이 측 역직렬화 + 스냅샷 복원 CPU (µs)
+- zlib     : permessage-deflate 압축 + 해제 CPU (µs, 양쪽 합)
+
+실행 방법:
+    python scripts/bench_node_protocol.py
+    python scripts/bench_node_protocol.py --devices 100 200 --churn 0.02 --heartbeats 500
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from shared.node_protocol import (
+    MSGPACK,
+    FrameCodec,
+    SnapshotDecoder,
+    SnapshotEncoder,
+    supported_encodings,
+)
+
+STATUSES = ["idle", "busy", "offline"]
+
+
+def make_devices(count: int, rng: random.Random) -> List[Dict]:
+    return [
+        {
+            "slot": i + 1,
+            "serial": f"R58M{rng.randrange(16**7):07X}",
+            "status": "idle",
+            "battery_level": rng.randint(20, 100),
+        }
+        for i in range(count)
+    ]
+
+
+def churn(devices: List[Dict], ratio: float, rng: random.Random) -> List[Dict]:
+    """노드 러너처럼 매번 새 dict 목록 (일부 디바이스만 값 변경)"""
+    devices = [dict(d) for d in devices]
+    for device in rng.sample(devices, max(1, int(len(devices) * ratio))):
+        device["status"] = rng.choice(STATUSES)
+        device["battery_level"] = max(0, device["battery_level"] - rng.randint(0, 2))
+    return devices
+
+
+def heartbeat(fields: Dict) -> Dict:
+    return {
+        "version": "1.0",
+        "timestamp": "2026-01-01T00:00:00.000000+00:00Z",
+        "message_id": "00000000-0000-0000-0000-000000000000",
+        "type": "HEARTBEAT",
+        "payload": {
+            "status": "READY",
+            "resources": {
+                "cpu_percent": 23.4,
+                "memory_percent": 61.2,
+                "disk_free_gb": 120.5,
+                "network_ok": True,
+            },
+            "active_tasks": 1,
+            "queue_depth": 0,
+            **fields,
+        },
+    }
+
+
+class Deflate:
+    """permessage-deflate 흉내 (context takeover, 메시지마다 sync flush 후 꼬리 4바이트 제거)"""
+
+    def __init__(self):
+        self._compress = zlib.compressobj(6, zlib.DEFLATED, -12, 8)
+        self._decompress = zlib.decompressobj(-12)
+
+    def roundtrip(self, frame: bytes) -> int:
+        data = self._compress.compress(frame) + self._compress.flush(zlib.Z_SYNC_FLUSH)
+        wire = data[:-4]
+        self._decompress.decompress(wire + b"\x00\x00\xff\xff")
+        return len(wire)
+
+
+def run(mode: str, device_count: int, args) -> List[str]:
+    rng = random.Random(device_count)
+    devices = make_devices(device_count, rng)
+    deflate = Deflate()
+
+    version, encoding = mode.split("/")
+    deltas = not encoding.endswith("-full")
+    encoding = encoding.removesuffix("-full")
+    codec = FrameCodec(encoding) if version == "v2" else None
+    encoder, decoder = SnapshotEncoder(), SnapshotDecoder()
+
+    raw = wire = 0
+    node_cpu = gateway_cpu = deflate_cpu = 0.0
+    for _ in range(args.heartbeats):
+        devices = churn(devices, args.churn, rng)
+
+        started = time.perf_counter()
+        if codec is None:
+            frame = json.dumps(heartbeat({"device_snapshot": devices})).encode("utf-8")
+        else:
+            fields = encoder.encode(devices) if deltas else {"device_snapshot": devices}
+            frame = codec.encode(heartbeat(fields))
+            if isinstance(frame, str):
+                frame = frame.encode("utf-8")
+        node_cpu += time.perf_counter() - started
+
+        started = time.perf_counter()
+        wire += deflate.roundtrip(frame)
+        deflate_cpu += time.perf_counter() - started
+        raw += len(frame)
+
+        started = time.perf_counter()
+        if codec is None:
+            message = json.loads(frame)
+            restored = message["payload"]["device_snapshot"]
+        else:
+            message = codec.decode(frame if codec.binary else frame.decode("utf-8"))
+            restored = decoder.apply(message["payload"])
+            if "device_snapshot_version" in message["payload"]:
+                encoder.ack(message["payload"]["device_snapshot_version"])
+        gateway_cpu += time.perf_counter() - started
+        assert len(restored) == device_count
+
+    n = args.heartbeats
+    return [
+        f"{device_count:>7}",
+        f"{mode:<15}",
+        f"{raw / n:>9.0f}",
+        f"{wire / n:>9.0f}",
+        f"{node_cpu / n * 1e6:>9.1f}",
+        f"{gateway_cpu / n * 1e6:>9.1f}",
+        f"{deflate_cpu / n * 1e6:>9.1f}",
+    ]
+
+
+def main(args):
+    modes = ["v1/json", "v2/json"]
+    if MSGPACK in supported_encodings():
+        modes += ["v2/msgpack", "v2/msgpack-full"]
+    else:
+        print("(msgpack 미설치 - v2/msgpack 생략: pip install msgpack)")
+
+    print(f"heartbeats={args.heartbeats} churn={args.churn:.0%}")
+    print(
+        f"{'devices':>7}  {'mode':<15}  {'raw(B)':>9}  {'deflate(B)':>9}  "
+        f"{'node(µs)':>9}  {'gw(µs)':>9}  {'zlib(µs)':>9}"
+    )
+    for count in args.devices:
+        for mode in modes:
+            print("  ".join(run(mode, count, args)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--devices", type=int, nargs="+", default=[100])
+    parser.add_argument("--heartbeats", type=int, default=200)
+    parser.add_argument(
+        "--churn", type=float, default=0.05, help="HEARTBEAT마다 바뀌는 디바이스 비율"
+    )
+    main(parser.parse_args())
@@ -13,6 +13,8 @@ from typing import Any, Dict, List, Optional
 
 from loguru import logger
 
+from shared.async_db import run_query
+from shared.query_cache import cached, invalidates
 from supabase import Client, create_client
 
 try:
@@ -94,6 +96,7 @@ class DeviceRepository:
         self.client = get_supabase_client()
         self.table = "devices"
 
+    @invalidates("devices")
     async def upsert(
         self, serial_number: str, pc_id: int, status: str = "idle", model: Optional[str] = None
     ) -> Dict[str, Any]:
@@ -129,10 +132,8 @@ class DeviceRepository:
             if model:
                 data["model"] = model
 
-            result = (
-                self.client.table(self.table)
-                .upsert(data, on_conflict="serial_number")  # serial_number 기준 충돌 처리
-                .execute()
+            result = await run_query(
+                self.client.table(self.table).upsert(data, on_conflict="serial_number")
             )
 
             if result.data and len(result.data) > 0:
@@ -146,6 +147,7 @@ class DeviceRepository:
             logger.error(f"기기 Upsert 실패: {serial_number} - {e}")
             raise
 
+    @invalidates("devices")
     async def update_status(self, serial_number: str, status: str) -> bool:
         """
         기기 상태 업데이트
@@ -160,11 +162,10 @@ class DeviceRepository:
         try:
             now = datetime.now(timezone.utc).isoformat()
 
-            result = (
+            result = await run_query(
                 self.client.table(self.table)
                 .update({"status": status, "last_seen": now})
                 .eq("serial_number", serial_number)
-                .execute()
             )
 
             success = result.data is not None and len(result.data) > 0
@@ -184,6 +185,9 @@ class DeviceRepository:
         """
         기기 하트비트 처리
 
+        하트비트는 기기 수만큼 잦으므로 캐시를 무효화하지 않음
+        (목록 캐시는 짧은 TTL로 반영)
+
         Args:
             serial_number: ADB 시리얼 번호
             health_data: 선택적 헬스 정보 (battery_temp, cpu_usage 등)
@@ -201,11 +205,8 @@ class DeviceRepository:
             # if health_data:
             #     update_data.update(health_data)
 
-            result = (
-                self.client.table(self.table)
-                .update(update_data)
-                .eq("serial_number", serial_number)
-                .execute()
+            result = await run_query(
+                self.client.table(self.table).update(update_data).eq("serial_number", serial_number)
             )
 
             return result.data is not None and len(result.data) > 0
@@ -217,12 +218,11 @@ class DeviceRepository:
     async def get_by_serial(self, serial_number: str) -> Optional[Dict]:
         """시리얼 번호로 기기 조회"""
         try:
-            result = (
+            result = await run_query(
                 self.client.table(self.table)
                 .select("*")
                 .eq("serial_number", serial_number)
                 .single()
-                .execute()
             )
 
             return result.data
@@ -234,7 +234,7 @@ class DeviceRepository:
     async def get_by_pc(self, pc_id: int) -> List[Dict]:
         """PC ID로 연결된 모든 기기 조회"""
         try:
-            result = self.client.table(self.table).select("*").eq("pc_id", pc_id).execute()
+            result = await run_query(self.client.table(self.table).select("*").eq("pc_id", pc_id))
 
             return result.data or []
 
@@ -242,6 +242,7 @@ class DeviceRepository:
             logger.error(f"PC 기기 목록 조회 실패: PC_{pc_id} - {e}")
             return []
 
+    @cached("devices.get_all", ttl=5, tags=["devices"])
     async def get_all(self, status: Optional[str] = None) -> List[Dict]:
         """
         전체 기기 목록 조회
@@ -258,7 +259,7 @@ class DeviceRepository:
             if status:
                 query = query.eq("status", status)
 
-            result = query.execute()
+            result = await run_query(query)
 
             return result.data or []
 
@@ -270,6 +271,7 @@ class DeviceRepository:
         """대기 중인 기기 목록"""
         return await self.get_all(status="idle")
 
+    @invalidates("devices")
     async def mark_offline_stale_devices(self, timeout_seconds: int = 30) -> int:
         """
         오래된 기기 offline 처리 (단일 쿼리로 최적화)
@@ -295,12 +297,11 @@ class DeviceRepository:
             # 단일 UPDATE 쿼리로 처리
             # 조건: status가 offline이 아니고, last_seen이 임계값보다 이전인 기기
             # Supabase Python SDK에서는 .neq()와 .lt()를 조합하여 사용
-            result = (
+            result = await run_query(
                 self.client.table(self.table)
                 .update({"status": "offline"})
                 .neq("status", "offline")
                 .lt("last_seen", threshold_iso)
-                .execute()
             )
 
             # 업데이트된 행 수 계산
@@ -337,6 +338,7 @@ class VideoRepository:
         self.client = get_supabase_client()
         self.table = "videos"
 
+    @invalidates("videos")
     async def create(
         self, url: str, title: Optional[str] = None, duration: Optional[int] = None
     ) -> Dict[str, Any]:
@@ -349,7 +351,7 @@ class VideoRepository:
             if duration is not None:
                 data["duration"] = duration
 
-            result = self.client.table(self.table).insert(data).execute()
+            result = await run_query(self.client.table(self.table).insert(data))
 
             if result.data and len(result.data) > 0:
                 logger.info(f"영상 등록: {url[:50]}...")
@@ -364,7 +366,9 @@ class VideoRepository:
     async def get_by_id(self, video_id: int) -> Optional[Dict]:
         """ID로 영상 조회"""
         try:
-            result = self.client.table(self.table).select("*").eq("id", video_id).single().execute()
+            result = await run_query(
+                self.client.table(self.table).select("*").eq("id", video_id).single()
+            )
 
             return result.data
 
@@ -372,15 +376,15 @@ class VideoRepository:
             logger.debug(f"영상 조회 실패: {video_id}")
             return None
 
+    @cached("videos.get_all", ttl=30, tags=["videos"])
     async def get_all(self, limit: int = 100) -> List[Dict]:
         """영상 목록 조회"""
         try:
-            result = (
+            result = await run_query(
                 self.client.table(self.table)
                 .select("*")
                 .order("created_at", desc=True)
                 .limit(limit)
-                .execute()
             )
 
             return result.data or []
@@ -419,10 +423,10 @@ class JobRepository:
     async def create(self, video_id: int, device_id: int) -> Dict[str, Any]:
         """작업 생성"""
         try:
-            result = (
-                self.client.table(self.table)
-                .insert({"video_id": video_id, "device_id": device_id, "status": "pending"})
-                .execute()
+            result = await run_query(
+                self.client.table(self.table).insert(
+                    {"video_id": video_id, "device_id": device_id, "status": "pending"}
+                )
             )
 
             if result.data and len(result.data) > 0:
@@ -440,11 +444,10 @@ class JobRepository:
         try:
             now = datetime.now(timezone.utc).isoformat()
 
-            result = (
+            result = await run_query(
                 self.client.table(self.table)
                 .update({"status": "running", "started_at": now})
                 .eq("id", job_id)
-                .execute()
             )
 
             return result.data is not None and len(result.data) > 0
@@ -465,7 +468,9 @@ class JobRepository:
             if screenshot_url:
                 update_data["screenshot_url"] = screenshot_url
 
-            result = self.client.table(self.table).update(update_data).eq("id", job_id).execute()
+            result = await run_query(
+                self.client.table(self.table).update(update_data).eq("id", job_id)
+            )
 
             if result.data and len(result.data) > 0:
                 logger.info(f"작업 완료: {job_id} (시청: {watch_time}초)")
@@ -482,11 +487,10 @@ class JobRepository:
         try:
             now = datetime.now(timezone.utc).isoformat()
 
-            result = (
+            result = await run_query(
                 self.client.table(self.table)
                 .update({"status": "failed", "completed_at": now, "error_message": error_message})
                 .eq("id", job_id)
-                .execute()
             )
 
             if result.data and len(result.data) > 0:
@@ -502,13 +506,12 @@ class JobRepository:
     async def get_pending(self, limit: int = 10) -> List[Dict]:
         """대기 중인 작업 조회"""
         try:
-            result = (
+            result = await run_query(
                 self.client.table(self.table)
                 .select("*, videos(*), devices(*)")
                 .eq("status", "pending")
                 .order("created_at", desc=False)
                 .limit(limit)
-                .execute()
             )
 
             return result.data or []
@@ -517,18 +520,55 @@ class JobRepository:
             logger.error(f"대기 작업 조회 실패: {e}")
             return []
 
+    async def claim(
+        self, device_ids: List[Any], pc_id: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        idle 기기들에 대기 작업 일괄 배정 (claim_jobs RPC)
+
+        기기/작업을 SKIP LOCKED로 잠그고 한 트랜잭션에서 running으로 전환
+        → 동시에 호출해도 같은 작업이 두 번 배정되지 않음
+
+        Args:
+            device_ids: 후보 기기 ID 목록 (우선순위 순)
+            pc_id: 워크스테이션 ID (생략 시 소속 검사 안 함)
+            limit: 최대 배정 수 (생략 시 기기 수)
+
+        Returns:
+            배정된 작업 목록 (videos 포함)
+        """
+        if not device_ids:
+            return []
+
+        try:
+            result = await run_query(
+                self.client.rpc(
+                    "claim_jobs",
+                    {
+                        "p_pc_id": pc_id,
+                        "p_device_ids": [str(device_id) for device_id in device_ids],
+                        "p_limit": limit,
+                    },
+                ).select("*, videos(*)")
+            )
+
+            return result.data or []
+
+        except Exception as e:
+            logger.error(f"작업 일괄 클레임 실패: {len(device_ids)}대 - {e}")
+            return []
+
     async def get_next_for_device(self, device_id: int) -> Optional[Dict]:
         """특정 기기의 다음 작업 가져오기"""
         try:
             # 대기 중인 작업 중 해당 기기에 할당된 것
-            result = (
+            result = await run_query(
                 self.client.table(self.table)
                 .select("*, videos(*)")
                 .eq("device_id", device_id)
                 .eq("status", "pending")
                 .order("created_at", desc=False)
                 .limit(1)
-                .execute()
             )
 
             if result.data and len(result.data) > 0:
@@ -543,7 +583,7 @@ class JobRepository:
     async def get_stats(self) -> Dict[str, int]:
         """작업 통계"""
         try:
-            all_jobs = self.client.table(self.table).select("status").execute()
+            all_jobs = await run_query(self.client.table(self.table).select("status"))
 
             stats = {"total": 0, "pending": 0, "running": 0, "completed": 0, "failed": 0}
 
@@ -11,12 +11,14 @@ import logging
 import os
 import time
 from contextlib import asynccontextmanager
+from typing import Optional
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
-from shared.cache import CacheKey, get_cache
+from shared.async_db import shutdown_query_executor
+from shared.cache import RateLimiter, get_cache
 
 # 라우터 임포트 (Docker/standalone 호환)
 try:
@@ -92,6 +94,7 @@ async def lifespan(app: FastAPI):
     logger.info("📺 YouTube Monitor Scheduler 종료됨")
     await stop_nocturne_scheduler()
     logger.info("🌙 Nocturne Scheduler 종료됨")
+    shutdown_query_executor(wait=False)
     logger.info("👋 DoAi.Me Backend API 종료")
 
 
@@ -120,6 +123,16 @@ RATE_LIMIT_REQUESTS = int(os.getenv("RATE_LIMIT_REQUESTS", "100"))
 RATE_LIMIT_WINDOW = int(os.getenv("RATE_LIMIT_WINDOW", "60"))
 RATE_LIMIT_EXEMPT_PATHS = {"/health", "/metrics", "/api/oob/metrics", "/api/devices/heartbeat"}
 
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def _get_rate_limiter() -> RateLimiter:
+    """API 슬라이딩 윈도우 리미터 (Redis 공유, 미연결 시 프로세스 로컬)"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter(get_cache(), RATE_LIMIT_REQUESTS, RATE_LIMIT_WINDOW, name="api")
+    return _rate_limiter
+
 
 @app.middleware("http")
 async def rate_limit_middleware(request: Request, call_next):
@@ -130,20 +143,18 @@ async def rate_limit_middleware(request: Request, call_next):
     client_ip = request.client.host if request.client else "unknown"
     identifier = request.headers.get("X-API-Key", client_ip)
 
-    cache = get_cache()
-    count = await cache.incr(CacheKey.RATE_LIMIT, identifier, ttl=RATE_LIMIT_WINDOW)
+    result = await _get_rate_limiter().hit(identifier)
 
-    if count > RATE_LIMIT_REQUESTS:
+    if not result.allowed:
         logger.warning(f"Rate limit exceeded: {identifier}")
         return JSONResponse(
             status_code=429,
             content={"error": "Rate limit exceeded"},
-            headers={"Retry-After": str(RATE_LIMIT_WINDOW)},
+            headers=result.headers(),
         )
 
     response = await call_next(request)
-    response.headers["X-RateLimit-Limit"] = str(RATE_LIMIT_REQUESTS)
-    response.headers["X-RateLimit-Remaining"] = str(max(0, RATE_LIMIT_REQUESTS - count))
+    response.headers.update(result.headers())
     return response
 
 
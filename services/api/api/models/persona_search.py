@@ -93,6 +93,7 @@ class SearchHistoryResponse(BaseModel):
     traits_influence: Dict[str, Any] = Field(
         default_factory=dict, description="Traits가 검색에 미치는 영향 분석"
     )
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 커서 (마지막 페이지면 null)")
 
     class Config:
         json_schema_extra = {
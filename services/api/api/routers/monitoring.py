@@ -7,18 +7,21 @@ DoAi.Me 모니터링 라우터
 - GET /api/monitoring/summary - 시스템 요약
 - GET /api/monitoring/alerts - 알림 목록
 - POST /api/monitoring/alerts - 알림 전송
+- GET /api/monitoring/cache - 캐시 백엔드 / 키 공간 샘플 (접두사별 개수, 크기, TTL 분포)
 - GET /api/monitoring/logs - 로그 검색
+- GET /api/monitoring/logs/export - 로그 내보내기 (NDJSON 스트리밍)
 - POST /api/monitoring/logs - 로그 저장
 - GET /api/monitoring/logs/stats - 로그 통계
 """
 
+import json
 import platform
 import time
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Query
-from fastapi.responses import PlainTextResponse
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from loguru import logger
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from pydantic import BaseModel
@@ -30,6 +33,7 @@ from shared.monitoring import (
     check_memory,
     get_log_collector,
     get_log_stats,
+    iter_logs,
     search_logs,
 )
 from shared.monitoring.metrics import (
@@ -510,6 +514,42 @@ async def network_health():
         }
 
 
+@router.get("/api/monitoring/cache")
+async def cache_keyspace(
+    sample: int = Query(1000, ge=1, le=10000, description="샘플링할 최대 키 수"),
+):
+    """
+    캐시 키 공간 샘플
+
+    Redis는 SCAN으로 최대 sample개 키를 읽고 MEMORY USAGE / PTTL을 조회해
+    접두사(CacheKey)별 개수 추정치, 크기(avg/p50/p95/max), TTL 분포를 반환
+    캐시 크기(CACHE_MEMORY_MAX_*, CACHE_L1_*)와 TTL 조정의 근거 데이터
+
+    히트율/지연 시간은 /metrics의 cache_hits_total, cache_operation_duration_seconds 참고
+    """
+    try:
+        from shared.cache import get_cache
+
+        cache = get_cache()
+        keyspace = await cache.keyspace(sample=sample)
+        tiers = cache.backend_stats()
+
+        return {
+            "backend": keyspace.pop("backend"),
+            "keyspace": keyspace,
+            "tiers": tiers,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+
+    except Exception as e:
+        logger.error(f"Failed to sample cache keyspace: {e}")
+        return {
+            "backend": "unknown",
+            "error": "An internal error occurred",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+
+
 # =============================================================================
 # 로그 엔드포인트 (M3)
 # =============================================================================
@@ -522,15 +562,19 @@ async def get_logs(
     search: Optional[str] = Query(None, description="메시지 검색어"),
     hours: int = Query(24, ge=1, le=168, description="조회 시간 범위 (시간)"),
     limit: int = Query(100, ge=1, le=500, description="최대 결과 수"),
-    offset: int = Query(0, ge=0, description="오프셋"),
+    offset: int = Query(0, ge=0, description="오프셋 (하위 호환용, cursor 사용 권장)"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
 ):
     """
     로그 검색
 
     monitoring_logs 테이블에서 로그 조회
+    다음 페이지는 응답의 next_cursor를 cursor로 전달 (created_at, id 키셋)
     """
     from datetime import timedelta
 
+    from shared.async_db import page_cursor
+
     try:
         start_time = datetime.now(timezone.utc) - timedelta(hours=hours)
         end_time = datetime.now(timezone.utc)
@@ -543,6 +587,7 @@ async def get_logs(
             search_text=search,
             limit=limit,
             offset=offset,
+            cursor=cursor,
         )
 
         return {
@@ -550,6 +595,7 @@ async def get_logs(
             "count": len(logs),
             "limit": limit,
             "offset": offset,
+            "next_cursor": page_cursor(logs, limit),
             "filters": {
                 "level": level,
                 "source": source,
@@ -558,6 +604,8 @@ async def get_logs(
             },
         }
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to search logs: {e}")
         return {
@@ -567,6 +615,47 @@ async def get_logs(
         }
 
 
+@router.get("/api/monitoring/logs/export")
+async def export_logs(
+    level: Optional[str] = Query(None, description="필터: debug, info, warning, error, critical"),
+    source: Optional[str] = Query(None, description="소스 필터: api, oob, laixi, node-runner"),
+    search: Optional[str] = Query(None, description="메시지 검색어"),
+    hours: int = Query(24, ge=1, le=168, description="조회 시간 범위 (시간)"),
+):
+    """
+    로그 내보내기 (NDJSON 스트리밍)
+
+    키셋 페이지 단위로 DB를 순회하며 한 줄에 로그 하나씩 전송
+    → 전체 결과를 메모리에 올리지 않음
+    """
+    from datetime import timedelta
+
+    end_time = datetime.now(timezone.utc)
+    start_time = end_time - timedelta(hours=hours)
+
+    async def stream():
+        try:
+            async for row in iter_logs(
+                level=level,
+                source=source,
+                start_time=start_time,
+                end_time=end_time,
+                search_text=search,
+            ):
+                yield json.dumps(row, ensure_ascii=False, default=str) + "\n"
+        except Exception as e:
+            # 응답 헤더가 이미 전송되었으므로 마지막 줄로 오류 표시
+            logger.error(f"Failed to export logs: {e}")
+            yield json.dumps({"error": "export interrupted"}) + "\n"
+
+    filename = f"logs_{end_time.strftime('%Y%m%d_%H%M%S')}.ndjson"
+    return StreamingResponse(
+        stream(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.post("/api/monitoring/logs", response_model=LogResponse)
 async def create_log(request: LogRequest):
     """
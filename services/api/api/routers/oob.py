@@ -100,6 +100,18 @@ class NodeMetricsUpdate(BaseModel):
     box_tcp_ok: bool = False
 
 
+class NodeMetricsBatch(BaseModel):
+    """노드 메트릭 일괄 업데이트 요청 (Cloud Gateway OOBForwarder)"""
+
+    nodes: List[NodeMetricsUpdate] = Field(default_factory=list, max_length=1000)
+
+
+class NodeMetricsBatchResponse(BaseModel):
+    """노드 메트릭 일괄 업데이트 응답"""
+
+    updated: int
+
+
 class NodeHealthResponse(BaseModel):
     """노드 건강 상태 응답"""
 
@@ -207,6 +219,32 @@ async def update_node_metrics(update: NodeMetricsUpdate):
     )
 
 
+@router.post("/metrics/bulk", response_model=NodeMetricsBatchResponse)
+async def update_nodes_metrics(batch: NodeMetricsBatch):
+    """
+    노드 메트릭 일괄 업데이트 (Cloud Gateway가 여러 노드의 HEARTBEAT를 모아서 호출)
+    수집기 락 1회 + 캐시 set_many 1회 (Redis 파이프라인)
+    """
+    if not batch.nodes:
+        return NodeMetricsBatchResponse(updated=0)
+
+    # 같은 노드가 여러 번 오면 마지막 값만 반영
+    latest = {update.node_id: update.model_dump() for update in batch.nodes}
+
+    collector = get_health_collector()
+    nodes = await collector.update_nodes_metrics(list(latest.values()))
+
+    # M4: Cache node health
+    cache = get_cache()
+    await cache.set_many(
+        CacheKey.NODE_HEALTH,
+        {node.node_id: _node_to_dict(node) for node in nodes},
+        ttl=NODE_HEALTH_CACHE_TTL,
+    )
+
+    return NodeMetricsBatchResponse(updated=len(nodes))
+
+
 @router.get("/nodes", response_model=List[NodeHealthResponse])
 async def get_all_nodes():
     """모든 노드 건강 상태 조회"""
@@ -527,7 +565,14 @@ async def test_box_connection(box_ip: str, box_port: int = 56666):
 
 @router.get("/stats/summary")
 async def get_oob_stats_summary():
-    """M4: Cached OOB statistics for dashboard (30s TTL)"""
+    """
+    M4: Cached OOB statistics for dashboard (30s TTL)
+
+    만료 직후 대시보드 폴링이 한꺼번에 몰려도 계산은 1회:
+    - 30초가 지나면 이전 값을 바로 반환하고 백그라운드에서 1회 갱신 (최대 30초 더)
+    - 캐시가 비어 있으면 프로세스 내 동시 요청은 하나의 계산 결과를 공유
+    - Redis 락으로 여러 API 프로세스 중 한 곳만 계산
+    """
     cache = get_cache()
 
     async def compute_stats():
@@ -541,4 +586,6 @@ async def get_oob_stats_summary():
             "total_devices": sum(n.metrics.device_count_adb for n in nodes.values()),
         }
 
-    return await cache.get_or_set(CacheKey.SYSTEM_STATS, "oob", ttl=30, factory=compute_stats)
+    return await cache.get_or_set(
+        CacheKey.SYSTEM_STATS, "oob", ttl=30, stale_ttl=30, lock_ttl=10, factory=compute_stats
+    )
@@ -219,17 +219,20 @@ async def trigger_idle_search(persona_id: str, request: IdleSearchRequest):
 """,
 )
 async def get_search_history(
-    persona_id: str, limit: int = Query(50, ge=1, le=200, description="조회 개수")
+    persona_id: str,
+    limit: int = Query(50, ge=1, le=200, description="조회 개수"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
 ):
     """
     검색 기록 조회
 
     - **persona_id**: 페르소나 UUID
     - **limit**: 조회 개수 (최대 200)
+    - **cursor**: 다음 페이지 커서 (created_at, id 키셋)
     """
     try:
         service = get_persona_search_service()
-        result = await service.get_search_history(persona_id, limit)
+        result = await service.get_search_history(persona_id, limit, cursor=cursor)
 
         return SearchHistoryResponse(
             success=result["success"],
@@ -237,8 +240,11 @@ async def get_search_history(
             total=result["total"],
             history=result["history"],
             traits_influence=result.get("traits_influence", {}),
+            next_cursor=result.get("next_cursor"),
         )
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.exception(f"검색 기록 조회 실패: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
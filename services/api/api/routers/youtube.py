@@ -15,6 +15,9 @@ from typing import List, Optional
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 
+from shared.async_db import run_query
+from shared.query_cache import cached, invalidate_tags
+
 try:
     from ..services.supabase_rpc import get_supabase_client
 except ImportError:
@@ -118,6 +121,62 @@ class ResultResponse(BaseModel):
     message: str
 
 
+# === 캐시 조회 ===
+
+
+@cached("youtube.videos", ttl=10, tags=["videos"])
+async def _fetch_videos(status: Optional[str], limit: int, offset: int) -> dict:
+    """영상 목록 + 통계 조회 (대시보드 폴링용 캐시)"""
+    supabase = get_supabase_client()
+
+    # 쿼리 빌드
+    query = supabase.table("videos").select("*")
+
+    if status:
+        query = query.eq("status", status)
+
+    query = query.range(offset, offset + limit - 1).order("created_at", desc=True)
+
+    result = await run_query(query)
+
+    # 통계 조회
+    stats_result = await run_query(supabase.rpc("get_video_stats"))
+
+    stats = (
+        stats_result.data[0]
+        if stats_result.data
+        else {"total": len(result.data), "pending": 0, "completed": 0, "error": 0}
+    )
+
+    return {"videos": result.data, "stats": stats}
+
+
+@cached("youtube.stats", ttl=10, tags=["videos", "results"])
+async def _fetch_stats() -> dict:
+    """전체 통계 조회 (대시보드 폴링용 캐시)"""
+    supabase = get_supabase_client()
+
+    # 영상 통계
+    videos_stats = await run_query(supabase.rpc("get_video_stats"))
+
+    # 디바이스 통계
+    device_stats = await run_query(supabase.rpc("get_device_stats"))
+
+    # 오늘 결과
+    today_results = await run_query(
+        supabase.table("results")
+        .select("count", count="exact")
+        .gte("created_at", datetime.utcnow().date().isoformat())
+    )
+
+    return {
+        "success": True,
+        "videos": videos_stats.data[0] if videos_stats.data else {},
+        "devices": device_stats.data[0] if device_stats.data else {},
+        "today_completed": today_results.count or 0,
+    }
+
+
 # === API 엔드포인트 ===
 
 
@@ -134,30 +193,10 @@ async def get_videos(
     - 페이지네이션 지원
     """
     try:
-        supabase = get_supabase_client()
-
-        # 쿼리 빌드
-        query = supabase.table("videos").select("*")
-
-        if status:
-            query = query.eq("status", status)
-
-        query = query.range(offset, offset + limit - 1).order("created_at", desc=True)
-
-        result = query.execute()
-
-        # 통계 조회
-        stats_query = supabase.rpc("get_video_stats")
-        stats_result = stats_query.execute()
-
-        stats = (
-            stats_result.data[0]
-            if stats_result.data
-            else {"total": len(result.data), "pending": 0, "completed": 0, "error": 0}
-        )
+        data = await _fetch_videos(status, limit, offset)
 
         return VideoResponse(
-            success=True, videos=[VideoInput(**v) for v in result.data], stats=stats
+            success=True, videos=[VideoInput(**v) for v in data["videos"]], stats=data["stats"]
         )
 
     except Exception as e:
@@ -174,7 +213,7 @@ async def add_video(video: VideoInput):
         supabase = get_supabase_client()
 
         # 중복 체크
-        existing = supabase.table("videos").select("id").eq("id", video.id).execute()
+        existing = await run_query(supabase.table("videos").select("id").eq("id", video.id))
 
         if existing.data:
             return {"success": False, "message": "이미 존재하는 영상입니다", "video_id": video.id}
@@ -189,7 +228,8 @@ async def add_video(video: VideoInput):
             "created_at": datetime.utcnow().isoformat(),
         }
 
-        supabase.table("videos").insert(insert_data).execute()
+        await run_query(supabase.table("videos").insert(insert_data))
+        await invalidate_tags("videos")
 
         return {"success": True, "message": "영상 추가 완료", "video_id": video.id}
 
@@ -227,7 +267,7 @@ async def save_result(result: WatchResult):
             "created_at": datetime.utcnow().isoformat(),
         }
 
-        db_result = supabase.table("results").insert(insert_data).execute()
+        db_result = await run_query(supabase.table("results").insert(insert_data))
 
         # 영상 상태 업데이트
         video_update = {"status": result.status, "updated_at": datetime.utcnow().isoformat()}
@@ -248,7 +288,8 @@ async def save_result(result: WatchResult):
                 },
             )
 
-        supabase.table("videos").update(video_update).eq("id", result.video_id).execute()
+        await run_query(supabase.table("videos").update(video_update).eq("id", result.video_id))
+        await invalidate_tags("videos", "results")
 
         result_id = db_result.data[0]["id"] if db_result.data else None
 
@@ -269,28 +310,7 @@ async def get_stats():
     전체 통계 조회
     """
     try:
-        supabase = get_supabase_client()
-
-        # 영상 통계
-        videos_stats = supabase.rpc("get_video_stats").execute()
-
-        # 디바이스 통계
-        device_stats = supabase.rpc("get_device_stats").execute()
-
-        # 오늘 결과
-        today_results = (
-            supabase.table("results")
-            .select("count", count="exact")
-            .gte("created_at", datetime.utcnow().date().isoformat())
-            .execute()
-        )
-
-        return {
-            "success": True,
-            "videos": videos_stats.data[0] if videos_stats.data else {},
-            "devices": device_stats.data[0] if device_stats.data else {},
-            "today_completed": today_results.count or 0,
-        }
+        return await _fetch_stats()
 
     except Exception as e:
         logger.error(f"통계 조회 실패: {str(e)}")
@@ -306,8 +326,9 @@ async def delete_video(video_id: str):
         supabase = get_supabase_client()
 
         # 관련 결과도 함께 삭제
-        supabase.table("results").delete().eq("video_id", video_id).execute()
-        supabase.table("videos").delete().eq("id", video_id).execute()
+        await run_query(supabase.table("results").delete().eq("video_id", video_id))
+        await run_query(supabase.table("videos").delete().eq("id", video_id))
+        await invalidate_tags("videos", "results")
 
         return {"success": True, "message": f"영상 {video_id} 삭제 완료"}
 
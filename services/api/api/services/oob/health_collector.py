@@ -12,6 +12,8 @@ from datetime import datetime, timedelta
 from enum import Enum
 from typing import Dict, List, Optional
 
+from shared.async_db import run_query
+
 logger = logging.getLogger(__name__)
 
 
@@ -163,36 +165,50 @@ class HealthCollector:
             metrics_data: 메트릭 딕셔너리 (NodeRunner HEARTBEAT에서 수신)
         """
         async with self._lock:
-            # 노드가 없으면 자동 등록 (락 없는 버전 사용하여 데드락 방지)
-            if node_id not in self._nodes:
-                self._register_node_unsafe(node_id)
-
-            node = self._nodes[node_id]
-
-            # 메트릭 파싱
-            metrics = NodeMetrics(
-                node_heartbeat_age_sec=0.0,  # 방금 받음
-                device_count_adb=metrics_data.get("device_count", 0),
-                device_count_expected=node.metrics.device_count_expected
-                or metrics_data.get("device_count", 0),
-                adb_server_ok=metrics_data.get("laixi_connected", False),
-                unauthorized_count=metrics_data.get("unauthorized_count", 0),
-                ws_connected=True,
-                box_tcp_ok=metrics_data.get("box_tcp_ok", False),
-                uptime_sec=metrics_data.get("uptime_sec", 0),
-                laixi_connected=metrics_data.get("laixi_connected", False),
-                laixi_restarts=metrics_data.get("laixi_restarts", 0),
-                collected_at=datetime.utcnow(),
-            )
+            return self._apply_metrics_unsafe(node_id, metrics_data)
 
-            node.update_metrics(metrics)
-            node.tailscale_online = True
+    async def update_nodes_metrics(self, items: List[dict]) -> List[NodeHealth]:
+        """
+        여러 노드 메트릭 일괄 업데이트 (Cloud Gateway 일괄 전달용, 락 1회)
 
-            logger.debug(
-                f"Metrics updated for {node_id}: devices={metrics.device_count_adb}, adb_ok={metrics.adb_server_ok}"
-            )
+        Args:
+            items: node_id를 포함한 메트릭 딕셔너리 목록
+        """
+        async with self._lock:
+            return [self._apply_metrics_unsafe(item["node_id"], item) for item in items]
 
-            return node
+    def _apply_metrics_unsafe(self, node_id: str, metrics_data: dict) -> NodeHealth:
+        """메트릭 반영 (락 없이 - 호출자가 락을 보유해야 함)"""
+        # 노드가 없으면 자동 등록 (락 없는 버전 사용하여 데드락 방지)
+        if node_id not in self._nodes:
+            self._register_node_unsafe(node_id)
+
+        node = self._nodes[node_id]
+
+        # 메트릭 파싱
+        metrics = NodeMetrics(
+            node_heartbeat_age_sec=0.0,  # 방금 받음
+            device_count_adb=metrics_data.get("device_count", 0),
+            device_count_expected=node.metrics.device_count_expected
+            or metrics_data.get("device_count", 0),
+            adb_server_ok=metrics_data.get("laixi_connected", False),
+            unauthorized_count=metrics_data.get("unauthorized_count", 0),
+            ws_connected=True,
+            box_tcp_ok=metrics_data.get("box_tcp_ok", False),
+            uptime_sec=metrics_data.get("uptime_sec", 0),
+            laixi_connected=metrics_data.get("laixi_connected", False),
+            laixi_restarts=metrics_data.get("laixi_restarts", 0),
+            collected_at=datetime.utcnow(),
+        )
+
+        node.update_metrics(metrics)
+        node.tailscale_online = True
+
+        logger.debug(
+            f"Metrics updated for {node_id}: devices={metrics.device_count_adb}, adb_ok={metrics.adb_server_ok}"
+        )
+
+        return node
 
     async def mark_heartbeat_timeout(self, node_id: str):
         """하트비트 타임아웃 처리"""
@@ -259,10 +275,10 @@ class HealthCollector:
 
         try:
             # nodes 테이블에서 정보 조회
-            result = (
-                self._supabase.table("nodes")
-                .select("node_id, name, capacity, tailscale_ip, status_v2")
-                .execute()
+            result = await run_query(
+                self._supabase.table("nodes").select(
+                    "node_id, name, capacity, tailscale_ip, status_v2"
+                )
             )
 
             for node_data in result.data or []:
@@ -289,16 +305,18 @@ class HealthCollector:
             return
 
         try:
-            self._supabase.table("node_health_logs").insert(
-                {
-                    "node_id": node_id,
-                    "status": node.status.value,
-                    "device_count_adb": node.metrics.device_count_adb,
-                    "device_count_expected": node.metrics.device_count_expected,
-                    "adb_server_ok": node.metrics.adb_server_ok,
-                    "unauthorized_count": node.metrics.unauthorized_count,
-                    "collected_at": node.metrics.collected_at.isoformat(),
-                }
-            ).execute()
+            await run_query(
+                self._supabase.table("node_health_logs").insert(
+                    {
+                        "node_id": node_id,
+                        "status": node.status.value,
+                        "device_count_adb": node.metrics.device_count_adb,
+                        "device_count_expected": node.metrics.device_count_expected,
+                        "adb_server_ok": node.metrics.adb_server_ok,
+                        "unauthorized_count": node.metrics.unauthorized_count,
+                        "collected_at": node.metrics.collected_at.isoformat(),
+                    }
+                )
+            )
         except Exception as e:
             logger.error(f"Failed to persist metrics for {node_id}: {e}")
@@ -41,6 +41,9 @@ except ImportError:
                 return create_client(url, key)
 
 
+from shared.async_db import run_query
+from shared.query_cache import invalidates
+
 logger = logging.getLogger("persona_crud_service")
 
 
@@ -141,6 +144,7 @@ class PersonaCrudService:
 
     # ==================== CREATE ====================
 
+    @invalidates("personas")
     async def create_persona(
         self,
         name: str,
@@ -206,7 +210,7 @@ class PersonaCrudService:
             }
 
         try:
-            self.client.table("personas").insert(persona_data).execute()
+            await run_query(self.client.table("personas").insert(persona_data))
             logger.info(f"페르소나 생성: {name} ({persona_id})")
             return {
                 "success": True,
@@ -221,6 +225,7 @@ class PersonaCrudService:
 
     # ==================== UPDATE ====================
 
+    @invalidates("personas")
     async def update_persona(
         self,
         persona_id: str,
@@ -285,7 +290,7 @@ class PersonaCrudService:
             raise ValueError(f"페르소나를 찾을 수 없습니다: {persona_id}")
 
         try:
-            self.client.table("personas").update(update_data).eq("id", persona_id).execute()
+            await run_query(self.client.table("personas").update(update_data).eq("id", persona_id))
             logger.info(f"페르소나 수정: {persona_id}, fields={updated_fields}")
             return {
                 "success": True,
@@ -299,6 +304,7 @@ class PersonaCrudService:
 
     # ==================== DELETE ====================
 
+    @invalidates("personas")
     async def delete_persona(self, persona_id: str) -> Dict[str, Any]:
         """페르소나 삭제"""
         # Mock 모드
@@ -331,22 +337,19 @@ class PersonaCrudService:
 
         try:
             # 페르소나 정보 조회
-            result = (
-                self.client.table("personas").select("name").eq("id", persona_id).single().execute()
+            result = await run_query(
+                self.client.table("personas").select("name").eq("id", persona_id).single()
             )
             name = result.data.get("name", "Unknown") if result.data else "Unknown"
 
             # 활동 로그 삭제
-            logs_result = (
-                self.client.table("persona_activity_logs")
-                .delete()
-                .eq("persona_id", persona_id)
-                .execute()
+            logs_result = await run_query(
+                self.client.table("persona_activity_logs").delete().eq("persona_id", persona_id)
             )
             activities_deleted = len(logs_result.data) if logs_result.data else 0
 
             # 페르소나 삭제
-            self.client.table("personas").delete().eq("id", persona_id).execute()
+            await run_query(self.client.table("personas").delete().eq("id", persona_id))
 
             logger.info(f"페르소나 삭제: {name} ({persona_id})")
             return {
@@ -587,8 +590,8 @@ class PersonaCrudService:
             return None
 
         try:
-            result = (
-                self.client.table("personas").select("*").eq("id", persona_id).single().execute()
+            result = await run_query(
+                self.client.table("personas").select("*").eq("id", persona_id).single()
             )
             return result.data
         except Exception:
@@ -608,13 +611,12 @@ class PersonaCrudService:
             ]
 
         try:
-            result = (
+            result = await run_query(
                 self.client.table("persona_activity_logs")
                 .select("search_keyword, created_at")
                 .eq("persona_id", persona_id)
                 .eq("activity_type", "idle_search")
                 .gte("created_at", since)
-                .execute()
             )
             return result.data or []
         except Exception as e:
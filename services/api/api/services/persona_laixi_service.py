@@ -58,6 +58,8 @@ try:
 except ImportError:
     from persona_search_service import get_persona_search_service
 
+from shared.async_db import run_query
+
 logger = logging.getLogger("persona_laixi_service")
 
 
@@ -358,7 +360,7 @@ class PersonaLaixiService:
                 "uniqueness_delta": 0.02 * formative_impact,
                 "created_at": datetime.now(timezone.utc).isoformat(),
             }
-            self.client.table("persona_activity_logs").insert(log_data).execute()
+            await run_query(self.client.table("persona_activity_logs").insert(log_data))
         except Exception as e:
             logger.error(f"활동 로그 저장 실패: {e}")
 
@@ -372,9 +374,11 @@ class PersonaLaixiService:
             return
 
         try:
-            self.client.table("persona_activity_logs").update(
-                {"target_url": video_url, "target_title": video_title}
-            ).eq("id", activity_log_id).execute()
+            await run_query(
+                self.client.table("persona_activity_logs")
+                .update({"target_url": video_url, "target_title": video_title})
+                .eq("id", activity_log_id)
+            )
         except Exception as e:
             logger.error(f"활동 로그 업데이트 실패: {e}")
 
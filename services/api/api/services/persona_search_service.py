@@ -62,6 +62,9 @@ except ImportError:
                 return create_client(url, key)
 
 
+from shared.async_db import apply_keyset, decode_cursor, iter_keyset, page_cursor, run_query
+from shared.query_cache import cached, invalidates
+
 logger = logging.getLogger("persona_search_service")
 
 
@@ -599,14 +602,15 @@ class PersonaSearchService:
             return None
 
         try:
-            result = (
-                self.client.table("personas").select("*").eq("id", persona_id).single().execute()
+            result = await run_query(
+                self.client.table("personas").select("*").eq("id", persona_id).single()
             )
             return result.data
         except Exception as e:
             logger.error(f"페르소나 조회 실패: {e}")
             return None
 
+    @cached("personas.list", ttl=30, tags=["personas"], unless=lambda r: not r.get("success"))
     async def list_personas(
         self, state: Optional[str] = None, limit: int = 50, offset: int = 0
     ) -> Dict[str, Any]:
@@ -630,8 +634,8 @@ class PersonaSearchService:
             if state:
                 query = query.eq("existence_state", state)
 
-            result = (
-                query.order("created_at", desc=True).range(offset, offset + limit - 1).execute()
+            result = await run_query(
+                query.order("created_at", desc=True).range(offset, offset + limit - 1)
             )
 
             return {"success": True, "personas": result.data or [], "total": len(result.data or [])}
@@ -648,14 +652,13 @@ class PersonaSearchService:
             return [log["search_keyword"] for log in logs[:limit] if log.get("search_keyword")]
 
         try:
-            result = (
+            result = await run_query(
                 self.client.table("persona_activity_logs")
                 .select("search_keyword")
                 .eq("persona_id", persona_id)
                 .eq("activity_type", "idle_search")
                 .order("created_at", desc=True)
                 .limit(limit)
-                .execute()
             )
 
             return [
@@ -691,13 +694,14 @@ class PersonaSearchService:
             return log_id
 
         try:
-            self.client.table("persona_activity_logs").insert(log_data).execute()
+            await run_query(self.client.table("persona_activity_logs").insert(log_data))
             logger.debug(f"검색 활동 로그 저장: {log_id}")
         except Exception as e:
             logger.error(f"검색 활동 로그 저장 실패: {e}")
 
         return log_id
 
+    @invalidates("personas")
     async def _update_persona_called(self, persona_id: str) -> None:
         """페르소나 호출 시간 및 활동 수 업데이트"""
         # Mock 모드
@@ -713,34 +717,56 @@ class PersonaSearchService:
 
         try:
             # 현재 활동 수 조회
-            result = (
+            result = await run_query(
                 self.client.table("personas")
                 .select("total_activities")
                 .eq("id", persona_id)
                 .single()
-                .execute()
             )
 
             current_activities = (result.data or {}).get("total_activities", 0)
 
             # 업데이트
-            self.client.table("personas").update(
-                {
-                    "last_called_at": datetime.now(timezone.utc).isoformat(),
-                    "existence_state": "active",
-                    "total_activities": current_activities + 1,
-                }
-            ).eq("id", persona_id).execute()
+            await run_query(
+                self.client.table("personas")
+                .update(
+                    {
+                        "last_called_at": datetime.now(timezone.utc).isoformat(),
+                        "existence_state": "active",
+                        "total_activities": current_activities + 1,
+                    }
+                )
+                .eq("id", persona_id)
+            )
 
         except Exception as e:
             logger.error(f"페르소나 상태 업데이트 실패: {e}")
 
-    async def get_search_history(self, persona_id: str, limit: int = 50) -> Dict[str, Any]:
-        """검색 기록 조회"""
+    async def get_search_history(
+        self, persona_id: str, limit: int = 50, cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        검색 기록 조회 (최신순, created_at/id 키셋 페이지네이션)
+
+        Args:
+            persona_id: 페르소나 ID
+            limit: 페이지 크기
+            cursor: 이전 응답의 next_cursor
+
+        Raises:
+            ValueError: 잘못된 커서
+        """
+        after = decode_cursor(cursor) if cursor else None
+
         # Mock 모드
         if self._mock_mode:
             logs = [log for log in _mock_search_logs if log.get("persona_id") == persona_id]
-            logs.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+            logs.sort(key=lambda x: (x.get("created_at", ""), x["id"]), reverse=True)
+            if after:
+                logs = [
+                    log for log in logs if (log.get("created_at", ""), log["id"]) < tuple(after)
+                ]
+            logs = logs[:limit]
             history = [
                 {
                     "id": log["id"],
@@ -751,7 +777,7 @@ class PersonaSearchService:
                     "video_title": log.get("target_title"),
                     "formative_impact": log.get("formative_impact", 0.0),
                 }
-                for log in logs[:limit]
+                for log in logs
             ]
             return {
                 "success": True,
@@ -759,11 +785,12 @@ class PersonaSearchService:
                 "total": len(history),
                 "history": history,
                 "traits_influence": {},
+                "next_cursor": page_cursor(logs, limit),
                 "mock_mode": True,
             }
 
         try:
-            result = (
+            query = (
                 self.client.table("persona_activity_logs")
                 .select(
                     "id, search_keyword, search_source, created_at, "
@@ -771,10 +798,9 @@ class PersonaSearchService:
                 )
                 .eq("persona_id", persona_id)
                 .eq("activity_type", "idle_search")
-                .order("created_at", desc=True)
-                .limit(limit)
-                .execute()
             )
+            result = await run_query(apply_keyset(query, cursor).limit(limit))
+            rows = result.data or []
 
             history = [
                 {
@@ -786,7 +812,7 @@ class PersonaSearchService:
                     "video_title": row.get("target_title"),
                     "formative_impact": row.get("formative_impact", 0.0),
                 }
-                for row in (result.data or [])
+                for row in rows
             ]
 
             return {
@@ -795,6 +821,7 @@ class PersonaSearchService:
                 "total": len(history),
                 "history": history,
                 "traits_influence": {},  # TODO: P2에서 구현
+                "next_cursor": page_cursor(rows, limit),
             }
         except Exception as e:
             logger.error(f"검색 기록 조회 실패: {e}")
@@ -806,50 +833,73 @@ class PersonaSearchService:
                 "traits_influence": {},
             }
 
+    async def _iter_search_logs(self, persona_id: str):
+        """검색 활동 로그를 오래된 순으로 순회 (키셋 페이지 단위)"""
+        # Mock 모드
+        if self._mock_mode:
+            logs = [log for log in _mock_search_logs if log.get("persona_id") == persona_id]
+            logs.sort(key=lambda x: (x.get("created_at", ""), x["id"]))
+            for log in logs:
+                yield log
+            return
+
+        async for row in iter_keyset(
+            lambda: self.client.table("persona_activity_logs")
+            .select("id, search_keyword, formative_impact, created_at")
+            .eq("persona_id", persona_id)
+            .eq("activity_type", "idle_search"),
+            desc=False,
+            page_size=1000,
+        ):
+            yield row
+
     async def get_search_profile(self, persona_id: str) -> Dict[str, Any]:
-        """검색 프로필 조회 (고유성 분석)"""
+        """
+        검색 프로필 조회 (고유성 분석)
+
+        활동 로그 전체를 한 번에 가져오지 않고 페이지 단위로 순회하며 집계
+        """
         try:
             # 페르소나 기본 정보
             persona = await self.get_persona(persona_id)
             if not persona:
                 raise ValueError(f"페르소나를 찾을 수 없습니다: {persona_id}")
 
-            # Mock 모드
-            if self._mock_mode:
-                logs = [log for log in _mock_search_logs if log.get("persona_id") == persona_id]
-                logs.sort(key=lambda x: x.get("created_at", ""))
-            else:
-                # 검색 통계 조회
-                result = (
-                    self.client.table("persona_activity_logs")
-                    .select("search_keyword, formative_impact, created_at")
-                    .eq("persona_id", persona_id)
-                    .eq("activity_type", "idle_search")
-                    .order("created_at")
-                    .execute()
-                )
-                logs = result.data or []
-
-            # 통계 계산
-            keywords = [log.get("search_keyword") for log in logs if log.get("search_keyword")]
-            impacts = [log.get("formative_impact", 0) for log in logs]
-
-            formative_count = sum(1 for i in impacts if i > 0.5)
+            # 통계 계산 (행을 보관하지 않고 누적)
+            total = 0
+            impact_sum = 0.0
+            formative_count = 0
+            keywords = set()
+            first_search_at = None
+            last_search_at = None
+
+            async for log in self._iter_search_logs(persona_id):
+                impact = log.get("formative_impact") or 0
+
+                total += 1
+                impact_sum += impact
+                if impact > 0.5:
+                    formative_count += 1
+                if log.get("search_keyword"):
+                    keywords.add(log["search_keyword"])
+                if first_search_at is None:
+                    first_search_at = log["created_at"]
+                last_search_at = log["created_at"]
 
             return {
                 "success": True,
                 "data": {
                     "persona_id": persona_id,
                     "persona_name": persona.get("name", "Unknown"),
-                    "total_searches": len(logs),
-                    "unique_keywords": len(set(keywords)),
+                    "total_searches": total,
+                    "unique_keywords": len(keywords),
                     "top_categories": [],  # TODO: 카테고리 분석
                     "formative_period_searches": formative_count,
-                    "avg_formative_impact": sum(impacts) / len(impacts) if impacts else 0,
+                    "avg_formative_impact": impact_sum / total if total else 0,
                     "personality_drift": 0.0,  # TODO: P2
                     "interests_evolved": [],  # TODO: P2
-                    "first_search_at": logs[0]["created_at"] if logs else None,
-                    "last_search_at": logs[-1]["created_at"] if logs else None,
+                    "first_search_at": first_search_at,
+                    "last_search_at": last_search_at,
                 },
                 "mock_mode": self._mock_mode,
             }
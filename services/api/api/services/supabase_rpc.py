@@ -12,6 +12,8 @@ from typing import Optional
 
 from loguru import logger
 
+from shared.async_db import run_query
+
 try:
     from ..db import get_supabase_client
 except ImportError:
@@ -41,9 +43,11 @@ class SupabaseRPC:
             {success: bool, new_balance: float, message: str}
         """
         try:
-            result = self.client.rpc(
-                "deduct_maintenance_fee", {"p_persona_id": persona_id, "p_amount": amount}
-            ).execute()
+            result = await run_query(
+                self.client.rpc(
+                    "deduct_maintenance_fee", {"p_persona_id": persona_id, "p_amount": amount}
+                )
+            )
 
             if result.data and len(result.data) > 0:
                 row = result.data[0]
@@ -78,9 +82,12 @@ class SupabaseRPC:
             {success: bool, new_balance: float, message: str}
         """
         try:
-            result = self.client.rpc(
-                "grant_credit", {"p_persona_id": persona_id, "p_amount": amount, "p_reason": reason}
-            ).execute()
+            result = await run_query(
+                self.client.rpc(
+                    "grant_credit",
+                    {"p_persona_id": persona_id, "p_amount": amount, "p_reason": reason},
+                )
+            )
 
             if result.data and len(result.data) > 0:
                 row = result.data[0]
@@ -108,7 +115,7 @@ class SupabaseRPC:
             {total_personas: int, success_count: int, crisis_count: int, total_deducted: float}
         """
         try:
-            result = self.client.rpc("run_daily_maintenance", {}).execute()
+            result = await run_query(self.client.rpc("run_daily_maintenance", {}))
 
             if result.data and len(result.data) > 0:
                 row = result.data[0]
@@ -138,10 +145,12 @@ class SupabaseRPC:
             성공 여부
         """
         try:
-            result = self.client.rpc(
-                "update_corruption_level",
-                {"p_persona_id": persona_id, "p_new_level": new_level, "p_reason": reason},
-            ).execute()
+            result = await run_query(
+                self.client.rpc(
+                    "update_corruption_level",
+                    {"p_persona_id": persona_id, "p_new_level": new_level, "p_reason": reason},
+                )
+            )
 
             return result.data is True
 
@@ -157,7 +166,7 @@ class SupabaseRPC:
             {total_personas, active_count, crisis_count, total_credit, avg_corruption}
         """
         try:
-            result = self.client.rpc("get_persona_stats", {}).execute()
+            result = await run_query(self.client.rpc("get_persona_stats", {}))
 
             if result.data and len(result.data) > 0:
                 return result.data[0]
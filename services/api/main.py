@@ -23,6 +23,8 @@ from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 
+from shared.async_db import decode_cursor, encode_cursor
+
 # ==================== 앱 설정 ====================
 app = FastAPI(title="YouTube Farm API", description="300대 폰팜 작업 관리 서버", version="1.0.0")
 
@@ -123,6 +125,8 @@ def init_db():
             -- 인덱스
             CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
             CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(priority DESC);
+            CREATE INDEX IF NOT EXISTS idx_tasks_listing
+                ON tasks(priority DESC, created_at DESC, id DESC);
             CREATE INDEX IF NOT EXISTS idx_devices_device_id ON devices(device_id);
         """
         )
@@ -440,38 +444,54 @@ async def get_task_status():
 
 
 @app.get("/api/tasks", tags=["Tasks"])
-async def list_tasks(status: Optional[str] = None, limit: int = Query(50, le=100)):
+async def list_tasks(
+    status: Optional[str] = None,
+    limit: int = Query(50, le=100),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+):
     """
     작업 목록 조회
+
+    우선순위 → 최신순 정렬, (priority, created_at, id) 키셋 페이지네이션
+    다음 페이지는 응답의 next_cursor를 cursor로 전달
     """
+    conditions = []
+    params: list = []
+
+    if status:
+        conditions.append("status = ?")
+        params.append(status)
+    if cursor:
+        # 행 값 비교로 이전 페이지 마지막 행 다음부터 조회 (idx_tasks_listing 사용)
+        conditions.append("(priority, created_at, id) < (?, ?, ?)")
+        try:
+            params.extend(decode_cursor(cursor, size=3))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="잘못된 커서입니다")
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
     with db_transaction() as conn:
-        if status:
-            cursor = conn.execute(
-                """
-                SELECT id, keyword, title, youtube_url, priority, status, 
-                       device_id, retry_count, created_at, assigned_at, completed_at
-                FROM tasks
-                WHERE status = ?
-                ORDER BY priority DESC, created_at DESC
-                LIMIT ?
-                """,
-                (status, limit),
-            )
-        else:
-            cursor = conn.execute(
-                """
-                SELECT id, keyword, title, youtube_url, priority, status,
-                       device_id, retry_count, created_at, assigned_at, completed_at
-                FROM tasks
-                ORDER BY priority DESC, created_at DESC
-                LIMIT ?
-                """,
-                (limit,),
-            )
+        rows = conn.execute(
+            f"""
+            SELECT id, keyword, title, youtube_url, priority, status,
+                   device_id, retry_count, created_at, assigned_at, completed_at
+            FROM tasks
+            {where}
+            ORDER BY priority DESC, created_at DESC, id DESC
+            LIMIT ?
+            """,
+            (*params, limit),
+        )
+
+        tasks = [dict(row) for row in rows.fetchall()]
 
-        tasks = [dict(row) for row in cursor.fetchall()]
+    next_cursor = None
+    if len(tasks) == limit:
+        last = tasks[-1]
+        next_cursor = encode_cursor(last["priority"], last["created_at"], last["id"])
 
-    return {"success": True, "tasks": tasks}
+    return {"success": True, "tasks": tasks, "next_cursor": next_cursor}
 
 
 # ----- 기기 관리 -----
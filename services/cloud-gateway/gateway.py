@@ -15,6 +15,8 @@ import hmac
 import json
 import logging
 import os
+import pathlib
+import sys
 import uuid
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
@@ -25,6 +27,13 @@ from typing import Dict, List, Optional
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel
 
+# 저장소에서 직접 실행 시 루트의 shared 패키지 사용
+_REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent.parent
+if (_REPO_ROOT / "shared").is_dir():
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from shared.placement import NodeLoad, PlacementScheduler
+
 # ============================================================
 # Configuration
 # ============================================================
@@ -323,6 +332,7 @@ class ConnectionManager:
         self.nodes: Dict[str, NodeConnection] = {}
         self.tasks: Dict[str, TaskInfo] = {}
         self._lock = asyncio.Lock()
+        self.placement = PlacementScheduler(strategy=os.getenv("GATEWAY_PLACEMENT_STRATEGY", "p2c"))
 
     async def register_node(
         self, websocket: WebSocket, node_id: str, payload: dict, signature: str
@@ -417,15 +427,21 @@ class ConnectionManager:
             return False
 
     def get_available_node(self) -> Optional[str]:
-        """사용 가능한 노드 선택 (Round Robin / Least Load)"""
+        """사용 가능한 노드 선택 (부하 점수: 태스크 슬롯 + CPU/RAM + 최근 실패율, p2c)"""
         available = [
-            (nid, n) for nid, n in self.nodes.items() if n.active_tasks < n.max_concurrent_tasks
+            NodeLoad(
+                node_id=nid,
+                active_tasks=n.active_tasks,
+                max_tasks=n.max_concurrent_tasks,
+                device_count=n.devices_online,
+                cpu=n.cpu_percent,
+                memory=n.ram_percent,
+            )
+            for nid, n in self.nodes.items()
+            if n.active_tasks < n.max_concurrent_tasks
         ]
-        if not available:
-            return None
-        # Least load
-        available.sort(key=lambda x: x[1].active_tasks)
-        return available[0][0]
+        chosen = self.placement.pick(available)
+        return chosen.node_id if chosen else None
 
     def get_all_nodes(self) -> List[dict]:
         return [n.to_dict() for n in self.nodes.values()]
@@ -553,6 +569,7 @@ async def websocket_endpoint(websocket: WebSocket, node_id: str = "unknown"):
                 task_id = payload.get("task_id")
                 success = payload.get("success", False)
                 logger.info(f"[{node_id}] TASK_RESULT: {task_id} success={success}")
+                manager.placement.record_result(node_id, bool(success))
 
                 if task_id in manager.tasks:
                     task = manager.tasks[task_id]
@@ -664,8 +681,14 @@ async def create_task(req: TaskRequest):
 
     if not success:
         del manager.tasks[task_id]
+        manager.placement.record_result(target_node, success=False)
         raise HTTPException(status_code=500, detail="Failed to send task to node")
 
+    # 다음 HEARTBEAT 전까지의 배치 결정에도 방금 할당한 태스크 반영
+    node = manager.get_node(target_node)
+    if node:
+        node.active_tasks += 1
+
     task.status = "ASSIGNED"
     logger.info(f"Task 할당: {task_id} → {target_node}")
 
@@ -6,12 +6,18 @@ Mission: 단순함이 전부다.
 - /ws/node: 노드 연결 관리 (HELLO/HEARTBEAT/COMMAND/RESULT)
 - /api/command: 프론트엔드 → 노드 명령 전달
 - /api/queue: 비동기 명령 큐
+- 다중 인스턴스: REDIS_URL이 있으면 노드 레지스트리 공유 + 담당 인스턴스로 명령 전달
+  (shared/gateway_cluster.py, GATEWAY_WORKERS로 같은 포트에 워커 여러 개)
 
 Protocol v1.0:
 - HELLO → HELLO_ACK (연결 + 인증)
-- HEARTBEAT → HEARTBEAT_ACK + 명령 Push (Pull-based Push)
+- HEARTBEAT → HEARTBEAT_ACK 즉시 응답, DB 일괄 처리 후 대기 명령을 COMMAND로 Push
 - COMMAND → RESULT (명령 실행)
 
+Protocol v2.0 (HELLO payload.protocol로 협상, shared/node_protocol.py):
+- msgpack 바이너리 프레임 (양쪽에 msgpack이 있을 때, 없으면 JSON)
+- HEARTBEAT 디바이스 스냅샷은 마지막 ACK 버전 대비 델타
+
 "복잡한 생각은 버려라." - Orion
 """
 
@@ -23,6 +29,8 @@ import hmac
 import json
 import logging
 import os
+import socket
+import sys
 import uuid
 from datetime import datetime, timedelta, timezone
 
@@ -32,14 +40,45 @@ from dotenv import load_dotenv
 load_dotenv()
 import pathlib
 from contextlib import asynccontextmanager
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import Depends, FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from pydantic import BaseModel, Field
 
+# 저장소에서 직접 실행 시 루트의 shared 패키지 사용 (Docker 이미지는 /app/shared로 복사)
+_REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent.parent
+if (_REPO_ROOT / "shared").is_dir():
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from shared.async_db import run_query
+from shared.command_tracker import CommandTracker, TrackedCommand
+from shared.connection_table import ConnectionTable
+from shared.dashboard_hub import DashboardHub
+from shared.fanout import SENT, send_all
+from shared.gateway_cluster import GatewayCluster, RedisClusterBackend
+from shared.heartbeat_aggregator import HeartbeatAggregator
+from shared.monitoring.metrics import node_frame_bytes, node_snapshot_frames_total
+from shared.node_protocol import (
+    JSON_CODEC,
+    FrameCodec,
+    SnapshotDecoder,
+    negotiate,
+)
+from shared.node_state import NodeStateTable
+from shared.oob_forwarder import OOBForwarder
+from shared.placement import NodeLoad, PlacementScheduler
+from shared.rate_limit import (
+    SlidingLogLimiter,
+    SlidingWindowLimiter,
+    TokenBucketLimiter,
+    client_key,
+    rate_limit_dependency,
+)
+
 # Supabase
 try:
     from supabase import create_client
@@ -75,8 +114,13 @@ class Config:
     HEARTBEAT_INTERVAL = 30  # 노드가 30초마다 HEARTBEAT 전송
     MAX_TASKS_PER_NODE = 5  # 노드당 최대 동시 태스크
     COMMAND_TIMEOUT = 300  # 명령 응답 대기 시간 (기본)
+    MAX_INFLIGHT_COMMANDS = int(os.getenv("GATEWAY_MAX_INFLIGHT_COMMANDS", "10000"))  # 초과 시 503
+    COMMAND_TICK_MS = int(os.getenv("GATEWAY_COMMAND_TICK_MS", "500"))  # 명령 만료 확인 간격
+    SEND_TIMEOUT = float(os.getenv("GATEWAY_SEND_TIMEOUT", "5"))  # 브로드캐스트 노드별 전송 상한
     HELLO_TIMEOUT = 10  # HELLO 대기 시간
     PROTOCOL_VERSION = "1.0"
+    PROTOCOL_V2 = os.getenv("GATEWAY_PROTOCOL_V2", "true").lower() == "true"  # v2 협상 허용
+    WS_DEFLATE = os.getenv("GATEWAY_WS_DEFLATE", "true").lower() == "true"  # permessage-deflate
 
     # Environment
     SUPABASE_URL = os.getenv("SUPABASE_URL", "")
@@ -84,6 +128,52 @@ class Config:
     VERIFY_SIGNATURE = os.getenv("VERIFY_SIGNATURE", "true").lower() == "true"
     CORS_ORIGINS = os.getenv("CORS_ALLOWED_ORIGINS", "*").split(",")
 
+    # Rate Limiting (설정 시 Redis로 여러 게이트웨이 인스턴스가 한도 공유)
+    REDIS_URL = os.getenv("REDIS_URL", "")
+    REDIS_TIMEOUT = float(os.getenv("GATEWAY_REDIS_TIMEOUT", "0.5"))  # 연결/명령 1회 제한 (초)
+    COMMAND_RATE_LIMIT = int(os.getenv("GATEWAY_COMMAND_RATE_LIMIT", "60"))  # 클라이언트당 분당
+    BROADCAST_RATE_LIMIT = int(os.getenv("GATEWAY_BROADCAST_RATE_LIMIT", "10"))  # 클라이언트당 분당
+    NODE_CONNECT_LIMIT = int(os.getenv("GATEWAY_NODE_CONNECT_LIMIT", "20"))  # IP당 분당 연결 시도
+    NODE_MSG_RATE = float(os.getenv("GATEWAY_NODE_MSG_RATE", "5"))  # 노드당 초당 메시지
+    NODE_MSG_BURST = int(os.getenv("GATEWAY_NODE_MSG_BURST", "50"))  # 노드당 최대 버스트
+    NODE_MSG_MAX_VIOLATIONS = 20  # 연속 초과 시 연결 종료
+
+    # HEARTBEAT 일괄 처리 (process_heartbeats_bulk RPC)
+    HEARTBEAT_BATCH_SIZE = int(os.getenv("GATEWAY_HEARTBEAT_BATCH_SIZE", "200"))  # 1회 최대
+    HEARTBEAT_FLUSH_MS = int(os.getenv("GATEWAY_HEARTBEAT_FLUSH_MS", "250"))  # 최대 대기
+    HEARTBEAT_MAX_PENDING = int(os.getenv("GATEWAY_HEARTBEAT_MAX_PENDING", "5000"))  # 버퍼 상한
+
+    # OOB 메트릭 전달 (세션 1개 재사용 + 일괄 POST)
+    OOB_API_URL = os.getenv("OOB_API_URL", "")  # 단건 엔드포인트 (.../oob/metrics)
+    OOB_BULK_URL = os.getenv("OOB_BULK_URL", "") or (
+        OOB_API_URL.rstrip("/") + "/bulk" if OOB_API_URL else ""
+    )
+    OOB_BATCH_SIZE = int(os.getenv("GATEWAY_OOB_BATCH_SIZE", "200"))  # POST 1회 최대
+    OOB_FLUSH_MS = int(os.getenv("GATEWAY_OOB_FLUSH_MS", "1000"))  # 최대 대기
+    OOB_MAX_QUEUE = int(os.getenv("GATEWAY_OOB_MAX_QUEUE", "5000"))  # 초과 시 오래된 것부터 버림
+
+    # 대시보드 팬아웃 (구독자별 송신 큐)
+    DASHBOARD_QUEUE_SIZE = int(os.getenv("GATEWAY_DASHBOARD_QUEUE_SIZE", "256"))  # 구독자별 상한
+    DASHBOARD_SEND_TIMEOUT = float(os.getenv("GATEWAY_DASHBOARD_SEND_TIMEOUT", "5"))  # 초과 시 끊음
+    DASHBOARD_DELTA_MS = int(os.getenv("GATEWAY_DASHBOARD_DELTA_MS", "1000"))  # NODE_DELTA 주기
+
+    # 명령 배치 (부하 점수 기반 노드 선택)
+    PLACEMENT_STRATEGY = os.getenv("GATEWAY_PLACEMENT_STRATEGY", "p2c")  # p2c | least_loaded
+    PLACEMENT_FAILURE_WINDOW = int(
+        os.getenv("GATEWAY_PLACEMENT_FAILURE_WINDOW", "600")
+    )  # 실패율 구간
+
+    # 다중 인스턴스 (REDIS_URL이 있으면 노드 레지스트리 + 인스턴스 간 명령 라우팅)
+    INSTANCE_ID = f"{os.getenv('GATEWAY_INSTANCE_ID') or socket.gethostname()}-{os.getpid()}"
+    WORKERS = int(os.getenv("GATEWAY_WORKERS", "1"))  # 같은 포트의 워커 프로세스 수
+    CLUSTER_PREFIX = os.getenv("GATEWAY_CLUSTER_PREFIX", "gateway")  # Redis 키/채널 접두사
+    CLUSTER_REQUEST_TIMEOUT = float(
+        os.getenv("GATEWAY_CLUSTER_REQUEST_TIMEOUT", "10")
+    )  # 다른 인스턴스 응답 대기 (/api/command는 명령 timeout 추가)
+    CLUSTER_BACKEND_TIMEOUT = float(
+        os.getenv("GATEWAY_CLUSTER_BACKEND_TIMEOUT", "1")
+    )  # 레지스트리 조회/기록, 발행 1회 제한
+
 
 # ============================================================
 # Supabase Client
@@ -104,6 +194,80 @@ def get_supabase() -> Optional[Any]:
     return supabase
 
 
+# ============================================================
+# Rate Limiting
+# ============================================================
+# 오작동하는 노드/클라이언트가 제어 평면을 마비시키지 않도록
+# - REST 명령/브로드캐스트: 클라이언트별 슬라이딩 윈도우 (분당)
+# - 노드 WebSocket 연결 시도: IP별 슬라이딩 로그 (재연결 폭주 차단)
+# - 노드 WebSocket 메시지: 노드별 토큰 버킷 (RESULT 몰아 보내기는 허용)
+
+command_limiter = SlidingWindowLimiter("gateway.command", Config.COMMAND_RATE_LIMIT, 60)
+broadcast_limiter = SlidingWindowLimiter("gateway.broadcast", Config.BROADCAST_RATE_LIMIT, 60)
+node_connect_limiter = SlidingLogLimiter("gateway.node_connect", Config.NODE_CONNECT_LIMIT, 60)
+node_message_limiter = TokenBucketLimiter(
+    "gateway.node_ws", Config.NODE_MSG_RATE, Config.NODE_MSG_BURST
+)
+RATE_LIMITERS = (command_limiter, broadcast_limiter, node_connect_limiter, node_message_limiter)
+
+
+async def open_redis(**options: Any) -> Any:
+    """REDIS_URL 클라이언트 (연결 타임아웃 Config.REDIS_TIMEOUT, PING 실패 시 예외)"""
+    import redis.asyncio as aioredis
+
+    client = aioredis.from_url(
+        Config.REDIS_URL, socket_connect_timeout=Config.REDIS_TIMEOUT, **options
+    )
+    try:
+        await asyncio.wait_for(client.ping(), Config.REDIS_TIMEOUT)
+    except BaseException:
+        await client.aclose()
+        raise
+    return client
+
+
+async def connect_rate_limit_redis() -> Optional[Any]:
+    """
+    REDIS_URL이 있으면 리미터 상태를 Redis에 저장 (없거나 실패 시 인스턴스 로컬)
+
+    소켓 타임아웃을 걸어 멈춘 Redis가 노드 세션/제어 API를 붙잡지 않음
+    (리미터는 타임아웃/연속 실패 시 로컬 판정으로 대체)
+    """
+    if not Config.REDIS_URL:
+        return None
+
+    try:
+        client = await open_redis(socket_timeout=Config.REDIS_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"⚠️ Redis 연결 실패 - 레이트 리밋은 인스턴스 로컬로 동작 ({e})")
+        return None
+
+    for limiter in RATE_LIMITERS:
+        limiter.redis = client
+    logger.info("✅ 레이트 리밋 Redis 연결됨")
+    return client
+
+
+async def connect_cluster_redis() -> Optional[Any]:
+    """
+    다중 인스턴스용 Redis 클라이언트 (없거나 실패 시 이 프로세스만)
+
+    pub/sub 구독은 메시지가 올 때까지 읽기 대기하므로 socket_timeout 없음
+    → 레지스트리/발행 호출은 GatewayCluster가 backend_timeout으로 제한
+    """
+    if not Config.REDIS_URL:
+        return None
+
+    try:
+        client = await open_redis()
+    except Exception as e:
+        logger.warning(f"⚠️ Redis 연결 실패 - 클러스터 없이 단일 인스턴스로 동작 ({e})")
+        return None
+
+    logger.info("✅ 클러스터 Redis 연결됨")
+    return client
+
+
 # ============================================================
 # Connection Pool (메모리 기반 + DB 동기화)
 # ============================================================
@@ -128,125 +292,234 @@ class NodeConnection:
         self.resources: Dict = {}
         self.runner_version = ""
         self.secret_key: Optional[str] = None
+        self.protocol: Optional[Dict] = None  # v2 협상 결과 (None = v1)
+        self.codec: FrameCodec = JSON_CODEC
+        self.snapshots = SnapshotDecoder()
+
+    def sender(self):
+        """협상된 인코딩의 프레임 전송 함수 (msgpack은 바이너리 프레임)"""
+        return self.websocket.send_bytes if self.codec.binary else self.websocket.send_text
+
+    async def send(self, message: dict):
+        """메시지 전송 (협상된 인코딩)"""
+        await self.sender()(self.codec.encode(message))
+
+    def to_dict(self) -> dict:
+        """노드 목록/대시보드용 요약"""
+        return {
+            "node_id": self.node_id,
+            "node_uuid": self.node_uuid,
+            "session_id": self.session_id,
+            "connected_at": self.connected_at.isoformat(),
+            "last_heartbeat": self.last_heartbeat.isoformat(),
+            "device_count": self.device_count,
+            "status": self.status,
+            "active_tasks": self.active_tasks,
+            "hostname": self.hostname,
+            "capabilities": self.capabilities,
+            "runner_version": self.runner_version,
+            "instance": Config.INSTANCE_ID,
+        }
 
 
 class ConnectionPool:
-    """노드 연결 풀 관리"""
+    """
+    노드 연결 풀 관리
+
+    메모리 상태는 ConnectionTable (전역 락 없음 - 변경 메서드에 await가 없어 그 자체로 원자적)
+    노드 상태는 해당 노드의 WebSocket 핸들러만 갱신 (단일 writer)
+    """
 
     def __init__(self):
-        self._nodes: Dict[str, NodeConnection] = {}
-        self._lock = asyncio.Lock()
+        self._table = ConnectionTable(max_tasks=Config.MAX_TASKS_PER_NODE)
+
+    def __len__(self) -> int:
+        return len(self._table)
 
     async def add(self, node_id: str, websocket: WebSocket, session_id: str) -> NodeConnection:
-        """노드 연결 추가"""
-        async with self._lock:
-            # 기존 연결이 있으면 끊기
-            if node_id in self._nodes:
-                old = self._nodes[node_id]
-                try:
-                    await old.websocket.close()
-                except Exception:
-                    pass
-                logger.warning(f"[{node_id}] 기존 연결 대체")
+        """노드 연결 추가 (기존 연결이 있으면 교체 후 끊기)"""
+        conn = NodeConnection(node_id, websocket, session_id)
+        old = self._table.add(conn)
+        logger.info(f"[{node_id}] 연결됨 (총 {len(self._table)}개 노드)")
+
+        if old is not None:
+            logger.warning(f"[{node_id}] 기존 연결 대체")
+            try:
+                await old.websocket.close()
+            except Exception:
+                pass
+        return conn
 
-            conn = NodeConnection(node_id, websocket, session_id)
-            self._nodes[node_id] = conn
-            logger.info(f"[{node_id}] 연결됨 (총 {len(self._nodes)}개 노드)")
-            return conn
+    async def remove(self, node_id: str, conn: Optional[NodeConnection] = None):
+        """
+        노드 연결 제거
 
-    async def remove(self, node_id: str):
-        """노드 연결 제거"""
-        async with self._lock:
-            if node_id in self._nodes:
-                del self._nodes[node_id]
-                logger.info(f"[{node_id}] 연결 해제 (총 {len(self._nodes)}개 노드)")
+        conn을 지정하면 그 연결이 아직 등록돼 있을 때만 제거
+        (재연결로 대체된 이전 핸들러가 새 연결을 지우지 않도록)
+        """
+        if self._table.remove(node_id, conn) is None:
+            return
+        logger.info(f"[{node_id}] 연결 해제 (총 {len(self._table)}개 노드)")
+
+        # 레지스트리에서 제거 (다른 인스턴스로 재연결됐으면 그쪽 기록 유지)
+        await cluster.unregister_node(node_id)
+
+        # 버퍼/플러시 중인 HEARTBEAT가 연결 해제 뒤에 반영되지 않도록 먼저 정리
+        await heartbeat_aggregator.discard(node_id)
 
         # DB 연결 해제 표시
         await db_disconnect_node(node_id)
 
-        # 대시보드에 노드 연결 해제 알림 (전역 함수 호출)
-        # 참고: 이 메서드가 호출될 때 broadcast_to_dashboards가 아직 정의되지 않았을 수 있음
-        try:
-            await broadcast_to_dashboards({"type": "NODE_DISCONNECTED", "node_id": node_id})
-        except NameError:
-            pass
+        # 대시보드에 노드 연결 해제 알림 (상태 테이블은 다음 NODE_DELTA의 removed)
+        remove_node_state(node_id)
+        publish_dashboard({"type": "NODE_DISCONNECTED", "node_id": node_id})
 
-    async def get(self, node_id: str) -> Optional[NodeConnection]:
+    def get(self, node_id: str) -> Optional[NodeConnection]:
         """노드 연결 조회"""
-        async with self._lock:
-            return self._nodes.get(node_id)
-
-    async def update_heartbeat(self, node_id: str, device_count: int = 0, status: str = "READY"):
-        """하트비트 업데이트"""
-        async with self._lock:
-            if node_id in self._nodes:
-                self._nodes[node_id].last_heartbeat = datetime.now(timezone.utc)
-                self._nodes[node_id].device_count = device_count
-                self._nodes[node_id].status = status
-
-    async def update_status(self, node_id: str, status: str, active_tasks: int = 0):
+        return self._table.get(node_id)
+
+    def update_heartbeat(
+        self, node_id: str, device_count: int = 0, status: str = "READY", active_tasks: int = 0
+    ):
+        """하트비트 반영 (필드 일괄 갱신 + READY 인덱스 갱신)"""
+        self._table.update(
+            node_id,
+            last_heartbeat=datetime.now(timezone.utc),
+            device_count=device_count,
+            status=status,
+            active_tasks=active_tasks,
+        )
+
+    def update_status(self, node_id: str, status: str, active_tasks: int = 0):
         """상태 업데이트"""
-        async with self._lock:
-            if node_id in self._nodes:
-                self._nodes[node_id].status = status
-                self._nodes[node_id].active_tasks = active_tasks
+        self._table.update(node_id, status=status, active_tasks=active_tasks)
+
+    def reserve_task(self, node_id: str):
+        """
+        명령 전송 직후 active_tasks 선반영
+
+        다음 HEARTBEAT가 실제 값으로 덮어씀 → 그 사이의 배치 결정도 방금 보낸 명령을 반영
+        """
+        conn = self._table.get(node_id)
+        if conn is not None:
+            self._table.update(node_id, active_tasks=conn.active_tasks + 1)
 
     async def send_to_node(self, node_id: str, message: dict) -> bool:
         """특정 노드에 메시지 전송"""
-        async with self._lock:
-            conn = self._nodes.get(node_id)
-
+        conn = self._table.get(node_id)
         if not conn:
             return False
 
         try:
-            await conn.websocket.send_json(message)
+            await conn.send(message)
             return True
         except Exception as e:
             logger.error(f"[{node_id}] 전송 실패: {e}")
             return False
 
-    async def broadcast(self, message: dict):
+    async def send_many(
+        self, node_ids: List[str], message: dict, timeout: float = Config.SEND_TIMEOUT
+    ) -> Dict[str, str]:
+        """
+        여러 노드에 같은 메시지를 동시에 전송 (인코딩별 직렬화 1회, 노드별 timeout)
+
+        Returns:
+            노드 ID → outcome (sent / timeout / error / not_connected)
+        """
+        codecs: Dict[str, FrameCodec] = {}
+        groups: Dict[str, Dict[str, Any]] = {}
+        for node_id in node_ids:
+            conn = self._table.get(node_id)
+            codec = conn.codec if conn else JSON_CODEC
+            codecs[codec.encoding] = codec
+            groups.setdefault(codec.encoding, {})[node_id] = conn.sender() if conn else None
+
+        outcomes = await asyncio.gather(
+            *(
+                send_all(sends, codecs[encoding].encode(message), timeout)
+                for encoding, sends in groups.items()
+            )
+        )
+        merged = {node_id: outcome for group in outcomes for node_id, outcome in group.items()}
+        return {node_id: merged[node_id] for node_id in node_ids}
+
+    async def broadcast(self, message: dict) -> Dict[str, str]:
         """모든 노드에 브로드캐스트"""
-        async with self._lock:
-            node_ids = list(self._nodes.keys())
+        node_ids = [conn.node_id for conn in self._table.snapshot()]
+        return await self.send_many(node_ids, message)
 
-        for node_id in node_ids:
-            await self.send_to_node(node_id, message)
+    def connections(self) -> Tuple[NodeConnection, ...]:
+        """연결 목록 스냅샷 (순회 중 추가/제거돼도 안전)"""
+        return self._table.snapshot()
 
     def list_nodes(self) -> list:
         """연결된 노드 목록"""
-        return [
-            {
-                "node_id": conn.node_id,
-                "node_uuid": conn.node_uuid,
-                "session_id": conn.session_id,
-                "connected_at": conn.connected_at.isoformat(),
-                "last_heartbeat": conn.last_heartbeat.isoformat(),
-                "device_count": conn.device_count,
-                "status": conn.status,
-                "active_tasks": conn.active_tasks,
-                "hostname": conn.hostname,
-                "capabilities": conn.capabilities,
-                "runner_version": conn.runner_version,
-            }
-            for conn in self._nodes.values()
-        ]
+        return [conn.to_dict() for conn in self._table.snapshot()]
 
     def get_ready_nodes(self) -> List[NodeConnection]:
-        """READY 상태의 노드들 반환"""
-        return [
-            conn
-            for conn in self._nodes.values()
-            if conn.status == "READY" and conn.active_tasks < Config.MAX_TASKS_PER_NODE
-        ]
+        """READY이고 여유 슬롯이 있는 노드들 (인덱스, 전체 순회 없음)"""
+        return self._table.ready()
+
+    def pick_ready(self) -> Optional[NodeConnection]:
+        """READY 노드 하나 선택 (라운드로빈, O(1))"""
+        return self._table.pick_ready()
 
 
 # Connection Pool 싱글톤
 pool = ConnectionPool()
 
-# Pending 명령 응답 대기
-pending_commands: Dict[str, asyncio.Future] = {}
+# 명령 배치 스케줄러 (브로드캐스트 대상 노드 선택 + 디바이스 분배)
+placement = PlacementScheduler(
+    strategy=Config.PLACEMENT_STRATEGY,
+    failure_window=Config.PLACEMENT_FAILURE_WINDOW,
+)
+
+
+def node_load(conn: NodeConnection) -> NodeLoad:
+    """배치 점수 입력 (HEARTBEAT의 active_tasks, device_count, resources)"""
+    return NodeLoad(
+        node_id=conn.node_id,
+        active_tasks=conn.active_tasks,
+        max_tasks=Config.MAX_TASKS_PER_NODE,
+        device_count=conn.device_count,
+        cpu=conn.resources.get("cpu_percent"),
+        memory=conn.resources.get("memory_percent"),
+    )
+
+
+def node_record(conn: NodeConnection) -> dict:
+    """클러스터 레지스트리 기록 (다른 인스턴스의 노드 목록 + 브로드캐스트 배치 입력)"""
+    return {
+        **conn.to_dict(),
+        "cpu": conn.resources.get("cpu_percent"),
+        "memory": conn.resources.get("memory_percent"),
+    }
+
+
+def record_load(record: dict) -> NodeLoad:
+    """다른 인스턴스 노드의 배치 점수 입력 (레지스트리 기록 기준)"""
+    return NodeLoad(
+        node_id=record["node_id"],
+        active_tasks=record.get("active_tasks", 0),
+        max_tasks=Config.MAX_TASKS_PER_NODE,
+        device_count=record.get("device_count", 0),
+        cpu=record.get("cpu"),
+        memory=record.get("memory"),
+    )
+
+
+def on_command_expired(entry: TrackedCommand):
+    """마감까지 RESULT가 없는 명령 → 배치 점수의 실패율에 반영"""
+    logger.warning(f"[{entry.node_id}] 명령 응답 없음: {entry.command_id} ({entry.kind})")
+    placement.record_result(entry.node_id, success=False)
+
+
+# RESULT 대기 중인 명령 (크기 제한 + 마감 시각, lifespan에서 만료 루프 시작/종료)
+command_tracker = CommandTracker(
+    max_inflight=Config.MAX_INFLIGHT_COMMANDS,
+    tick=Config.COMMAND_TICK_MS / 1000,
+    on_expire=on_command_expired,
+)
 
 
 # ============================================================
@@ -262,7 +535,7 @@ async def db_get_node_secret(node_id: str) -> Optional[str]:
         return os.getenv("NODE_SHARED_SECRET")
 
     try:
-        result = sb.rpc("get_node_secret", {"p_node_id": node_id}).execute()
+        result = await run_query(sb.rpc("get_node_secret", {"p_node_id": node_id}))
         if result.data:
             return result.data
         return None
@@ -285,17 +558,19 @@ async def db_register_node_connection(
         return {"success": True, "node_uuid": None, "is_new": False}
 
     try:
-        result = sb.rpc(
-            "register_node_connection",
-            {
-                "p_node_id": node_id,
-                "p_ws_session_id": session_id,
-                "p_hostname": hostname,
-                "p_ip_address": ip_address,
-                "p_runner_version": runner_version,
-                "p_capabilities": capabilities or [],
-            },
-        ).execute()
+        result = await run_query(
+            sb.rpc(
+                "register_node_connection",
+                {
+                    "p_node_id": node_id,
+                    "p_ws_session_id": session_id,
+                    "p_hostname": hostname,
+                    "p_ip_address": ip_address,
+                    "p_runner_version": runner_version,
+                    "p_capabilities": capabilities or [],
+                },
+            )
+        )
 
         if result.data:
             return result.data
@@ -312,43 +587,35 @@ async def db_disconnect_node(node_id: str):
         return
 
     try:
-        sb.rpc("disconnect_node", {"p_node_id": node_id}).execute()
+        await run_query(sb.rpc("disconnect_node", {"p_node_id": node_id}))
     except Exception as e:
         logger.error(f"[{node_id}] DB 연결 해제 실패: {e}")
 
 
-async def db_process_heartbeat(
-    node_id: str,
-    status: str,
-    resources: dict,
-    device_snapshot: list,
-    active_tasks: int = 0,
-    session_id: str = None,
-) -> dict:
-    """HEARTBEAT 처리 + Pull-based Push (DB)"""
+async def db_process_heartbeats_bulk(heartbeats: List[dict]) -> List[dict]:
+    """
+    HEARTBEAT 일괄 처리 + Pull-based Push (DB 왕복 1회)
+
+    Args:
+        heartbeats: [{node_id, status, resources, device_snapshot, active_tasks, ws_session_id}]
+
+    Returns:
+        노드별 process_heartbeat 결과 (node_id, success, pending_commands, ...)
+
+    Raises:
+        Exception: RPC 실패 (HeartbeatAggregator가 로그 후 배치 실패로 처리)
+    """
     sb = get_supabase()
     if not sb:
-        return {"success": True, "pending_commands": []}
-
-    try:
-        result = sb.rpc(
-            "process_heartbeat",
-            {
-                "p_node_id": node_id,
-                "p_status": status,
-                "p_resources": resources,
-                "p_device_snapshot": device_snapshot,
-                "p_active_tasks": active_tasks,
-                "p_ws_session_id": session_id,
-            },
-        ).execute()
+        return [
+            {"node_id": hb["node_id"], "success": True, "pending_commands": []} for hb in heartbeats
+        ]
 
-        if result.data:
-            return result.data
-        return {"success": False, "pending_commands": []}
-    except Exception as e:
-        logger.error(f"[{node_id}] DB heartbeat 처리 실패: {e}")
-        return {"success": False, "error": str(e), "pending_commands": []}
+    # supabase-py는 동기 HTTP → 쿼리 스레드 풀에서 실행 (이벤트 루프 차단 없음)
+    result = await run_query(
+        sb.rpc("process_heartbeats_bulk", {"p_heartbeats": heartbeats}), timeout=10.0
+    )
+    return result.data or []
 
 
 async def db_start_command(command_id: str) -> bool:
@@ -358,7 +625,7 @@ async def db_start_command(command_id: str) -> bool:
         return True
 
     try:
-        result = sb.rpc("start_command", {"p_command_id": command_id}).execute()
+        result = await run_query(sb.rpc("start_command", {"p_command_id": command_id}))
         return result.data is True
     except Exception as e:
         logger.error(f"[{command_id}] DB 명령 시작 표시 실패: {e}")
@@ -374,10 +641,17 @@ async def db_complete_command(
         return True
 
     try:
-        sb.rpc(
-            "complete_command",
-            {"p_command_id": command_id, "p_status": status, "p_result": result, "p_error": error},
-        ).execute()
+        await run_query(
+            sb.rpc(
+                "complete_command",
+                {
+                    "p_command_id": command_id,
+                    "p_status": status,
+                    "p_result": result,
+                    "p_error": error,
+                },
+            )
+        )
         return True
     except Exception as e:
         logger.error(f"[{command_id}] DB 명령 완료 처리 실패: {e}")
@@ -400,19 +674,21 @@ async def db_enqueue_command(
         return str(uuid.uuid4())
 
     try:
-        result = sb.rpc(
-            "enqueue_command",
-            {
-                "p_command_type": command_type,
-                "p_params": params,
-                "p_target_node_id": target_node_id,
-                "p_target_spec": target_spec or {"type": "ALL_DEVICES"},
-                "p_priority": priority,
-                "p_scheduled_at": scheduled_at,
-                "p_source_request_id": source_request_id,
-                "p_created_by": created_by,
-            },
-        ).execute()
+        result = await run_query(
+            sb.rpc(
+                "enqueue_command",
+                {
+                    "p_command_type": command_type,
+                    "p_params": params,
+                    "p_target_node_id": target_node_id,
+                    "p_target_spec": target_spec or {"type": "ALL_DEVICES"},
+                    "p_priority": priority,
+                    "p_scheduled_at": scheduled_at,
+                    "p_source_request_id": source_request_id,
+                    "p_created_by": created_by,
+                },
+            )
+        )
 
         return result.data
     except Exception as e:
@@ -463,9 +739,9 @@ def build_message(msg_type: str, payload: dict) -> dict:
     }
 
 
-def build_hello_ack(session_id: str, server_time: str = None) -> dict:
-    """HELLO_ACK 메시지 빌드"""
-    return {
+def build_hello_ack(session_id: str, server_time: str = None, protocol: dict = None) -> dict:
+    """HELLO_ACK 메시지 빌드 (protocol: v2 협상 결과, v1이면 생략)"""
+    message = {
         "type": "HELLO_ACK",
         "version": Config.PROTOCOL_VERSION,
         "timestamp": server_time or (datetime.now(timezone.utc).isoformat() + "Z"),
@@ -476,19 +752,38 @@ def build_hello_ack(session_id: str, server_time: str = None) -> dict:
             "max_tasks": Config.MAX_TASKS_PER_NODE,
         },
     }
+    if protocol:
+        message["payload"]["protocol"] = protocol
+    return message
 
 
-def build_heartbeat_ack(server_time: str = None, pending_commands: list = None) -> dict:
-    """HEARTBEAT_ACK 메시지 빌드 (Pull-based Push 포함)"""
+def build_heartbeat_ack(
+    server_time: str = None, pending_commands: list = None, snapshot: dict = None
+) -> dict:
+    """
+    HEARTBEAT_ACK 메시지 빌드 (Pull-based Push 포함)
+
+    snapshot: v2 디바이스 스냅샷 ACK (device_snapshot_version 또는 device_snapshot_resync)
+    """
     return {
         "type": "HEARTBEAT_ACK",
         "version": Config.PROTOCOL_VERSION,
         "timestamp": server_time or (datetime.now(timezone.utc).isoformat() + "Z"),
         "message_id": str(uuid.uuid4()),
-        "payload": {"status": "OK", "commands": pending_commands or []},
+        "payload": {"status": "OK", "commands": pending_commands or [], **(snapshot or {})},
     }
 
 
+async def receive_frame(websocket: WebSocket):
+    """텍스트/바이너리 프레임 수신 (v2 msgpack은 바이너리)"""
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+    if message.get("bytes") is not None:
+        return message["bytes"]
+    return message.get("text") or ""
+
+
 def build_ack(ack_message_id: str, status: str, reason: str = None) -> dict:
     """ACK 메시지 빌드"""
     payload = {"ack_message_id": ack_message_id, "status": status}
@@ -548,17 +843,46 @@ async def lifespan(app: FastAPI):
     else:
         logger.warning("⚠️ Supabase 연결 없음 (Mock 모드)")
 
-    # Background task: 비활성 노드 정리
+    redis_client = await connect_rate_limit_redis()
+    cluster_redis = await connect_cluster_redis()
+
+    # 다중 인스턴스: Redis가 있으면 노드 레지스트리/pub/sub 공유 (없으면 이 프로세스만)
+    if cluster_redis is not None:
+        cluster.backend = RedisClusterBackend(cluster_redis, Config.CLUSTER_PREFIX)
+    await cluster.start()
+    await seed_remote_node_state()
+
+    # HEARTBEAT 일괄 처리 루프
+    await heartbeat_aggregator.start()
+    await oob_forwarder.start()
+    await command_tracker.start()
+
+    # Background task: 비활성 노드 정리, 대시보드 NODE_DELTA
     cleanup_task = asyncio.create_task(cleanup_stale_connections())
+    delta_task = asyncio.create_task(publish_node_deltas())
 
     yield
 
     # Cleanup
-    cleanup_task.cancel()
-    try:
-        await cleanup_task
-    except asyncio.CancelledError:
-        pass
+    for task in (cleanup_task, delta_task):
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    # 다른 인스턴스가 더 이상 이 인스턴스로 라우팅하지 않도록 먼저 레지스트리에서 빠짐
+    await cluster.stop()
+
+    # 버퍼에 남은 HEARTBEAT까지 DB 반영
+    await heartbeat_aggregator.stop()
+    await oob_forwarder.stop()
+    await command_tracker.stop()
+    await dashboard_hub.close()
+
+    for client in (redis_client, cluster_redis):
+        if client is not None:
+            await client.aclose()
 
     logger.info("🧠 Cloud Gateway 종료")
 
@@ -573,7 +897,7 @@ async def cleanup_stale_connections():
             timeout = timedelta(seconds=Config.HEARTBEAT_TIMEOUT)
 
             # 스냅샷을 통해 순회 중 딕셔너리 변경 에러 방지
-            nodes_snapshot = list(pool._nodes.values())
+            nodes_snapshot = pool.connections()
             stale_nodes = []
 
             for node in nodes_snapshot:
@@ -586,7 +910,7 @@ async def cleanup_stale_connections():
                     await conn.websocket.close(code=4008, reason="Heartbeat timeout")
                 except Exception:
                     pass
-                await pool.remove(node_id)
+                await pool.remove(node_id, conn)
 
         except asyncio.CancelledError:
             break
@@ -626,26 +950,39 @@ async def root():
 
 
 # ============================================================
-# WebSocket: 노드 연결 (Protocol v1.0)
+# WebSocket: 노드 연결 (Protocol v1.0 / v2.0)
 # ============================================================
 
 
 @app.websocket("/ws/node")
 async def websocket_node(websocket: WebSocket):
     """
-    노드 WebSocket 연결 (Protocol v1.0)
+    노드 WebSocket 연결 (Protocol v1.0 / v2.0)
 
     Protocol Flow:
     1. Client → Server: HELLO (node_id + signature + payload)
     2. Server → Client: HELLO_ACK (session_id + config)
     3. Client → Server: HEARTBEAT (30초 간격)
-    4. Server → Client: HEARTBEAT_ACK + pending commands (Pull-based Push)
+    4. Server → Client: HEARTBEAT_ACK (즉시), 일괄 DB 처리 후 대기 명령은 COMMAND로 Push
     5. Server → Client: COMMAND (명령 전달)
     6. Client → Server: RESULT (명령 결과)
+
+    Rate Limit:
+    - IP별 연결 시도 초과 → accept 전에 거부 (1008)
+    - 노드별 메시지 초과 → RATE_LIMITED 에러 응답 후 메시지 무시,
+      연속 NODE_MSG_MAX_VIOLATIONS회 초과 시 연결 종료 (4029)
     """
+    client = client_key(websocket)
+    if not (await node_connect_limiter.hit(client)).allowed:
+        logger.warning(f"[{client}] 노드 연결 시도 한도 초과 - 거부")
+        await websocket.close(code=1008)
+        return
+
     await websocket.accept()
     node_id = None
+    conn = None
     session_id = str(uuid.uuid4())[:8]
+    violations = 0
 
     try:
         # ═══════════════════════════════════════════════════════════════════
@@ -705,6 +1042,10 @@ async def websocket_node(websocket: WebSocket):
         conn.device_count = payload.get("device_count", 0)
         conn.runner_version = payload.get("runner_version", "")
 
+        # ═══ 프로토콜 협상 (v2를 제안하지 않은 노드는 v1 그대로) ═══
+        if Config.PROTOCOL_V2:
+            conn.protocol = negotiate(payload.get("protocol"))
+
         # ═══ DB에 연결 등록 ═══
         db_result = await db_register_node_connection(
             node_id=node_id,
@@ -721,12 +1062,27 @@ async def websocket_node(websocket: WebSocket):
                 logger.info(f"[{node_id}] 새 노드 등록됨 (uuid={conn.node_uuid})")
 
         # ═══ HELLO_ACK 응답 ═══
-        await websocket.send_json(build_hello_ack(session_id))
+        # HELLO_ACK까지는 JSON, 이후 협상된 인코딩
+        await websocket.send_json(build_hello_ack(session_id, protocol=conn.protocol))
+        if conn.protocol:
+            conn.codec = FrameCodec(conn.protocol["encoding"])
+
+        protocol = (
+            f"{conn.protocol['version']}/{conn.codec.encoding}"
+            if conn.protocol
+            else Config.PROTOCOL_VERSION
+        )
+        logger.info(
+            f"[{node_id}] HELLO 완료 (session={session_id}, devices={conn.device_count}, "
+            f"protocol={protocol})"
+        )
 
-        logger.info(f"[{node_id}] HELLO 완료 (session={session_id}, devices={conn.device_count})")
+        # 레지스트리 등록 (기록은 sync 루프가 수행 - Redis가 멈춰도 HELLO는 기다리지 않음)
+        cluster.register_node(node_id, node_record(conn))
 
         # 대시보드에 노드 연결 알림
-        await broadcast_to_dashboards(
+        update_node_state(node_id, conn.to_dict())
+        publish_dashboard(
             {
                 "type": "NODE_CONNECTED",
                 "node_id": node_id,
@@ -740,14 +1096,30 @@ async def websocket_node(websocket: WebSocket):
         # Phase 2: Message Loop
         # ═══════════════════════════════════════════════════════════════════
         while True:
-            message = await websocket.receive_json()
+            frame = await receive_frame(websocket)
+            node_frame_bytes.labels(encoding=conn.codec.encoding).observe(len(frame))
+            message = conn.codec.decode(frame)
             msg_type = message.get("type")
             msg_id = message.get("message_id", "")
             msg_payload = message.get("payload", {})
 
+            # ═══ 레이트 리밋 (노드별 토큰 버킷) ═══
+            limit = await node_message_limiter.hit(node_id)
+            if not limit.allowed:
+                violations += 1
+                if violations >= Config.NODE_MSG_MAX_VIOLATIONS:
+                    logger.warning(f"[{node_id}] 메시지 한도 연속 초과 - 연결 종료")
+                    await websocket.close(code=4029, reason="Rate limited")
+                    return
+                await conn.send(
+                    build_error("RATE_LIMITED", f"Retry after {limit.retry_after:.1f}s", msg_id)
+                )
+                continue
+            violations = 0
+
             # ═══ HEARTBEAT 처리 ═══
             if msg_type == "HEARTBEAT":
-                await handle_heartbeat(node_id, conn, websocket, message)
+                await handle_heartbeat(node_id, conn, message)
 
             # ═══ RESULT 처리 ═══
             elif msg_type == "RESULT":
@@ -768,7 +1140,7 @@ async def websocket_node(websocket: WebSocket):
             # ═══ 알 수 없는 메시지 ═══
             else:
                 logger.warning(f"[{node_id}] 알 수 없는 메시지 타입: {msg_type}")
-                await websocket.send_json(
+                await conn.send(
                     build_error("UNKNOWN_MESSAGE", f"Unknown message type: {msg_type}", msg_id)
                 )
 
@@ -777,20 +1149,33 @@ async def websocket_node(websocket: WebSocket):
     except Exception as e:
         logger.error(f"[{node_id or 'unknown'}] 에러: {e}", exc_info=True)
     finally:
-        if node_id:
-            await pool.remove(node_id)
+        # HELLO 전에 끊긴 경우 또는 재연결로 대체된 경우 새 연결은 건드리지 않음
+        if node_id and conn is not None:
+            await pool.remove(node_id, conn)
 
 
-async def handle_heartbeat(node_id: str, conn: NodeConnection, websocket: WebSocket, message: dict):
+async def handle_heartbeat(node_id: str, conn: NodeConnection, message: dict):
     """HEARTBEAT 메시지 처리"""
     msg_payload = message.get("payload", {})
 
     # Protocol v1.0 필드
     status = msg_payload.get("status", "READY")
-    device_snapshot = msg_payload.get("device_snapshot", [])
     active_tasks = msg_payload.get("active_tasks", 0)
     resources = msg_payload.get("resources", {})
-    msg_payload.get("queue_depth", 0)
+
+    # 디바이스 스냅샷 (v1 전체 / v2 전체 또는 마지막 ACK 버전 대비 델타)
+    snapshot_ack = None
+    device_snapshot = conn.snapshots.apply(msg_payload)
+    if device_snapshot is None:
+        # 델타 기준 버전이 없음 → 이전 스냅샷으로 처리하고 다음 HEARTBEAT에 전체 요청
+        node_snapshot_frames_total.labels(kind="resync").inc()
+        device_snapshot = conn.snapshots.devices
+        snapshot_ack = {"device_snapshot_resync": True}
+    else:
+        is_delta = "device_delta" in msg_payload
+        node_snapshot_frames_total.labels(kind="delta" if is_delta else "full").inc()
+        if "device_snapshot_version" in msg_payload:
+            snapshot_ack = {"device_snapshot_version": msg_payload["device_snapshot_version"]}
 
     # 확장 필드 (기존 NodeRunner 호환)
     metrics = message.get("metrics", {})
@@ -798,40 +1183,26 @@ async def handle_heartbeat(node_id: str, conn: NodeConnection, websocket: WebSoc
     device_count = len(device_snapshot) or len(devices) or metrics.get("device_count", 0)
 
     # 메모리 상태 업데이트
-    await pool.update_heartbeat(node_id, device_count, status)
-    await pool.update_status(node_id, status, active_tasks)
+    pool.update_heartbeat(node_id, device_count, status, active_tasks)
     conn.resources = resources
 
     # ═══ DB 처리 (HEARTBEAT + Pull-based Push) ═══
-    db_result = await db_process_heartbeat(
-        node_id=node_id,
-        status=status,
-        resources=resources,
-        device_snapshot=device_snapshot or devices,
-        active_tasks=active_tasks,
-        session_id=conn.session_id,
+    # 버퍼에 넣기만 하고 바로 진행 - 대기 명령은 일괄 처리 후 deliver_heartbeat_result가 Push
+    heartbeat_aggregator.submit(
+        node_id,
+        {
+            "node_id": node_id,
+            "status": status,
+            "resources": resources,
+            "device_snapshot": device_snapshot or devices,
+            "active_tasks": active_tasks,
+            "ws_session_id": conn.session_id,
+            "queue_depth": msg_payload.get("queue_depth", 0),
+        },
     )
 
-    # 대기 명령 추출
-    pending_commands = []
-    if db_result.get("success"):
-        db_commands = db_result.get("pending_commands", [])
-
-        # DB 명령을 Protocol v1.0 COMMAND 형식으로 변환
-        for cmd in db_commands or []:
-            pending_commands.append(
-                {
-                    "command_id": cmd.get("id"),
-                    "command_type": cmd.get("command_type"),
-                    "priority": cmd.get("priority", "NORMAL"),
-                    "target": cmd.get("target_spec", {"type": "ALL_DEVICES"}),
-                    "params": cmd.get("params", {}),
-                    "timeout_seconds": cmd.get("timeout_seconds", 300),
-                }
-            )
-
-    # ═══ OOB 메트릭 전달 ═══
-    await forward_metrics_to_oob(
+    # ═══ OOB 메트릭 전달 (큐에 넣기만 함) ═══
+    oob_forwarder.submit(
         node_id,
         {
             "device_count": device_count,
@@ -845,27 +1216,69 @@ async def handle_heartbeat(node_id: str, conn: NodeConnection, websocket: WebSoc
         },
     )
 
-    # ═══ HEARTBEAT_ACK 응답 (+ 대기 명령) ═══
-    await websocket.send_json(
-        build_heartbeat_ack(pending_commands=pending_commands if status == "READY" else [])
-    )
+    # ═══ HEARTBEAT_ACK 응답 (DB 반영을 기다리지 않음) ═══
+    await conn.send(build_heartbeat_ack(snapshot=snapshot_ack))
 
-    if pending_commands:
-        logger.info(f"[{node_id}] HEARTBEAT_ACK + {len(pending_commands)}개 명령 Push")
+    # 레지스트리 갱신 (sync 주기마다 모아서 기록)
+    cluster.update_node(node_id, node_record(conn))
 
-    # 대시보드에 노드 상태 업데이트 브로드캐스트
-    await broadcast_to_dashboards(
+    # 대시보드 상태 테이블 갱신 (바뀐 필드만 다음 NODE_DELTA로 전송)
+    update_node_state(
+        node_id,
         {
-            "type": "NODE_UPDATE",
-            "node_id": node_id,
             "status": status,
             "device_count": device_count,
             "active_tasks": active_tasks,
-            "last_heartbeat": datetime.now(timezone.utc).isoformat() + "Z",
-        }
+            "last_heartbeat": conn.last_heartbeat.isoformat(),
+        },
     )
 
 
+async def deliver_heartbeat_result(node_id: str, result: dict):
+    """일괄 처리 결과 반영 + 할당된 대기 명령을 해당 노드 소켓으로 Push"""
+    if not result.get("success"):
+        logger.warning(f"[{node_id}] DB heartbeat 처리 실패: {result.get('error')}")
+        return
+
+    conn = pool.get(node_id)
+    if conn is not None and result.get("node_uuid"):
+        conn.node_uuid = result["node_uuid"]
+
+    commands = result.get("pending_commands") or []
+    if not commands:
+        return
+    if conn is None:
+        # 할당된 명령은 ASSIGNED로 남음 (명령 타임아웃 처리 대상)
+        logger.warning(f"[{node_id}] 명령 {len(commands)}개 할당됐으나 연결 없음")
+        return
+
+    # DB 명령을 Protocol v1.0 COMMAND 메시지로 변환
+    sent = 0
+    for cmd in commands:
+        command = build_command(
+            command_id=cmd.get("id"),
+            command_type=cmd.get("command_type"),
+            target=cmd.get("target_spec") or {"type": "ALL_DEVICES"},
+            params=cmd.get("params") or {},
+            priority=cmd.get("priority", "NORMAL"),
+            timeout=cmd.get("timeout_seconds", 300),
+        )
+        if await pool.send_to_node(node_id, command):
+            sent += 1
+
+    logger.info(f"[{node_id}] HEARTBEAT 처리 후 {sent}/{len(commands)}개 명령 Push")
+
+
+# HEARTBEAT 일괄 처리기 (lifespan에서 시작/종료)
+heartbeat_aggregator = HeartbeatAggregator(
+    db_process_heartbeats_bulk,
+    deliver_heartbeat_result,
+    max_batch=Config.HEARTBEAT_BATCH_SIZE,
+    max_delay=Config.HEARTBEAT_FLUSH_MS / 1000,
+    max_pending=Config.HEARTBEAT_MAX_PENDING,
+)
+
+
 async def handle_result(node_id: str, message: dict):
     """RESULT 메시지 처리"""
     msg_payload = message.get("payload", {})
@@ -881,9 +1294,13 @@ async def handle_result(node_id: str, message: dict):
         f"({summary.get('success_count', 0)}/{summary.get('total_devices', 0)} devices)"
     )
 
-    # ═══ Pending Future 해결 (동기 API용) ═══
-    if command_id and command_id in pending_commands:
-        pending_commands[command_id].set_result(msg_payload)
+    # 배치 점수의 실패율 입력
+    if command_id:
+        placement.record_result(node_id, result_status in ("SUCCESS", "PARTIAL_SUCCESS"))
+
+    # ═══ 대기 중인 명령 완료 (모든 대기자에게 전달) ═══
+    if command_id:
+        command_tracker.resolve(command_id, msg_payload)
 
     # ═══ DB 명령 완료 처리 ═══
     if command_id:
@@ -898,7 +1315,7 @@ async def handle_result(node_id: str, message: dict):
         )
 
     # 대시보드에 결과 브로드캐스트
-    await broadcast_to_dashboards(
+    publish_dashboard(
         {
             "type": "COMMAND_RESULT",
             "node_id": node_id,
@@ -910,27 +1327,13 @@ async def handle_result(node_id: str, message: dict):
     )
 
 
-async def forward_metrics_to_oob(node_id: str, metrics: dict):
-    """OOB 시스템에 메트릭 전달"""
-    try:
-        import aiohttp
-
-        oob_api_url = os.getenv("OOB_API_URL")
-
-        if not oob_api_url:
-            return
-
-        async with aiohttp.ClientSession() as session:
-            payload = {"node_id": node_id, **metrics}
-            async with session.post(
-                oob_api_url, json=payload, timeout=aiohttp.ClientTimeout(total=5)
-            ) as resp:
-                if resp.status != 200:
-                    logger.debug(f"[{node_id}] OOB metrics forward: {resp.status}")
-    except ImportError:
-        pass
-    except Exception as e:
-        logger.debug(f"[{node_id}] OOB forward error: {e}")
+# OOB 메트릭 일괄 전달기 (lifespan에서 시작/종료)
+oob_forwarder = OOBForwarder(
+    Config.OOB_BULK_URL,
+    max_batch=Config.OOB_BATCH_SIZE,
+    max_delay=Config.OOB_FLUSH_MS / 1000,
+    max_queue=Config.OOB_MAX_QUEUE,
+)
 
 
 # ============================================================
@@ -958,14 +1361,31 @@ class CommandResponse(BaseModel):
     error: Optional[str] = None
 
 
-@app.post("/api/command", response_model=CommandResponse)
+@app.post(
+    "/api/command",
+    response_model=CommandResponse,
+    dependencies=[Depends(rate_limit_dependency(command_limiter))],
+)
 async def send_command(request: CommandRequest):
     """
     노드에 명령 전송 (동기 - 응답 대기)
 
     프론트엔드 → Gateway → Node → Laixi → Gateway → 프론트엔드
+    노드가 다른 인스턴스에 연결돼 있으면 그 인스턴스가 전송/대기 후 응답 (pub/sub)
     """
-    conn = await pool.get(request.node_id)
+    if pool.get(request.node_id) is None:
+        owner = await cluster.owner(request.node_id)
+        if owner is not None:
+            reply = await forward_to_owner(
+                owner, "command", request.model_dump(), timeout=request.timeout
+            )
+            return CommandResponse(**reply)
+    return await execute_command(request)
+
+
+async def execute_command(request: CommandRequest) -> CommandResponse:
+    """이 인스턴스에 연결된 노드에 명령 전송 + RESULT 대기"""
+    conn = pool.get(request.node_id)
     if not conn:
         raise HTTPException(
             status_code=404, detail=f"Node not found or not connected: {request.node_id}"
@@ -990,30 +1410,49 @@ async def send_command(request: CommandRequest):
         timeout=request.timeout,
     )
 
-    # Future 생성 (응답 대기용)
-    future = asyncio.get_event_loop().create_future()
-    pending_commands[command_id] = future
+    # 전송 전에 등록 (마감 시각에 트래커가 정리 - 호출자가 먼저 떠나도 남지 않음)
+    if not command_tracker.track(command_id, request.node_id, timeout=request.timeout):
+        raise HTTPException(status_code=503, detail="Too many commands in flight")
 
-    try:
-        success = await pool.send_to_node(request.node_id, command)
-        if not success:
-            raise HTTPException(status_code=500, detail="Failed to send command")
+    success = await pool.send_to_node(request.node_id, command)
+    if not success:
+        command_tracker.cancel(command_id)
+        raise HTTPException(status_code=500, detail="Failed to send command")
 
-        # 응답 대기
-        try:
-            result = await asyncio.wait_for(future, timeout=float(request.timeout))
-            return CommandResponse(
-                success=result.get("status") in ["SUCCESS", "PARTIAL_SUCCESS"],
-                command_id=command_id,
-                result=result,
-                error=result.get("error_message"),
-            )
-        except asyncio.TimeoutError:
-            return CommandResponse(
-                success=False, command_id=command_id, error=f"Command timeout ({request.timeout}s)"
-            )
-    finally:
-        pending_commands.pop(command_id, None)
+    # 응답 대기 (None = 마감까지 RESULT 없음)
+    result = await command_tracker.wait(command_id)
+    if result is None:
+        return CommandResponse(
+            success=False, command_id=command_id, error=f"Command timeout ({request.timeout}s)"
+        )
+    return CommandResponse(
+        success=result.get("status") in ["SUCCESS", "PARTIAL_SUCCESS"],
+        command_id=command_id,
+        result=result,
+        error=result.get("error_message"),
+    )
+
+
+@app.get("/api/commands")
+async def list_inflight_commands(limit: int = 100):
+    """RESULT 대기 중인 명령 (오래된 순) + 개수/나이 백분위"""
+    return {**command_tracker.stats(), "commands": command_tracker.inflight(limit)}
+
+
+@app.get("/api/commands/{command_id}")
+async def get_command(command_id: str, wait: float = 0):
+    """
+    명령 상태 조회
+
+    wait > 0이면 RESULT까지 최대 wait초 대기 (여러 호출자가 같은 명령을 동시에 기다릴 수 있음)
+    """
+    if wait > 0 and command_id in command_tracker:
+        await command_tracker.wait(command_id, timeout=wait)
+
+    state = command_tracker.lookup(command_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Command not tracked")
+    return state
 
 
 # ============================================================
@@ -1050,7 +1489,7 @@ async def queue_command(request: QueueCommandRequest):
     # target_node_id가 있으면 연결 확인
     node_uuid = None
     if request.target_node_id:
-        conn = await pool.get(request.target_node_id)
+        conn = pool.get(request.target_node_id)
         if conn and conn.node_uuid:
             node_uuid = conn.node_uuid
 
@@ -1080,8 +1519,8 @@ async def queue_command(request: QueueCommandRequest):
 
 @app.get("/api/nodes")
 async def list_nodes():
-    """연결된 노드 목록"""
-    nodes = pool.list_nodes()
+    """연결된 노드 목록 (모든 인스턴스, instance = 담당 인스턴스)"""
+    nodes = await cluster_node_list()
     return {
         "nodes": nodes,
         "total": len(nodes),
@@ -1092,10 +1531,13 @@ async def list_nodes():
 
 @app.get("/api/nodes/{node_id}")
 async def get_node(node_id: str):
-    """특정 노드 상태"""
-    conn = await pool.get(node_id)
+    """특정 노드 상태 (다른 인스턴스의 노드는 레지스트리 기록)"""
+    conn = pool.get(node_id)
     if not conn:
-        raise HTTPException(status_code=404, detail="Node not found")
+        record = (await cluster.remote_nodes()).get(node_id)
+        if record is None:
+            raise HTTPException(status_code=404, detail="Node not found")
+        return record
 
     return {
         "node_id": conn.node_id,
@@ -1111,27 +1553,47 @@ async def get_node(node_id: str):
         "capabilities": conn.capabilities,
         "resources": conn.resources,
         "runner_version": conn.runner_version,
+        "protocol": conn.protocol,
     }
 
 
-@app.post("/api/nodes/{node_id}/command")
+@app.post(
+    "/api/nodes/{node_id}/command",
+    dependencies=[Depends(rate_limit_dependency(command_limiter))],
+)
 async def send_command_to_node(node_id: str, request: dict):
-    """특정 노드에 직접 명령 전송"""
-    conn = await pool.get(node_id)
+    """특정 노드에 직접 명령 전송 (다른 인스턴스의 노드면 그 인스턴스가 전송)"""
+    if pool.get(node_id) is None:
+        owner = await cluster.owner(node_id)
+        if owner is not None:
+            return await forward_to_owner(owner, "direct", {"node_id": node_id, "request": request})
+    return await execute_direct_command(node_id, request)
+
+
+async def execute_direct_command(node_id: str, request: dict) -> dict:
+    """이 인스턴스에 연결된 노드에 명령 전송 (응답 대기 없음)"""
+    conn = pool.get(node_id)
     if not conn:
         raise HTTPException(status_code=404, detail="Node not found")
 
     command_id = str(uuid.uuid4())
+    timeout = request.get("timeout", 60)
     command = build_command(
         command_id=command_id,
         command_type=request.get("action", "PING"),
         target=request.get("target", {"type": "ALL_DEVICES"}),
         params=request.get("params", {}),
         priority=request.get("priority", "NORMAL"),
-        timeout=request.get("timeout", 60),
+        timeout=timeout,
     )
 
+    # 응답을 기다리지 않지만 GET /api/commands/{id}로 결과 확인 가능
+    if not command_tracker.track(command_id, node_id, timeout=timeout, kind="direct"):
+        raise HTTPException(status_code=503, detail="Too many commands in flight")
+
     success = await pool.send_to_node(node_id, command)
+    if not success:
+        command_tracker.cancel(command_id)
 
     return {"sent": success, "command_id": command_id, "node_id": node_id}
 
@@ -1146,7 +1608,8 @@ class BroadcastRequest(BaseModel):
 
     video_url: str
     duration_seconds: int = 60
-    target_node_count: int = 0  # 0 = 모든 노드
+    target_node_count: int = 0  # 0 = 모든 노드, N = 부하 점수가 낮은 N개
+    target_device_count: int = 0  # 0 = 노드별 전체 디바이스, N = 선택된 노드에 균등 분배
     target_node_ids: List[str] = Field(default_factory=list)  # 특정 노드 지정
     priority: str = "HIGH"
 
@@ -1159,9 +1622,15 @@ class BroadcastResponse(BaseModel):
     target_nodes: int
     sent_nodes: int
     errors: List[str] = Field(default_factory=list)
+    results: Dict[str, str] = Field(default_factory=dict)  # 노드 ID → sent/timeout/error/...
+    assigned_devices: Dict[str, int] = Field(default_factory=dict)  # target_device_count 분배
 
 
-@app.post("/api/broadcast", response_model=BroadcastResponse)
+@app.post(
+    "/api/broadcast",
+    response_model=BroadcastResponse,
+    dependencies=[Depends(rate_limit_dependency(broadcast_limiter))],
+)
 async def broadcast_command(request: BroadcastRequest):
     """
     모든/지정 노드에 비디오 시청 명령 브로드캐스트
@@ -1169,23 +1638,36 @@ async def broadcast_command(request: BroadcastRequest):
     Control Room → Gateway → 모든 연결된 노드
     """
     broadcast_id = str(uuid.uuid4())[:8]
-    errors = []
-    sent_count = 0
 
     logger.info(f"[BROADCAST:{broadcast_id}] 시작: {request.video_url}")
 
-    # 대상 노드 결정
+    # 다른 인스턴스에 연결된 노드 (단일 인스턴스면 비어 있음)
+    remote = await cluster.remote_nodes()
+
+    # 대상 노드 결정 → {노드 ID: 디바이스 수 (None = 전체)}
+    quotas: Dict[str, Optional[int]] = {}
     if request.target_node_ids:
         # 특정 노드 지정
-        target_nodes = request.target_node_ids
+        quotas = {node_id: None for node_id in request.target_node_ids}
     else:
-        # 연결된 모든 READY 노드
-        ready_nodes = pool.get_ready_nodes()
-        target_nodes = [n.node_id for n in ready_nodes]
-
-        # 노드 수 제한
+        # 모든 인스턴스의 READY 노드 중 부하 점수가 낮은 순
+        loads = [node_load(conn) for conn in pool.get_ready_nodes()]
+        loads += [
+            record_load(record)
+            for record in remote.values()
+            if record.get("status") == "READY"
+            and record.get("active_tasks", 0) < Config.MAX_TASKS_PER_NODE
+        ]
         if request.target_node_count > 0:
-            target_nodes = target_nodes[: request.target_node_count]
+            loads = placement.select(loads, request.target_node_count)
+
+        if request.target_device_count > 0:
+            quotas = {
+                load.node_id: n for load, n in placement.spread(loads, request.target_device_count)
+            }
+        else:
+            quotas = {load.node_id: None for load in loads}
+    target_nodes = list(quotas)
 
     if not target_nodes:
         return BroadcastResponse(
@@ -1196,33 +1678,71 @@ async def broadcast_command(request: BroadcastRequest):
             errors=["No connected nodes available"],
         )
 
-    # COMMAND 메시지 생성
+    # 담당 인스턴스별 → 같은 디바이스 수끼리 묶어 COMMAND 1개씩 (IDLE_DEVICES max_count로 노드별 할당)
+    # 레지스트리에 없는 노드는 이 인스턴스로 (send_many가 not_connected로 보고)
     command_id = str(uuid.uuid4())
-    command = build_command(
-        command_id=command_id,
-        command_type="WATCH_VIDEO",
-        target={"type": "ALL_DEVICES"},
-        params={
-            "video_url": request.video_url,
-            "min_watch_seconds": request.duration_seconds,
-            "broadcast_id": broadcast_id,
-        },
-        priority=request.priority,
-        timeout=request.duration_seconds + 60,
-    )
+    plans: Dict[str, Dict[Optional[int], List[str]]] = {}
+    for node_id, quota in quotas.items():
+        owner = Config.INSTANCE_ID
+        if pool.get(node_id) is None and node_id in remote:
+            owner = remote[node_id]["instance"]
+        plans.setdefault(owner, {}).setdefault(quota, []).append(node_id)
+
+    def command_for(quota: Optional[int]) -> dict:
+        return build_command(
+            command_id=command_id,
+            command_type="WATCH_VIDEO",
+            target=(
+                {"type": "ALL_DEVICES"}
+                if quota is None
+                else {"type": "IDLE_DEVICES", "max_count": quota}
+            ),
+            params={
+                "video_url": request.video_url,
+                "min_watch_seconds": request.duration_seconds,
+                "broadcast_id": broadcast_id,
+            },
+            priority=request.priority,
+            timeout=request.duration_seconds + 60,
+        )
 
-    # 각 노드에 전송
-    for node_id in target_nodes:
-        success = await pool.send_to_node(node_id, command)
-        if success:
-            sent_count += 1
-            logger.info(f"[BROADCAST:{broadcast_id}] → {node_id} 전송 완료")
-        else:
-            errors.append(f"Failed to send to {node_id}")
-            logger.warning(f"[BROADCAST:{broadcast_id}] → {node_id} 전송 실패")
+    async def send_plan(owner: str, groups: Dict[Optional[int], List[str]]) -> Dict[str, str]:
+        batches = [
+            {"node_ids": node_ids, "command": command_for(quota)}
+            for quota, node_ids in groups.items()
+        ]
+        if owner == Config.INSTANCE_ID:
+            return await send_batches(batches)
+        reply = await cluster.request(
+            owner,
+            "send",
+            {"batches": batches},
+            timeout=Config.SEND_TIMEOUT + Config.CLUSTER_REQUEST_TIMEOUT,
+        )
+        if reply is None:
+            return {node_id: "timeout" for batch in batches for node_id in batch["node_ids"]}
+        return reply
+
+    # 모든 대상 노드에 동시 전송 (멈춘 노드/인스턴스 하나가 나머지의 명령 시작을 늦추지 않음)
+    outcomes = await asyncio.gather(*(send_plan(owner, groups) for owner, groups in plans.items()))
+    results = {node_id: outcome for group in outcomes for node_id, outcome in group.items()}
+    results = {node_id: results.get(node_id, "error") for node_id in target_nodes}  # 선택 순서 유지
+
+    # 전송 실패는 실패율에 반영 (active_tasks 선반영은 담당 인스턴스의 send_batches에서)
+    for node_id, outcome in results.items():
+        if outcome != SENT:
+            placement.record_result(node_id, success=False)
+    sent_count = sum(1 for outcome in results.values() if outcome == SENT)
+    errors = [
+        f"Failed to send to {node_id} ({outcome})"
+        for node_id, outcome in results.items()
+        if outcome != SENT
+    ]
+    if errors:
+        logger.warning(f"[BROADCAST:{broadcast_id}] 전송 실패 {len(errors)}개: {errors[:5]}")
 
     # 대시보드에 이벤트 브로드캐스트
-    await broadcast_to_dashboards(
+    publish_dashboard(
         {
             "type": "BROADCAST_STARTED",
             "broadcast_id": broadcast_id,
@@ -1240,28 +1760,96 @@ async def broadcast_command(request: BroadcastRequest):
         target_nodes=len(target_nodes),
         sent_nodes=sent_count,
         errors=errors,
+        results=results,
+        assigned_devices={node_id: quota for node_id, quota in quotas.items() if quota is not None},
+    )
+
+
+async def send_batches(batches: List[dict]) -> Dict[str, str]:
+    """
+    이 인스턴스에 연결된 노드에 묶음별 COMMAND 동시 전송 (보낸 노드는 active_tasks 선반영)
+
+    Args:
+        batches: [{"node_ids": [...], "command": COMMAND 메시지}]
+
+    Returns:
+        노드 ID → outcome (sent / timeout / error / not_connected)
+    """
+    outcomes = await asyncio.gather(
+        *(pool.send_many(batch["node_ids"], batch["command"]) for batch in batches)
     )
+    results = {node_id: outcome for group in outcomes for node_id, outcome in group.items()}
+    for node_id, outcome in results.items():
+        if outcome == SENT:
+            pool.reserve_task(node_id)
+    return results
+
+
+@app.get("/api/placement")
+async def placement_debug(limit: int = 20):
+    """
+    배치 디버깅 (현재 노드별 점수 + 최근 결정과 입력값)
+
+    decisions[].candidates: 점수가 낮은 순 (inputs는 항목별 0~1 값)
+    """
+    loads = [node_load(conn) for conn in pool.connections()]
+    max_devices = max((load.device_count for load in loads), default=0)
+    nodes = []
+    for load in loads:
+        score, inputs = placement.score(load, max_devices)
+        nodes.append({"node_id": load.node_id, "score": score, "inputs": inputs})
+    nodes.sort(key=lambda node: node["score"])
+
+    return {
+        **placement.stats(),
+        "nodes": nodes,
+        "decisions": placement.decisions(limit),
+    }
 
 
 # ============================================================
 # WebSocket: 대시보드 실시간 피드
 # ============================================================
 
-# 대시보드 연결 풀
-dashboard_connections: List[WebSocket] = []
+# 대시보드 팬아웃 허브 (구독자별 송신 큐 + writer 태스크)
+dashboard_hub = DashboardHub(
+    max_queue=Config.DASHBOARD_QUEUE_SIZE,
+    send_timeout=Config.DASHBOARD_SEND_TIMEOUT,
+)
 
+# 대시보드용 노드 상태 테이블 (버전 + 틱 단위 변경분)
+node_state = NodeStateTable()
 
-async def broadcast_to_dashboards(message: dict):
-    """대시보드들에 메시지 브로드캐스트"""
-    disconnected = []
-    for ws in dashboard_connections:
+
+async def publish_node_deltas():
+    """DASHBOARD_DELTA_MS마다 바뀐 필드만 NODE_DELTA 프레임 1개로 전송 (Background Task)"""
+    while True:
         try:
-            await ws.send_json(message)
-        except Exception:
-            disconnected.append(ws)
+            await asyncio.sleep(Config.DASHBOARD_DELTA_MS / 1000)
+            frame = node_state.take_delta()
+            if frame is not None:
+                dashboard_hub.publish(frame)
+        except asyncio.CancelledError:
+            break
+        except Exception as e:
+            logger.error(f"NODE_DELTA task error: {e}")
 
-    for ws in disconnected:
-        dashboard_connections.remove(ws)
+
+def dashboard_sync_frame(since: Optional[str], epoch: Optional[str]) -> dict:
+    """
+    대시보드 동기화 프레임
+
+    since가 있으면 그 버전 이후 변경분(NODE_DELTA), 없거나 재개 불가면 전체(INIT)
+    """
+    try:
+        frame = node_state.since(int(since), epoch) if since is not None else None
+    except ValueError:
+        frame = None
+    if frame is None or frame["type"] == "INIT":
+        frame = node_state.snapshot()
+        frame["total_nodes"] = len(frame["nodes"])
+        frame["ready_nodes"] = len([n for n in frame["nodes"] if n.get("status") == "READY"])
+    return frame
 
 
 @app.websocket("/ws/dashboard")
@@ -1270,36 +1858,43 @@ async def websocket_dashboard(websocket: WebSocket):
     대시보드 WebSocket 연결
 
     실시간으로 노드 상태, 명령 결과 등을 수신
+    응답(INIT/PONG/STATUS)도 같은 송신 큐를 거쳐 브로드캐스트와 순서 유지
+
+    노드 상태:
+    - 연결 시 INIT (전체, version 포함) → 이후 NODE_DELTA (바뀐 필드만, 틱마다 최대 1개)
+    - 재연결 시 ?since=<version>&epoch=<epoch> → 그 이후 변경분만 NODE_DELTA로
+    - 연결 중 누락 감지 시 {"type": "RESUME", "since": ..., "epoch": ...}
     """
     await websocket.accept()
-    dashboard_connections.append(websocket)
+    subscriber = dashboard_hub.subscribe(websocket.send_text, close=websocket.close)
 
-    logger.info(f"[DASHBOARD] 연결됨 (총 {len(dashboard_connections)}개)")
+    logger.info(f"[DASHBOARD] 연결됨 (총 {len(dashboard_hub)}개)")
 
     try:
-        # 초기 상태 전송
-        nodes = pool.list_nodes()
-        await websocket.send_json(
-            {
-                "type": "INIT",
-                "nodes": nodes,
-                "total_nodes": len(nodes),
-                "ready_nodes": len([n for n in nodes if n["status"] == "READY"]),
-            }
-        )
+        # 초기 상태 전송 (구독 직후라 이후 NODE_DELTA는 모두 이 프레임 뒤에 옴)
+        params = websocket.query_params
+        subscriber.send(dashboard_sync_frame(params.get("since"), params.get("epoch")))
 
         # 연결 유지 (클라이언트 메시지 대기)
-        async for message in websocket:
+        async for message in websocket.iter_text():
             try:
                 data = json.loads(message)
                 msg_type = data.get("type")
 
                 if msg_type == "PING":
-                    await websocket.send_json({"type": "PONG"})
+                    subscriber.send({"type": "PONG"})
+
+                elif msg_type == "RESUME":
+                    since = data.get("since")
+                    subscriber.send(
+                        dashboard_sync_frame(
+                            str(since) if since is not None else None, data.get("epoch")
+                        )
+                    )
 
                 elif msg_type == "GET_STATUS":
-                    nodes = pool.list_nodes()
-                    await websocket.send_json(
+                    nodes = await cluster_node_list()
+                    subscriber.send(
                         {
                             "type": "STATUS",
                             "nodes": nodes,
@@ -1316,9 +1911,148 @@ async def websocket_dashboard(websocket: WebSocket):
     except Exception as e:
         logger.error(f"[DASHBOARD] 에러: {e}")
     finally:
-        if websocket in dashboard_connections:
-            dashboard_connections.remove(websocket)
-        logger.info(f"[DASHBOARD] 연결 해제 (총 {len(dashboard_connections)}개)")
+        await dashboard_hub.unsubscribe(subscriber)
+        logger.info(f"[DASHBOARD] 연결 해제 (총 {len(dashboard_hub)}개)")
+
+
+# ============================================================
+# 인스턴스 간 라우팅 (다중 워커/레플리카)
+# ============================================================
+# 노드 소켓과 RESULT 대기는 노드가 연결된 인스턴스에만 있음
+# - 요청을 받은 인스턴스는 레지스트리에서 담당 인스턴스를 찾아 pub/sub로 전달
+# - 대시보드 이벤트/노드 상태는 모든 인스턴스에 전달 → 어느 인스턴스의 대시보드든 전체 노드
+
+cluster = GatewayCluster(
+    Config.INSTANCE_ID,
+    node_ttl=Config.HEARTBEAT_TIMEOUT,
+    request_timeout=Config.CLUSTER_REQUEST_TIMEOUT,
+    backend_timeout=Config.CLUSTER_BACKEND_TIMEOUT,
+)
+
+# 다른 인스턴스 노드 → 담당 인스턴스 (대시보드 상태 테이블 정리용)
+remote_node_owners: Dict[str, str] = {}
+
+REGISTRY_ONLY_FIELDS = ("cpu", "memory", "updated_at")
+
+
+def publish_dashboard(message: dict, key: Optional[str] = None):
+    """이 인스턴스 대시보드 + 다른 인스턴스 대시보드에 발행"""
+    dashboard_hub.publish(message, key)
+    cluster.publish_event({"type": "dashboard", "message": message, "key": key})
+
+
+def update_node_state(node_id: str, fields: dict):
+    """대시보드 상태 테이블 갱신 (바뀐 필드가 있으면 다른 인스턴스 테이블에도)"""
+    if node_state.update(node_id, fields):
+        cluster.publish_event({"type": "node_state", "node_id": node_id, "fields": fields})
+
+
+def remove_node_state(node_id: str):
+    """대시보드 상태 테이블에서 제거 (다른 인스턴스 테이블에도)"""
+    if node_state.remove(node_id):
+        cluster.publish_event({"type": "node_removed", "node_id": node_id})
+
+
+def apply_cluster_event(instance_id: str, event: dict):
+    """다른 인스턴스 이벤트 → 이 인스턴스의 대시보드/상태 테이블"""
+    kind = event.get("type")
+    if kind == "dashboard":
+        dashboard_hub.publish(event.get("message") or {}, event.get("key"))
+        return
+
+    node_id = event.get("node_id")
+    if not node_id or pool.get(node_id) is not None:
+        return  # 이 인스턴스에 연결된 노드는 로컬 상태가 기준
+    if kind == "node_state":
+        remote_node_owners[node_id] = instance_id
+        node_state.update(node_id, event.get("fields") or {})
+    elif kind == "node_removed" and remote_node_owners.get(node_id) == instance_id:
+        # 다른 인스턴스로 재연결된 노드의 이전 인스턴스 해제 이벤트는 무시
+        del remote_node_owners[node_id]
+        node_state.remove(node_id)
+
+
+def forget_instance(instance_id: str):
+    """응답 없는 인스턴스의 노드를 상태 테이블에서 제거"""
+    for node_id in [n for n, owner in remote_node_owners.items() if owner == instance_id]:
+        del remote_node_owners[node_id]
+        node_state.remove(node_id)
+        dashboard_hub.publish({"type": "NODE_DISCONNECTED", "node_id": node_id})
+
+
+async def seed_remote_node_state():
+    """시작 시 다른 인스턴스 노드를 상태 테이블에 반영 (이후는 이벤트로 갱신)"""
+    for node_id, record in (await cluster.remote_nodes()).items():
+        remote_node_owners[node_id] = record["instance"]
+        node_state.update(
+            node_id, {k: v for k, v in record.items() if k not in REGISTRY_ONLY_FIELDS}
+        )
+
+
+async def cluster_node_list() -> List[dict]:
+    """이 인스턴스 노드 + 다른 인스턴스 노드 (레지스트리 기록)"""
+    remote = await cluster.remote_nodes()
+    return pool.list_nodes() + [
+        {k: v for k, v in record.items() if k not in REGISTRY_ONLY_FIELDS}
+        for node_id, record in remote.items()
+        if pool.get(node_id) is None
+    ]
+
+
+async def forward_to_owner(owner: str, action: str, payload: dict, timeout: float = 0) -> dict:
+    """
+    담당 인스턴스에 요청 전달 (담당 인스턴스의 HTTPException은 그대로 재현)
+
+    Args:
+        timeout: 담당 인스턴스의 처리 시간 (RESULT 대기 등) - CLUSTER_REQUEST_TIMEOUT을 더해 대기
+    """
+    reply = await cluster.request(
+        owner, action, payload, timeout=timeout + Config.CLUSTER_REQUEST_TIMEOUT
+    )
+    if reply is None:
+        raise HTTPException(status_code=504, detail=f"Gateway instance {owner} did not respond")
+    if "status_code" in reply:
+        raise HTTPException(status_code=reply["status_code"], detail=reply.get("detail"))
+    return reply
+
+
+async def serve_command(payload: dict) -> dict:
+    """다른 인스턴스의 /api/command → 이 인스턴스 노드에 전송 + RESULT 대기"""
+    try:
+        return (await execute_command(CommandRequest(**payload))).model_dump()
+    except HTTPException as e:
+        return {"status_code": e.status_code, "detail": e.detail}
+
+
+async def serve_direct(payload: dict) -> dict:
+    """다른 인스턴스의 /api/nodes/{id}/command → 이 인스턴스 노드에 전송"""
+    try:
+        return await execute_direct_command(payload["node_id"], payload.get("request") or {})
+    except HTTPException as e:
+        return {"status_code": e.status_code, "detail": e.detail}
+
+
+async def serve_send(payload: dict) -> dict:
+    """다른 인스턴스의 /api/broadcast → 이 인스턴스 노드에 묶음별 전송"""
+    return await send_batches(payload.get("batches") or [])
+
+
+cluster.handle("command", serve_command)
+cluster.handle("direct", serve_direct)
+cluster.handle("send", serve_send)
+cluster.on_event = apply_cluster_event
+cluster.on_instance_lost = forget_instance
+
+
+@app.get("/api/cluster")
+async def cluster_status():
+    """게이트웨이 인스턴스 목록 + 인스턴스별 노드 수"""
+    remote = await cluster.remote_nodes()
+    nodes_by_instance = {Config.INSTANCE_ID: len(pool)}
+    for record in remote.values():
+        instance = record["instance"]
+        nodes_by_instance[instance] = nodes_by_instance.get(instance, 0) + 1
+    return {**cluster.stats(), "peers": cluster.peers(), "nodes_by_instance": nodes_by_instance}
 
 
 # ============================================================
@@ -1339,9 +2073,22 @@ async def health():
         "nodes_ready": len([n for n in nodes if n["status"] == "READY"]),
         "supabase_connected": sb is not None,
         "signature_verification": Config.VERIFY_SIGNATURE,
+        "heartbeats": heartbeat_aggregator.stats(),
+        "oob_forward": oob_forwarder.stats(),
+        "dashboards": dashboard_hub.stats(),
+        "node_state": node_state.stats(),
+        "placement": {"strategy": placement.strategy},
+        "commands": command_tracker.stats(),
+        "cluster": cluster.stats(),
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus 메트릭 (하트비트 일괄 처리, 레이트 리밋, DB 쿼리)"""
+    return PlainTextResponse(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.get("/api/status")
 async def system_status():
     """시스템 전체 상태"""
@@ -1351,7 +2098,7 @@ async def system_status():
     db_stats = {}
     if sb:
         try:
-            result = sb.from_("system_status_overview").select("*").single().execute()
+            result = await run_query(sb.from_("system_status_overview").select("*").single())
             if result.data:
                 db_stats = result.data
         except Exception as e:
@@ -1384,4 +2131,18 @@ if __name__ == "__main__":
     port = int(os.getenv("PORT", "8000"))
     host = os.getenv("HOST", "0.0.0.0")
 
-    uvicorn.run("main:app", host=host, port=port, reload=False, log_level="info")
+    # 워커마다 별도 인스턴스 (같은 포트, 노드/요청은 워커에 분산) → 인스턴스 간 라우팅에 Redis 필요
+    workers = Config.WORKERS
+    if workers > 1 and not Config.REDIS_URL:
+        logger.warning("⚠️ GATEWAY_WORKERS > 1은 REDIS_URL이 필요 - 워커 1개로 실행")
+        workers = 1
+
+    uvicorn.run(
+        "main:app",
+        host=host,
+        port=port,
+        reload=False,
+        log_level="info",
+        ws_per_message_deflate=Config.WS_DEFLATE,
+        workers=workers,
+    )
@@ -0,0 +1,318 @@
+"""
+⚡ DoAi.Me 비동기 데이터 접근 계층
+동기 supabase-py 쿼리를 이벤트 루프 밖에서 실행
+
+왜 이 구조인가?
+- supabase-py의 .execute()는 동기 HTTP 호출
+  → async 함수 안에서 그대로 호출하면 PostgREST 왕복 동안 이벤트 루프 전체가 멈춤
+    (WebSocket 하트비트, Laixi I/O 포함)
+- 크기가 제한된 전용 스레드 풀에서 실행하여 동시 DB 호출 수를 제어
+  (supabase-py 내부 httpx.Client가 커넥션 풀을 재사용)
+- 타임아웃/취소는 호출자에게 그대로 전파하고, 쿼리별 지연 시간은 Prometheus로 기록
+
+사용 예:
+    from shared.async_db import run_query
+
+    result = await run_query(client.table("devices").select("*").eq("pc_id", 1))
+    devices = result.data or []
+
+    # RPC + 개별 타임아웃
+    result = await run_query(client.rpc("process_heartbeat", params), timeout=5.0)
+
+    # 키셋 페이지네이션 (created_at, id)
+    query = apply_keyset(client.table("workload_logs").select("*"), cursor).limit(100)
+    rows = (await run_query(query)).data or []
+    next_cursor = page_cursor(rows, 100)
+
+환경 변수:
+- DB_QUERY_MAX_WORKERS: 쿼리 스레드 풀 크기 (기본 16)
+- DB_QUERY_TIMEOUT: 기본 쿼리 타임아웃 초 (기본 15, 0이면 무제한)
+- DB_UPSERT_CHUNK_SIZE: bulk_upsert 요청당 최대 행 수 (기본 500)
+"""
+
+import asyncio
+import base64
+import functools
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, TypeVar
+from urllib.parse import urlsplit
+
+from shared.monitoring.metrics import db_queries_total, db_query_duration
+
+T = TypeVar("T")
+
+DEFAULT_MAX_WORKERS = int(os.getenv("DB_QUERY_MAX_WORKERS", "16"))
+DEFAULT_TIMEOUT = float(os.getenv("DB_QUERY_TIMEOUT", "15"))
+DEFAULT_UPSERT_CHUNK = int(os.getenv("DB_UPSERT_CHUNK_SIZE", "500"))
+
+# 기본 타임아웃 사용 표시 (None은 "타임아웃 없음"을 의미)
+_DEFAULT = object()
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_query_executor() -> ThreadPoolExecutor:
+    """쿼리 전용 스레드 풀 싱글톤"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=DEFAULT_MAX_WORKERS, thread_name_prefix="db-query"
+        )
+    return _executor
+
+
+def shutdown_query_executor(wait: bool = True) -> None:
+    """스레드 풀 종료 (애플리케이션 종료 시 / 테스트용)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=wait, cancel_futures=True)
+        _executor = None
+
+
+def describe_query(query: Any) -> str:
+    """
+    PostgREST 요청 빌더에서 메트릭 레이블 생성
+
+    Returns:
+        "GET devices", "POST rpc/process_heartbeat" 형식 (알 수 없으면 "query")
+    """
+    if not type(query).__module__.startswith("postgrest"):
+        return "query"
+
+    request = getattr(query, "request", None)
+    path = getattr(request, "path", None)
+    method = getattr(request, "http_method", None)
+    if path is None or method is None:
+        return "query"
+
+    segments = [s for s in urlsplit(str(path)).path.split("/") if s]
+    if not segments:
+        return "query"
+
+    # RPC는 함수 이름까지 포함 (rpc/process_heartbeat), 테이블은 테이블 이름만
+    resource = "/".join(segments[-2:]) if segments[-2:-1] == ["rpc"] else segments[-1]
+    return f"{getattr(method, 'value', method)} {resource}"
+
+
+async def run_sync(
+    func: Callable[..., T],
+    *args: Any,
+    name: str = "query",
+    timeout: Any = _DEFAULT,
+) -> T:
+    """
+    동기 함수를 쿼리 스레드 풀에서 실행
+
+    Args:
+        func: 실행할 동기 함수
+        *args: 함수 인자
+        name: 메트릭 레이블
+        timeout: 타임아웃 초 (None이면 무제한, 생략 시 DB_QUERY_TIMEOUT)
+
+    Raises:
+        asyncio.TimeoutError: 타임아웃 초과
+        asyncio.CancelledError: 호출 태스크가 취소됨
+
+    Note:
+        취소/타임아웃 시 호출자는 즉시 풀려나지만, 이미 전송된 HTTP 요청은
+        스레드에서 끝까지 실행된 뒤 결과가 버려짐
+    """
+    if timeout is _DEFAULT:
+        timeout = DEFAULT_TIMEOUT or None
+
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    status = "ok"
+
+    try:
+        future = loop.run_in_executor(get_query_executor(), functools.partial(func, *args))
+        if timeout is None:
+            return await future
+        return await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        status = "timeout"
+        raise
+    except asyncio.CancelledError:
+        status = "cancelled"
+        raise
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        db_query_duration.labels(query=name).observe(time.perf_counter() - started)
+        db_queries_total.labels(query=name, status=status).inc()
+
+
+async def run_query(query: Any, *, name: Optional[str] = None, timeout: Any = _DEFAULT) -> Any:
+    """
+    PostgREST 쿼리 빌더를 비동기로 실행
+
+    Args:
+        query: .execute()를 가진 쿼리 빌더 (table(...).select(...), rpc(...) 등)
+        name: 메트릭 레이블 (생략 시 HTTP 메서드 + 리소스 경로)
+        timeout: 타임아웃 초 (None이면 무제한, 생략 시 DB_QUERY_TIMEOUT)
+
+    Returns:
+        execute() 결과 (APIResponse)
+    """
+    return await run_sync(query.execute, name=name or describe_query(query), timeout=timeout)
+
+
+async def bulk_upsert(
+    client: Any,
+    table: str,
+    rows: List[Dict[str, Any]],
+    *,
+    on_conflict: str,
+    chunk_size: int = DEFAULT_UPSERT_CHUNK,
+) -> List[Dict[str, Any]]:
+    """
+    다중 행 upsert (청크당 단일 INSERT ... ON CONFLICT 문장)
+
+    왜 이렇게 작성했는가?
+    - 행마다 upsert하면 N번의 HTTP 왕복
+    - PostgREST는 한 요청 안의 모든 객체 키가 같아야 함
+      → 키 구성이 다른 행(예: model 유무)은 별도 요청으로 분리
+      (누락 키를 NULL로 채우면 기존 값을 덮어쓰게 됨)
+    - 대규모 팜은 chunk_size 단위로 나눠 요청 크기 제한
+
+    Args:
+        client: Supabase 클라이언트 (table() 제공)
+        table: 테이블 이름
+        rows: upsert할 행 목록
+        on_conflict: 충돌 기준 컬럼 (예: "serial_number")
+        chunk_size: 요청당 최대 행 수
+
+    Returns:
+        upsert된 행 목록 (요청 순서대로 합침)
+    """
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+
+    upserted: List[Dict[str, Any]] = []
+    for group in groups.values():
+        for start in range(0, len(group), chunk_size):
+            chunk = group[start : start + chunk_size]
+            result = await run_query(client.table(table).upsert(chunk, on_conflict=on_conflict))
+            upserted.extend(result.data or [])
+
+    return upserted
+
+
+# ===========================================
+# 키셋 페이지네이션
+# ===========================================
+
+
+def encode_cursor(*values: Any) -> str:
+    """정렬 키 값들을 불투명한 커서 문자열로 인코딩"""
+    payload = json.dumps(list(values), default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int = 2) -> List[Any]:
+    """
+    커서 디코딩
+
+    Raises:
+        ValueError: 형식이 잘못되었거나 값 개수가 다름
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception as e:
+        raise ValueError(f"잘못된 커서: {cursor}") from e
+
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError(f"잘못된 커서: {cursor}")
+    return values
+
+
+def page_cursor(
+    rows: List[Dict[str, Any]], limit: int, column: str = "created_at"
+) -> Optional[str]:
+    """
+    다음 페이지 커서 (마지막 행의 정렬 키)
+
+    Returns:
+        결과가 limit보다 적으면 마지막 페이지이므로 None
+    """
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(last[column], last["id"])
+
+
+def _quote(value: Any) -> str:
+    # PostgREST 논리 필터 값: 타임스탬프의 ':' '+' ',' 등이 구문과 섞이지 않도록 따옴표 처리
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def apply_keyset(
+    query: Any, cursor: Optional[str], *, column: str = "created_at", desc: bool = True
+) -> Any:
+    """
+    (column, id) 키셋 조건과 정렬을 쿼리에 적용
+
+    왜 이렇게 작성했는가?
+    - limit/offset은 offset만큼 행을 읽고 버림 → 뒤 페이지일수록 느려짐
+    - 페이지 사이에 행이 추가되면 offset 기준이 밀려 중복/누락 발생
+    - (column, id) 튜플 비교는 (column, id) 인덱스로 바로 다음 위치를 찾음
+      (같은 시각의 행은 id로 순서를 고정)
+
+    Args:
+        query: select 빌더
+        cursor: 이전 페이지의 page_cursor() 값 (None이면 첫 페이지)
+        column: 정렬 시각 컬럼
+        desc: 최신순 여부
+
+    Raises:
+        ValueError: 잘못된 커서
+    """
+    if cursor:
+        value, row_id = decode_cursor(cursor)
+        op = "lt" if desc else "gt"
+        query = query.or_(
+            f"{column}.{op}.{_quote(value)},"
+            f"and({column}.eq.{_quote(value)},id.{op}.{_quote(row_id)})"
+        )
+
+    return query.order(column, desc=desc).order("id", desc=desc)
+
+
+async def iter_keyset(
+    build_query: Callable[[], Any],
+    *,
+    column: str = "created_at",
+    desc: bool = True,
+    page_size: int = 500,
+    cursor: Optional[str] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    키셋 페이지 단위로 전체 결과를 순회 (한 번에 한 페이지만 메모리에 유지)
+
+    Args:
+        build_query: 필터가 적용된 새 select 빌더를 만드는 함수
+            (PostgREST 빌더는 변경 가능한 객체이므로 페이지마다 새로 생성)
+        column: 정렬 시각 컬럼 (select에 column과 id가 포함되어야 함)
+        desc: 최신순 여부
+        page_size: 페이지당 행 수
+        cursor: 시작 커서
+
+    Yields:
+        행 (정렬 순서대로)
+    """
+    while True:
+        query = apply_keyset(build_query(), cursor, column=column, desc=desc).limit(page_size)
+        rows = (await run_query(query)).data or []
+
+        for row in rows:
+            yield row
+
+        cursor = page_cursor(rows, page_size, column)
+        if cursor is None:
+            return
@@ -15,15 +15,58 @@ Usage:
 
     # Delete
     await cache.delete(CacheKey.NODE_HEALTH, node_id)
+
+    # Bulk (one MGET / pipeline on Redis)
+    health = await cache.get_many(CacheKey.NODE_HEALTH, node_ids)
+    await cache.set_many(CacheKey.NODE_HEALTH, {"node_01": h1, "node_02": h2}, ttl=60)
+
+    # Compute once per key: concurrent misses share one factory() call,
+    # stale entries are served while one background task refreshes them
+    stats = await cache.get_or_set(
+        CacheKey.SYSTEM_STATS, ttl=30, stale_ttl=30, lock_ttl=10, factory=compute_stats
+    )
+
+    # Key-space sample by prefix (counts, sizes, TTL distribution)
+    summary = await cache.keyspace(sample=1000)
+
+Metrics (shared.monitoring.metrics): cache_hits_total / cache_misses_total /
+cache_sets_total and cache_operation_duration_seconds per key prefix,
+cache_evictions_total, cache_backend_errors_total and cache_backend_active.
+
+Environment (memory backend, used when Redis is unavailable):
+- CACHE_MEMORY_MAX_SIZE: maximum number of keys (default 10000)
+- CACHE_MEMORY_MAX_BYTES: approximate byte budget, 0 = unlimited (default 0)
+- CACHE_MEMORY_SWEEP_INTERVAL: seconds between expired-key sweeps (default 1.0)
+
+Environment (Redis value encoding, see shared.cache_codec):
+- CACHE_CODEC: json | orjson | msgpack (default orjson)
+- CACHE_COMPRESSION: none | zstd | lz4 (default none)
+- CACHE_COMPRESSION_THRESHOLD: minimum payload bytes to compress (default 1024)
+
+Environment (two-tier cache, used when Redis is available):
+- CACHE_L1_ENABLED: 0 to talk to Redis directly (default 1)
+- CACHE_L1_MAX_SIZE: per-process L1 key limit (default 2000)
+- CACHE_L1_TTL: maximum L1 lifetime in seconds (default 2)
+- CACHE_INVALIDATION_CHANNEL: Redis pub/sub channel (default "cache:invalidate")
+
+Environment (Redis availability):
+- CACHE_REDIS_TIMEOUT: seconds per Redis command / connection attempt (default 0.5)
+- CACHE_BREAKER_FAILURES: consecutive failures before serving from memory (default 5)
+- CACHE_BREAKER_PROBE_INTERVAL: seconds between PING probes while degraded (default 2)
+- CACHE_SAMPLE_TIMEOUT: total seconds of one key-space sample (default 2)
 """
 
 import asyncio
+import heapq
 import inspect
 import json
 import os
-from datetime import datetime, timezone
+import random
+import time
+import uuid
+from collections import OrderedDict
 from enum import Enum
-from typing import Any, Dict, Optional, Union
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 try:
     from loguru import logger
@@ -33,6 +76,62 @@ except ImportError:
     logger = logging.getLogger(__name__)
     logging.basicConfig(level=logging.INFO)
 
+from shared.cache_codec import CacheCodec, get_codec
+from shared.monitoring.metrics import (
+    cache_backend_active,
+    cache_backend_errors_total,
+    cache_circuit_rejected_total,
+    cache_circuit_state,
+    cache_circuit_transitions_total,
+    cache_coalesced_requests_total,
+    cache_evictions_total,
+    cache_hits_total,
+    cache_invalidations_received_total,
+    cache_lock_waits_total,
+    cache_misses_total,
+    cache_operation_duration_seconds,
+    cache_requests_total,
+    cache_sets_total,
+    cache_stale_served_total,
+)
+
+# Memory backend limits (used when Redis is unavailable)
+MEMORY_CACHE_MAX_SIZE = int(os.getenv("CACHE_MEMORY_MAX_SIZE", "10000"))
+MEMORY_CACHE_MAX_BYTES = int(os.getenv("CACHE_MEMORY_MAX_BYTES", "0")) or None
+MEMORY_CACHE_SWEEP_INTERVAL = float(os.getenv("CACHE_MEMORY_SWEEP_INTERVAL", "1.0"))
+
+# Two-tier cache (per-process L1 in front of Redis)
+L1_CACHE_ENABLED = os.getenv("CACHE_L1_ENABLED", "1") != "0"
+L1_CACHE_MAX_SIZE = int(os.getenv("CACHE_L1_MAX_SIZE", "2000"))
+L1_CACHE_TTL = float(os.getenv("CACHE_L1_TTL", "2"))
+CACHE_INVALIDATION_CHANNEL = os.getenv("CACHE_INVALIDATION_CHANNEL", "cache:invalidate")
+
+# Redis circuit breaker (degraded in-memory mode while Redis is down)
+CACHE_REDIS_TIMEOUT = float(os.getenv("CACHE_REDIS_TIMEOUT", "0.5"))
+CACHE_BREAKER_FAILURES = int(os.getenv("CACHE_BREAKER_FAILURES", "5"))
+CACHE_BREAKER_PROBE_INTERVAL = float(os.getenv("CACHE_BREAKER_PROBE_INTERVAL", "2"))
+# Total time budget of one key-space sample (SCAN + MEMORY USAGE/PTTL + DBSIZE)
+CACHE_SAMPLE_TIMEOUT = float(os.getenv("CACHE_SAMPLE_TIMEOUT", "2"))
+
+try:
+    from redis.exceptions import ConnectionError as _RedisConnectionError
+    from redis.exceptions import TimeoutError as _RedisTimeoutError
+
+    _OUTAGE_ERRORS: Tuple[type, ...] = (
+        OSError,
+        asyncio.TimeoutError,
+        _RedisConnectionError,
+        _RedisTimeoutError,
+    )
+except ImportError:
+    _OUTAGE_ERRORS = (OSError, asyncio.TimeoutError)
+
+# get_or_set: poll interval while another process holds the refresh lock
+LOCK_POLL_INTERVAL = 0.05
+
+# Marker key of stale-while-revalidate envelopes ({"__swr__": fresh_until, "value": ...})
+_SWR_FIELD = "__swr__"
+
 
 class CacheKey(str, Enum):
     """Cache key prefixes"""
@@ -44,6 +143,31 @@ class CacheKey(str, Enum):
     VIDEO_QUEUE_STATS = "stats:video_queue"
     SYSTEM_STATS = "stats:system"
     RATE_LIMIT = "ratelimit"
+    QUERY = "query"
+    QUERY_TAG = "query:tag"
+
+
+# Longest first, so "query:tag:x" is labelled query:tag rather than query
+_KEY_PREFIXES = sorted((k.value for k in CacheKey), key=len, reverse=True)
+
+# Upper bounds (seconds) of the TTL histogram in keyspace summaries
+_TTL_BUCKETS = ((10, "<10s"), (60, "<1m"), (300, "<5m"), (3600, "<1h"))
+
+# (key, approximate size in bytes, remaining TTL in seconds or None if persistent)
+KeySample = Tuple[str, Optional[int], Optional[float]]
+
+
+def key_prefix(key: str) -> str:
+    """
+    Metric label of a cache key
+
+    The longest CacheKey prefix the key starts with, otherwise its first segment
+    (keeps label cardinality bounded for ad-hoc keys like "custom:<id>").
+    """
+    for prefix in _KEY_PREFIXES:
+        if key.startswith(prefix) and (len(key) == len(prefix) or key[len(prefix)] == ":"):
+            return prefix
+    return key.split(":", 1)[0]
 
 
 class CacheBackend:
@@ -64,15 +188,215 @@ class CacheBackend:
     async def incr(self, key: str, ttl: int = 60) -> int:
         raise NotImplementedError
 
+    # Bulk operations: one round trip on backends that support it.
+    # The defaults below fall back to one call per key.
+
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """Values in key order (None for missing keys)"""
+        return [await self.get(key) for key in keys]
+
+    async def set_many(self, items: Dict[str, Any], ttl: int = 60) -> bool:
+        results = [await self.set(key, value, ttl) for key, value in items.items()]
+        return all(results)
+
+    async def delete_many(self, keys: List[str]) -> bool:
+        results = [await self.delete(key) for key in keys]
+        return all(results)
+
+    async def incr_many(self, keys: List[str], ttl: int = 60) -> List[int]:
+        """Counters in key order"""
+        return [await self.incr(key, ttl) for key in keys]
+
+    # Cross-process lock used by Cache.get_or_set(lock_ttl=...).
+    # Process-local backends have nothing to coordinate with: the lock always succeeds.
+
+    async def acquire_lock(self, key: str, ttl: float) -> Optional[str]:
+        """Try to take a lock; returns a release token, or None if held elsewhere"""
+        return uuid.uuid4().hex
+
+    async def release_lock(self, key: str, token: str) -> None:
+        pass
+
+    async def sample_keys(self, limit: int = 1000) -> Tuple[List[KeySample], Optional[int]]:
+        """
+        Sample of stored keys for keyspace summaries
+
+        Returns:
+            (up to limit samples, total key count or None if unknown)
+        """
+        return [], None
+
     async def close(self):
         pass
 
 
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker around a remote cache backend
+
+    - closed: calls go through; failure_threshold outage errors in a row open it
+    - open: callers are refused without touching the network (they serve their
+      degraded path), and probe() runs every probe_interval seconds in the background
+    - the first successful probe closes it again
+
+    Only outage errors (connection refused/reset, timeouts) should be recorded:
+    a WRONGTYPE reply or an undecodable value says nothing about availability.
+
+    Args:
+        name: backend label of the cache_circuit_* metrics
+        probe: async callable that raises while the backend is down (e.g. PING)
+        failure_threshold: consecutive failures that open the circuit
+        probe_interval: seconds between background probes while open
+    """
+
+    def __init__(
+        self,
+        name: str,
+        probe: Callable[[], Awaitable[Any]],
+        failure_threshold: int = CACHE_BREAKER_FAILURES,
+        probe_interval: float = CACHE_BREAKER_PROBE_INTERVAL,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.state = "closed"
+        self.failures = 0
+        self._probe = probe
+        self._listeners: List[Callable[[str], None]] = []
+        self._probe_handle: Optional[asyncio.TimerHandle] = None
+        self._probe_task: Optional[asyncio.Task] = None
+        self._probe_loop: Optional[asyncio.AbstractEventLoop] = None
+        cache_circuit_state.labels(backend=name).set(0)
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == "open"
+
+    def add_listener(self, callback: Callable[[str], None]) -> None:
+        """Call callback(state) on every transition"""
+        self._listeners.append(callback)
+
+    def allow(self) -> bool:
+        """Whether a call may go to the backend (counts the refusals)"""
+        if self.state == "open":
+            cache_circuit_rejected_total.labels(backend=self.name).inc()
+            self._ensure_probe()
+            return False
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+
+    def record_failure(self, reason: str = "") -> None:
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.trip(reason)
+
+    def trip(self, reason: str = "") -> None:
+        """Open the circuit now (no-op if already open)"""
+        if self.state == "open":
+            return
+        logger.error(
+            f"Cache circuit '{self.name}' open after {self.failures} failure(s) ({reason}); "
+            "serving from process memory"
+        )
+        self._transition("open")
+        self._schedule_probe()
+
+    def close(self) -> None:
+        """Stop background probing (the state is left as is)"""
+        if self._probe_handle is not None:
+            self._probe_handle.cancel()
+            self._probe_handle = None
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            self._probe_task = None
+        self._probe_loop = None
+
+    def _transition(self, state: str) -> None:
+        self.state = state
+        cache_circuit_state.labels(backend=self.name).set(1 if state == "open" else 0)
+        cache_circuit_transitions_total.labels(backend=self.name, state=state).inc()
+        for callback in self._listeners:
+            try:
+                callback(state)
+            except Exception as e:
+                logger.warning(f"Cache circuit listener failed: {e}")
+
+    def _ensure_probe(self) -> None:
+        # The loop that scheduled the probe may be gone (tests, a restarted worker loop)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._probe_loop is not loop:
+            self.close()
+            self._schedule_probe()
+
+    def _schedule_probe(self) -> None:
+        # Timer callback, like MemoryBackend's sweep: nothing pending when a loop closes
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._probe_loop = loop
+        self._probe_handle = loop.call_later(self.probe_interval, self._start_probe, loop)
+
+    def _start_probe(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._probe_handle = None
+        self._probe_task = loop.create_task(self._run_probe())
+
+    async def _run_probe(self) -> None:
+        try:
+            await self._probe()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"Cache circuit '{self.name}' probe failed: {e}")
+            self._schedule_probe()
+            return
+        finally:
+            self._probe_task = None
+
+        self.failures = 0
+        logger.info(f"Cache circuit '{self.name}' closed: backend reachable again")
+        self._transition("closed")
+
+
 class RedisBackend(CacheBackend):
-    """Redis cache backend using aioredis"""
+    """
+    Redis cache backend using aioredis
+
+    The connection is binary (decode_responses=False): values go through the codec
+    (orjson/msgpack, optional zstd/lz4) instead of JSON text.
+
+    Every command runs through a circuit breaker with a per-command timeout. After
+    CACHE_BREAKER_FAILURES consecutive outage errors the circuit opens: calls are
+    answered by a process-local MemoryBackend (degraded mode) without waiting on the
+    network, a background PING probes Redis, and the first successful probe switches
+    back (the degraded entries are dropped, Redis is the source of truth again).
+
+    Args:
+        url: Redis URL
+        codec: Value codec (default get_codec(), configured from the environment)
+        timeout: Seconds per command (and per connection attempt)
+        breaker: Circuit breaker (default one probing this backend with PING)
+    """
 
-    def __init__(self, url: str = "redis://localhost:6379"):
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379",
+        codec: Optional[CacheCodec] = None,
+        timeout: float = CACHE_REDIS_TIMEOUT,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
         self.url = url
+        self.codec = codec or get_codec()
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker("redis", self.ping)
+        self.breaker.add_listener(self._on_circuit_change)
+        # Degraded mode store while the circuit is open
+        self.degraded = MemoryBackend(name="degraded")
         self._redis = None
         self._lock = asyncio.Lock()
 
@@ -83,125 +407,841 @@ class RedisBackend(CacheBackend):
                     try:
                         import redis.asyncio as aioredis
 
+                        # Only the connect timeout here: the pub/sub connection idles in
+                        # listen(), so command timeouts are applied per call in _run()
                         self._redis = await aioredis.from_url(
-                            self.url,
-                            encoding="utf-8",
-                            decode_responses=True,
+                            self.url, decode_responses=False, socket_connect_timeout=self.timeout
                         )
-                        logger.info(f"Redis connected: {self.url}")
+                        logger.info(f"Redis connected: {self.url} (codec {self.codec.name})")
                     except ImportError:
                         logger.warning("redis package not installed, falling back to memory cache")
                         raise
         return self._redis
 
-    async def get(self, key: str) -> Optional[Any]:
-        try:
-            client = await self._get_client()
-            value = await client.get(key)
-            if value:
-                return json.loads(value)
-            return None
-        except Exception as e:
-            logger.warning(f"Redis GET failed: {e}")
-            return None
+    async def ping(self) -> None:
+        """Round trip to Redis (raises if unreachable)"""
+        client = await self._get_client()
+        await asyncio.wait_for(client.ping(), self.timeout)
 
-    async def set(self, key: str, value: Any, ttl: int = 60) -> bool:
+    async def check(self) -> bool:
+        """PING now; an unreachable server opens the circuit right away"""
         try:
-            client = await self._get_client()
-            serialized = json.dumps(value, default=str)
-            await client.setex(key, ttl, serialized)
+            await self.ping()
             return True
+        except ImportError:
+            raise
         except Exception as e:
-            logger.warning(f"Redis SET failed: {e}")
+            cache_backend_errors_total.labels(backend="redis", op="ping").inc()
+            self.breaker.trip(str(e) or type(e).__name__)
             return False
 
-    async def delete(self, key: str) -> bool:
+    async def _run(
+        self,
+        op: str,
+        command: Callable[[Any], Awaitable[Any]],
+        degraded: Callable[[], Awaitable[Any]],
+        default: Any,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        Run command(client) through the circuit breaker
+
+        Open circuit: degraded() answers from process memory, no network wait.
+        Failure: counted (outage errors also count toward opening), default returned.
+        timeout overrides the per-command timeout for multi-round-trip commands.
+        """
+        if not self.breaker.allow():
+            return await degraded()
         try:
             client = await self._get_client()
+            result = await asyncio.wait_for(command(client), timeout or self.timeout)
+        except Exception as e:
+            self._failed(op, e)
+            return default
+        self.breaker.record_success()
+        return result
+
+    async def get(self, key: str) -> Optional[Any]:
+        async def command(client):
+            value = await client.get(key)
+            return self.codec.loads(value) if value else None
+
+        return await self._run("get", command, lambda: self.degraded.get(key), None)
+
+    async def set(self, key: str, value: Any, ttl: int = 60) -> bool:
+        async def command(client):
+            await client.setex(key, ttl, self.codec.dumps(value))
+            return True
+
+        return await self._run("set", command, lambda: self.degraded.set(key, value, ttl), False)
+
+    async def delete(self, key: str) -> bool:
+        async def command(client):
             await client.delete(key)
             return True
-        except Exception as e:
-            logger.warning(f"Redis DELETE failed: {e}")
-            return False
+
+        return await self._run("delete", command, lambda: self.degraded.delete(key), False)
 
     async def exists(self, key: str) -> bool:
-        try:
-            client = await self._get_client()
+        async def command(client):
             return await client.exists(key) > 0
-        except Exception as e:
-            logger.warning(f"Redis EXISTS failed: {e}")
-            return False
+
+        return await self._run("exists", command, lambda: self.degraded.exists(key), False)
 
     async def incr(self, key: str, ttl: int = 60) -> int:
-        try:
-            client = await self._get_client()
+        async def command(client):
             pipe = client.pipeline()
             pipe.incr(key)
             pipe.expire(key, ttl)
             results = await pipe.execute()
             return results[0]
+
+        return await self._run("incr", command, lambda: self.degraded.incr(key, ttl), 0)
+
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        if not keys:
+            return []
+
+        async def command(client):
+            values = await client.mget(keys)
+            return [self.codec.loads(value) if value else None for value in values]
+
+        return await self._run(
+            "get_many", command, lambda: self.degraded.get_many(keys), [None] * len(keys)
+        )
+
+    async def set_many(self, items: Dict[str, Any], ttl: int = 60) -> bool:
+        if not items:
+            return True
+
+        async def command(client):
+            # SETEX per key in one pipeline (MSET has no TTL); no MULTI needed
+            pipe = client.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.setex(key, ttl, self.codec.dumps(value))
+            await pipe.execute()
+            return True
+
+        return await self._run(
+            "set_many", command, lambda: self.degraded.set_many(items, ttl), False
+        )
+
+    async def delete_many(self, keys: List[str]) -> bool:
+        if not keys:
+            return True
+
+        async def command(client):
+            await client.delete(*keys)
+            return True
+
+        return await self._run(
+            "delete_many", command, lambda: self.degraded.delete_many(keys), False
+        )
+
+    async def incr_many(self, keys: List[str], ttl: int = 60) -> List[int]:
+        if not keys:
+            return []
+
+        async def command(client):
+            pipe = client.pipeline()
+            for key in keys:
+                pipe.incr(key)
+                pipe.expire(key, ttl)
+            results = await pipe.execute()
+            return list(results[::2])
+
+        return await self._run(
+            "incr_many", command, lambda: self.degraded.incr_many(keys, ttl), [0] * len(keys)
+        )
+
+    # Delete the lock only if it still holds our token (it may have expired and been
+    # taken by another process in the meantime)
+    _RELEASE_SCRIPT = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('del', KEYS[1])
+    end
+    return 0
+    """
+
+    async def acquire_lock(self, key: str, ttl: float) -> Optional[str]:
+        token = uuid.uuid4().hex
+
+        async def command(client):
+            acquired = await client.set(f"lock:{key}", token, nx=True, px=max(1, int(ttl * 1000)))
+            return token if acquired else None
+
+        # Fail open (and no cross-process lock in degraded mode): a duplicate
+        # computation is better than no computation
+        return await self._run("lock", command, lambda: self.degraded.acquire_lock(key, ttl), token)
+
+    async def release_lock(self, key: str, token: str) -> None:
+        async def command(client):
+            await client.eval(self._RELEASE_SCRIPT, 1, f"lock:{key}", token)
+
+        await self._run("unlock", command, lambda: self.degraded.release_lock(key, token), None)
+
+    async def evalsha(self, sha: str, numkeys: int, *args: Any) -> Any:
+        """EVALSHA through the circuit breaker (raises instead of answering from memory)"""
+        return await self._script("evalsha", sha, numkeys, *args)
+
+    async def eval(self, script: str, numkeys: int, *args: Any) -> Any:
+        """EVAL through the circuit breaker (raises instead of answering from memory)"""
+        return await self._script("eval", script, numkeys, *args)
+
+    async def _script(self, op: str, *args: Any) -> Any:
+        # For shared.rate_limit: the limiter catches the error and decides in process
+        # memory, so an open circuit or a hung Redis never holds a request
+        if not self.breaker.allow():
+            raise ConnectionError("Redis circuit open")
+        try:
+            client = await self._get_client()
+            result = await asyncio.wait_for(getattr(client, op)(*args), self.timeout)
         except Exception as e:
-            logger.warning(f"Redis INCR failed: {e}")
-            return 0
+            # NOSCRIPT is the normal first call (the limiter retries with EVAL)
+            if "NOSCRIPT" not in str(e):
+                self._failed(op, e)
+            raise
+        self.breaker.record_success()
+        return result
+
+    async def sample_keys(self, limit: int = 1000) -> Tuple[List[KeySample], Optional[int]]:
+        """
+        SCAN up to limit keys, then MEMORY USAGE + PTTL for each in one pipeline
+
+        The whole sample is capped at CACHE_SAMPLE_TIMEOUT: SCAN stops at half the budget
+        (a smaller sample) so the pipeline and DBSIZE still fit in the rest.
+        """
+        budget = max(CACHE_SAMPLE_TIMEOUT, self.timeout)
+
+        async def command(client):
+            keys = []
+            deadline = time.monotonic() + budget / 2
+            cursor = 0
+            # SCAN walks the hash table in slot order: an unbiased enough sample by prefix
+            while len(keys) < limit and time.monotonic() < deadline:
+                cursor, batch = await client.scan(cursor, count=min(limit, 1000))
+                keys.extend(batch[: limit - len(keys)])
+                if not cursor:
+                    break
+            results = []
+            if keys:
+                pipe = client.pipeline(transaction=False)
+                for key in keys:
+                    pipe.memory_usage(key)
+                    pipe.pttl(key)
+                results = await pipe.execute()
+            total = await client.dbsize()
+
+            samples = []
+            for i, key in enumerate(keys):
+                size, pttl = results[2 * i], results[2 * i + 1]
+                if pttl == -2:
+                    continue  # expired between SCAN and PTTL
+                name = key.decode(errors="replace") if isinstance(key, bytes) else key
+                samples.append((name, size, pttl / 1000 if pttl >= 0 else None))
+            return samples, total
+
+        return await self._run(
+            "sample", command, lambda: self.degraded.sample_keys(limit), ([], None), timeout=budget
+        )
+
+    def _failed(self, op: str, error: Exception) -> None:
+        cache_backend_errors_total.labels(backend="redis", op=op).inc()
+        if isinstance(error, _OUTAGE_ERRORS):
+            self.breaker.record_failure(f"{op}: {error!r}")
+        logger.warning(f"Redis {op} failed: {error!r}")
+
+    def _on_circuit_change(self, state: str) -> None:
+        if state == "closed":
+            # Writes made while degraded never reached Redis: do not serve them anymore
+            self.degraded.clear()
 
     async def close(self):
+        self.breaker.close()
+        await self.degraded.close()
         if self._redis:
             await self._redis.close()
             self._redis = None
 
 
+class _Entry:
+    """Memory cache entry (slots keep per-key overhead low at 1M keys)"""
+
+    __slots__ = ("value", "expires_at", "size")
+
+    def __init__(self, value: Any, expires_at: float, size: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+
+
+def _estimate_size(key: str, value: Any) -> int:
+    """Approximate entry size in bytes (serialized length, as stored in Redis)"""
+    if isinstance(value, (str, bytes)):
+        return len(key) + len(value)
+    if isinstance(value, (int, float, bool)) or value is None:
+        return len(key) + 8
+    return len(key) + len(json.dumps(value, default=str))
+
+
 class MemoryBackend(CacheBackend):
-    """In-memory cache backend (fallback when Redis unavailable)"""
+    """
+    In-memory cache backend (fallback when Redis unavailable)
+
+    - LRU order in an OrderedDict: get/set/evict are O(1)
+    - Expiry min-heap of (expires_at, key): expired keys are purged in
+      O(log n) each, both on write and by a periodic sweep on the event loop
+    - Monotonic clock, so wall-clock jumps (NTP) do not expire or revive keys
+    - Optional byte budget (max_bytes) on top of the key count (max_size)
+    - No lock: every operation runs without awaiting, so it is atomic on the loop
+
+    Args:
+        max_size: Maximum number of keys
+        max_bytes: Maximum approximate total size in bytes (None = unlimited)
+        sweep_interval: Seconds between background sweeps (0 = no background sweep)
+        clock: Time source in seconds (tests inject a fake clock)
+        name: backend label of cache_evictions_total ("l1" inside TieredBackend)
+    """
+
+    # Upper bound of expired keys removed per sweep tick (keeps each tick short)
+    SWEEP_BATCH = 1000
 
-    def __init__(self, max_size: int = 10000):
-        self._cache: Dict[str, Dict[str, Any]] = {}
+    def __init__(
+        self,
+        max_size: int = MEMORY_CACHE_MAX_SIZE,
+        max_bytes: Optional[int] = MEMORY_CACHE_MAX_BYTES,
+        sweep_interval: float = MEMORY_CACHE_SWEEP_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+        name: str = "memory",
+    ):
+        self.name = name
+        self._cache: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._expiry: List[Tuple[float, str]] = []
         self._max_size = max_size
-        self._lock = asyncio.Lock()
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._clock = clock
+        self._sweep_interval = sweep_interval
+        self._sweep_handle: Optional[asyncio.TimerHandle] = None
+        self._sweep_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @property
+    def size_bytes(self) -> int:
+        """Approximate total size of stored entries"""
+        return self._bytes
 
     async def get(self, key: str) -> Optional[Any]:
-        async with self._lock:
-            entry = self._cache.get(key)
-            if entry:
-                if entry["expires_at"] > datetime.now(timezone.utc).timestamp():
-                    return entry["value"]
-                else:
-                    del self._cache[key]
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= self._clock():
+            self._remove(key)
+            self._count_evictions({key_prefix(key): 1}, "expired")
             return None
+        self._cache.move_to_end(key)
+        return entry.value
 
     async def set(self, key: str, value: Any, ttl: int = 60) -> bool:
-        async with self._lock:
-            # Evict oldest entries if at capacity
-            if len(self._cache) >= self._max_size:
-                oldest_key = min(self._cache.keys(), key=lambda k: self._cache[k]["expires_at"])
-                del self._cache[oldest_key]
-
-            self._cache[key] = {
-                "value": value,
-                "expires_at": datetime.now(timezone.utc).timestamp() + ttl,
-            }
-            return True
+        self._store(key, value, self._clock() + ttl)
+        return True
 
     async def delete(self, key: str) -> bool:
-        async with self._lock:
-            if key in self._cache:
-                del self._cache[key]
-            return True
+        self._remove(key)
+        return True
 
     async def exists(self, key: str) -> bool:
         return await self.get(key) is not None
 
     async def incr(self, key: str, ttl: int = 60) -> int:
-        async with self._lock:
+        now = self._clock()
+        entry = self._cache.get(key)
+        if entry is not None and entry.expires_at > now:
+            # Keep the window's original expiry (fixed-window counter)
+            count = int(entry.value) + 1
+            self._store(key, count, entry.expires_at)
+            return count
+
+        self._store(key, 1, now + ttl)
+        return 1
+
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        return [await self.get(key) for key in keys]
+
+    async def set_many(self, items: Dict[str, Any], ttl: int = 60) -> bool:
+        expires_at = self._clock() + ttl
+        for key, value in items.items():
+            self._store(key, value, expires_at)
+        return True
+
+    async def delete_many(self, keys: List[str]) -> bool:
+        for key in keys:
+            self._remove(key)
+        return True
+
+    async def incr_many(self, keys: List[str], ttl: int = 60) -> List[int]:
+        return [await self.incr(key, ttl) for key in keys]
+
+    def discard(self, key: str) -> bool:
+        """Remove a key, returning whether it was present"""
+        present = key in self._cache
+        self._remove(key)
+        return present
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self._expiry.clear()
+        self._bytes = 0
+
+    def sweep(self, limit: Optional[int] = None) -> int:
+        """
+        Remove expired keys from the head of the expiry heap
+
+        Args:
+            limit: Maximum number of heap entries to inspect (None = all expired)
+
+        Returns:
+            Number of keys removed
+        """
+        now = self._clock()
+        removed = 0
+        inspected = 0
+        expired: Dict[str, int] = {}
+        while self._expiry and self._expiry[0][0] <= now:
+            if limit is not None and inspected >= limit:
+                break
+            expires_at, key = heapq.heappop(self._expiry)
+            inspected += 1
             entry = self._cache.get(key)
-            if entry and entry["expires_at"] > datetime.now(timezone.utc).timestamp():
-                entry["value"] = int(entry["value"]) + 1
-                return entry["value"]
-            else:
-                self._cache[key] = {
-                    "value": 1,
-                    "expires_at": datetime.now(timezone.utc).timestamp() + ttl,
-                }
-                return 1
+            # Heap items are not updated on overwrite; skip those that no longer match
+            if entry is not None and entry.expires_at == expires_at:
+                self._remove(key)
+                removed += 1
+                prefix = key_prefix(key)
+                expired[prefix] = expired.get(prefix, 0) + 1
+        self._count_evictions(expired, "expired")
+        return removed
+
+    async def sample_keys(self, limit: int = 1000) -> Tuple[List[KeySample], Optional[int]]:
+        now = self._clock()
+        keys = list(self._cache)
+        if len(keys) > limit:
+            keys = random.sample(keys, limit)
+
+        samples = []
+        for key in keys:
+            entry = self._cache[key]
+            if entry.expires_at <= now:
+                continue
+            size = entry.size or _estimate_size(key, entry.value)
+            samples.append((key, size, entry.expires_at - now))
+        return samples, len(self._cache)
+
+    async def close(self):
+        if self._sweep_handle is not None:
+            self._sweep_handle.cancel()
+            self._sweep_handle = None
+        self._sweep_loop = None
+
+    # ---------- internals ----------
+
+    def _store(self, key: str, value: Any, expires_at: float) -> None:
+        size = _estimate_size(key, value) if self._max_bytes is not None else 0
+
+        old = self._cache.get(key)
+        if old is not None:
+            self._bytes -= old.size
+
+        self._cache[key] = _Entry(value, expires_at, size)
+        self._cache.move_to_end(key)
+        self._bytes += size
+
+        if old is None or old.expires_at != expires_at:
+            heapq.heappush(self._expiry, (expires_at, key))
+            if len(self._expiry) > 2 * len(self._cache) + 64:
+                self._compact_expiry()
+
+        self._evict()
+        self._schedule_sweep()
+
+    def _remove(self, key: str) -> None:
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _evict(self) -> None:
+        """Drop expired keys first, then least recently used keys until within limits"""
+        if not self._over_limit():
+            return
+
+        self.sweep()
+        evicted: Dict[str, int] = {}
+        while self._cache and self._over_limit():
+            key, entry = self._cache.popitem(last=False)
+            self._bytes -= entry.size
+            prefix = key_prefix(key)
+            evicted[prefix] = evicted.get(prefix, 0) + 1
+        self._count_evictions(evicted, "lru")
+
+    def _count_evictions(self, counts: Dict[str, int], reason: str) -> None:
+        # Aggregated per prefix: one label lookup per sweep instead of one per key
+        for prefix, count in counts.items():
+            cache_evictions_total.labels(backend=self.name, prefix=prefix, reason=reason).inc(count)
+
+    def _over_limit(self) -> bool:
+        return len(self._cache) > self._max_size or (
+            self._max_bytes is not None and self._bytes > self._max_bytes
+        )
+
+    def _compact_expiry(self) -> None:
+        """Rebuild the heap from live entries (bounds growth from repeated overwrites)"""
+        self._expiry = [(entry.expires_at, key) for key, entry in self._cache.items()]
+        heapq.heapify(self._expiry)
+
+    def _schedule_sweep(self) -> None:
+        # Timer callback instead of a task: nothing is left pending when a loop closes
+        if self._sweep_interval <= 0:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._sweep_handle is not None and self._sweep_loop is loop:
+            return
+
+        self._sweep_loop = loop
+        self._sweep_handle = loop.call_later(self._sweep_interval, self._sweep_tick)
+
+    def _sweep_tick(self) -> None:
+        self._sweep_handle = None
+        self.sweep(limit=self.SWEEP_BATCH)
+        if self._cache:
+            self._schedule_sweep()
+        else:
+            self._sweep_loop = None
+
+
+class TieredBackend(CacheBackend):
+    """
+    Two-tier cache: per-process L1 (MemoryBackend) in front of a shared L2 (Redis)
+
+    - Reads are served from L1 when present, otherwise from L2 (and copied into L1)
+    - L1 entries live at most l1_ttl seconds, so a missed invalidation is bounded
+    - set/delete are published on a Redis channel; peer processes drop their L1 copy
+      (messages from this process are ignored by origin id)
+    - incr goes straight to L2 (counters must be shared) and only drops the local L1 copy;
+      incr_many (version bumps such as query-cache tags) is also published
+    - L1/L2 hit ratios are exported as cache_requests_total{tier, result} and stats()
+
+    Args:
+        l2: Shared backend (RedisBackend)
+        l1_max_size: Maximum number of L1 keys
+        l1_ttl: Maximum L1 lifetime in seconds
+        channel: Redis pub/sub channel for invalidation
+    """
+
+    def __init__(
+        self,
+        l2: RedisBackend,
+        l1_max_size: int = L1_CACHE_MAX_SIZE,
+        l1_ttl: float = L1_CACHE_TTL,
+        channel: str = CACHE_INVALIDATION_CHANNEL,
+    ):
+        self.l1 = MemoryBackend(max_size=l1_max_size, name="l1")
+        self.l2 = l2
+        # Entries copied from either side of a circuit transition must not outlive it
+        l2.breaker.add_listener(lambda state: self.l1.clear())
+        self.l1_ttl = l1_ttl
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self._subscriber: Optional[asyncio.Task] = None
+        self._hits = {"l1": 0, "l2": 0}
+        self._misses = {"l1": 0, "l2": 0}
+
+    async def get(self, key: str) -> Optional[Any]:
+        self._ensure_subscriber()
+
+        value = await self.l1.get(key)
+        if value is not None:
+            self._record("l1", hit=True)
+            return value
+        self._record("l1", hit=False)
+
+        value = await self.l2.get(key)
+        self._record("l2", hit=value is not None)
+        if value is not None:
+            await self.l1.set(key, value, ttl=self.l1_ttl)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: int = 60) -> bool:
+        self._ensure_subscriber()
+        ok = await self.l2.set(key, value, ttl)
+        if ok:
+            await self.l1.set(key, value, ttl=min(ttl, self.l1_ttl))
+        else:
+            await self.l1.delete(key)
+        await self._publish(key)
+        return ok
+
+    async def delete(self, key: str) -> bool:
+        self._ensure_subscriber()
+        await self.l1.delete(key)
+        ok = await self.l2.delete(key)
+        await self._publish(key)
+        return ok
+
+    async def exists(self, key: str) -> bool:
+        return await self.get(key) is not None
+
+    async def incr(self, key: str, ttl: int = 60) -> int:
+        # Counters change on every request: broadcasting each one would cost more than
+        # the bounded staleness of a peer's L1 copy (at most l1_ttl)
+        await self.l1.delete(key)
+        return await self.l2.incr(key, ttl)
+
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        self._ensure_subscriber()
+
+        values = await self.l1.get_many(keys)
+        missing = [key for key, value in zip(keys, values) if value is None]
+        self._record("l1", hit=True, count=len(keys) - len(missing))
+        self._record("l1", hit=False, count=len(missing))
+        if not missing:
+            return values
+
+        # Only L1 misses go to Redis, in a single MGET
+        fetched = dict(zip(missing, await self.l2.get_many(missing)))
+        found = {key: value for key, value in fetched.items() if value is not None}
+        self._record("l2", hit=True, count=len(found))
+        self._record("l2", hit=False, count=len(missing) - len(found))
+        await self.l1.set_many(found, ttl=self.l1_ttl)
+
+        return [value if value is not None else found.get(key) for key, value in zip(keys, values)]
+
+    async def set_many(self, items: Dict[str, Any], ttl: int = 60) -> bool:
+        self._ensure_subscriber()
+        ok = await self.l2.set_many(items, ttl)
+        if ok:
+            await self.l1.set_many(items, ttl=min(ttl, self.l1_ttl))
+        else:
+            await self.l1.delete_many(list(items))
+        await self._publish(*items)
+        return ok
+
+    async def delete_many(self, keys: List[str]) -> bool:
+        self._ensure_subscriber()
+        await self.l1.delete_many(keys)
+        ok = await self.l2.delete_many(keys)
+        await self._publish(*keys)
+        return ok
+
+    async def incr_many(self, keys: List[str], ttl: int = 60) -> List[int]:
+        # Batched bumps are version counters (query-cache tags): a peer serving its L1
+        # copy would keep returning entries that were just invalidated
+        self._ensure_subscriber()
+        await self.l1.delete_many(keys)
+        counts = await self.l2.incr_many(keys, ttl)
+        await self._publish(*keys)
+        return counts
+
+    async def acquire_lock(self, key: str, ttl: float) -> Optional[str]:
+        return await self.l2.acquire_lock(key, ttl)
+
+    async def release_lock(self, key: str, token: str) -> None:
+        await self.l2.release_lock(key, token)
+
+    async def sample_keys(self, limit: int = 1000) -> Tuple[List[KeySample], Optional[int]]:
+        # L1 only holds short-lived copies of L2 keys
+        return await self.l2.sample_keys(limit)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counts and hit ratio per tier for this process"""
+        result = {}
+        for tier in ("l1", "l2"):
+            total = self._hits[tier] + self._misses[tier]
+            result[tier] = {
+                "hits": self._hits[tier],
+                "misses": self._misses[tier],
+                "hit_ratio": round(self._hits[tier] / total, 4) if total else 0.0,
+            }
+        result["l1"]["keys"] = len(self.l1)
+        return result
+
+    async def close(self):
+        if self._subscriber is not None:
+            self._subscriber.cancel()
+            try:
+                await self._subscriber
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._subscriber = None
+        await self.l1.close()
+        await self.l2.close()
+
+    # ---------- invalidation ----------
+
+    def _record(self, tier: str, hit: bool, count: int = 1) -> None:
+        if count <= 0:
+            return
+        if hit:
+            self._hits[tier] += count
+        else:
+            self._misses[tier] += count
+        cache_requests_total.labels(tier=tier, result="hit" if hit else "miss").inc(count)
+
+    async def _publish(self, *keys: str) -> None:
+        """One message per write call, listing every key it touched"""
+        if not keys or self.l2.breaker.is_open:
+            # Degraded mode: peers cannot be reached either, and L1 is cleared on recovery
+            return
+        try:
+            client = await self.l2._get_client()
+            message = json.dumps({"origin": self.origin, "keys": list(keys)})
+            await client.publish(self.channel, message)
+        except Exception as e:
+            cache_backend_errors_total.labels(backend="redis", op="publish").inc()
+            logger.warning(f"Cache invalidation publish failed: {e}")
+
+    def handle_invalidation(self, message: Union[str, bytes]) -> bool:
+        """
+        Apply an invalidation message from the channel
+
+        Returns:
+            True if at least one local L1 key was dropped
+        """
+        try:
+            payload = json.loads(message)
+        except (TypeError, ValueError):
+            return False
+        if not isinstance(payload, dict) or payload.get("origin") == self.origin:
+            return False
+
+        dropped = sum(1 for key in payload.get("keys") or [] if self.l1.discard(key))
+        if dropped:
+            cache_invalidations_received_total.inc(dropped)
+        return dropped > 0
+
+    def _ensure_subscriber(self) -> None:
+        if self._subscriber is not None and not self._subscriber.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._subscriber = loop.create_task(self._subscribe())
+
+    async def _subscribe(self) -> None:
+        """Listen for invalidations, reconnecting with backoff (L1 TTL bounds staleness meanwhile)"""
+        delay = 1.0
+        while True:
+            if self.l2.breaker.is_open:
+                self.l1.clear()
+                await asyncio.sleep(self.l2.breaker.probe_interval)
+                continue
+
+            pubsub = None
+            try:
+                client = await self.l2._get_client()
+                pubsub = client.pubsub()
+                await pubsub.subscribe(self.channel)
+                delay = 1.0
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self.handle_invalidation(message.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation subscriber error: {e}")
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+            # Drop everything that may have missed an invalidation while disconnected
+            self.l1.clear()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+
+def _percentile(ordered: List[int], fraction: float) -> int:
+    if not ordered:
+        return 0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _ttl_bucket(ttl: Optional[float]) -> str:
+    if ttl is None:
+        return "none"
+    for bound, label in _TTL_BUCKETS:
+        if ttl < bound:
+            return label
+    return ">=1h"
+
+
+def summarize_keyspace(
+    samples: List[KeySample], total_keys: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Per-prefix key counts, sizes and TTL distribution of a key sample
+
+    estimated_keys / estimated_bytes scale the sample up to total_keys, so a
+    prefix's share of the sample stands for its share of the whole key space.
+
+    Returns:
+        {"total_keys", "sampled", "prefixes": {prefix: {...}}} (largest prefix first)
+    """
+    groups: Dict[str, List[Tuple[Optional[int], Optional[float]]]] = {}
+    for key, size, ttl in samples:
+        groups.setdefault(key_prefix(key), []).append((size, ttl))
+
+    scale = total_keys / len(samples) if total_keys and samples else 1.0
+    prefixes = {}
+    for prefix, entries in sorted(groups.items(), key=lambda item: -len(item[1])):
+        sizes = sorted(size for size, _ in entries if size is not None)
+        avg = sum(sizes) / len(sizes) if sizes else 0.0
+        ttl = {label: 0 for _, label in _TTL_BUCKETS}
+        ttl.update({">=1h": 0, "none": 0})
+        for _, remaining in entries:
+            ttl[_ttl_bucket(remaining)] += 1
+
+        prefixes[prefix] = {
+            "sampled": len(entries),
+            "estimated_keys": round(len(entries) * scale),
+            "bytes": {
+                "avg": round(avg),
+                "p50": _percentile(sizes, 0.5),
+                "p95": _percentile(sizes, 0.95),
+                "max": sizes[-1] if sizes else 0,
+            },
+            "estimated_bytes": round(avg * len(entries) * scale),
+            "ttl": ttl,
+        }
+
+    return {"total_keys": total_keys, "sampled": len(samples), "prefixes": prefixes}
+
+
+def _backend_name(backend: Optional[CacheBackend]) -> str:
+    redis = backend.l2 if isinstance(backend, TieredBackend) else backend
+    if isinstance(redis, RedisBackend) and redis.breaker.is_open:
+        return "degraded"
+    if isinstance(backend, TieredBackend):
+        return "tiered"
+    if isinstance(backend, RedisBackend):
+        return "redis"
+    if isinstance(backend, MemoryBackend):
+        return "memory"
+    return type(backend).__name__.lower()
+
+
+def _unwrap(stored: Any) -> Optional[Any]:
+    """Value of a stale-while-revalidate envelope (None for anything else)"""
+    if isinstance(stored, dict) and _SWR_FIELD in stored:
+        return stored.get("value")
+    return None
 
 
 class Cache:
@@ -209,25 +1249,70 @@ class Cache:
     Unified cache interface with key prefix management
 
     Automatically falls back to memory cache if Redis unavailable.
+    Values stored in Redis are encoded with the codec (see shared.cache_codec).
     """
 
-    def __init__(self, backend: Optional[CacheBackend] = None):
+    def __init__(self, backend: Optional[CacheBackend] = None, codec: Optional[CacheCodec] = None):
         self._backend = backend
+        # Redis value codec (None = get_codec() from CACHE_CODEC / CACHE_COMPRESSION)
+        self.codec = codec
         self._initialized = False
+        # get_or_set single-flight: key -> (computation shared by concurrent callers,
+        # True if it is a background refresh that may give up without a value)
+        self._inflight: Dict[str, Tuple[asyncio.Task, bool]] = {}
 
     async def _ensure_backend(self):
         if not self._initialized:
             if self._backend is None:
                 redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
                 try:
-                    self._backend = RedisBackend(redis_url)
-                    # Test connection
-                    await self._backend._get_client()
-                    logger.info("Using Redis cache backend")
+                    redis_backend = RedisBackend(redis_url, codec=self.codec)
+                    # Test connection: unreachable opens the circuit (degraded until a probe
+                    # succeeds); only a missing redis package falls back to memory for good
+                    if not await redis_backend.check():
+                        logger.warning(f"Redis unreachable at {redis_url}, serving from memory")
+                    if L1_CACHE_ENABLED:
+                        self._backend = TieredBackend(redis_backend)
+                        logger.info("Using tiered cache backend (memory L1 + Redis L2)")
+                    else:
+                        self._backend = redis_backend
+                        logger.info("Using Redis cache backend")
                 except Exception as e:
-                    logger.warning(f"Redis unavailable ({e}), using memory cache")
+                    cache_backend_errors_total.labels(backend="redis", op="connect").inc()
+                    logger.warning(
+                        f"Redis unavailable ({e}), using memory cache "
+                        "(not shared between processes)"
+                    )
                     self._backend = MemoryBackend()
             self._initialized = True
+            self._set_active_backend()
+            redis = self._backend.l2 if isinstance(self._backend, TieredBackend) else self._backend
+            if isinstance(redis, RedisBackend):
+                redis.breaker.add_listener(lambda state: self._set_active_backend())
+
+    @property
+    def backend_name(self) -> str:
+        """Label of the backend in use (tiered, redis, memory, degraded)"""
+        return _backend_name(self._backend)
+
+    def _set_active_backend(self) -> None:
+        active = self.backend_name
+        for name in ("tiered", "redis", "memory", "degraded"):
+            cache_backend_active.labels(backend=name).set(1 if name == active else 0)
+
+    def _observe(
+        self, label: str, op: str, started: float, hits: int = 0, misses: int = 0, sets: int = 0
+    ) -> None:
+        """Record latency and hit/miss/set counts of one Cache API call"""
+        cache_operation_duration_seconds.labels(prefix=label, op=op).observe(
+            time.perf_counter() - started
+        )
+        if hits:
+            cache_hits_total.labels(prefix=label).inc(hits)
+        if misses:
+            cache_misses_total.labels(prefix=label).inc(misses)
+        if sets:
+            cache_sets_total.labels(prefix=label).inc(sets)
 
     def _make_key(self, prefix: Union[CacheKey, str], *parts: str) -> str:
         """Build cache key from prefix and parts"""
@@ -236,11 +1321,20 @@ class Cache:
             return f"{prefix_str}:{':'.join(str(p) for p in parts)}"
         return prefix_str
 
+    def _label(self, prefix: Union[CacheKey, str]) -> str:
+        """Metric label of a prefix argument"""
+        return prefix.value if isinstance(prefix, CacheKey) else key_prefix(str(prefix))
+
     async def get(self, prefix: Union[CacheKey, str], *key_parts: str) -> Optional[Any]:
         """Get value from cache"""
         await self._ensure_backend()
         key = self._make_key(prefix, *key_parts)
-        return await self._backend.get(key)
+        started = time.perf_counter()
+        value = await self._backend.get(key)
+        self._observe(
+            self._label(prefix), "get", started, hits=value is not None, misses=value is None
+        )
+        return value
 
     async def set(
         self,
@@ -266,7 +1360,10 @@ class Cache:
         key_parts = args[:-1]
         key = self._make_key(prefix, *key_parts)
 
-        return await self._backend.set(key, value, ttl)
+        started = time.perf_counter()
+        ok = await self._backend.set(key, value, ttl)
+        self._observe(self._label(prefix), "set", started, sets=1 if ok else 0)
+        return ok
 
     async def delete(self, prefix: Union[CacheKey, str], *key_parts: str) -> bool:
         """Delete value from cache"""
@@ -286,36 +1383,155 @@ class Cache:
         *args,
         ttl: int = 60,
         factory,
+        stale_ttl: int = 0,
+        lock_ttl: Optional[float] = None,
     ) -> Any:
         """
         Get from cache or compute and store
 
+        Concurrent misses on the same key in this process share one factory() call
+        (single-flight); the other callers await its result.
+
         Usage:
             data = await cache.get_or_set(
                 CacheKey.JOB_STATS,
                 ttl=30,
                 factory=lambda: compute_stats()
             )
+
+            # Serve the old value for up to 30s past ttl while one task refreshes it,
+            # and let only one process across the fleet run the factory
+            data = await cache.get_or_set(
+                CacheKey.SYSTEM_STATS, "oob", ttl=30, stale_ttl=30, lock_ttl=10,
+                factory=compute_stats,
+            )
+
+        Args:
+            ttl: Seconds the value is fresh
+            factory: Sync or async callable producing the value
+            stale_ttl: Extra seconds a value may be served stale (stale-while-revalidate).
+                Entries are stored wrapped with their soft expiry, so a key must always be
+                read with the same stale_ttl setting (0 = plain values, the default).
+            lock_ttl: Hold a Redis lock for at most this many seconds while computing.
+                Other processes that miss wait up to lock_ttl for the value instead of
+                running the factory themselves. None = process-local coalescing only.
         """
         await self._ensure_backend()
 
-        key_parts = args
-        key = self._make_key(prefix, *key_parts)
-
-        # Try cache first
-        value = await self._backend.get(key)
-        if value is not None:
-            return value
+        key = self._make_key(prefix, *args)
+        label = self._label(prefix)
+
+        started = time.perf_counter()
+        cached = await self._backend.get(key)
+        self._observe(label, "get", started, hits=cached is not None, misses=cached is None)
+        if cached is not None:
+            if not stale_ttl:
+                return cached
+            value = _unwrap(cached)
+            if value is not None:
+                if time.time() >= cached[_SWR_FIELD]:
+                    # Soft TTL passed: answer now, refresh once in the background
+                    cache_stale_served_total.labels(prefix=label).inc()
+                    self._single_flight(key, label, factory, ttl, stale_ttl, lock_ttl, False)
+                return value
+
+        # shield: a cancelled caller must not cancel the computation other callers share
+        task = self._single_flight(key, label, factory, ttl, stale_ttl, lock_ttl, True)
+        return await asyncio.shield(task)
+
+    def _single_flight(
+        self,
+        key: str,
+        label: str,
+        factory,
+        ttl: int,
+        stale_ttl: int,
+        lock_ttl: Optional[float],
+        wait_for_peer: bool,
+    ) -> asyncio.Task:
+        """Return the in-flight computation for key, starting one if there is none"""
+        task, refresh_only = self._inflight.get(key, (None, False))
+        if (
+            task is not None
+            and not task.done()
+            and task.get_loop() is asyncio.get_running_loop()
+            # A refresh returns the stored value (None after expiry) when a peer holds
+            # the lock: a caller that missed must wait for or run the factory itself
+            and not (wait_for_peer and refresh_only)
+        ):
+            cache_coalesced_requests_total.labels(prefix=label).inc()
+            return task
+
+        task = asyncio.ensure_future(
+            self._compute(key, label, factory, ttl, stale_ttl, lock_ttl, wait_for_peer)
+        )
+        self._inflight[key] = (task, not wait_for_peer)
+
+        def _done(finished: asyncio.Task) -> None:
+            if self._inflight.get(key, (None, False))[0] is finished:
+                del self._inflight[key]
+            # Background refreshes have no awaiter: consume the exception here
+            if not finished.cancelled() and finished.exception() and not wait_for_peer:
+                logger.warning(f"Cache refresh failed for {key}: {finished.exception()}")
+
+        task.add_done_callback(_done)
+        return task
+
+    async def _compute(
+        self,
+        key: str,
+        label: str,
+        factory,
+        ttl: int,
+        stale_ttl: int,
+        lock_ttl: Optional[float],
+        wait_for_peer: bool,
+    ) -> Any:
+        token = None
+        if lock_ttl:
+            token = await self._backend.acquire_lock(key, lock_ttl)
+            if token is None:
+                if not wait_for_peer:
+                    # Stale refresh: another process is already refreshing this key
+                    return _unwrap(await self._backend.get(key))
+                value = await self._wait_for_peer(key, lock_ttl, stale_ttl)
+                cache_lock_waits_total.labels(
+                    prefix=label, result="timeout" if value is None else "filled"
+                ).inc()
+                if value is not None:
+                    return value
 
-        # Compute value
-        if inspect.iscoroutinefunction(factory):
-            value = await factory()
-        else:
-            value = factory()
+        try:
+            if inspect.iscoroutinefunction(factory):
+                value = await factory()
+            else:
+                value = factory()
 
-        # Store in cache
-        await self._backend.set(key, value, ttl)
-        return value
+            started = time.perf_counter()
+            if stale_ttl:
+                stored = {_SWR_FIELD: time.time() + ttl, "value": value}
+                ok = await self._backend.set(key, stored, ttl + stale_ttl)
+            else:
+                ok = await self._backend.set(key, value, ttl)
+            self._observe(label, "set", started, sets=1 if ok else 0)
+            return value
+        finally:
+            if token is not None:
+                await self._backend.release_lock(key, token)
+
+    async def _wait_for_peer(self, key: str, timeout: float, stale_ttl: int) -> Optional[Any]:
+        """Poll until the lock holder stores the value (None on timeout)"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(LOCK_POLL_INTERVAL)
+            value = await self._backend.get(key)
+            if value is None:
+                continue
+            if not stale_ttl:
+                return value
+            if _unwrap(value) is not None:
+                return _unwrap(value)
+        return None
 
     async def incr(self, prefix: Union[CacheKey, str], *key_parts: str, ttl: int = 60) -> int:
         """Increment counter (for rate limiting)"""
@@ -323,6 +1539,78 @@ class Cache:
         key = self._make_key(prefix, *key_parts)
         return await self._backend.incr(key, ttl)
 
+    async def get_many(self, prefix: Union[CacheKey, str], ids: Iterable[str]) -> Dict[str, Any]:
+        """
+        Get several keys sharing a prefix in one round trip
+
+        Usage:
+            health = await cache.get_many(CacheKey.NODE_HEALTH, node_ids)
+
+        Returns:
+            {id: value} for the ids found in cache
+        """
+        await self._ensure_backend()
+        ids = list(ids)
+        started = time.perf_counter()
+        values = await self._backend.get_many([self._make_key(prefix, i) for i in ids])
+        found = {i: value for i, value in zip(ids, values) if value is not None}
+        self._observe(
+            self._label(prefix), "get_many", started, hits=len(found), misses=len(ids) - len(found)
+        )
+        return found
+
+    async def set_many(
+        self, prefix: Union[CacheKey, str], items: Dict[str, Any], ttl: int = 60
+    ) -> bool:
+        """Set several {id: value} pairs sharing a prefix and TTL in one round trip"""
+        await self._ensure_backend()
+        started = time.perf_counter()
+        ok = await self._backend.set_many(
+            {self._make_key(prefix, i): value for i, value in items.items()}, ttl
+        )
+        self._observe(self._label(prefix), "set_many", started, sets=len(items) if ok else 0)
+        return ok
+
+    async def delete_many(self, prefix: Union[CacheKey, str], ids: Iterable[str]) -> bool:
+        """Delete several keys sharing a prefix in one round trip"""
+        await self._ensure_backend()
+        return await self._backend.delete_many([self._make_key(prefix, i) for i in ids])
+
+    async def incr_many(
+        self, prefix: Union[CacheKey, str], ids: Iterable[str], ttl: int = 60
+    ) -> Dict[str, int]:
+        """Increment several counters sharing a prefix in one round trip"""
+        await self._ensure_backend()
+        ids = list(ids)
+        counts = await self._backend.incr_many([self._make_key(prefix, i) for i in ids], ttl)
+        return dict(zip(ids, counts))
+
+    async def keyspace(self, sample: int = 1000) -> Dict[str, Any]:
+        """
+        Sample up to `sample` keys and summarize them by prefix
+
+        Usage:
+            summary = await cache.keyspace(sample=2000)
+            summary["prefixes"]["node:health"]["ttl"]  # {"<10s": 3, "<1m": 41, ...}
+        """
+        await self._ensure_backend()
+        samples, total = await self._backend.sample_keys(sample)
+        summary = summarize_keyspace(samples, total)
+        summary["backend"] = self.backend_name
+        return summary
+
+    def backend_stats(self) -> Optional[Dict[str, Any]]:
+        """Per-tier hit/miss counts of the tiered backend (None for single-tier backends)"""
+        if isinstance(self._backend, TieredBackend):
+            return self._backend.stats()
+        return None
+
+    async def redis_backend(self) -> Optional["RedisBackend"]:
+        """Redis backend behind this cache (None when running on the memory backend)"""
+        await self._ensure_backend()
+        backend = self._backend.l2 if isinstance(self._backend, TieredBackend) else self._backend
+        return backend if isinstance(backend, RedisBackend) else None
+
     async def close(self):
         """Close cache connections"""
         if self._backend:
@@ -336,7 +1624,14 @@ class Cache:
 
 class RateLimiter:
     """
-    Simple rate limiter using cache backend
+    Sliding-window rate limiter on the cache's Redis (in-process when Redis is unavailable)
+
+    Backed by shared.rate_limit.SlidingWindowLimiter: the decision is one atomic Lua
+    script, so there is no 2x burst at window edges and no TTL reset on every hit.
+
+    The script runs through the cache's RedisBackend, i.e. its circuit breaker and
+    command timeout: failures count toward opening the circuit, and while it is open
+    requests are decided in process memory without touching the network.
 
     Usage:
         limiter = RateLimiter(cache, max_requests=10, window_seconds=60)
@@ -347,20 +1642,41 @@ class RateLimiter:
             # Rate limited
     """
 
-    def __init__(self, cache: Cache, max_requests: int = 10, window_seconds: int = 60):
+    def __init__(
+        self,
+        cache: Cache,
+        max_requests: int = 10,
+        window_seconds: int = 60,
+        name: str = "default",
+    ):
+        # Imported here: shared.rate_limit sits above the cache layer
+        from shared.rate_limit import SlidingWindowLimiter
+
         self.cache = cache
         self.max_requests = max_requests
         self.window_seconds = window_seconds
+        # No cooldown of its own: the cache's circuit breaker does the backing off
+        self._limiter = SlidingWindowLimiter(name, max_requests, window_seconds, cooldown=0)
+        self._bound = False
+
+    async def hit(self, identifier: str):
+        """Record one request and return its RateLimitResult (with headers/Retry-After)"""
+        await self._bind()
+        return await self._limiter.hit(identifier)
 
     async def is_allowed(self, identifier: str) -> bool:
         """Check if request is allowed under rate limit"""
-        count = await self.cache.incr(CacheKey.RATE_LIMIT, identifier, ttl=self.window_seconds)
-        return count <= self.max_requests
+        return (await self.hit(identifier)).allowed
 
     async def get_remaining(self, identifier: str) -> int:
         """Get remaining requests in current window"""
-        count = await self.cache.get(CacheKey.RATE_LIMIT, identifier) or 0
-        return max(0, self.max_requests - int(count))
+        await self._bind()
+        return (await self._limiter.peek(identifier)).remaining
+
+    async def _bind(self) -> None:
+        if not self._bound:
+            self._limiter.redis = await self.cache.redis_backend()
+            self._bound = True
 
 
 # ===========================================
@@ -401,6 +1717,18 @@ async def get_node_health(node_id: str) -> Optional[Dict[str, Any]]:
     return await cache.get(CacheKey.NODE_HEALTH, node_id)
 
 
+async def cache_node_health_many(health_by_node: Dict[str, Dict[str, Any]], ttl: int = 60):
+    """Cache health data for many nodes in one round trip"""
+    cache = get_cache()
+    await cache.set_many(CacheKey.NODE_HEALTH, health_by_node, ttl=ttl)
+
+
+async def get_node_health_many(node_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """Get cached health data for many nodes ({node_id: health}, cached nodes only)"""
+    cache = get_cache()
+    return await cache.get_many(CacheKey.NODE_HEALTH, node_ids)
+
+
 async def cache_system_stats(stats: Dict[str, Any], ttl: int = 30):
     """Cache system statistics"""
     cache = get_cache()
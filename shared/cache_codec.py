@@ -0,0 +1,236 @@
+"""
+🚀 DoAi.Me Cache Codecs
+Serialization and compression for values stored in Redis
+
+Usage:
+    from shared.cache_codec import CacheCodec, get_codec
+
+    codec = CacheCodec("msgpack", compression="zstd", threshold=1024)
+    data = codec.dumps({"node_id": "node_01", "at": datetime.now(timezone.utc)})
+    value = codec.loads(data)
+
+Wire format:
+- JSON (stdlib or orjson) is stored as plain JSON bytes, exactly what earlier
+  versions wrote, so old entries and old readers keep working
+- Everything else starts with a one-byte tag that never begins a JSON document:
+    0x01 msgpack, 0x02 zstd frame, 0x03 lz4 frame
+  Compressed frames wrap the encoded payload (which may itself be tagged)
+- loads() dispatches on the tag, not on the configured codec, so processes with
+  different settings can share a Redis during a rolling change
+
+Environment:
+- CACHE_CODEC: json | orjson | msgpack (default orjson, json if orjson is missing)
+- CACHE_COMPRESSION: none | zstd | lz4 (default none)
+- CACHE_COMPRESSION_THRESHOLD: only compress payloads of at least this many bytes (default 1024)
+
+Optional packages: orjson, msgpack, zstandard, lz4 (pip install doaime[cache])
+"""
+
+import json
+import os
+from datetime import date, datetime, timezone
+from typing import Any, Optional, Union
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+
+    logger = logging.getLogger(__name__)
+    logging.basicConfig(level=logging.INFO)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+CACHE_CODEC = os.getenv("CACHE_CODEC", "orjson")
+CACHE_COMPRESSION = os.getenv("CACHE_COMPRESSION", "none")
+CACHE_COMPRESSION_THRESHOLD = int(os.getenv("CACHE_COMPRESSION_THRESHOLD", "1024"))
+
+TAG_MSGPACK = 0x01
+TAG_ZSTD = 0x02
+TAG_LZ4 = 0x03
+_JSON_WHITESPACE = (0x09, 0x0A, 0x0D)
+
+SERIALIZERS = ("json", "orjson", "msgpack")
+COMPRESSIONS = ("none", "zstd", "lz4")
+
+
+class CodecError(ValueError):
+    """Payload cannot be decoded (unknown tag or codec package not installed)"""
+
+
+def _json_default(value: Any) -> Any:
+    return str(value)
+
+
+def _msgpack_default(value: Any) -> Any:
+    # msgpack only packs timezone-aware datetimes as timestamps
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+
+class CacheCodec:
+    """
+    Value <-> bytes for RedisBackend
+
+    Args:
+        serializer: "json", "orjson" or "msgpack"
+        compression: "zstd", "lz4", or None / "none"
+        threshold: Minimum encoded size in bytes before compressing
+        level: Compression level (None = library default)
+
+    Raises:
+        ValueError: Unknown serializer or compression
+        ImportError: The requested package is not installed
+    """
+
+    def __init__(
+        self,
+        serializer: str = "json",
+        compression: Optional[str] = None,
+        threshold: int = CACHE_COMPRESSION_THRESHOLD,
+        level: Optional[int] = None,
+    ):
+        compression = None if compression in (None, "", "none") else compression
+        if serializer not in SERIALIZERS:
+            raise ValueError(f"Unknown cache serializer: {serializer}")
+        if compression is not None and compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown cache compression: {compression}")
+
+        if serializer == "orjson" and orjson is None:
+            raise ImportError("orjson package not installed")
+        if serializer == "msgpack" and msgpack is None:
+            raise ImportError("msgpack package not installed")
+        if compression == "zstd" and zstandard is None:
+            raise ImportError("zstandard package not installed")
+        if compression == "lz4" and lz4_frame is None:
+            raise ImportError("lz4 package not installed")
+
+        self.serializer = serializer
+        self.compression = compression
+        self.threshold = threshold
+        self.level = level
+
+        # zstd (de)compressor objects are reusable and faster than one-shot calls
+        self._zstd_c = None
+        self._zstd_d = None
+        if zstandard is not None:
+            self._zstd_d = zstandard.ZstdDecompressor()
+            if compression == "zstd":
+                self._zstd_c = zstandard.ZstdCompressor(level=level if level is not None else 3)
+
+    @property
+    def name(self) -> str:
+        if self.compression:
+            return f"{self.serializer}+{self.compression}"
+        return self.serializer
+
+    def dumps(self, value: Any) -> bytes:
+        data = self._serialize(value)
+        if self.compression and len(data) >= self.threshold:
+            return self._compress(data)
+        return data
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        if isinstance(data, str):
+            # Text from a decode_responses=True connection is always JSON
+            return json.loads(data)
+        if not data:
+            raise CodecError("Empty payload")
+
+        tag = data[0]
+        if tag == TAG_MSGPACK:
+            if msgpack is None:
+                raise CodecError("msgpack package not installed")
+            return msgpack.unpackb(data[1:], raw=False, timestamp=3, strict_map_key=False)
+        if tag == TAG_ZSTD:
+            if self._zstd_d is None:
+                raise CodecError("zstandard package not installed")
+            return self.loads(self._zstd_d.decompress(data[1:]))
+        if tag == TAG_LZ4:
+            if lz4_frame is None:
+                raise CodecError("lz4 package not installed")
+            return self.loads(lz4_frame.decompress(data[1:]))
+        if tag < 0x20 and tag not in _JSON_WHITESPACE:
+            raise CodecError(f"Unknown cache payload tag: {tag:#04x}")
+
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+
+    def _serialize(self, value: Any) -> bytes:
+        if self.serializer == "msgpack":
+            return bytes([TAG_MSGPACK]) + msgpack.packb(
+                value, default=_msgpack_default, datetime=True, use_bin_type=True
+            )
+        if self.serializer == "orjson":
+            try:
+                return orjson.dumps(value, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+            except TypeError:
+                # e.g. integers beyond 64 bits: let the stdlib handle the odd value
+                pass
+        return json.dumps(value, default=_json_default).encode()
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.compression == "zstd":
+            return bytes([TAG_ZSTD]) + self._zstd_c.compress(data)
+        level = self.level if self.level is not None else 0
+        return bytes([TAG_LZ4]) + lz4_frame.compress(data, compression_level=level)
+
+
+_codec: Optional[CacheCodec] = None
+
+
+def get_codec() -> CacheCodec:
+    """
+    Codec configured by CACHE_CODEC / CACHE_COMPRESSION
+
+    Missing optional packages downgrade to what is available (orjson/msgpack -> json,
+    compression -> none) with a warning instead of failing the cache.
+    """
+    global _codec
+    if _codec is None:
+        serializer, compression = CACHE_CODEC, CACHE_COMPRESSION
+        try:
+            CacheCodec(serializer, compression)
+        except ImportError as e:
+            logger.warning(f"Cache codec {serializer}+{compression} unavailable ({e})")
+            if serializer != "json":
+                try:
+                    CacheCodec(serializer)
+                except ImportError:
+                    serializer = "json"
+            try:
+                CacheCodec(serializer, compression)
+            except ImportError:
+                compression = None
+        _codec = CacheCodec(serializer, compression)
+    return _codec
+
+
+def reset_codec() -> None:
+    """Reset codec singleton (for testing)"""
+    global _codec
+    _codec = None
@@ -0,0 +1,322 @@
+"""
+⏱️ DoAi.Me 명령 추적 테이블
+게이트웨이가 보낸 명령의 RESULT 대기 (크기 제한 + 마감 시각 + 타이머 휠)
+
+왜 이 구조인가?
+- 기존 pending_commands는 command_id → Future 전역 dict
+  → 항목 정리는 /api/command 핸들러의 finally에만 의존, 크기 제한 없음
+  → 대기 중인 명령이 몇 개인지, 얼마나 오래됐는지 볼 방법이 없음
+  → 타임아웃 직후 도착한 RESULT가 이미 끝난 Future에 set_result (InvalidStateError)
+- 명령마다 마감 시각(deadline)을 기록하고 타이머 휠로 만료
+  → 노드가 응답하지 않거나 HTTP 호출자가 먼저 떠나도 마감 시각에 정리됨
+  → 틱마다 슬롯 하나만 확인 (항목 수와 무관), 취소/완료는 슬롯에서 O(1) 제거
+- 대기자(waiter)는 명령당 여러 개 → 각자 Future를 가지므로 한 대기자의 취소가 다른 대기자에 영향 없음
+- 끝난 명령은 최근 max_recent개만 보관 → RESULT가 wait 등록보다 먼저 와도 결과 전달
+- 항목은 등록 순서 = 나이 순 → 나이 백분위를 정렬 없이 계산
+
+사용 예:
+    from shared.command_tracker import CommandTracker
+
+    tracker = CommandTracker(max_inflight=10000, tick=0.5)
+    await tracker.start()
+
+    if not tracker.track(command_id, node_id, timeout=60):
+        ...  # 테이블이 가득 참 → 503
+    result = await tracker.wait(command_id)       # None이면 만료/취소
+    tracker.resolve(command_id, payload)          # RESULT 수신 시 (모든 대기자에게 전달)
+"""
+
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+
+    logger = logging.getLogger(__name__)
+    logging.basicConfig(level=logging.INFO)
+
+from shared.monitoring.metrics import (
+    command_inflight_age_seconds,
+    command_latency_seconds,
+    commands_finished_total,
+    commands_inflight,
+)
+
+COMPLETED = "completed"
+EXPIRED = "expired"
+CANCELLED = "cancelled"
+REJECTED = "rejected"
+
+AGE_QUANTILES = (0.5, 0.9, 0.99)
+
+
+@dataclass
+class TrackedCommand:
+    """대기 중인 명령"""
+
+    command_id: str
+    node_id: str
+    created_at: float
+    deadline: float
+    kind: str = "command"
+    waiters: List[asyncio.Future] = field(default_factory=list)
+    tick: int = 0  # 만료 틱 (타이머 휠 슬롯 = tick % wheel_size)
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        return {
+            "command_id": self.command_id,
+            "node_id": self.node_id,
+            "kind": self.kind,
+            "age": round(now - self.created_at, 3),
+            "expires_in": round(self.deadline - now, 3),
+            "waiters": len(self.waiters),
+        }
+
+
+class CommandTracker:
+    """
+    대기 중인 명령 테이블
+
+    Args:
+        max_inflight: 최대 동시 추적 수 (초과 시 track이 False)
+        tick: 타이머 휠 틱 간격 (초) - 만료는 최대 tick만큼 늦을 수 있음
+        wheel_size: 타이머 휠 슬롯 수 (tick * wheel_size보다 긴 마감은 여러 바퀴 후 만료)
+        max_recent: 끝난 명령 결과 보관 수
+        on_expire: 만료 시 호출 (TrackedCommand) - 로깅, 노드 실패율 반영 등
+        clock: 테스트용 시계
+    """
+
+    def __init__(
+        self,
+        max_inflight: int = 10000,
+        tick: float = 0.5,
+        wheel_size: int = 1024,
+        max_recent: int = 1000,
+        on_expire: Optional[Callable[[TrackedCommand], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_inflight = max_inflight
+        self.tick = tick
+        self.wheel_size = wheel_size
+        self.max_recent = max_recent
+        self.on_expire = on_expire
+        self._clock = clock
+
+        self._entries: Dict[str, TrackedCommand] = {}
+        self._wheel: List[Set[str]] = [set() for _ in range(wheel_size)]
+        self._origin = clock()
+        self._tick = 0
+        self._recent: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._task: Optional[asyncio.Task] = None
+
+        self.completed = 0
+        self.expired = 0
+        self.cancelled = 0
+        self.rejected = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, command_id: str) -> bool:
+        return command_id in self._entries
+
+    # ---------- lifecycle ----------
+
+    async def start(self) -> None:
+        """만료 루프 시작"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """만료 루프 종료 + 남은 명령 취소 (대기자는 None)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        for command_id in list(self._entries):
+            self.cancel(command_id)
+
+    # ---------- commands ----------
+
+    def track(self, command_id: str, node_id: str, timeout: float, kind: str = "command") -> bool:
+        """
+        명령 등록 (전송 전에 호출 - RESULT가 먼저 와도 놓치지 않도록)
+
+        Returns:
+            False면 테이블이 가득 찼거나 이미 추적 중
+        """
+        if command_id in self._entries:
+            return False
+        if len(self._entries) >= self.max_inflight:
+            self.rejected += 1
+            commands_finished_total.labels(result=REJECTED).inc()
+            return False
+
+        now = self._clock()
+        entry = TrackedCommand(command_id, node_id, now, now + timeout, kind)
+        entry.tick = max(math.ceil((entry.deadline - self._origin) / self.tick), self._tick + 1)
+        self._entries[command_id] = entry
+        self._wheel[entry.tick % self.wheel_size].add(command_id)
+        commands_inflight.set(len(self._entries))
+        return True
+
+    def resolve(self, command_id: str, result: Dict[str, Any]) -> bool:
+        """RESULT 수신 → 모든 대기자에게 전달 (추적 중이 아니면 False)"""
+        entry = self._finish(command_id, COMPLETED, result)
+        if entry is None:
+            return False
+        self.completed += 1
+        command_latency_seconds.observe(self._clock() - entry.created_at)
+        return True
+
+    def cancel(self, command_id: str) -> bool:
+        """전송 실패 등으로 추적 중단 (대기자는 None)"""
+        if self._finish(command_id, CANCELLED, None) is None:
+            return False
+        self.cancelled += 1
+        return True
+
+    async def wait(self, command_id: str, timeout: Optional[float] = None) -> Optional[Dict]:
+        """
+        결과 대기 (여러 대기자 가능)
+
+        Args:
+            timeout: 이 대기자만의 상한 (None이면 명령 마감까지)
+
+        Returns:
+            RESULT payload - 만료/취소/timeout이거나 모르는 명령이면 None
+        """
+        entry = self._entries.get(command_id)
+        if entry is None:
+            recent = self._recent.get(command_id)
+            return recent["result"] if recent else None
+
+        future = asyncio.get_running_loop().create_future()
+        entry.waiters.append(future)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            if future in entry.waiters:
+                entry.waiters.remove(future)
+
+    def lookup(self, command_id: str) -> Optional[Dict[str, Any]]:
+        """대기 중이면 현재 상태, 끝났으면 최근 결과 (없으면 None)"""
+        entry = self._entries.get(command_id)
+        if entry is not None:
+            return {**entry.to_dict(self._clock()), "status": "inflight"}
+        return self._recent.get(command_id)
+
+    # ---------- expiry ----------
+
+    def advance(self, now: Optional[float] = None) -> int:
+        """
+        현재 시각까지 틱 진행 + 마감 지난 명령 만료
+
+        Returns:
+            만료된 명령 수
+        """
+        now = self._clock() if now is None else now
+        target = int((now - self._origin) / self.tick)
+        if target - self._tick > self.wheel_size:
+            # 한 바퀴 이상 밀림 → 슬롯마다 마지막 방문만 수행해도 동일
+            self._tick = target - self.wheel_size
+
+        expired = 0
+        while self._tick < target:
+            self._tick += 1
+            slot = self._wheel[self._tick % self.wheel_size]
+            for command_id in [c for c in slot if self._entries[c].tick <= self._tick]:
+                entry = self._finish(command_id, EXPIRED, None)
+                self.expired += 1
+                expired += 1
+                if self.on_expire is not None:
+                    try:
+                        self.on_expire(entry)
+                    except Exception as e:
+                        logger.error(f"명령 만료 콜백 실패 ({command_id}): {e}")
+        return expired
+
+    # ---------- stats ----------
+
+    def inflight(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """대기 중인 명령 (오래된 순)"""
+        now = self._clock()
+        return [entry.to_dict(now) for _, entry in zip(range(limit), self._entries.values())]
+
+    def age_percentiles(self) -> Dict[str, float]:
+        """대기 중인 명령 나이 백분위 (등록 순 = 나이 순이라 정렬 없음)"""
+        if not self._entries:
+            return {"p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0}
+        now = self._clock()
+        created = [entry.created_at for entry in self._entries.values()]  # 오래된 순
+        last = len(created) - 1
+        ages = {f"p{int(q * 100)}": now - created[round((1 - q) * last)] for q in AGE_QUANTILES}
+        ages["max"] = now - created[0]
+        return {key: round(value, 3) for key, value in ages.items()}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "inflight": len(self._entries),
+            "max_inflight": self.max_inflight,
+            "age": self.age_percentiles(),
+            "completed": self.completed,
+            "expired": self.expired,
+            "cancelled": self.cancelled,
+            "rejected": self.rejected,
+        }
+
+    # ---------- internals ----------
+
+    def _finish(
+        self, command_id: str, status: str, result: Optional[Dict[str, Any]]
+    ) -> Optional[TrackedCommand]:
+        entry = self._entries.pop(command_id, None)
+        if entry is None:
+            return None
+        self._wheel[entry.tick % self.wheel_size].discard(command_id)
+
+        for future in entry.waiters:
+            if not future.done():
+                future.set_result(result)
+
+        self._recent[command_id] = {
+            "command_id": command_id,
+            "node_id": entry.node_id,
+            "kind": entry.kind,
+            "status": status,
+            "duration": round(self._clock() - entry.created_at, 3),
+            "result": result,
+        }
+        while len(self._recent) > self.max_recent:
+            self._recent.popitem(last=False)
+
+        commands_finished_total.labels(result=status).inc()
+        commands_inflight.set(len(self._entries))
+        return entry
+
+    def _update_age_gauges(self) -> None:
+        ages = self.age_percentiles()
+        for q in AGE_QUANTILES:
+            command_inflight_age_seconds.labels(quantile=str(q)).set(ages[f"p{int(q * 100)}"])
+        command_inflight_age_seconds.labels(quantile="1").set(ages["max"])
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.tick)
+            try:
+                self.advance()
+                self._update_age_gauges()
+            except Exception as e:
+                logger.error(f"명령 추적 틱 실패: {e}")
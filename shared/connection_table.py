@@ -0,0 +1,133 @@
+"""
+🔌 DoAi.Me 노드 연결 테이블
+게이트웨이 ConnectionPool의 메모리 상태 (전역 락 없음 + READY 인덱스)
+
+왜 이 구조인가?
+- 기존 ConnectionPool은 asyncio.Lock 하나로 _nodes 전체를 보호
+  → HEARTBEAT 1회에 락 2번 (update_heartbeat, update_status), 명령마다 get/send_to_node에서 또 락
+  → 정작 list_nodes/get_ready_nodes는 락 없이 순회
+- asyncio는 단일 스레드 → await가 없는 메서드는 그 자체로 원자적
+  → 모든 변경 메서드를 동기 함수로 만들고 락 제거
+- 노드 상태는 해당 노드의 WebSocket 핸들러만 갱신 (단일 writer)
+  → update()는 여러 필드를 한 번에 반영 (중간 상태가 보이지 않음)
+- READY이고 여유 슬롯이 있는 노드를 인덱스로 유지
+  → 상태가 바뀔 때만 인덱스 갱신, 선택은 O(1) 라운드로빈 (전체 순회 없음)
+- snapshot()은 멤버십이 바뀔 때만 새로 만드는 튜플
+  → 순회 중 추가/제거가 일어나도 안전하고, 변경이 없으면 재사용
+
+사용 예:
+    from shared.connection_table import ConnectionTable
+
+    table = ConnectionTable(max_tasks=5)
+    old = table.add(conn)                 # 같은 node_id의 기존 연결 반환 (호출자가 close)
+    table.update("node_01", status="READY", active_tasks=1)
+    conn = table.pick_ready()             # O(1), 없으면 None
+    table.remove("node_01", conn)         # 대체된 연결이면 무시
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+READY = "READY"
+
+
+class ConnectionTable:
+    """
+    노드 연결 테이블
+
+    연결 객체는 node_id, status, active_tasks 속성을 가져야 함
+
+    Args:
+        max_tasks: 노드당 최대 동시 태스크 (이 수 이상이면 READY 인덱스에서 제외)
+    """
+
+    def __init__(self, max_tasks: int = 5):
+        self.max_tasks = max_tasks
+        self._conns: Dict[str, Any] = {}
+        self._ready: "OrderedDict[str, Any]" = OrderedDict()
+        self._snapshot: Optional[Tuple[Any, ...]] = None
+
+    def __len__(self) -> int:
+        return len(self._conns)
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self._conns
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.snapshot())
+
+    def get(self, node_id: str) -> Optional[Any]:
+        return self._conns.get(node_id)
+
+    def add(self, conn: Any) -> Optional[Any]:
+        """
+        연결 등록
+
+        Returns:
+            같은 node_id로 등록돼 있던 이전 연결 (없으면 None)
+        """
+        old = self._conns.get(conn.node_id)
+        self._conns[conn.node_id] = conn
+        self._snapshot = None
+        self._reindex(conn)
+        return old
+
+    def remove(self, node_id: str, conn: Any = None) -> Optional[Any]:
+        """
+        연결 제거
+
+        Args:
+            conn: 지정하면 현재 등록된 연결이 이 객체일 때만 제거
+                  (재연결로 대체된 이전 핸들러가 새 연결을 지우지 않도록)
+
+        Returns:
+            제거된 연결 (없거나 대체된 경우 None)
+        """
+        current = self._conns.get(node_id)
+        if current is None or (conn is not None and current is not conn):
+            return None
+        del self._conns[node_id]
+        self._ready.pop(node_id, None)
+        self._snapshot = None
+        return current
+
+    def update(self, node_id: str, **fields: Any) -> bool:
+        """여러 필드를 한 번에 반영 + READY 인덱스 갱신 (없는 노드면 False)"""
+        conn = self._conns.get(node_id)
+        if conn is None:
+            return False
+        for key, value in fields.items():
+            setattr(conn, key, value)
+        self._reindex(conn)
+        return True
+
+    def pick_ready(self) -> Optional[Any]:
+        """READY 노드 하나 선택 (라운드로빈, O(1))"""
+        if not self._ready:
+            return None
+        node_id, conn = next(iter(self._ready.items()))
+        self._ready.move_to_end(node_id)
+        return conn
+
+    def ready(self) -> List[Any]:
+        """READY이고 여유 슬롯이 있는 노드 (O(READY 수))"""
+        return list(self._ready.values())
+
+    @property
+    def ready_count(self) -> int:
+        return len(self._ready)
+
+    def snapshot(self) -> Tuple[Any, ...]:
+        """현재 연결 목록 (멤버십이 바뀔 때만 새로 생성)"""
+        if self._snapshot is None:
+            self._snapshot = tuple(self._conns.values())
+        return self._snapshot
+
+    # ---------- internals ----------
+
+    def _reindex(self, conn: Any) -> None:
+        if conn.status == READY and conn.active_tasks < self.max_tasks:
+            # 이미 있으면 순서 유지한 채 객체만 교체 (재연결로 대체된 경우)
+            self._ready[conn.node_id] = conn
+        else:
+            self._ready.pop(conn.node_id, None)
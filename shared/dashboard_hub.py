@@ -0,0 +1,238 @@
+"""
+📺 DoAi.Me 대시보드 허브
+대시보드 WebSocket 구독자별 송신 큐 + 전용 writer 태스크
+
+왜 이 구조인가?
+- 기존 broadcast_to_dashboards는 구독자마다 send_json을 순서대로 await
+  → 느린 브라우저 탭 하나가 모든 노드의 HEARTBEAT/RESULT 처리를 지연
+- publish()는 await 없이 각 구독자 큐에 넣기만 함 (구독자당 O(1))
+- 메시지 직렬화는 publish 1회당 한 번 → 같은 문자열을 모든 구독자가 공유
+- 구독자마다 writer 태스크 1개가 자기 큐만 비움 → 느린 구독자는 자기 큐만 밀림
+- 큐는 크기 제한 + 느린 구독자 정책
+  - coalesce 키가 있는 프레임 (예: 노드별 NODE_UPDATE)은 큐에 남은 같은 키 프레임을 교체
+  - 그래도 가득 차면 가장 오래된 프레임을 버림
+  - 한 번의 전송이 send_timeout을 넘기면 연결을 끊음 (다시 연결하면 INIT으로 복구)
+
+사용 예:
+    from shared.dashboard_hub import DashboardHub
+
+    hub = DashboardHub(max_queue=256, send_timeout=5)
+
+    sub = hub.subscribe(websocket.send_text, close=websocket.close)
+    sub.send({"type": "INIT", ...})                     # 이 구독자에게만
+    hub.publish({"type": "NODE_CONNECTED", ...})        # 모든 구독자에게
+    hub.publish({"type": "NODE_UPDATE", ...}, key="NODE_UPDATE:node_01")
+    ...
+    await hub.unsubscribe(sub)
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+
+    logger = logging.getLogger(__name__)
+    logging.basicConfig(level=logging.INFO)
+
+from shared.fanout import encode
+from shared.monitoring.metrics import (
+    dashboard_disconnects_total,
+    dashboard_frames_total,
+    dashboard_subscribers,
+)
+
+SendFunc = Callable[[str], Awaitable[None]]
+CloseFunc = Callable[[], Awaitable[None]]
+
+
+class DashboardSubscriber:
+    """
+    대시보드 구독자 1개 (송신 큐 + writer 태스크)
+
+    큐 항목은 [key, frame] 슬롯 → coalesce 시 슬롯의 frame만 바꿔서 큐 위치 유지
+    """
+
+    def __init__(
+        self,
+        send: SendFunc,
+        close: Optional[CloseFunc] = None,
+        max_queue: int = 256,
+        send_timeout: float = 5.0,
+    ):
+        self._send = send
+        self._close = close
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+
+        self._queue: Deque[List[Any]] = deque()
+        self._keyed: Dict[str, List[Any]] = {}
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.closed = False
+
+        self.sent = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def send(self, message: Dict[str, Any], key: Optional[str] = None) -> None:
+        """이 구독자에게만 전송 (await 없음)"""
+        self.enqueue(encode(message), key)
+
+    def enqueue(self, frame: str, key: Optional[str] = None) -> None:
+        """직렬화된 프레임 추가 (await 없음)"""
+        if self.closed:
+            return
+
+        if key is not None:
+            slot = self._keyed.get(key)
+            if slot is not None:
+                slot[1] = frame
+                self.coalesced += 1
+                dashboard_frames_total.labels(result="coalesced").inc()
+                return
+
+        if len(self._queue) >= self.max_queue:
+            self._pop()
+            self.dropped += 1
+            dashboard_frames_total.labels(result="dropped").inc()
+
+        slot = [key, frame]
+        self._queue.append(slot)
+        if key is not None:
+            self._keyed[key] = slot
+        self._ready.set()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """writer 종료 (큐에 남은 프레임은 버림)"""
+        self.closed = True
+        self._queue.clear()
+        self._keyed.clear()
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    # ---------- internals ----------
+
+    def _pop(self) -> str:
+        key, frame = self._queue.popleft()
+        if key is not None:
+            self._keyed.pop(key, None)
+        return frame
+
+    async def _run(self) -> None:
+        while not self.closed:
+            await self._ready.wait()
+            while self._queue:
+                frame = self._pop()
+                try:
+                    await asyncio.wait_for(self._send(frame), self.send_timeout)
+                except asyncio.TimeoutError:
+                    await self._abort("slow")
+                    return
+                except Exception:
+                    await self._abort("error")
+                    return
+                self.sent += 1
+                dashboard_frames_total.labels(result="sent").inc()
+            self._ready.clear()
+
+    async def _abort(self, reason: str) -> None:
+        """전송 불가 구독자 정리 → close()로 수신 루프도 끝나게 함"""
+        self.closed = True
+        self._queue.clear()
+        self._keyed.clear()
+        dashboard_disconnects_total.labels(reason=reason).inc()
+        logger.warning(f"[DASHBOARD] 구독자 연결 종료 ({reason})")
+        if self._close is not None:
+            try:
+                await self._close()
+            except Exception:
+                pass
+
+
+class DashboardHub:
+    """
+    대시보드 팬아웃 허브
+
+    Args:
+        max_queue: 구독자별 송신 큐 최대 프레임 수
+        send_timeout: 프레임 1개 전송 최대 시간 (초과 시 연결 종료)
+    """
+
+    def __init__(self, max_queue: int = 256, send_timeout: float = 5.0):
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self._subscribers: Dict[int, DashboardSubscriber] = {}
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, send: SendFunc, close: Optional[CloseFunc] = None) -> DashboardSubscriber:
+        """구독자 등록 + writer 시작"""
+        sub = DashboardSubscriber(send, close, self.max_queue, self.send_timeout)
+        self._subscribers[id(sub)] = sub
+        sub.start()
+        dashboard_subscribers.set(len(self._subscribers))
+        return sub
+
+    async def unsubscribe(self, sub: DashboardSubscriber) -> None:
+        self._subscribers.pop(id(sub), None)
+        dashboard_subscribers.set(len(self._subscribers))
+        await sub.stop()
+
+    def publish(self, message: Dict[str, Any], key: Optional[str] = None) -> int:
+        """
+        모든 구독자에게 전송 (await 없음, 직렬화 1회)
+
+        Args:
+            message: 메시지
+            key: coalesce 키 (큐에 같은 키 프레임이 남아 있으면 교체)
+
+        Returns:
+            큐에 넣은 구독자 수
+        """
+        if not self._subscribers:
+            return 0
+
+        frame = encode(message)
+        count = 0
+        for sub in list(self._subscribers.values()):
+            if sub.closed:
+                self._subscribers.pop(id(sub), None)
+                continue
+            sub.enqueue(frame, key)
+            count += 1
+        dashboard_subscribers.set(len(self._subscribers))
+        return count
+
+    async def close(self) -> None:
+        """모든 구독자 writer 종료"""
+        subs = list(self._subscribers.values())
+        self._subscribers.clear()
+        dashboard_subscribers.set(0)
+        await asyncio.gather(*(sub.stop() for sub in subs), return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        subs = list(self._subscribers.values())
+        return {
+            "subscribers": len(subs),
+            "queued": sum(len(sub) for sub in subs),
+            "sent": sum(sub.sent for sub in subs),
+            "coalesced": sum(sub.coalesced for sub in subs),
+            "dropped": sum(sub.dropped for sub in subs),
+        }
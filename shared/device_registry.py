@@ -24,6 +24,7 @@ except ImportError:
 
     logger = logging.getLogger(__name__)
 
+from shared.async_db import bulk_upsert, run_query
 from shared.supabase_client import get_client
 
 
@@ -136,7 +137,7 @@ class DeviceRegistry:
             if status:
                 query = query.eq("status", status)
 
-            result = query.order("id").execute()
+            result = await run_query(query.order("id"))
 
             return [
                 WorkstationInfo(
@@ -184,11 +185,8 @@ class DeviceRegistry:
             if ip_address is not None:
                 update_data["ip_address"] = ip_address
 
-            result = (
-                self.client.table("workstations")
-                .update(update_data)
-                .eq("id", workstation_id)
-                .execute()
+            result = await run_query(
+                self.client.table("workstations").update(update_data).eq("id", workstation_id)
             )
 
             return bool(result.data)
@@ -221,7 +219,7 @@ class DeviceRegistry:
             if status:
                 query = query.eq("status", status)
 
-            result = query.order("id").execute()
+            result = await run_query(query.order("id"))
 
             return [
                 PhoneboardInfo(
@@ -251,11 +249,8 @@ class DeviceRegistry:
             if connected_count is not None:
                 update_data["connected_count"] = connected_count
 
-            result = (
-                self.client.table("phoneboards")
-                .update(update_data)
-                .eq("id", phoneboard_id)
-                .execute()
+            result = await run_query(
+                self.client.table("phoneboards").update(update_data).eq("id", phoneboard_id)
             )
 
             return bool(result.data)
@@ -267,6 +262,31 @@ class DeviceRegistry:
     # 디바이스 등록/관리
     # =========================================
 
+    @staticmethod
+    def _build_device_row(
+        serial: str, workstation: str, board: int, slot: int, model: Optional[str], now: str
+    ) -> Dict[str, Any]:
+        """폰보드-슬롯 위치로 devices 행 생성"""
+        phoneboard_id = f"{workstation}-PB{board:02d}"
+
+        data = {
+            "serial_number": serial,
+            "pc_id": workstation,  # 레거시 호환
+            "workstation_id": workstation,
+            "phoneboard_id": phoneboard_id,
+            "slot_number": slot,
+            "hierarchy_id": f"{phoneboard_id}-S{slot:02d}",
+            # 그룹 할당 (홀수/짝수)
+            "device_group": "A" if slot % 2 == 1 else "B",
+            "status": "idle",
+            "last_heartbeat": now,
+        }
+
+        if model:
+            data["model"] = model
+
+        return data
+
     async def register_device(
         self, serial: str, workstation: str, board: int, slot: int, model: Optional[str] = None
     ) -> Optional[DeviceInfo]:
@@ -284,45 +304,25 @@ class DeviceRegistry:
             등록된 디바이스 정보 또는 None
         """
         try:
-            phoneboard_id = f"{workstation}-PB{board:02d}"
-            hierarchy_id = f"{phoneboard_id}-S{slot:02d}"
-
-            # 그룹 할당 (홀수/짝수)
-            device_group = "A" if slot % 2 == 1 else "B"
-
             now = datetime.now(timezone.utc).isoformat()
+            data = self._build_device_row(serial, workstation, board, slot, model, now)
 
-            data = {
-                "serial_number": serial,
-                "pc_id": workstation,  # 레거시 호환
-                "workstation_id": workstation,
-                "phoneboard_id": phoneboard_id,
-                "slot_number": slot,
-                "hierarchy_id": hierarchy_id,
-                "device_group": device_group,
-                "status": "idle",
-                "last_heartbeat": now,
-            }
-
-            if model:
-                data["model"] = model
-
-            result = (
-                self.client.table("devices").upsert(data, on_conflict="serial_number").execute()
+            result = await run_query(
+                self.client.table("devices").upsert(data, on_conflict="serial_number")
             )
 
             if result.data and len(result.data) > 0:
                 device = result.data[0]
-                logger.info(f"디바이스 등록: {hierarchy_id} (serial={serial})")
+                logger.info(f"디바이스 등록: {data['hierarchy_id']} (serial={serial})")
 
                 return DeviceInfo(
                     id=device["id"],
                     serial_number=device["serial_number"],
-                    hierarchy_id=device.get("hierarchy_id", hierarchy_id),
+                    hierarchy_id=device.get("hierarchy_id", data["hierarchy_id"]),
                     workstation_id=workstation,
-                    phoneboard_id=phoneboard_id,
+                    phoneboard_id=data["phoneboard_id"],
                     slot_number=slot,
-                    device_group=device_group,
+                    device_group=data["device_group"],
                     status=device["status"],
                     model=device.get("model"),
                     last_heartbeat=datetime.fromisoformat(now),
@@ -337,24 +337,33 @@ class DeviceRegistry:
         """
         여러 디바이스 일괄 등록
 
+        300대를 디바이스별로 upsert하면 300번의 HTTP 왕복
+        → 다중 행 upsert로 청크당 한 문장에 처리
+
         Args:
             devices: [{"serial": "xxx", "workstation": "WS01", "board": 1, "slot": 5}, ...]
 
         Returns:
             등록된 디바이스 목록
         """
-        results = []
-
-        for device in devices:
-            result = await self.register_device(
-                serial=device["serial"],
-                workstation=device["workstation"],
-                board=device["board"],
-                slot=device["slot"],
-                model=device.get("model"),
+        now = datetime.now(timezone.utc).isoformat()
+        rows = [
+            self._build_device_row(
+                d["serial"], d["workstation"], d["board"], d["slot"], d.get("model"), now
             )
-            if result:
-                results.append(result)
+            for d in devices
+        ]
+
+        if not rows:
+            return []
+
+        try:
+            upserted = await bulk_upsert(self.client, "devices", rows, on_conflict="serial_number")
+        except Exception as e:
+            logger.error(f"디바이스 일괄 등록 실패: {len(rows)}대 - {e}")
+            return []
+
+        results = [self._to_device_info(device) for device in upserted]
 
         logger.info(f"{len(results)}대 디바이스 일괄 등록 완료")
         return results
@@ -366,12 +375,8 @@ class DeviceRegistry:
     async def get_device_by_serial(self, serial: str) -> Optional[DeviceInfo]:
         """시리얼 번호로 디바이스 조회"""
         try:
-            result = (
-                self.client.table("devices")
-                .select("*")
-                .eq("serial_number", serial)
-                .single()
-                .execute()
+            result = await run_query(
+                self.client.table("devices").select("*").eq("serial_number", serial).single()
             )
 
             if result.data:
@@ -383,12 +388,8 @@ class DeviceRegistry:
     async def get_device_by_hierarchy(self, hierarchy_id: str) -> Optional[DeviceInfo]:
         """계층 ID로 디바이스 조회 (예: WS01-PB01-S05)"""
         try:
-            result = (
-                self.client.table("devices")
-                .select("*")
-                .eq("hierarchy_id", hierarchy_id)
-                .single()
-                .execute()
+            result = await run_query(
+                self.client.table("devices").select("*").eq("hierarchy_id", hierarchy_id).single()
             )
 
             if result.data:
@@ -435,7 +436,7 @@ class DeviceRegistry:
             if limit:
                 query = query.limit(limit)
 
-            result = query.execute()
+            result = await run_query(query)
 
             return [self._to_device_info(d) for d in (result.data or [])]
         except Exception as e:
@@ -522,7 +523,7 @@ class DeviceRegistry:
                     self.client.table("devices").update(update_data).eq("serial_number", device_id)
                 )
 
-            result = query.execute()
+            result = await run_query(query)
             return bool(result.data)
         except Exception as e:
             logger.error(f"디바이스 상태 변경 실패: {device_id} - {e}")
@@ -557,12 +558,11 @@ class DeviceRegistry:
         try:
             threshold = datetime.now(timezone.utc) - timedelta(seconds=stale_threshold_seconds)
 
-            result = (
+            result = await run_query(
                 self.client.table("devices")
                 .update({"status": "offline"})
                 .lt("last_heartbeat", threshold.isoformat())
                 .neq("status", "offline")
-                .execute()
             )
 
             count = len(result.data) if result.data else 0
@@ -593,9 +593,11 @@ class DeviceRegistry:
             if result:
                 update_data["last_command_result"] = result
 
-            self.client.table("devices").update(update_data).eq(
-                "serial_number" if "-" not in device_id else "hierarchy_id", device_id
-            ).execute()
+            await run_query(
+                self.client.table("devices")
+                .update(update_data)
+                .eq("serial_number" if "-" not in device_id else "hierarchy_id", device_id)
+            )
 
             return True
         except Exception as e:
@@ -619,7 +621,7 @@ class DeviceRegistry:
             if workstation_id:
                 query = query.eq("workstation_id", workstation_id)
 
-            result = query.execute()
+            result = await run_query(query)
             devices = result.data or []
 
             stats = {"total": len(devices), "idle": 0, "busy": 0, "offline": 0, "error": 0}
@@ -0,0 +1,98 @@
+"""
+📣 DoAi.Me 노드 팬아웃
+같은 메시지를 여러 WebSocket에 동시에 전송
+
+왜 이 구조인가?
+- 기존 브로드캐스트는 대상 노드마다 send_json을 순서대로 await
+  → 멈춘 TCP 전송 하나가 뒤의 모든 노드의 명령 시작을 지연 (600대면 수 초에 걸쳐 퍼짐)
+- 메시지는 한 번만 직렬화하고 같은 문자열을 모든 노드에 전송
+- 모든 전송을 동시에 시작하고 노드별로 timeout 적용 → 느린 노드는 자기 결과만 timeout
+- 결과는 노드별 outcome으로 반환 (sent / timeout / error / not_connected)
+
+사용 예:
+    from shared.fanout import encode, send_all
+
+    frame = encode(command)
+    outcomes = await send_all({node_id: conn.websocket.send_text for ...}, frame, timeout=5)
+    sent = [node_id for node_id, outcome in outcomes.items() if outcome == SENT]
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+
+    logger = logging.getLogger(__name__)
+    logging.basicConfig(level=logging.INFO)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from shared.monitoring.metrics import node_fanout_duration_seconds, node_sends_total
+
+SENT = "sent"
+TIMEOUT = "timeout"
+ERROR = "error"
+NOT_CONNECTED = "not_connected"
+
+SendFunc = Callable[[str], Awaitable[None]]
+
+
+def encode(message: Dict[str, Any]) -> str:
+    """메시지 → JSON 텍스트 (orjson이 있으면 사용)"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(message, default=str).decode()
+        except TypeError:
+            pass
+    return json.dumps(message, ensure_ascii=False, default=str)
+
+
+async def send_one(node_id: str, send: Optional[SendFunc], frame: str, timeout: float) -> str:
+    """노드 1개 전송 → outcome"""
+    if send is None:
+        outcome = NOT_CONNECTED
+    else:
+        try:
+            await asyncio.wait_for(send(frame), timeout)
+            outcome = SENT
+        except asyncio.TimeoutError:
+            logger.warning(f"[{node_id}] 전송 타임아웃 ({timeout}s)")
+            outcome = TIMEOUT
+        except Exception as e:
+            logger.error(f"[{node_id}] 전송 실패: {e}")
+            outcome = ERROR
+    node_sends_total.labels(result=outcome).inc()
+    return outcome
+
+
+async def send_all(
+    sends: Mapping[str, Optional[SendFunc]], frame: str, timeout: float = 5.0
+) -> Dict[str, str]:
+    """
+    같은 프레임을 모든 대상에 동시에 전송
+
+    Args:
+        sends: 노드 ID → send(text) (연결 없는 노드는 None)
+        frame: 직렬화된 메시지
+        timeout: 노드별 전송 최대 시간 (초)
+
+    Returns:
+        노드 ID → outcome (입력 순서 유지)
+    """
+    if not sends:
+        return {}
+
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(
+        *(send_one(node_id, send, frame, timeout) for node_id, send in sends.items())
+    )
+    node_fanout_duration_seconds.observe(time.perf_counter() - started)
+    return dict(zip(sends.keys(), outcomes))
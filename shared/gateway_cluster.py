@@ -0,0 +1,730 @@
+"""
+🛰️ DoAi.Me 게이트웨이 클러스터
+여러 게이트웨이 인스턴스(워커/레플리카) 간 노드 레지스트리 + 명령 라우팅 + 대시보드 이벤트
+
+왜 이 구조인가?
+- 노드 WebSocket, 대기 중인 명령, 대시보드 연결은 프로세스 메모리에만 있음
+  → 워커를 늘리면 /api/command가 노드 소켓이 없는 워커로 가서 404
+- 인스턴스마다 자기에게 연결된 노드를 공유 레지스트리에 등록 (노드 ID → 인스턴스 + 부하 요약)
+  → 요청을 받은 인스턴스는 레지스트리에서 담당 인스턴스를 찾아 pub/sub로 전달 (request/reply)
+  → 노드 소켓과 RESULT 대기는 담당 인스턴스에서만 (소켓을 옮기지 않음)
+- 대시보드 이벤트는 events 채널로 모든 인스턴스에 전달 → 각 인스턴스가 자기 대시보드에 다시 발행
+  (자기 인스턴스가 보낸 이벤트는 무시)
+- 인스턴스 생존은 TTL 키로 판단 → 죽은 인스턴스의 노드는 조회에서 제외, 살아 있는 인스턴스가 정리
+- 하트비트마다 레지스트리를 쓰지 않고 sync_interval마다 바뀐 노드만 모아서 기록
+- 백엔드
+  - RedisClusterBackend: 해시(owners/nodes) + 인스턴스 TTL 키 + pub/sub (Lua로 소유자 확인 후 삭제)
+  - MemoryClusterBackend: 프로세스 내 대체 (테스트, REDIS_URL 없는 단일 인스턴스)
+    → 같은 백엔드를 여러 GatewayCluster가 공유하면 다중 인스턴스를 한 프로세스에서 재현
+- Redis 장애(에러든 응답 없음이든) 시 로컬 노드는 그대로 동작 (원격 라우팅만 실패)
+  → 레지스트리/발행 호출은 모두 backend_timeout 안에 끝남 (멈춘 Redis가 요청을 붙잡지 않음)
+  → 노드 등록(HELLO)은 레지스트리 쓰기를 기다리지 않음 (sync 루프를 바로 깨워서 기록)
+  → 구독(listen)만 타임아웃 없이 대기하므로 Redis 클라이언트에 socket_timeout을 걸지 않음
+
+사용 예:
+    from shared.gateway_cluster import GatewayCluster, RedisClusterBackend
+
+    cluster = GatewayCluster("gw-1", RedisClusterBackend(redis_client), backend_timeout=1.0)
+    cluster.handle("command", run_local_command)     # async (payload) -> dict
+    cluster.on_event = relay_to_dashboards            # (instance_id, event) -> None
+    await cluster.start()
+
+    cluster.register_node("node_01", {"status": "READY", ...})  # 기록은 sync 루프에서
+    owner = await cluster.owner("node_02")            # 담당 인스턴스 ID (없으면 None)
+    reply = await cluster.request(owner, "command", {...}, timeout=30)
+    cluster.publish_event({"type": "dashboard", "message": {...}})
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+
+    logger = logging.getLogger(__name__)
+    logging.basicConfig(level=logging.INFO)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from shared.monitoring.metrics import (
+    cluster_events_total,
+    cluster_instances,
+    cluster_requests_total,
+)
+
+EVENTS_CHANNEL = "events"
+
+Handler = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+Listener = Callable[[str, bytes], Awaitable[None]]
+
+
+def instance_channel(instance_id: str) -> str:
+    """인스턴스 전용 채널 (요청 + 응답)"""
+    return f"instance:{instance_id}"
+
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(message, default=str)
+    return json.dumps(message, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _decode(data: Any) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _reason(error: Exception) -> str:
+    # asyncio.TimeoutError는 메시지가 비어 있음
+    return str(error) or type(error).__name__
+
+
+def _text(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, (bytes, bytearray)) else str(value)
+
+
+# ============================================================
+# 백엔드
+# ============================================================
+
+
+class MemoryClusterBackend:
+    """
+    프로세스 내 레지스트리 + pub/sub
+
+    Args:
+        clock: 인스턴스 TTL 판단용 시계 (테스트용)
+    """
+
+    name = "memory"
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        self._instances: Dict[str, float] = {}  # 인스턴스 → 만료 시각
+        self._owners: Dict[str, str] = {}
+        self._nodes: Dict[str, Dict[str, Any]] = {}
+        self._channels: Dict[str, List[asyncio.Queue]] = {}
+
+    async def touch_instance(self, instance_id: str, ttl: float) -> None:
+        self._instances[instance_id] = self._clock() + ttl
+
+    async def remove_instance(self, instance_id: str) -> None:
+        self._instances.pop(instance_id, None)
+
+    async def live_instances(self) -> Set[str]:
+        now = self._clock()
+        for instance_id in [i for i, expires in self._instances.items() if expires <= now]:
+            del self._instances[instance_id]
+        return set(self._instances)
+
+    async def set_nodes(self, instance_id: str, records: Dict[str, Dict[str, Any]]) -> None:
+        for node_id, record in records.items():
+            self._owners[node_id] = instance_id
+            self._nodes[node_id] = dict(record)
+
+    async def remove_node(self, node_id: str, instance_id: str) -> bool:
+        """instance_id가 아직 소유자일 때만 삭제 (다른 인스턴스로 재연결된 노드 보호)"""
+        if self._owners.get(node_id) != instance_id:
+            return False
+        del self._owners[node_id]
+        self._nodes.pop(node_id, None)
+        return True
+
+    async def get_node(self, node_id: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        owner = self._owners.get(node_id)
+        if owner is None:
+            return None
+        return owner, dict(self._nodes.get(node_id, {}))
+
+    async def all_nodes(self) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        return {
+            node_id: (owner, dict(self._nodes.get(node_id, {})))
+            for node_id, owner in self._owners.items()
+        }
+
+    async def publish(self, channel: str, data: bytes) -> None:
+        for queue in self._channels.get(channel, []):
+            queue.put_nowait((channel, data))
+
+    async def listen(
+        self, channels: List[str], handler: Listener, ready: Optional[asyncio.Event] = None
+    ) -> None:
+        queue: asyncio.Queue = asyncio.Queue()
+        for channel in channels:
+            self._channels.setdefault(channel, []).append(queue)
+        if ready is not None:
+            ready.set()
+        try:
+            while True:
+                channel, data = await queue.get()
+                await handler(channel, data)
+        finally:
+            for channel in channels:
+                self._channels[channel].remove(queue)
+
+
+class RedisClusterBackend:
+    """
+    Redis 레지스트리 + pub/sub
+
+    키:
+        {prefix}:owners           해시 - 노드 ID → 인스턴스 ID
+        {prefix}:nodes            해시 - 노드 ID → 부하 요약 JSON
+        {prefix}:instances        집합 - 등록된 인스턴스
+        {prefix}:alive:{id}       인스턴스 생존 키 (TTL)
+    채널:
+        {prefix}:events, {prefix}:instance:{id}
+
+    Args:
+        redis: redis.asyncio 클라이언트 (pub/sub는 같은 커넥션 풀에서 별도 연결)
+        prefix: 키/채널 접두사 (같은 Redis를 여러 클러스터가 쓸 때 구분)
+    """
+
+    name = "redis"
+
+    # 소유자가 그대로일 때만 삭제 (HGET → HDEL 사이에 다른 인스턴스가 등록해도 안전)
+    REMOVE_SCRIPT = """
+if redis.call('HGET', KEYS[1], ARGV[1]) == ARGV[2] then
+    redis.call('HDEL', KEYS[1], ARGV[1])
+    redis.call('HDEL', KEYS[2], ARGV[1])
+    return 1
+end
+return 0
+"""
+
+    def __init__(self, redis: Any, prefix: str = "gateway"):
+        self.redis = redis
+        self.prefix = prefix
+        self._owners_key = f"{prefix}:owners"
+        self._nodes_key = f"{prefix}:nodes"
+        self._instances_key = f"{prefix}:instances"
+
+    def _alive_key(self, instance_id: str) -> str:
+        return f"{self.prefix}:alive:{instance_id}"
+
+    async def touch_instance(self, instance_id: str, ttl: float) -> None:
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.set(self._alive_key(instance_id), 1, px=int(ttl * 1000))
+        pipe.sadd(self._instances_key, instance_id)
+        await pipe.execute()
+
+    async def remove_instance(self, instance_id: str) -> None:
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.delete(self._alive_key(instance_id))
+        pipe.srem(self._instances_key, instance_id)
+        await pipe.execute()
+
+    async def live_instances(self) -> Set[str]:
+        members = [_text(m) for m in await self.redis.smembers(self._instances_key)]
+        if not members:
+            return set()
+        pipe = self.redis.pipeline(transaction=False)
+        for instance_id in members:
+            pipe.exists(self._alive_key(instance_id))
+        alive = await pipe.execute()
+
+        dead = [i for i, ok in zip(members, alive) if not ok]
+        if dead:
+            await self.redis.srem(self._instances_key, *dead)
+        return {i for i, ok in zip(members, alive) if ok}
+
+    async def set_nodes(self, instance_id: str, records: Dict[str, Dict[str, Any]]) -> None:
+        if not records:
+            return
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hset(self._owners_key, mapping={node_id: instance_id for node_id in records})
+        pipe.hset(
+            self._nodes_key,
+            mapping={node_id: _encode(record) for node_id, record in records.items()},
+        )
+        await pipe.execute()
+
+    async def remove_node(self, node_id: str, instance_id: str) -> bool:
+        removed = await self.redis.eval(
+            self.REMOVE_SCRIPT, 2, self._owners_key, self._nodes_key, node_id, instance_id
+        )
+        return bool(int(removed))
+
+    async def get_node(self, node_id: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hget(self._owners_key, node_id)
+        pipe.hget(self._nodes_key, node_id)
+        owner, record = await pipe.execute()
+        if owner is None:
+            return None
+        return _text(owner), _decode(record) if record else {}
+
+    async def all_nodes(self) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hgetall(self._owners_key)
+        pipe.hgetall(self._nodes_key)
+        owners, records = await pipe.execute()
+        records = {_text(k): v for k, v in records.items()}
+        return {
+            _text(node_id): (_text(owner), _decode(records[_text(node_id)]))
+            for node_id, owner in owners.items()
+            if _text(node_id) in records
+        }
+
+    async def publish(self, channel: str, data: bytes) -> None:
+        await self.redis.publish(f"{self.prefix}:{channel}", data)
+
+    async def listen(
+        self, channels: List[str], handler: Listener, ready: Optional[asyncio.Event] = None
+    ) -> None:
+        prefixed = {f"{self.prefix}:{channel}": channel for channel in channels}
+        pubsub = self.redis.pubsub()
+        try:
+            await pubsub.subscribe(*prefixed)
+            if ready is not None:
+                ready.set()
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                channel = prefixed.get(_text(message["channel"]))
+                if channel is not None:
+                    await handler(channel, message["data"])
+        finally:
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
+
+
+# ============================================================
+# 클러스터
+# ============================================================
+
+
+class GatewayCluster:
+    """
+    게이트웨이 인스턴스 1개의 클러스터 참여
+
+    Args:
+        instance_id: 이 인스턴스 ID (프로세스마다 고유)
+        backend: MemoryClusterBackend | RedisClusterBackend (None이면 메모리)
+        instance_ttl: 인스턴스 생존 키 TTL (초) - 이 시간 동안 갱신이 없으면 죽은 것으로 봄
+        node_ttl: 노드 기록 유효 시간 (초) - 이 시간 동안 갱신이 없으면 조회에서 제외
+        sync_interval: 바뀐 노드 기록 반영 + 생존 키 갱신 주기 (초)
+        request_timeout: request 기본 응답 대기 (초)
+        backend_timeout: 백엔드 호출(레지스트리 조회/기록, 발행) 1회 제한 시간 (초)
+        max_events: 발행 대기 이벤트 상한 (초과 시 오래된 것부터 버림)
+        clock: 노드 기록 시각용 시계 (인스턴스 간 비교라 벽시계)
+    """
+
+    def __init__(
+        self,
+        instance_id: str,
+        backend: Any = None,
+        instance_ttl: float = 15.0,
+        node_ttl: float = 90.0,
+        sync_interval: float = 1.0,
+        request_timeout: float = 10.0,
+        backend_timeout: float = 1.0,
+        max_events: int = 10000,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.instance_id = instance_id
+        self.backend = backend if backend is not None else MemoryClusterBackend()
+        self.instance_ttl = instance_ttl
+        self.node_ttl = node_ttl
+        self.sync_interval = sync_interval
+        self.request_timeout = request_timeout
+        self.backend_timeout = backend_timeout
+        self.max_events = max_events
+        self._clock = clock
+
+        self.on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None
+        self.on_instance_lost: Optional[Callable[[str], None]] = None
+        self._handlers: Dict[str, Handler] = {}
+
+        self._local: Set[str] = set()
+        self._dirty: Dict[str, Dict[str, Any]] = {}
+        # 새 노드 등록 시 sync_interval을 기다리지 않고 바로 동기화
+        self._sync_wakeup = asyncio.Event()
+        self._replies: Dict[str, asyncio.Future] = {}
+        self._events: Optional[asyncio.Queue] = None
+        self._peers: Set[str] = set()
+        self._tasks: List[asyncio.Task] = []
+        self._inflight: Set[asyncio.Task] = set()
+
+        self.forwarded = 0
+        self.served = 0
+        self.events_published = 0
+        self.events_received = 0
+        self.events_dropped = 0
+
+    # ---------- lifecycle ----------
+
+    async def start(self) -> None:
+        """생존 키 등록 + 구독/동기화/이벤트 발행 루프 시작"""
+        if self._tasks:
+            return
+        self._events = asyncio.Queue()
+        try:
+            await self._call(self.backend.touch_instance(self.instance_id, self.instance_ttl))
+            self._peers = await self._call(self.backend.live_instances())
+            # 이전에 비정상 종료된 인스턴스가 남긴 기록
+            await self._prune(self._peers)
+        except Exception as e:
+            logger.warning(f"[Cluster] 인스턴스 등록 실패 - 다음 동기화에서 재시도 ({_reason(e)})")
+
+        subscribed = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._listen_loop(subscribed)),
+            asyncio.create_task(self._sync_loop()),
+            asyncio.create_task(self._publish_loop()),
+        ]
+        # 구독 전에 온 요청/이벤트는 유실되므로 구독까지 대기 (실패해도 루프가 재시도)
+        try:
+            await asyncio.wait_for(subscribed.wait(), timeout=5.0)
+        except asyncio.TimeoutError:
+            logger.warning("[Cluster] 구독 지연 - 백그라운드에서 계속 재시도")
+        logger.info(f"[Cluster] 인스턴스 {self.instance_id} 시작 (backend={self.backend.name})")
+
+    async def stop(self) -> None:
+        """남은 이벤트 발행 + 루프 종료 + 이 인스턴스의 노드/생존 키 삭제"""
+        if self._events is not None and self._tasks:
+            try:
+                await asyncio.wait_for(self._events.join(), timeout=1.0)
+            except asyncio.TimeoutError:
+                pass
+
+        for task in [*self._tasks, *self._inflight]:
+            task.cancel()
+        for task in [*self._tasks, *self._inflight]:
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._tasks = []
+        self._inflight.clear()
+
+        for future in self._replies.values():
+            if not future.done():
+                future.set_result(None)
+        self._replies.clear()
+
+        try:
+            for node_id in list(self._local):
+                await self._call(self.backend.remove_node(node_id, self.instance_id))
+            await self._call(self.backend.remove_instance(self.instance_id))
+        except Exception as e:
+            logger.warning(f"[Cluster] 종료 정리 실패 ({_reason(e)})")
+        self._local.clear()
+        self._dirty.clear()
+
+    # ---------- registry ----------
+
+    def register_node(self, node_id: str, record: Dict[str, Any]) -> None:
+        """
+        노드 연결 (await 없음)
+
+        기록은 sync 루프가 바로 깨어나서 수행 (다른 인스턴스는 그 뒤부터 라우팅 가능)
+        → Redis가 멈춰도 HELLO 처리는 기다리지 않음, 실패하면 다음 동기화에서 재시도
+        """
+        self._local.add(node_id)
+        self._dirty[node_id] = record
+        self._sync_wakeup.set()
+
+    def update_node(self, node_id: str, record: Dict[str, Any]) -> None:
+        """노드 상태 갱신 (await 없음, sync_interval마다 모아서 기록)"""
+        if node_id in self._local:
+            self._dirty[node_id] = record
+
+    async def unregister_node(self, node_id: str) -> None:
+        """노드 연결 해제 (다른 인스턴스로 재연결됐으면 그쪽 기록은 유지)"""
+        self._local.discard(node_id)
+        self._dirty.pop(node_id, None)
+        try:
+            await self._call(self.backend.remove_node(node_id, self.instance_id))
+        except Exception as e:
+            logger.warning(f"[Cluster] [{node_id}] 노드 해제 실패 ({_reason(e)})")
+
+    def is_local(self, node_id: str) -> bool:
+        return node_id in self._local
+
+    async def owner(self, node_id: str) -> Optional[str]:
+        """노드 담당 인스턴스 (살아 있는 인스턴스의 유효한 기록만, 없으면 None)"""
+        if node_id in self._local:
+            return self.instance_id
+        try:
+            entry = await self._call(self.backend.get_node(node_id))
+            if entry is None:
+                return None
+            owner, record = entry
+            if not self._fresh(record) or owner not in await self._call(
+                self.backend.live_instances()
+            ):
+                return None
+        except Exception as e:
+            logger.warning(f"[Cluster] [{node_id}] 담당 인스턴스 조회 실패 ({_reason(e)})")
+            return None
+        return owner
+
+    async def remote_nodes(self) -> Dict[str, Dict[str, Any]]:
+        """
+        다른 인스턴스에 연결된 노드
+
+        Returns:
+            노드 ID → 기록 (+ "instance") - 조회 실패 시 빈 dict
+        """
+        try:
+            entries = await self._call(self.backend.all_nodes())
+            if not any(owner != self.instance_id for owner, _ in entries.values()):
+                return {}
+            live = await self._call(self.backend.live_instances())
+        except Exception as e:
+            logger.warning(f"[Cluster] 노드 레지스트리 조회 실패 ({_reason(e)})")
+            return {}
+        return {
+            node_id: {**record, "instance": owner}
+            for node_id, (owner, record) in entries.items()
+            if owner != self.instance_id and owner in live and self._fresh(record)
+        }
+
+    # ---------- messaging ----------
+
+    def handle(self, action: str, handler: Handler) -> None:
+        """다른 인스턴스의 request(action) 처리 함수 등록"""
+        self._handlers[action] = handler
+
+    async def request(
+        self,
+        instance_id: str,
+        action: str,
+        payload: Dict[str, Any],
+        timeout: Optional[float] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        다른 인스턴스에 요청 후 응답 대기
+
+        Returns:
+            처리 함수 반환값 - 응답이 없거나(timeout) 처리 중 예외면 None
+        """
+        request_id = uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self._replies[request_id] = future
+        message = {
+            "kind": "request",
+            "id": request_id,
+            "from": self.instance_id,
+            "action": action,
+            "payload": payload,
+        }
+
+        result = "error"
+        try:
+            await self._call(self.backend.publish(instance_channel(instance_id), _encode(message)))
+            self.forwarded += 1
+            reply = await asyncio.wait_for(future, timeout or self.request_timeout)
+            if reply is None or "error" in reply:
+                if reply is not None:
+                    logger.warning(f"[Cluster] {instance_id} {action} 실패: {reply['error']}")
+                return None
+            result = "ok"
+            return reply.get("result")
+        except asyncio.TimeoutError:
+            result = "timeout"
+            logger.warning(f"[Cluster] {instance_id} {action} 응답 없음")
+            return None
+        except Exception as e:
+            logger.warning(f"[Cluster] {instance_id} {action} 전달 실패 ({_reason(e)})")
+            return None
+        finally:
+            self._replies.pop(request_id, None)
+            cluster_requests_total.labels(action=action, result=result).inc()
+
+    def publish_event(self, event: Dict[str, Any]) -> None:
+        """모든 인스턴스에 이벤트 발행 (await 없음, 순서 유지)"""
+        if self._events is None or not self._tasks:
+            return
+        if self._events.qsize() >= self.max_events:
+            self._events.get_nowait()
+            self._events.task_done()
+            self.events_dropped += 1
+            cluster_events_total.labels(direction="dropped").inc()
+        self._events.put_nowait(_encode({"from": self.instance_id, "event": event}))
+
+    # ---------- stats ----------
+
+    def peers(self) -> List[str]:
+        """마지막 동기화 시점의 살아 있는 인스턴스"""
+        return sorted(self._peers)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "instance_id": self.instance_id,
+            "backend": self.backend.name,
+            "instances": len(self._peers),
+            "local_nodes": len(self._local),
+            "forwarded": self.forwarded,
+            "served": self.served,
+            "events_published": self.events_published,
+            "events_received": self.events_received,
+            "events_dropped": self.events_dropped,
+        }
+
+    # ---------- internals ----------
+
+    def _stamp(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        return {**record, "updated_at": self._clock()}
+
+    def _fresh(self, record: Dict[str, Any]) -> bool:
+        return self._clock() - record.get("updated_at", 0) <= self.node_ttl
+
+    async def _on_message(self, channel: str, data: bytes) -> None:
+        try:
+            message = _decode(data)
+        except Exception:
+            return
+
+        if channel == EVENTS_CHANNEL:
+            if message.get("from") == self.instance_id or self.on_event is None:
+                return
+            self.events_received += 1
+            cluster_events_total.labels(direction="received").inc()
+            try:
+                self.on_event(message.get("from"), message.get("event") or {})
+            except Exception as e:
+                logger.error(f"[Cluster] 이벤트 처리 실패: {e}")
+            return
+
+        kind = message.get("kind")
+        if kind == "reply":
+            future = self._replies.get(message.get("id"))
+            if future is not None and not future.done():
+                future.set_result(message)
+        elif kind == "request":
+            # 처리(명령 RESULT 대기 등)가 길어도 구독 루프는 막지 않음
+            task = asyncio.create_task(self._serve(message))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _serve(self, message: Dict[str, Any]) -> None:
+        action = message.get("action")
+        handler = self._handlers.get(action)
+        reply: Dict[str, Any] = {"kind": "reply", "id": message.get("id")}
+        if handler is None:
+            reply["error"] = f"Unknown action: {action}"
+        else:
+            try:
+                reply["result"] = await handler(message.get("payload") or {})
+                self.served += 1
+            except Exception as e:
+                logger.error(f"[Cluster] {action} 처리 실패: {e}")
+                reply["error"] = str(e)
+        try:
+            await self._call(
+                self.backend.publish(instance_channel(message.get("from", "")), _encode(reply))
+            )
+        except Exception as e:
+            logger.warning(f"[Cluster] {action} 응답 전송 실패 ({_reason(e)})")
+
+    async def _listen_loop(self, subscribed: asyncio.Event) -> None:
+        channels = [EVENTS_CHANNEL, instance_channel(self.instance_id)]
+        delay = 1.0
+        while True:
+            try:
+                await self.backend.listen(channels, self._on_message, subscribed)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[Cluster] 구독 에러 - {delay:.0f}초 후 재연결 ({e})")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+    async def _publish_loop(self) -> None:
+        while True:
+            data = await self._events.get()
+            try:
+                await self._call(self.backend.publish(EVENTS_CHANNEL, data))
+                self.events_published += 1
+                cluster_events_total.labels(direction="published").inc()
+            except Exception as e:
+                self.events_dropped += 1
+                cluster_events_total.labels(direction="dropped").inc()
+                logger.warning(f"[Cluster] 이벤트 발행 실패 ({_reason(e)})")
+            finally:
+                self._events.task_done()
+
+    async def _sync_loop(self) -> None:
+        while True:
+            try:
+                async with asyncio.timeout(self.sync_interval):
+                    await self._sync_wakeup.wait()
+            except TimeoutError:
+                pass
+            self._sync_wakeup.clear()
+            try:
+                await self.sync()
+            except Exception as e:
+                logger.warning(f"[Cluster] 동기화 실패 ({_reason(e)})")
+
+    async def sync(self) -> None:
+        """생존 키 갱신 + 바뀐 노드 기록 + 죽은 인스턴스 정리 (sync_interval마다, 노드 등록 시 즉시)"""
+        await self._call(self.backend.touch_instance(self.instance_id, self.instance_ttl))
+
+        dirty, self._dirty = self._dirty, {}
+        try:
+            await self._call(
+                self.backend.set_nodes(
+                    self.instance_id,
+                    {node_id: self._stamp(record) for node_id, record in dirty.items()},
+                )
+            )
+        except Exception:
+            # 그 사이 더 새 값이 들어온 노드는 새 값 유지 (해제된 노드는 제외)
+            self._dirty = {
+                **{node_id: r for node_id, r in dirty.items() if node_id in self._local},
+                **self._dirty,
+            }
+            raise
+
+        # 기록하는 동안 해제된 노드 (unregister의 삭제보다 기록이 늦게 도착했을 수 있음)
+        for node_id in dirty:
+            if node_id not in self._local:
+                await self._call(self.backend.remove_node(node_id, self.instance_id))
+
+        live = await self._call(self.backend.live_instances())
+        lost = self._peers - live - {self.instance_id}
+        self._peers = live
+        cluster_instances.set(len(live))
+        if not lost:
+            return
+
+        for instance_id in lost:
+            logger.warning(f"[Cluster] 인스턴스 {instance_id} 응답 없음 - 노드 기록 정리")
+            if self.on_instance_lost is not None:
+                try:
+                    self.on_instance_lost(instance_id)
+                except Exception as e:
+                    logger.error(f"[Cluster] 인스턴스 손실 처리 실패: {e}")
+        await self._prune(live)
+
+    async def _prune(self, live: Set[str]) -> int:
+        """살아 있지 않은 인스턴스의 노드 기록 삭제 (소유자 확인 후 삭제라 여러 인스턴스가 동시에 해도 안전)"""
+        removed = 0
+        for node_id, (owner, _) in (await self._call(self.backend.all_nodes())).items():
+            if owner not in live and await self._call(self.backend.remove_node(node_id, owner)):
+                removed += 1
+        return removed
+
+    async def _call(self, operation: Awaitable[Any]) -> Any:
+        """
+        백엔드 호출 1회 (backend_timeout 초과 시 TimeoutError)
+
+        asyncio.wait_for는 호출이 끝난 직후 도착한 취소를 삼킬 수 있어 (3.11)
+        stop()이 루프를 끝내지 못하므로 asyncio.timeout 사용
+        """
+        async with asyncio.timeout(self.backend_timeout):
+            return await operation
@@ -0,0 +1,250 @@
+"""
+💓 DoAi.Me 하트비트 집계기
+노드 HEARTBEAT를 모아 DB 왕복 1회로 일괄 처리
+
+왜 이 구조인가?
+- 노드 600대 x 30초 주기 = 초당 20회의 process_heartbeat RPC
+  → 하트비트마다 DB 왕복을 기다리면 그동안 해당 WebSocket의 다음 메시지 처리도 멈춤
+- submit()은 await 없이 메모리 버퍼에 넣기만 함 (O(1))
+  → 게이트웨이는 HEARTBEAT_ACK를 즉시 보내고, DB 반영은 백그라운드에서 진행
+- max_delay(ms)가 지나거나 max_batch개가 모이면 process_heartbeats_bulk RPC 1회로 처리
+- 같은 노드의 하트비트가 플러시 전에 다시 오면 최신 것으로 교체 (노드 상태는 마지막 값만 의미)
+- 버퍼 상한(max_pending)을 넘는 새 노드의 하트비트는 버림 (DB 장애 시 메모리 보호)
+  → 다음 주기의 하트비트가 다시 들어오므로 유실되는 것은 상태 갱신 1회분
+- 플러시는 한 번에 하나 → DB가 느리면 배치가 커지고 하트비트가 합쳐짐 (자연스러운 백프레셔)
+- 결과(대기 명령 포함)는 deliver(node_id, result) 콜백으로 노드별로 전달
+- 연결 해제 시 discard(node_id)로 버퍼에서 빼고, 플러시 중인 배치에 있으면 DB 반영까지 대기
+  → 연결 해제 기록 뒤에 하트비트가 반영되어 노드가 다시 연결됨으로 표시되고
+    명령이 할당된 채 남는 일이 없음
+
+사용 예:
+    from shared.heartbeat_aggregator import HeartbeatAggregator
+
+    async def flush(heartbeats):
+        result = await run_query(client.rpc("process_heartbeats_bulk", {"p_heartbeats": heartbeats}))
+        return result.data or []
+
+    async def deliver(node_id, result):
+        for cmd in result.get("pending_commands") or []:
+            await send_command(node_id, cmd)
+
+    aggregator = HeartbeatAggregator(flush, deliver, max_batch=200, max_delay=0.25)
+    await aggregator.start()
+    aggregator.submit("node_01", {"node_id": "node_01", "status": "READY", ...})
+    ...
+    await aggregator.discard("node_01")  # 연결 해제 전
+    await aggregator.stop()  # 남은 하트비트 플러시
+"""
+
+import asyncio
+import time
+from itertools import islice
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+
+    logger = logging.getLogger(__name__)
+    logging.basicConfig(level=logging.INFO)
+
+from shared.monitoring.metrics import (
+    heartbeat_batch_size,
+    heartbeat_flush_duration_seconds,
+    heartbeat_flushes_total,
+    heartbeat_pending,
+    heartbeats_coalesced_total,
+    heartbeats_dropped_total,
+)
+
+FlushFunc = Callable[[List[Dict[str, Any]]], Awaitable[List[Dict[str, Any]]]]
+DeliverFunc = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+class HeartbeatAggregator:
+    """
+    하트비트 버퍼 + 주기적 일괄 플러시
+
+    Args:
+        flush: 하트비트 목록 → 결과 목록 (각 결과에 node_id 포함, 순서 무관)
+        deliver: 노드별 결과 전달 (대기 명령 Push 등)
+        max_batch: 플러시 1회당 최대 하트비트 수
+        max_delay: 첫 하트비트가 들어온 뒤 플러시까지 최대 대기 (초)
+        max_pending: 버퍼 최대 노드 수 (초과 시 새 노드의 하트비트 버림)
+    """
+
+    def __init__(
+        self,
+        flush: FlushFunc,
+        deliver: DeliverFunc,
+        max_batch: int = 200,
+        max_delay: float = 0.25,
+        max_pending: int = 5000,
+    ):
+        self._flush = flush
+        self._deliver = deliver
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+
+        # 노드 ID → 최신 하트비트 (dict 삽입 순서 = 도착 순서, 교체 시 위치 유지)
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._first_at = 0.0
+        self._wakeup = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        # 플러시 중인 배치의 노드 ID → DB 반영 완료 이벤트
+        self._flushing: Dict[str, asyncio.Event] = {}
+
+        self.flushed = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def submit(self, node_id: str, heartbeat: Dict[str, Any]) -> bool:
+        """
+        하트비트 추가 (await 없음)
+
+        Returns:
+            False면 버퍼가 가득 차서 버림
+        """
+        if node_id in self._pending:
+            self._pending[node_id] = heartbeat
+            self.coalesced += 1
+            heartbeats_coalesced_total.inc()
+            return True
+
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            heartbeats_dropped_total.inc()
+            return False
+
+        self._pending[node_id] = heartbeat
+        heartbeat_pending.set(len(self._pending))
+        if len(self._pending) == 1:
+            self._first_at = time.monotonic()
+            self._wakeup.set()
+        elif len(self._pending) >= self.max_batch:
+            self._full.set()
+        return True
+
+    async def discard(self, node_id: str) -> None:
+        """
+        노드의 버퍼된 하트비트 제거 (연결 해제 기록 전에 호출)
+
+        이미 플러시 중인 배치에 들어 있으면 그 DB 반영이 끝날 때까지 대기
+        """
+        if self._pending.pop(node_id, None) is not None:
+            heartbeat_pending.set(len(self._pending))
+            if not self._pending:
+                self._wakeup.clear()
+
+        flushing = self._flushing.get(node_id)
+        if flushing is not None:
+            await flushing.wait()
+
+    async def start(self) -> None:
+        """플러시 루프 시작"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """플러시 루프 종료 후 남은 하트비트를 모두 플러시"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        try:
+            await asyncio.wait_for(self.flush_all(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"하트비트 집계기 종료: {len(self._pending)}개 미처리")
+
+    async def flush_all(self) -> None:
+        """버퍼가 빌 때까지 즉시 플러시"""
+        while self._pending:
+            await self._flush_batch(self._take())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "flushed": self.flushed,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+        }
+
+    # ---------- internals ----------
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+
+            # 첫 하트비트 후 max_delay까지 모으되, max_batch가 차면 바로 플러시
+            delay = self._first_at + self.max_delay - time.monotonic()
+            if delay > 0 and len(self._pending) < self.max_batch:
+                self._full.clear()
+                try:
+                    await asyncio.wait_for(self._full.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+
+            batch = self._take()
+            if batch:
+                await self._flush_batch(batch)
+
+    def _take(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """버퍼 앞에서 최대 max_batch개 꺼내기 (남은 것은 다음 루프에서 바로 플러시)"""
+        batch = list(islice(self._pending.items(), self.max_batch))
+        for node_id, _ in batch:
+            del self._pending[node_id]
+        if self._pending:
+            self._first_at = 0.0  # 이미 max_delay 이상 기다린 것으로 취급
+        else:
+            self._wakeup.clear()
+        heartbeat_pending.set(len(self._pending))
+        return batch
+
+    async def _flush_batch(self, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        done = asyncio.Event()
+        for node_id, _ in batch:
+            self._flushing[node_id] = done
+
+        started = time.perf_counter()
+        try:
+            results = await self._flush([heartbeat for _, heartbeat in batch])
+            heartbeat_flushes_total.labels(result="ok").inc()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"하트비트 일괄 처리 실패 ({len(batch)}개): {e}")
+            heartbeat_flushes_total.labels(result="error").inc()
+            results = []
+        finally:
+            heartbeat_flush_duration_seconds.observe(time.perf_counter() - started)
+            heartbeat_batch_size.observe(len(batch))
+            # DB 반영이 끝나면 discard 대기 해제 (결과 전달까지 기다리지 않음)
+            for node_id, _ in batch:
+                if self._flushing.get(node_id) is done:
+                    del self._flushing[node_id]
+            done.set()
+        self.flushed += len(batch)
+
+        by_node = {
+            result.get("node_id"): result for result in results or [] if isinstance(result, dict)
+        }
+        missing = {"success": False, "error": "No result", "pending_commands": []}
+
+        # 느린 소켓 하나가 배치의 다른 노드 전달을 막지 않도록 동시에 전달
+        outcomes = await asyncio.gather(
+            *(self._deliver(node_id, by_node.get(node_id, missing)) for node_id, _ in batch),
+            return_exceptions=True,
+        )
+        for (node_id, _), outcome in zip(batch, outcomes):
+            if isinstance(outcome, Exception):
+                logger.warning(f"[{node_id}] 하트비트 결과 전달 실패: {outcome}")
@@ -0,0 +1,852 @@
+"""
+🧪 DoAi.Me 로컬 Supabase 대체 클라이언트
+SQLite 위에서 PostgREST 쿼리 빌더의 사용 중인 부분집합을 흉내내는 오프라인 클라이언트
+
+왜 이 구조인가?
+- tests/integration과 리포지토리 성능 개선 검증은 실제 Supabase가 있어야 실행 가능
+  → 오프라인에서도 같은 코드 경로(run_query + 빌더 체인)를 그대로 실행
+- supabase-py와 같은 메서드 이름/체인 구조 (table().select().eq().order().limit().execute())
+  → DeviceSync, DeviceRegistry 등 기존 코드를 수정 없이 get_client() 교체만으로 실행
+- execute() 1회 = HTTP 왕복 1회로 계산하고 설정한 지연을 주입
+  → 벤치마크에서 작업당 왕복 수와 벽시계 시간을 네트워크 없이 측정
+- 저장소는 표준 라이브러리 sqlite3 (추가 의존성 없음)
+  - 테이블/컬럼은 처음 쓰일 때 자동 생성 (마이그레이션 불필요)
+  - 컬럼 타입은 처음 기록된 값으로 결정 → "1"과 1 비교 등 PostgREST 형 변환과 유사하게 동작
+  - dict/list 값은 JSON 문자열로 저장하고 조회 시 복원
+
+지원 범위:
+- 필터: eq, neq, gt, gte, lt, lte, in_, is_, like, ilike, or_ (PostgREST 논리 트리 문법)
+- 정렬/범위: order, limit, offset, range, single, maybe_single, count="exact"
+- 쓰기: insert, upsert(on_conflict), update, delete (변경된 행 반환)
+- 임베드: select("*, videos(*)") - {단수형}_id 외래 키 기준 1단계
+- RPC: Python 함수로 등록 (heartbeat_devices, claim_jobs 기본 제공)
+
+사용 예:
+    from shared.local_supabase import LocalSupabase, use_local_supabase
+
+    with use_local_supabase(latency=0.02) as db:
+        db.seed("devices", [{"serial_number": "A", "status": "idle"}])
+        await DeviceSync(pc_id=1).heartbeat_many(["A", "B"])
+        print(db.stats.total, db.stats.by_label)
+"""
+
+import contextlib
+import json
+import random
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    from postgrest.exceptions import APIError
+except ImportError:  # supabase 미설치 환경에서도 단독 사용 가능
+
+    class APIError(Exception):  # type: ignore[no-redef]
+        """PostgREST 오류 (postgrest.exceptions.APIError 대체)"""
+
+        def __init__(self, error: Dict[str, Any]) -> None:
+            self.message = error.get("message")
+            self.code = error.get("code")
+            self.hint = error.get("hint")
+            self.details = error.get("details")
+            super().__init__(str(error))
+
+
+RpcHandler = Callable[["LocalSupabase", Dict[str, Any]], Any]
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_EMBED = re.compile(r"^(?:(\w+):)?(\w+)(?:!\w+)?\((.*)\)$")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _ident(name: str) -> str:
+    """SQL 식별자 검증 후 인용"""
+    if not _IDENTIFIER.match(name):
+        raise APIError({"code": "42703", "message": f"잘못된 식별자: {name}"})
+    return f'"{name}"'
+
+
+def _split_top_level(text: str, sep: str = ",") -> List[str]:
+    """괄호/따옴표 밖의 구분자로만 분리"""
+    parts: List[str] = []
+    depth, quoted, escaped, start = 0, False, False, 0
+    for i, ch in enumerate(text):
+        if escaped:
+            escaped = False
+        elif ch == "\\":
+            escaped = True
+        elif ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and ch == sep:
+            parts.append(text[start:i].strip())
+            start = i + 1
+    parts.append(text[start:].strip())
+    return [p for p in parts if p]
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+    return value
+
+
+def _singular(table: str) -> str:
+    return table[:-1] if table.endswith("s") else table
+
+
+@dataclass
+class RoundTripStats:
+    """왕복 횟수 집계 (레이블: "GET devices", "POST rpc/claim_jobs" 형식)"""
+
+    by_label: Counter = field(default_factory=Counter)
+    wall_time: float = 0.0
+
+    @property
+    def total(self) -> int:
+        return sum(self.by_label.values())
+
+    def reset(self) -> None:
+        self.by_label.clear()
+        self.wall_time = 0.0
+
+
+@dataclass
+class LocalResponse:
+    """execute() 결과 (APIResponse와 같은 data/count 속성)"""
+
+    data: Any
+    count: Optional[int] = None
+
+
+# ===========================================
+# 쿼리 빌더
+# ===========================================
+
+
+class LocalQuery:
+    """
+    테이블 쿼리 빌더
+
+    supabase-py처럼 메서드 체인으로 요청을 구성하고 execute()에서 한 번에 실행
+    """
+
+    def __init__(self, db: "LocalSupabase", table: str):
+        self._db = db
+        self._table = table
+        self._method = "GET"
+        self._columns = "*"
+        self._count: Optional[str] = None
+        self._payload: List[Dict[str, Any]] = []
+        self._on_conflict: Optional[str] = None
+        self._ignore_duplicates = False
+        self._where: List[str] = []
+        self._params: List[Any] = []
+        self._order: List[Tuple[str, bool, Optional[bool]]] = []
+        self._limit: Optional[int] = None
+        self._offset: Optional[int] = None
+        self._single: Optional[str] = None
+
+    # ---------- 요청 종류 ----------
+
+    def select(self, *columns: str, count: Optional[str] = None) -> "LocalQuery":
+        self._columns = ",".join(columns) or "*"
+        self._count = count
+        return self
+
+    def insert(self, json: Any, *, count: Optional[str] = None, **_: Any) -> "LocalQuery":
+        self._method = "INSERT"
+        self._payload = list(json) if isinstance(json, list) else [json]
+        self._count = count
+        return self
+
+    def upsert(
+        self,
+        json: Any,
+        *,
+        on_conflict: str = "",
+        ignore_duplicates: bool = False,
+        count: Optional[str] = None,
+        **_: Any,
+    ) -> "LocalQuery":
+        self.insert(json, count=count)
+        self._method = "UPSERT"
+        self._on_conflict = on_conflict or "id"
+        self._ignore_duplicates = ignore_duplicates
+        return self
+
+    def update(self, json: Dict[str, Any], *, count: Optional[str] = None) -> "LocalQuery":
+        self._method = "PATCH"
+        self._payload = [json]
+        self._count = count
+        return self
+
+    def delete(self, *, count: Optional[str] = None) -> "LocalQuery":
+        self._method = "DELETE"
+        self._count = count
+        return self
+
+    # ---------- 필터 ----------
+
+    def _filter(self, sql: str, *params: Any) -> "LocalQuery":
+        self._where.append(sql)
+        self._params.extend(params)
+        return self
+
+    def eq(self, column: str, value: Any) -> "LocalQuery":
+        return self._filter(f"{_ident(column)} = ?", self._db._to_sql(value))
+
+    def neq(self, column: str, value: Any) -> "LocalQuery":
+        return self._filter(f"{_ident(column)} <> ?", self._db._to_sql(value))
+
+    def gt(self, column: str, value: Any) -> "LocalQuery":
+        return self._filter(f"{_ident(column)} > ?", self._db._to_sql(value))
+
+    def gte(self, column: str, value: Any) -> "LocalQuery":
+        return self._filter(f"{_ident(column)} >= ?", self._db._to_sql(value))
+
+    def lt(self, column: str, value: Any) -> "LocalQuery":
+        return self._filter(f"{_ident(column)} < ?", self._db._to_sql(value))
+
+    def lte(self, column: str, value: Any) -> "LocalQuery":
+        return self._filter(f"{_ident(column)} <= ?", self._db._to_sql(value))
+
+    def in_(self, column: str, values: Sequence[Any]) -> "LocalQuery":
+        values = list(values)
+        if not values:
+            return self._filter("0")
+        marks = ",".join("?" for _ in values)
+        return self._filter(
+            f"{_ident(column)} IN ({marks})", *[self._db._to_sql(v) for v in values]
+        )
+
+    def is_(self, column: str, value: Any) -> "LocalQuery":
+        literal = {None: "NULL", "null": "NULL", True: "1", "true": "1", False: "0", "false": "0"}
+        return self._filter(f"{_ident(column)} IS {literal[value]}")
+
+    def like(self, column: str, pattern: str) -> "LocalQuery":
+        return self._filter(f"{_ident(column)} GLOB ?", pattern.replace("%", "*"))
+
+    def ilike(self, column: str, pattern: str) -> "LocalQuery":
+        return self._filter(f"{_ident(column)} LIKE ?", pattern.replace("*", "%"))
+
+    def or_(self, filters: str, reference_table: Optional[str] = None) -> "LocalQuery":
+        sql, params = _parse_logic(filters, "OR", self._db)
+        return self._filter(sql, *params)
+
+    # ---------- 정렬/범위 ----------
+
+    def order(
+        self, column: str, *, desc: bool = False, nullsfirst: Optional[bool] = None, **_: Any
+    ) -> "LocalQuery":
+        self._order.append((column, desc, nullsfirst))
+        return self
+
+    def limit(self, size: int, **_: Any) -> "LocalQuery":
+        self._limit = size
+        return self
+
+    def offset(self, size: int, **_: Any) -> "LocalQuery":
+        self._offset = size
+        return self
+
+    def range(self, start: int, end: int, **_: Any) -> "LocalQuery":
+        self._offset = start
+        self._limit = end - start + 1
+        return self
+
+    def single(self) -> "LocalQuery":
+        self._single = "single"
+        return self
+
+    def maybe_single(self) -> "LocalQuery":
+        self._single = "maybe"
+        return self
+
+    # ---------- 실행 ----------
+
+    @property
+    def label(self) -> str:
+        method = {"INSERT": "POST", "UPSERT": "POST"}.get(self._method, self._method)
+        return f"{method} {self._table}"
+
+    def execute(self) -> Optional[LocalResponse]:
+        return self._db._round_trip(self.label, self._run)
+
+    def _run(self) -> Optional[LocalResponse]:
+        if self._method in ("INSERT", "UPSERT"):
+            rows = self._db._write_rows(
+                self._table,
+                self._payload,
+                on_conflict=self._on_conflict if self._method == "UPSERT" else None,
+                ignore_duplicates=self._ignore_duplicates,
+            )
+        elif self._method == "PATCH":
+            rows = self._db._update_rows(
+                self._table, self._payload[0], self._where_sql(), self._params
+            )
+        elif self._method == "DELETE":
+            rows = self._db._delete_rows(self._table, self._where_sql(), self._params)
+        else:
+            rows = self._db._select_rows(
+                self._table,
+                self._where_sql(),
+                self._params,
+                order=self._order,
+                limit=self._limit,
+                offset=self._offset,
+            )
+
+        count = None
+        if self._count:
+            count = (
+                self._db._count_rows(self._table, self._where_sql(), self._params)
+                if self._method == "GET"
+                else len(rows)
+            )
+
+        rows = self._db._project(self._table, rows, self._columns)
+        return _shape(rows, count, self._single)
+
+    def _where_sql(self) -> str:
+        return " AND ".join(f"({w})" for w in self._where) or "1"
+
+
+class LocalRPC:
+    """RPC 호출 빌더 (반환 행에 select()로 임베드 적용 가능)"""
+
+    def __init__(self, db: "LocalSupabase", name: str, params: Dict[str, Any]):
+        self._db = db
+        self._name = name
+        self._params = params or {}
+        self._columns = "*"
+        self._single: Optional[str] = None
+
+    def select(self, *columns: str, **_: Any) -> "LocalRPC":
+        self._columns = ",".join(columns) or "*"
+        return self
+
+    def single(self) -> "LocalRPC":
+        self._single = "single"
+        return self
+
+    @property
+    def label(self) -> str:
+        return f"POST rpc/{self._name}"
+
+    def execute(self) -> Optional[LocalResponse]:
+        return self._db._round_trip(self.label, self._run)
+
+    def _run(self) -> Optional[LocalResponse]:
+        if self._name not in self._db._rpcs:
+            raise APIError(
+                {"code": "PGRST202", "message": f"Could not find the function {self._name}"}
+            )
+
+        handler, returns = self._db._rpcs[self._name]
+        data = handler(self._db, dict(self._params))
+
+        if returns and isinstance(data, list):
+            data = self._db._project(returns, data, self._columns)
+            return _shape(data, None, self._single)
+        return LocalResponse(data=data)
+
+
+def _shape(rows: List[Dict[str, Any]], count: Optional[int], single: Optional[str]):
+    """single()/maybe_single() 응답 형태 적용 (실패 코드는 PostgREST와 동일)"""
+    if single is None:
+        return LocalResponse(data=rows, count=count)
+    if single == "maybe" and not rows:
+        return None
+    if len(rows) != 1:
+        raise APIError(
+            {
+                "code": "PGRST116",
+                "message": "JSON object requested, multiple (or no) rows returned",
+                "details": f"The result contains {len(rows)} rows",
+            }
+        )
+    return LocalResponse(data=rows[0], count=count)
+
+
+def _parse_logic(expr: str, joiner: str, db: "LocalSupabase") -> Tuple[str, List[Any]]:
+    """
+    PostgREST 논리 필터 파싱
+
+    예: 'created_at.lt."2026-01-01",and(created_at.eq."2026-01-01",id.lt."5")'
+    """
+    clauses: List[str] = []
+    params: List[Any] = []
+    ops = {"eq": "=", "neq": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+    for part in _split_top_level(expr):
+        nested = re.match(r"^(and|or)\((.*)\)$", part, re.S)
+        if nested:
+            sql, nested_params = _parse_logic(nested.group(2), nested.group(1).upper(), db)
+            clauses.append(f"({sql})")
+            params.extend(nested_params)
+            continue
+
+        column, op, value = part.split(".", 2)
+        value = _unquote(value)
+        if op in ops:
+            clauses.append(f"{_ident(column)} {ops[op]} ?")
+            params.append(value)
+        elif op == "is":
+            clauses.append(f"{_ident(column)} IS {'NULL' if value == 'null' else value}")
+        elif op == "in":
+            values = [_unquote(v) for v in _split_top_level(value.strip("()"))]
+            clauses.append(f"{_ident(column)} IN ({','.join('?' for _ in values)})")
+            params.extend(values)
+        elif op in ("like", "ilike"):
+            clauses.append(f"{_ident(column)} LIKE ?")
+            params.append(value.replace("*", "%"))
+        else:
+            raise APIError({"code": "PGRST100", "message": f"지원하지 않는 연산자: {op}"})
+
+    return f" {joiner} ".join(clauses) or "1", params
+
+
+# ===========================================
+# 클라이언트
+# ===========================================
+
+
+class LocalSupabase:
+    """
+    SQLite 기반 Supabase 클라이언트 대체
+
+    Args:
+        path: SQLite 파일 경로 (기본 메모리)
+        latency: execute()마다 주입할 왕복 지연 (초)
+        jitter: 지연에 더할 균등 분포 난수 상한 (초)
+
+    Note:
+        - 지연은 잠금 밖에서 sleep → run_query 스레드 풀에서 동시 요청이 겹치는 것도 재현
+        - SQL 실행은 잠금 안에서 직렬화 (RPC 한 번은 하나의 트랜잭션과 같음)
+    """
+
+    def __init__(self, path: str = ":memory:", latency: float = 0.0, jitter: float = 0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.stats = RoundTripStats()
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        # 테이블별 {컬럼: "json" | "bool" | None}
+        self._columns: Dict[str, Dict[str, Optional[str]]] = {}
+        self._rpcs: Dict[str, Tuple[RpcHandler, Optional[str]]] = {}
+
+        self.register_rpc("heartbeat_devices", _heartbeat_devices)
+        self.register_rpc("claim_jobs", _claim_jobs, returns="jobs")
+
+    # ---------- supabase-py 호환 진입점 ----------
+
+    def table(self, name: str) -> LocalQuery:
+        return LocalQuery(self, name)
+
+    from_ = table
+
+    def schema(self, name: str) -> "LocalSupabase":
+        """스키마 구분 없음 (api/public 모두 같은 네임스페이스)"""
+        return self
+
+    def rpc(self, name: str, params: Optional[Dict[str, Any]] = None, **_: Any) -> LocalRPC:
+        return LocalRPC(self, name, params or {})
+
+    # ---------- 설정/관리 ----------
+
+    def register_rpc(self, name: str, handler: RpcHandler, returns: Optional[str] = None) -> None:
+        """
+        RPC 등록
+
+        Args:
+            name: 함수 이름
+            handler: handler(db, params) → 행 목록 또는 스칼라 (잠금 안에서 실행)
+            returns: 반환 행의 테이블 (select() 임베드에 사용)
+        """
+        self._rpcs[name] = (handler, returns)
+
+    def seed(self, table: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """왕복/지연 없이 행 추가 (테스트/벤치마크 준비용)"""
+        with self._lock:
+            return self._write_rows(table, rows)
+
+    def rows(self, table: str) -> List[Dict[str, Any]]:
+        """왕복/지연 없이 전체 행 조회 (검증용)"""
+        with self._lock:
+            return self._select_rows(table, "1", [], order=[("id", False, None)])
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # ---------- 왕복 ----------
+
+    def _round_trip(self, label: str, run: Callable[[], Any]) -> Any:
+        started = time.perf_counter()
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+        try:
+            with self._lock:
+                # 요청 하나를 트랜잭션 하나로 실행 (실패 시 자동 생성된 컬럼 정보도 되돌림)
+                columns = {table: dict(kinds) for table, kinds in self._columns.items()}
+                self._conn.execute("BEGIN")
+                try:
+                    result = run()
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    self._columns = columns
+                    raise
+                self._conn.execute("COMMIT")
+            return result
+        finally:
+            self.stats.by_label[label] += 1
+            self.stats.wall_time += time.perf_counter() - started
+
+    # ---------- 스키마 ----------
+
+    def _ensure_table(self, table: str, sample: Optional[Dict[str, Any]] = None) -> None:
+        if table in self._columns:
+            return
+
+        # 첫 행의 id가 문자열(UUID 등)이면 TEXT 기본 키, 아니면 자동 증가 정수
+        text_id = sample is not None and isinstance(sample.get("id"), str)
+        id_sql = "id TEXT PRIMARY KEY" if text_id else "id INTEGER PRIMARY KEY AUTOINCREMENT"
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {_ident(table)} ({id_sql}, created_at TEXT)"
+        )
+        self._columns[table] = {"id": None, "created_at": None}
+
+    def _ensure_columns(self, table: str, row: Dict[str, Any]) -> None:
+        known = self._columns[table]
+        for column, value in row.items():
+            if column in known:
+                continue
+            if isinstance(value, bool):
+                kind, sql_type = "bool", "INTEGER"
+            elif isinstance(value, (int, float)):
+                kind, sql_type = None, "NUMERIC"
+            elif isinstance(value, (dict, list)):
+                kind, sql_type = "json", "TEXT"
+            elif value is None:
+                # 타입을 알 수 없는 NULL 컬럼은 타입 없이 생성 (비교 시 형 변환 없음)
+                kind, sql_type = None, ""
+            else:
+                kind, sql_type = None, "TEXT"
+            self._conn.execute(
+                f"ALTER TABLE {_ident(table)} ADD COLUMN {_ident(column)} {sql_type}"
+            )
+            known[column] = kind
+
+    def _to_sql(self, value: Any) -> Any:
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, ensure_ascii=False, default=str)
+        if isinstance(value, bool):
+            return int(value)
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return value
+
+    def _from_row(self, table: str, row: sqlite3.Row) -> Dict[str, Any]:
+        kinds = self._columns.get(table, {})
+        data = dict(row)
+        for column, value in data.items():
+            kind = kinds.get(column)
+            if value is None or kind is None:
+                continue
+            if kind == "json":
+                data[column] = json.loads(value)
+            elif kind == "bool":
+                data[column] = bool(value)
+        return data
+
+    # ---------- SQL 실행 (잠금 안에서 호출) ----------
+
+    def _select_rows(
+        self,
+        table: str,
+        where: str,
+        params: List[Any],
+        *,
+        order: Sequence[Tuple[str, bool, Optional[bool]]] = (),
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        if table not in self._columns:
+            return []
+
+        sql = f"SELECT * FROM {_ident(table)} WHERE {where}"
+        if order:
+            terms = []
+            for column, desc, nullsfirst in order:
+                # Postgres 기본값: ASC는 NULL 마지막, DESC는 NULL 처음
+                nulls_first = desc if nullsfirst is None else nullsfirst
+                terms.append(f"({_ident(column)} IS NULL) {'DESC' if nulls_first else 'ASC'}")
+                terms.append(f"{_ident(column)} {'DESC' if desc else 'ASC'}")
+            sql += " ORDER BY " + ", ".join(terms)
+        if limit is not None or offset is not None:
+            sql += f" LIMIT {int(limit) if limit is not None else -1} OFFSET {int(offset or 0)}"
+
+        try:
+            cursor = self._conn.execute(sql, params)
+        except sqlite3.OperationalError as e:
+            if "no such column" in str(e):
+                # 아직 한 번도 기록되지 않은 컬럼 필터 → PostgREST처럼 오류
+                raise APIError({"code": "42703", "message": str(e)}) from e
+            raise
+        return [self._from_row(table, row) for row in cursor]
+
+    def _count_rows(self, table: str, where: str, params: List[Any]) -> int:
+        if table not in self._columns:
+            return 0
+        sql = f"SELECT count(*) FROM {_ident(table)} WHERE {where}"
+        return self._conn.execute(sql, params).fetchone()[0]
+
+    def _write_rows(
+        self,
+        table: str,
+        rows: List[Dict[str, Any]],
+        *,
+        on_conflict: Optional[str] = None,
+        ignore_duplicates: bool = False,
+    ) -> List[Dict[str, Any]]:
+        if not rows:
+            return []
+
+        self._ensure_table(table, rows[0])
+        conflict = [c.strip() for c in on_conflict.split(",")] if on_conflict else []
+        if conflict and conflict != ["id"]:
+            for row in rows:
+                self._ensure_columns(table, row)
+            # ON CONFLICT 대상 컬럼에는 고유 인덱스가 필요 (실제 스키마의 UNIQUE 제약에 해당)
+            index = f"uq_{table}_{'_'.join(conflict)}"
+            columns = ", ".join(_ident(c) for c in conflict)
+            self._conn.execute(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS {_ident(index)} ON {_ident(table)} ({columns})"
+            )
+
+        written: List[Dict[str, Any]] = []
+        for row in rows:
+            row = dict(row)
+            row.setdefault("created_at", _now())
+            self._ensure_columns(table, row)
+
+            columns = list(row)
+            sql = (
+                f"INSERT INTO {_ident(table)} ({', '.join(_ident(c) for c in columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})"
+            )
+            if conflict:
+                target = ", ".join(_ident(c) for c in conflict)
+                # 명시한 컬럼만 갱신 (created_at은 최초 값 유지)
+                updates = [c for c in columns if c not in conflict and c != "created_at"]
+                if ignore_duplicates or not updates:
+                    sql += f" ON CONFLICT ({target}) DO NOTHING"
+                else:
+                    assignments = ", ".join(f"{_ident(c)} = excluded.{_ident(c)}" for c in updates)
+                    sql += f" ON CONFLICT ({target}) DO UPDATE SET {assignments}"
+            sql += " RETURNING *"
+
+            try:
+                result = self._conn.execute(sql, [self._to_sql(row[c]) for c in columns])
+            except sqlite3.IntegrityError as e:
+                raise APIError({"code": "23505", "message": str(e)}) from e
+            written.extend(self._from_row(table, r) for r in result.fetchall())
+
+        return written
+
+    def _update_rows(
+        self, table: str, data: Dict[str, Any], where: str, params: List[Any]
+    ) -> List[Dict[str, Any]]:
+        if table not in self._columns or not data:
+            return []
+
+        self._ensure_columns(table, data)
+        assignments = ", ".join(f"{_ident(c)} = ?" for c in data)
+        sql = f"UPDATE {_ident(table)} SET {assignments} WHERE {where} RETURNING *"
+        values = [self._to_sql(v) for v in data.values()]
+        return [self._from_row(table, r) for r in self._conn.execute(sql, values + params)]
+
+    def _delete_rows(self, table: str, where: str, params: List[Any]) -> List[Dict[str, Any]]:
+        if table not in self._columns:
+            return []
+        sql = f"DELETE FROM {_ident(table)} WHERE {where} RETURNING *"
+        return [self._from_row(table, r) for r in self._conn.execute(sql, params)]
+
+    # ---------- select 컬럼/임베드 ----------
+
+    def _project(
+        self, table: str, rows: List[Dict[str, Any]], columns: str
+    ) -> List[Dict[str, Any]]:
+        """
+        select 문자열 적용
+
+        - "*" / "a, b" 컬럼 선택
+        - "videos(*)" 임베드: 행의 video_id → videos.id (단건),
+          없으면 videos.{단수형 테이블}_id → 행의 id (목록)
+        """
+        fields = _split_top_level(columns)
+        if fields == ["*"]:
+            return rows
+
+        projected = []
+        for row in rows:
+            out: Dict[str, Any] = {}
+            for item in fields:
+                embed = _EMBED.match(item)
+                if embed:
+                    alias, relation, inner = embed.groups()
+                    out[alias or relation] = self._embed(table, row, relation, inner)
+                elif item == "*":
+                    out.update(row)
+                else:
+                    alias, _, column = item.rpartition(":")
+                    out[alias or column] = row.get(column)
+            projected.append(out)
+        return projected
+
+    def _embed(self, table: str, row: Dict[str, Any], relation: str, columns: str) -> Any:
+        foreign_key = f"{_singular(relation)}_id"
+        if foreign_key in row:
+            if row[foreign_key] is None:
+                return None
+            found = self._select_rows(relation, '"id" = ?', [row[foreign_key]])
+            return self._project(relation, found, columns)[0] if found else None
+
+        back_key = f"{_singular(table)}_id"
+        if back_key in self._columns.get(relation, {}):
+            found = self._select_rows(relation, f"{_ident(back_key)} = ?", [row.get("id")])
+            return self._project(relation, found, columns)
+        return None
+
+
+# ===========================================
+# 기본 RPC (SQL 마이그레이션의 Python 재구현)
+# ===========================================
+
+
+def _heartbeat_devices(db: LocalSupabase, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """마이그레이션 20261019_device_heartbeat_bulk의 heartbeat_devices와 같은 규칙"""
+    pc_id = params.get("p_pc_id")
+    health = params.get("p_health") or {}
+    now = _now()
+    results = []
+
+    for serial in dict.fromkeys(s for s in params.get("p_serials") or [] if s):
+        current = db._select_rows("devices", '"serial_number" = ?', [serial])
+        if current:
+            status = "busy" if current[0].get("status") == "busy" else "idle"
+            # pc_id는 등록 시에만 (기존 기기의 소속은 하트비트로 바뀌지 않음)
+            data = {"last_seen": now, "status": status}
+            if serial in health:
+                data["last_health"] = health[serial]
+            db._update_rows("devices", data, '"serial_number" = ?', [serial])
+            outcome = "busy" if status == "busy" else "updated"
+        else:
+            row = {"serial_number": serial, "pc_id": pc_id, "status": "idle", "last_seen": now}
+            if serial in health:
+                row["last_health"] = health[serial]
+            db._write_rows("devices", [row], on_conflict="serial_number")
+            status, outcome = "idle", "registered"
+        results.append({"serial_number": serial, "outcome": outcome, "status": status})
+
+    return results
+
+
+def _claim_jobs(db: LocalSupabase, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    마이그레이션 20261019_claim_jobs의 claim_jobs와 같은 배정 규칙
+
+    SKIP LOCKED 대신 클라이언트 잠금으로 직렬화 (동시 클레임의 결과는 동일하게 중복 없음)
+    """
+    pc_id = params.get("p_pc_id")
+    device_ids = [str(d) for d in params.get("p_device_ids") or []]
+    limit = params.get("p_limit") or len(device_ids)
+    if not device_ids:
+        return []
+
+    jobs = db._select_rows(
+        "jobs", "1", [], order=[("created_at", False, None), ("id", False, None)]
+    )
+    running = {str(j["device_id"]) for j in jobs if j.get("status") == "running"}
+    devices = {str(d["id"]): d for d in db._select_rows("devices", "1", [])}
+
+    candidates = [
+        device_id
+        for device_id in device_ids
+        if device_id in devices
+        and devices[device_id].get("status") == "idle"
+        and (pc_id is None or str(devices[device_id].get("pc_id")) == str(pc_id))
+        and device_id not in running
+    ][:limit]
+
+    pending = [j for j in jobs if j.get("status") == "pending"]
+    pairs: Dict[Any, Any] = {}
+    for device_id in candidates:
+        assigned = next((j for j in pending if str(j.get("device_id")) == device_id), None)
+        if assigned is not None:
+            pairs[assigned["id"]] = devices[device_id]["id"]
+
+    free_jobs = [j for j in pending if j.get("device_id") is None]
+    free_devices = [d for d in candidates if devices[d]["id"] not in pairs.values()]
+    for job, device_id in zip(free_jobs, free_devices):
+        pairs[job["id"]] = devices[device_id]["id"]
+
+    now = _now()
+    claimed = []
+    for job_id, device_id in pairs.items():
+        claimed.extend(
+            db._update_rows(
+                "jobs",
+                {"device_id": device_id, "status": "running", "started_at": now},
+                '"id" = ? AND "status" = ?',
+                [job_id, "pending"],
+            )
+        )
+    return claimed
+
+
+# ===========================================
+# 설치 헬퍼
+# ===========================================
+
+
+@contextlib.contextmanager
+def use_local_supabase(
+    client: Optional[LocalSupabase] = None, **kwargs: Any
+) -> Iterator[LocalSupabase]:
+    """
+    shared.supabase_client 싱글톤을 로컬 클라이언트로 교체
+
+    get_client()를 호출하는 DeviceSync/JobSync/DeviceRegistry/WorkloadEngine 등이
+    with 블록 안에서 생성되면 로컬 클라이언트를 사용
+
+    Args:
+        client: 사용할 클라이언트 (생략 시 kwargs로 새로 생성)
+        **kwargs: LocalSupabase 생성 인자 (latency, jitter, path)
+    """
+    from shared import supabase_client
+
+    db = client or LocalSupabase(**kwargs)
+    previous = supabase_client._client
+    supabase_client._client = db
+    try:
+        yield db
+    finally:
+        supabase_client._client = previous
+        if client is None:
+            db.close()
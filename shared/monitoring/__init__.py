@@ -9,6 +9,7 @@ from .log_collector import (
     LogLevel,
     get_log_collector,
     get_log_stats,
+    iter_logs,
     reset_log_collector,
     search_logs,
 )
@@ -39,6 +40,7 @@ __all__ = [
     "LogLevel",
     "get_log_collector",
     "get_log_stats",
+    "iter_logs",
     "reset_log_collector",
     "search_logs",
 ]
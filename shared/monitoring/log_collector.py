@@ -18,7 +18,7 @@ Supabase monitoring_logs 테이블에 로그 저장
 import asyncio
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 try:
     from loguru import logger
@@ -257,6 +257,31 @@ def reset_log_collector():
 # ===========================================
 
 
+def _build_log_query(
+    client: Any,
+    level: Optional[str] = None,
+    source: Optional[str] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    search_text: Optional[str] = None,
+) -> Any:
+    """필터가 적용된 monitoring_logs select 빌더"""
+    query = client.table("monitoring_logs").select("*")
+
+    if level:
+        query = query.eq("level", level)
+    if source:
+        query = query.eq("source", source)
+    if start_time:
+        query = query.gte("created_at", start_time.isoformat())
+    if end_time:
+        query = query.lte("created_at", end_time.isoformat())
+    if search_text:
+        query = query.ilike("message", f"%{search_text}%")
+
+    return query
+
+
 async def search_logs(
     level: Optional[str] = None,
     source: Optional[str] = None,
@@ -265,6 +290,7 @@ async def search_logs(
     search_text: Optional[str] = None,
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
     """
     로그 검색
@@ -276,32 +302,31 @@ async def search_logs(
         end_time: 종료 시간
         search_text: 메시지 검색어
         limit: 최대 결과 수
-        offset: 오프셋
+        offset: 오프셋 (하위 호환용, cursor가 있으면 무시)
+        cursor: 이전 페이지 마지막 행의 커서 (page_cursor)
 
     Returns:
-        로그 목록
+        로그 목록 (최신순)
+
+    Raises:
+        ValueError: 잘못된 커서
     """
-    try:
-        from shared.supabase_client import get_client
+    from shared.async_db import apply_keyset, decode_cursor, run_query
 
-        client = get_client()
+    # 잘못된 커서는 조회 실패가 아닌 잘못된 요청이므로 호출자에게 전파
+    if cursor:
+        decode_cursor(cursor)
 
-        query = client.table("monitoring_logs").select("*")
+    try:
+        from shared.supabase_client import get_client
 
-        if level:
-            query = query.eq("level", level)
-        if source:
-            query = query.eq("source", source)
-        if start_time:
-            query = query.gte("created_at", start_time.isoformat())
-        if end_time:
-            query = query.lte("created_at", end_time.isoformat())
-        if search_text:
-            query = query.ilike("message", f"%{search_text}%")
+        query = _build_log_query(get_client(), level, source, start_time, end_time, search_text)
+        query = apply_keyset(query, cursor).limit(limit)
 
-        query = query.order("created_at", desc=True).limit(limit).offset(offset)
+        if offset and not cursor:
+            query = query.offset(offset)
 
-        result = query.execute()
+        result = await run_query(query)
         return result.data or []
 
     except Exception as e:
@@ -309,6 +334,31 @@ async def search_logs(
         return []
 
 
+async def iter_logs(
+    level: Optional[str] = None,
+    source: Optional[str] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    search_text: Optional[str] = None,
+    page_size: int = 500,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    조건에 맞는 전체 로그를 키셋 페이지 단위로 순회 (내보내기용)
+
+    전체 결과를 메모리에 올리지 않고 page_size 행씩 가져옴
+    """
+    from shared.async_db import iter_keyset
+    from shared.supabase_client import get_client
+
+    client = get_client()
+
+    async for row in iter_keyset(
+        lambda: _build_log_query(client, level, source, start_time, end_time, search_text),
+        page_size=page_size,
+    ):
+        yield row
+
+
 async def get_log_stats(hours: int = 24) -> Dict[str, Any]:
     """
     로그 통계 조회
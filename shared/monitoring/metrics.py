@@ -1,159 +1,766 @@
-"""
-📈 DoAi.Me Prometheus 메트릭 정의
-Agent 및 Device 모니터링용 메트릭
-
-사용 예:
-    from shared.monitoring import agent_tasks_total, active_agents
-
-    # 태스크 완료 시
-    agent_tasks_total.labels(agent_type="worker", status="success").inc()
-
-    # 활성 에이전트 수 설정
-    active_agents.labels(agent_type="worker").set(10)
-"""
-
-from prometheus_client import Counter, Gauge, Histogram, Info
-
-# ===========================================
-# Agent 메트릭
-# ===========================================
-
-agent_tasks_total = Counter(
-    "agent_tasks_total",
-    "Total tasks processed by agent",
-    ["agent_type", "status"],
-)
-"""
-에이전트가 처리한 총 태스크 수
-
-Labels:
-    agent_type: 에이전트 유형 (worker, orchestrator, etc.)
-    status: 결과 상태 (success, failure, timeout)
-"""
-
-agent_task_duration = Histogram(
-    "agent_task_duration_seconds",
-    "Task processing duration in seconds",
-    ["agent_type"],
-    buckets=[0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0],
-)
-"""
-태스크 처리 시간 분포
-
-Labels:
-    agent_type: 에이전트 유형
-"""
-
-active_agents = Gauge(
-    "active_agents",
-    "Number of currently active agents",
-    ["agent_type"],
-)
-"""
-현재 활성 에이전트 수
-
-Labels:
-    agent_type: 에이전트 유형
-"""
-
-# ===========================================
-# Device 메트릭 (DoAi.Me 전용)
-# ===========================================
-
-device_status = Gauge(
-    "device_status",
-    "Device status (1=online, 0=offline, -1=error)",
-    ["serial_number", "pc_id"],
-)
-"""
-기기 상태
-
-Labels:
-    serial_number: ADB 시리얼 번호
-    pc_id: 연결된 PC ID
-"""
-
-device_tasks_total = Counter(
-    "device_tasks_total",
-    "Total tasks executed on device",
-    ["serial_number", "task_type", "status"],
-)
-"""
-기기에서 실행된 총 태스크 수
-
-Labels:
-    serial_number: ADB 시리얼 번호
-    task_type: 태스크 유형 (youtube_watch, app_install, etc.)
-    status: 결과 상태 (success, failure)
-"""
-
-device_battery_level = Gauge(
-    "device_battery_level",
-    "Device battery level percentage",
-    ["serial_number"],
-)
-"""
-기기 배터리 레벨 (0-100)
-
-Labels:
-    serial_number: ADB 시리얼 번호
-"""
-
-device_task_duration = Histogram(
-    "device_task_duration_seconds",
-    "Task execution duration on device",
-    ["serial_number", "task_type"],
-    buckets=[1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0],
-)
-"""
-기기에서 태스크 실행 시간 분포
-
-Labels:
-    serial_number: ADB 시리얼 번호
-    task_type: 태스크 유형
-"""
-
-# ===========================================
-# 시스템 정보
-# ===========================================
-
-system_info = Info("system", "System information")
-"""
-시스템 정보 (버전, 환경 등)
-
-사용 예:
-    system_info.info({
-        "version": "2.0.0",
-        "environment": "production",
-        "python_version": "3.11.0"
-    })
-"""
-
-# ===========================================
-# 큐 메트릭
-# ===========================================
-
-queue_size = Gauge(
-    "queue_size",
-    "Current queue size",
-    ["queue_name"],
-)
-"""
-큐 현재 크기
-
-Labels:
-    queue_name: 큐 이름 (youtube_tasks, device_commands, etc.)
-"""
-
-queue_processed_total = Counter(
-    "queue_processed_total",
-    "Total items processed from queue",
-    ["queue_name", "status"],
-)
-"""
-큐에서 처리된 총 아이템 수
-
-Labels:
-    queue_name: 큐 이름
-    status: 처리 결과 (success, failure)
-"""
+"""
+📈 DoAi.Me Prometheus 메트릭 정의
+Agent 및 Device 모니터링용 메트릭
+
+사용 예:
+    from shared.monitoring import agent_tasks_total, active_agents
+
+    # 태스크 완료 시
+    agent_tasks_total.labels(agent_type="worker", status="success").inc()
+
+    # 활성 에이전트 수 설정
+    active_agents.labels(agent_type="worker").set(10)
+"""
+
+from prometheus_client import Counter, Gauge, Histogram, Info
+
+# ===========================================
+# Agent 메트릭
+# ===========================================
+
+agent_tasks_total = Counter(
+    "agent_tasks_total",
+    "Total tasks processed by agent",
+    ["agent_type", "status"],
+)
+"""
+에이전트가 처리한 총 태스크 수
+
+Labels:
+    agent_type: 에이전트 유형 (worker, orchestrator, etc.)
+    status: 결과 상태 (success, failure, timeout)
+"""
+
+agent_task_duration = Histogram(
+    "agent_task_duration_seconds",
+    "Task processing duration in seconds",
+    ["agent_type"],
+    buckets=[0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0],
+)
+"""
+태스크 처리 시간 분포
+
+Labels:
+    agent_type: 에이전트 유형
+"""
+
+active_agents = Gauge(
+    "active_agents",
+    "Number of currently active agents",
+    ["agent_type"],
+)
+"""
+현재 활성 에이전트 수
+
+Labels:
+    agent_type: 에이전트 유형
+"""
+
+# ===========================================
+# Device 메트릭 (DoAi.Me 전용)
+# ===========================================
+
+device_status = Gauge(
+    "device_status",
+    "Device status (1=online, 0=offline, -1=error)",
+    ["serial_number", "pc_id"],
+)
+"""
+기기 상태
+
+Labels:
+    serial_number: ADB 시리얼 번호
+    pc_id: 연결된 PC ID
+"""
+
+device_tasks_total = Counter(
+    "device_tasks_total",
+    "Total tasks executed on device",
+    ["serial_number", "task_type", "status"],
+)
+"""
+기기에서 실행된 총 태스크 수
+
+Labels:
+    serial_number: ADB 시리얼 번호
+    task_type: 태스크 유형 (youtube_watch, app_install, etc.)
+    status: 결과 상태 (success, failure)
+"""
+
+device_battery_level = Gauge(
+    "device_battery_level",
+    "Device battery level percentage",
+    ["serial_number"],
+)
+"""
+기기 배터리 레벨 (0-100)
+
+Labels:
+    serial_number: ADB 시리얼 번호
+"""
+
+device_task_duration = Histogram(
+    "device_task_duration_seconds",
+    "Task execution duration on device",
+    ["serial_number", "task_type"],
+    buckets=[1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0],
+)
+"""
+기기에서 태스크 실행 시간 분포
+
+Labels:
+    serial_number: ADB 시리얼 번호
+    task_type: 태스크 유형
+"""
+
+# ===========================================
+# 시스템 정보
+# ===========================================
+
+system_info = Info("system", "System information")
+"""
+시스템 정보 (버전, 환경 등)
+
+사용 예:
+    system_info.info({
+        "version": "2.0.0",
+        "environment": "production",
+        "python_version": "3.11.0"
+    })
+"""
+
+# ===========================================
+# 큐 메트릭
+# ===========================================
+
+queue_size = Gauge(
+    "queue_size",
+    "Current queue size",
+    ["queue_name"],
+)
+"""
+큐 현재 크기
+
+Labels:
+    queue_name: 큐 이름 (youtube_tasks, device_commands, etc.)
+"""
+
+queue_processed_total = Counter(
+    "queue_processed_total",
+    "Total items processed from queue",
+    ["queue_name", "status"],
+)
+"""
+큐에서 처리된 총 아이템 수
+
+Labels:
+    queue_name: 큐 이름
+    status: 처리 결과 (success, failure)
+"""
+
+# ===========================================
+# DB 쿼리 메트릭
+# ===========================================
+
+db_query_duration = Histogram(
+    "db_query_duration_seconds",
+    "Supabase/PostgREST query latency in seconds",
+    ["query"],
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0],
+)
+"""
+쿼리별 왕복 지연 시간 분포
+
+Labels:
+    query: 쿼리 이름 (예: "GET devices", "POST rpc/process_heartbeat")
+"""
+
+db_queries_total = Counter(
+    "db_queries_total",
+    "Total Supabase/PostgREST queries executed",
+    ["query", "status"],
+)
+"""
+실행된 총 쿼리 수
+
+Labels:
+    query: 쿼리 이름
+    status: 결과 (ok, error, timeout, cancelled)
+"""
+
+# ===========================================
+# 쿼리 캐시 메트릭
+# ===========================================
+
+query_cache_hits_total = Counter(
+    "query_cache_hits_total",
+    "Total read-through query cache hits",
+    ["query"],
+)
+"""
+캐시에서 응답한 조회 수
+
+Labels:
+    query: 캐시 이름 (예: "devices.get_all")
+"""
+
+query_cache_misses_total = Counter(
+    "query_cache_misses_total",
+    "Total read-through query cache misses",
+    ["query"],
+)
+"""
+캐시에 없어 DB를 조회한 수
+
+Labels:
+    query: 캐시 이름
+"""
+
+query_cache_invalidations_total = Counter(
+    "query_cache_invalidations_total",
+    "Total query cache tag invalidations",
+    ["tag"],
+)
+"""
+쓰기 메서드가 발생시킨 태그 무효화 수
+
+Labels:
+    tag: 무효화된 태그 (예: "devices")
+"""
+
+# ===========================================
+# 캐시 계층 메트릭
+# ===========================================
+
+cache_requests_total = Counter(
+    "cache_requests_total",
+    "Total cache lookups by tier",
+    ["tier", "result"],
+)
+"""
+계층별 캐시 조회 수 (L1 미스만 L2로 전달되므로 L2 조회 수 = L1 미스 수)
+
+Labels:
+    tier: 계층 (l1: 프로세스 메모리, l2: Redis)
+    result: 결과 (hit, miss)
+"""
+
+cache_invalidations_received_total = Counter(
+    "cache_invalidations_received_total",
+    "Total L1 keys dropped by pub/sub invalidation from peer processes",
+)
+"""
+다른 프로세스의 쓰기/삭제 브로드캐스트로 제거된 L1 키 수
+"""
+
+cache_coalesced_requests_total = Counter(
+    "cache_coalesced_requests_total",
+    "Total get_or_set callers that joined an in-flight factory instead of running their own",
+    ["prefix"],
+)
+"""
+get_or_set 단일 실행(single-flight)으로 합쳐진 호출 수
+
+같은 키의 factory가 이미 실행 중이면 새로 실행하지 않고 그 결과를 기다림
+(백그라운드 갱신에 합류한 경우 포함)
+
+Labels:
+    prefix: 캐시 키 접두사 (예: stats:system)
+"""
+
+cache_stale_served_total = Counter(
+    "cache_stale_served_total",
+    "Total get_or_set responses served from a stale entry while refreshing in background",
+    ["prefix"],
+)
+"""
+소프트 TTL이 지난 값을 즉시 반환하고 백그라운드 갱신을 시작한 횟수
+
+Labels:
+    prefix: 캐시 키 접두사
+"""
+
+cache_lock_waits_total = Counter(
+    "cache_lock_waits_total",
+    "Total get_or_set misses that waited on another process's Redis lock",
+    ["prefix", "result"],
+)
+"""
+다른 프로세스가 같은 키를 계산 중(Redis 락 보유)이어서 결과를 기다린 횟수
+
+Labels:
+    prefix: 캐시 키 접두사
+    result: 결과 (filled: 상대 프로세스가 채운 값 사용, timeout: 대기 초과 후 직접 계산)
+"""
+
+cache_hits_total = Counter(
+    "cache_hits_total",
+    "Total Cache.get/get_many/get_or_set lookups that found a value",
+    ["prefix"],
+)
+"""
+접두사별 캐시 히트 수 (계층 구분 없이 Cache API 기준)
+
+히트율 = cache_hits_total / (cache_hits_total + cache_misses_total)
+
+Labels:
+    prefix: 캐시 키 접두사 (CacheKey 값, 그 외 키는 첫 세그먼트)
+"""
+
+cache_misses_total = Counter(
+    "cache_misses_total",
+    "Total Cache.get/get_many/get_or_set lookups that found nothing",
+    ["prefix"],
+)
+"""
+접두사별 캐시 미스 수
+
+Labels:
+    prefix: 캐시 키 접두사
+"""
+
+cache_sets_total = Counter(
+    "cache_sets_total",
+    "Total keys written through Cache.set/set_many/get_or_set",
+    ["prefix"],
+)
+"""
+접두사별 캐시 쓰기 수 (set_many는 키 개수만큼 증가)
+
+Labels:
+    prefix: 캐시 키 접두사
+"""
+
+cache_evictions_total = Counter(
+    "cache_evictions_total",
+    "Total keys removed from a memory cache before being deleted explicitly",
+    ["backend", "prefix", "reason"],
+)
+"""
+메모리 캐시에서 제거된 키 수 (Redis 자체 만료/축출은 INFO stats로 확인)
+
+expired가 많으면 TTL이 조회 주기보다 짧고, lru가 많으면 max_size/max_bytes가 작음
+
+Labels:
+    backend: 메모리 캐시 (memory: Redis 대체, l1: 2계층 캐시의 L1, degraded: 서킷 open 중 대체)
+    prefix: 캐시 키 접두사
+    reason: 사유 (expired: TTL 만료, lru: 크기 제한 초과로 오래된 키 제거)
+"""
+
+cache_backend_errors_total = Counter(
+    "cache_backend_errors_total",
+    "Total cache backend operations that failed and returned a fallback value",
+    ["backend", "op"],
+)
+"""
+캐시 백엔드 오류 수 (오류 시 None/False/0을 반환하므로 호출자에게는 미스로 보임)
+
+Labels:
+    backend: 백엔드 (redis)
+    op: 연산 (get, set, delete, exists, incr, mget, mset, ...)
+"""
+
+cache_operation_duration_seconds = Histogram(
+    "cache_operation_duration_seconds",
+    "Cache API call latency in seconds",
+    ["prefix", "op"],
+    buckets=[0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0],
+)
+"""
+접두사별 캐시 호출 지연 시간 분포 (L1 히트는 수십 us, Redis 왕복은 ms 단위)
+
+Labels:
+    prefix: 캐시 키 접두사
+    op: 연산 (get, set, get_many, set_many)
+"""
+
+cache_backend_active = Gauge(
+    "cache_backend_active",
+    "Cache backend currently serving requests (1 = active)",
+    ["backend"],
+)
+"""
+현재 사용 중인 캐시 백엔드
+
+redis 패키지가 없어 메모리 캐시로 대체되면 memory=1, Redis 장애로 서킷이 열려
+있는 동안은 degraded=1 (둘 다 프로세스 간 캐시 공유 안 됨)
+
+Labels:
+    backend: 백엔드 (tiered, redis, memory, degraded)
+"""
+
+cache_circuit_state = Gauge(
+    "cache_circuit_state",
+    "Cache backend circuit breaker state (0 = closed, 1 = open)",
+    ["backend"],
+)
+"""
+캐시 백엔드 서킷 브레이커 상태
+
+open 동안 Redis 호출 없이 프로세스 메모리로 응답하고, 백그라운드 PING으로 복구 확인
+
+Labels:
+    backend: 백엔드 (redis)
+"""
+
+cache_circuit_transitions_total = Counter(
+    "cache_circuit_transitions_total",
+    "Total cache circuit breaker state changes",
+    ["backend", "state"],
+)
+"""
+서킷 브레이커 전환 횟수 (open 증가 = Redis 장애 감지, closed 증가 = 복구)
+
+Labels:
+    backend: 백엔드 (redis)
+    state: 전환된 상태 (open, closed)
+"""
+
+cache_circuit_rejected_total = Counter(
+    "cache_circuit_rejected_total",
+    "Total cache calls answered from degraded memory without contacting the backend",
+    ["backend"],
+)
+"""
+서킷 open으로 네트워크 대기 없이 메모리에서 처리한 호출 수
+
+Labels:
+    backend: 백엔드 (redis)
+"""
+
+
+# ===========================================
+# 레이트 리밋 메트릭
+# ===========================================
+
+rate_limit_requests_total = Counter(
+    "rate_limit_requests_total",
+    "Total rate limiter decisions",
+    ["limiter", "result"],
+)
+"""
+레이트 리미터 판정 수
+
+Labels:
+    limiter: 리미터 이름 (예: gateway.command, gateway.node_ws)
+    result: 결과 (allowed, limited)
+"""
+
+
+# ===========================================
+# 하트비트 집계 메트릭 (Cloud Gateway)
+# ===========================================
+
+heartbeat_batch_size = Histogram(
+    "heartbeat_batch_size",
+    "Heartbeats per process_heartbeats_bulk call",
+    buckets=[1, 5, 10, 25, 50, 100, 200, 500],
+)
+"""
+일괄 처리 1회당 하트비트 수 분포
+"""
+
+heartbeat_flush_duration_seconds = Histogram(
+    "heartbeat_flush_duration_seconds",
+    "process_heartbeats_bulk round trip in seconds",
+    buckets=[0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0],
+)
+"""
+일괄 처리 DB 왕복 시간 분포 (HEARTBEAT_ACK 응답 시간과는 무관)
+"""
+
+heartbeat_flushes_total = Counter(
+    "heartbeat_flushes_total",
+    "Total heartbeat batch flushes",
+    ["result"],
+)
+"""
+하트비트 일괄 처리 횟수
+
+Labels:
+    result: 결과 (ok, error)
+"""
+
+heartbeats_coalesced_total = Counter(
+    "heartbeats_coalesced_total",
+    "Total heartbeats replaced by a newer one from the same node before flushing",
+)
+"""
+플러시 전에 같은 노드의 새 하트비트로 교체된 수 (DB가 느릴수록 증가)
+"""
+
+heartbeats_dropped_total = Counter(
+    "heartbeats_dropped_total",
+    "Total heartbeats dropped because the aggregator buffer was full",
+)
+"""
+버퍼가 가득 차서 버린 하트비트 수 (0이 아니면 DB 처리량 부족)
+"""
+
+heartbeat_pending = Gauge(
+    "heartbeat_pending",
+    "Heartbeats buffered and waiting for the next flush",
+)
+"""
+다음 플러시를 기다리는 하트비트 수
+"""
+
+
+# ===========================================
+# OOB 메트릭 전달 (Cloud Gateway → OOB API)
+# ===========================================
+
+oob_forward_batches_total = Counter(
+    "oob_forward_batches_total",
+    "Total batched POSTs to the OOB metrics endpoint",
+    ["result"],
+)
+"""
+OOB 일괄 전송 횟수
+
+Labels:
+    result: 결과 (ok, http_error, error)
+"""
+
+oob_forward_batch_size = Histogram(
+    "oob_forward_batch_size",
+    "Node metrics per OOB POST",
+    buckets=[1, 5, 10, 25, 50, 100, 200, 500],
+)
+"""
+전송 1회당 노드 메트릭 수 분포
+"""
+
+oob_forward_lag_seconds = Histogram(
+    "oob_forward_lag_seconds",
+    "Time from heartbeat to OOB delivery of its metrics (oldest item per batch)",
+    buckets=[0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0],
+)
+"""
+하트비트 수신부터 OOB 전달 완료까지 지연 (배치의 가장 오래된 항목 기준)
+"""
+
+oob_forward_dropped_total = Counter(
+    "oob_forward_dropped_total",
+    "Total node metrics dropped instead of forwarded to OOB",
+    ["reason"],
+)
+"""
+OOB에 전달되지 않고 버린 메트릭 수
+
+Labels:
+    reason: 사유 (queue_full - 큐가 가득 차 가장 오래된 항목 제거, send_error - 전송 실패)
+"""
+
+oob_forward_queue_depth = Gauge(
+    "oob_forward_queue_depth",
+    "Node metrics queued for the next OOB POST",
+)
+"""
+다음 전송을 기다리는 메트릭 수
+"""
+
+
+# ===========================================
+# 대시보드 팬아웃 메트릭 (Cloud Gateway)
+# ===========================================
+
+dashboard_subscribers = Gauge(
+    "dashboard_subscribers",
+    "Connected dashboard WebSocket subscribers",
+)
+"""
+연결된 대시보드 수
+"""
+
+dashboard_frames_total = Counter(
+    "dashboard_frames_total",
+    "Dashboard frames by outcome, counted per subscriber",
+    ["result"],
+)
+"""
+대시보드 프레임 처리 결과 (구독자별로 집계)
+
+Labels:
+    result: 결과 (sent, coalesced - 같은 키의 새 프레임으로 교체, dropped - 큐가 가득 차 제거)
+"""
+
+dashboard_disconnects_total = Counter(
+    "dashboard_disconnects_total",
+    "Dashboard subscribers removed by the hub",
+    ["reason"],
+)
+"""
+허브가 끊은 대시보드 수
+
+Labels:
+    reason: 사유 (slow - 전송 타임아웃, error - 전송 실패)
+"""
+
+
+# ===========================================
+# 노드 팬아웃 메트릭 (Cloud Gateway 브로드캐스트)
+# ===========================================
+
+node_sends_total = Counter(
+    "node_sends_total",
+    "Gateway sends to node WebSockets during fan-out",
+    ["result"],
+)
+"""
+노드 전송 결과
+
+Labels:
+    result: 결과 (sent, timeout, error, not_connected)
+"""
+
+node_fanout_duration_seconds = Histogram(
+    "node_fanout_duration_seconds",
+    "Time from the first to the last completed send of a node fan-out",
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0],
+)
+"""
+팬아웃 1회 전체 소요 시간 (노드별 timeout이 상한)
+"""
+
+
+# ===========================================
+# 명령 배치 메트릭 (Cloud Gateway 스케줄러)
+# ===========================================
+
+placement_decisions_total = Counter(
+    "placement_decisions_total",
+    "Placement decisions made by the gateway scheduler",
+    ["kind", "strategy"],
+)
+"""
+배치 결정 수
+
+Labels:
+    kind: 결정 종류 (pick - 1개, select - 점수 순 N개, spread - 디바이스 분배)
+    strategy: 선택 전략 (p2c, least_loaded)
+"""
+
+placement_chosen_score = Histogram(
+    "placement_chosen_score",
+    "Load score of nodes chosen by the placement scheduler (lower is less loaded)",
+    buckets=[-0.25, 0.0, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0],
+)
+"""
+선택된 노드의 부하 점수 분포 (높은 값이 늘면 전체 노드가 포화 상태)
+"""
+
+
+# ===========================================
+# 노드 프로토콜 메트릭 (Cloud Gateway /ws/node)
+# ===========================================
+
+node_frame_bytes = Histogram(
+    "node_frame_bytes",
+    "Size of frames received from node WebSockets (after permessage-deflate inflation)",
+    ["encoding"],
+    buckets=[256, 512, 1024, 2048, 4096, 8192, 16384, 32768, 65536, 262144, 1048576],
+)
+"""
+노드 → 게이트웨이 프레임 크기 (바이너리는 바이트, 텍스트는 문자 수)
+
+Labels:
+    encoding: 협상된 인코딩 (json, msgpack)
+"""
+
+node_snapshot_frames_total = Counter(
+    "node_snapshot_frames_total",
+    "Device snapshots received in node heartbeats",
+    ["kind"],
+)
+"""
+HEARTBEAT 디바이스 스냅샷 종류
+
+Labels:
+    kind: full - 전체 (v1 또는 v2 첫 전송), delta - 기준 대비 변경분, resync - 기준 없음 → 전체 재요청
+"""
+
+
+# ===========================================
+# 명령 추적 메트릭 (Cloud Gateway 명령 RESULT 대기)
+# ===========================================
+
+commands_inflight = Gauge(
+    "commands_inflight",
+    "Commands sent by the gateway that are waiting for a RESULT",
+)
+"""
+RESULT 대기 중인 명령 수 (max_inflight에 가까우면 새 명령이 503)
+"""
+
+command_inflight_age_seconds = Gauge(
+    "command_inflight_age_seconds",
+    "Age of in-flight commands by quantile (quantile=1 is the oldest)",
+    ["quantile"],
+)
+"""
+대기 중인 명령 나이 백분위 (틱마다 갱신)
+
+Labels:
+    quantile: 0.5, 0.9, 0.99, 1 (가장 오래된 명령)
+"""
+
+commands_finished_total = Counter(
+    "commands_finished_total",
+    "Tracked commands that left the in-flight table",
+    ["result"],
+)
+"""
+추적 종료된 명령 수
+
+Labels:
+    result: completed - RESULT 수신, expired - 마감 초과, cancelled - 전송 실패/종료,
+            rejected - 테이블이 가득 차 등록 거부
+"""
+
+command_latency_seconds = Histogram(
+    "command_latency_seconds",
+    "Time from sending a tracked command to receiving its RESULT",
+    buckets=[0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0],
+)
+"""
+명령 전송 → RESULT 수신 시간 (completed만)
+"""
+
+
+# ===========================================
+# 게이트웨이 클러스터 메트릭 (인스턴스 간 라우팅)
+# ===========================================
+
+cluster_requests_total = Counter(
+    "cluster_requests_total",
+    "Requests forwarded to the gateway instance that owns the target node",
+    ["action", "result"],
+)
+"""
+다른 인스턴스로 전달한 요청 수
+
+Labels:
+    action: command - /api/command, direct - /api/nodes/{id}/command, send - 브로드캐스트 전송
+    result: ok - 응답 수신, timeout - 응답 없음, error - 전달/처리 실패
+"""
+
+cluster_events_total = Counter(
+    "cluster_events_total",
+    "Dashboard events exchanged between gateway instances",
+    ["direction"],
+)
+"""
+인스턴스 간 대시보드 이벤트 수
+
+Labels:
+    direction: published - 발행, received - 다른 인스턴스에서 수신, dropped - 큐 초과/발행 실패로 버림
+"""
+
+cluster_instances = Gauge(
+    "cluster_instances",
+    "Live gateway instances seen in the shared registry",
+)
+"""
+살아 있는 게이트웨이 인스턴스 수 (자기 자신 포함, 동기화마다 갱신)
+"""
@@ -0,0 +1,227 @@
+"""
+📦 DoAi.Me 노드 프로토콜 v2
+HELLO에서 협상하는 프레임 인코딩 + 디바이스 스냅샷 델타
+
+왜 이 구조인가?
+- v1 HEARTBEAT는 30초마다 device_snapshot 전체를 JSON으로 전송
+  → 노드당 디바이스 100대면 대부분 바뀌지 않은 값을 매번 직렬화/전송/파싱
+- v2는 HELLO payload의 protocol 제안을 게이트웨이가 HELLO_ACK로 확정 (v2를 모르는 쪽이 있으면 v1 그대로)
+  → 노드/게이트웨이를 따로 배포해도 호환
+- 인코딩: msgpack (설치돼 있으면, 바이너리 프레임) 또는 JSON (텍스트 프레임)
+  → msgpack은 선택 의존성, 없는 쪽이 있으면 JSON으로 협상
+- 전송 압축은 WebSocket permessage-deflate (websockets/uvicorn 기본 확장)에 맡김
+- 디바이스 스냅샷은 "마지막으로 ACK된 버전" 기준 델타
+  - 노드: 보낸 버전을 보관하다가 HEARTBEAT_ACK의 device_snapshot_version으로 기준 갱신
+    → ACK가 유실돼도 이전 기준으로 계속 델타 (게이트웨이는 최근 버전 몇 개를 보관)
+  - 게이트웨이: 기준 버전이 없으면 device_snapshot_resync → 노드는 다음 HEARTBEAT에 전체 전송
+- HELLO 서명(sort_keys 정규화)은 그대로 JSON - 핸드셰이크 1회뿐이라 비용 무시 가능
+- 노드 러너도 import하므로 표준 라이브러리 외 필수 의존성 없음 (prometheus 등 미사용)
+
+사용 예:
+    from shared.node_protocol import FrameCodec, SnapshotDecoder, SnapshotEncoder, negotiate
+
+    # 게이트웨이
+    protocol = negotiate(hello["payload"].get("protocol"))   # None이면 v1
+    codec = FrameCodec(protocol["encoding"]) if protocol else JSON_CODEC
+    devices = decoder.apply(heartbeat["payload"])             # None이면 resync 요청
+
+    # 노드
+    fields = encoder.encode(devices)   # device_snapshot 또는 device_delta
+    encoder.ack(ack["payload"]["device_snapshot_version"])
+"""
+
+import json
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+PROTOCOL_V1 = "1.0"
+PROTOCOL_V2 = "2.0"
+
+JSON = "json"
+MSGPACK = "msgpack"
+
+Frame = Union[str, bytes]
+
+
+def supported_encodings() -> List[str]:
+    """이 프로세스에서 쓸 수 있는 인코딩 (선호 순)"""
+    return [MSGPACK, JSON] if msgpack is not None else [JSON]
+
+
+def hello_offer() -> Dict[str, Any]:
+    """노드 HELLO payload["protocol"]"""
+    return {
+        "versions": [PROTOCOL_V2, PROTOCOL_V1],
+        "encodings": supported_encodings(),
+        "snapshot_deltas": True,
+    }
+
+
+def negotiate(offer: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    노드 제안 → 확정 (HELLO_ACK payload["protocol"])
+
+    Returns:
+        {"version", "encoding", "snapshot_deltas"} - 제안이 없거나 v2가 없으면 None (v1)
+    """
+    if not isinstance(offer, dict) or PROTOCOL_V2 not in offer.get("versions", []):
+        return None
+    ours = supported_encodings()
+    encoding = next((e for e in offer.get("encodings", []) if e in ours), JSON)
+    return {
+        "version": PROTOCOL_V2,
+        "encoding": encoding,
+        "snapshot_deltas": bool(offer.get("snapshot_deltas", False)),
+    }
+
+
+class FrameCodec:
+    """
+    메시지 ↔ WebSocket 프레임
+
+    msgpack은 바이너리 프레임, JSON은 텍스트 프레임
+    decode는 프레임 종류로 판단 (협상 전/후 프레임이 섞여도 안전)
+    """
+
+    def __init__(self, encoding: str = JSON):
+        if encoding not in (JSON, MSGPACK):
+            raise ValueError(f"Unknown frame encoding: {encoding}")
+        if encoding == MSGPACK and msgpack is None:
+            raise ValueError("msgpack encoding requires the msgpack package")
+        self.encoding = encoding
+        self.binary = encoding == MSGPACK
+
+    def encode(self, message: Dict[str, Any]) -> Frame:
+        if self.binary:
+            return msgpack.packb(message, use_bin_type=True)
+        if orjson is not None:
+            return orjson.dumps(message, default=str).decode("utf-8")
+        return json.dumps(message, ensure_ascii=False, separators=(",", ":"), default=str)
+
+    def decode(self, frame: Frame) -> Dict[str, Any]:
+        if isinstance(frame, (bytes, bytearray)):
+            if msgpack is None:
+                raise ValueError("Binary frame received but msgpack is not installed")
+            return msgpack.unpackb(frame, raw=False)
+        if orjson is not None:
+            return orjson.loads(frame)
+        return json.loads(frame)
+
+
+JSON_CODEC = FrameCodec(JSON)
+
+
+def device_key(device: Dict[str, Any]) -> Any:
+    """디바이스 식별 키 (serial, 없으면 slot)"""
+    return device.get("serial", device.get("slot"))
+
+
+class SnapshotEncoder:
+    """
+    노드 측: 디바이스 스냅샷 → HEARTBEAT 필드
+
+    ACK된 기준이 없으면 전체 (device_snapshot), 있으면 기준 대비 델타 (device_delta)
+
+    Args:
+        max_pending: ACK를 기다리는 버전 최대 보관 수
+    """
+
+    def __init__(self, max_pending: int = 8):
+        self.max_pending = max_pending
+        self.version = 0
+        self._acked_version: Optional[int] = None
+        self._acked: Dict[Any, Dict] = {}
+        self._pending: "OrderedDict[int, Dict[Any, Dict]]" = OrderedDict()
+
+    def encode(self, devices: List[Dict[str, Any]]) -> Dict[str, Any]:
+        self.version += 1
+        current = {device_key(d): dict(d) for d in devices}
+        self._pending[self.version] = current
+        while len(self._pending) > self.max_pending:
+            self._pending.popitem(last=False)
+
+        if self._acked_version is None:
+            return {"device_snapshot_version": self.version, "device_snapshot": list(devices)}
+
+        return {
+            "device_snapshot_version": self.version,
+            "device_delta": {
+                "base": self._acked_version,
+                "upsert": [d for key, d in current.items() if self._acked.get(key) != d],
+                "removed": [key for key in self._acked if key not in current],
+            },
+        }
+
+    def ack(self, version: int) -> None:
+        """게이트웨이가 반영한 버전 → 다음 델타의 기준"""
+        state = self._pending.get(version)
+        if state is None:
+            return
+        self._acked_version, self._acked = version, state
+        for pending in list(self._pending):
+            if pending <= version:
+                del self._pending[pending]
+
+    def reset(self) -> None:
+        """기준 폐기 (device_snapshot_resync) → 다음은 전체 스냅샷"""
+        self._acked_version = None
+        self._acked = {}
+        self._pending.clear()
+
+
+class SnapshotDecoder:
+    """
+    게이트웨이 측: HEARTBEAT payload → 전체 디바이스 스냅샷
+
+    v1 payload (device_snapshot만, 버전 없음)도 그대로 처리
+
+    Args:
+        history: 보관할 최근 버전 수 (노드가 ACK를 못 받아 이전 기준으로 보낸 델타 처리용)
+    """
+
+    def __init__(self, history: int = 4):
+        self.history = history
+        self.version: Optional[int] = None
+        self.devices: List[Dict[str, Any]] = []
+        self._states: "OrderedDict[int, Dict[Any, Dict]]" = OrderedDict()
+
+    def apply(self, payload: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Returns:
+            전체 디바이스 목록 - 델타의 기준 버전이 없으면 None (resync 필요, devices는 이전 값 유지)
+        """
+        delta = payload.get("device_delta")
+        version = payload.get("device_snapshot_version")
+        if delta is None and version is None:
+            # v1: 전체 스냅샷 그대로 (키가 없는 디바이스도 유지)
+            self.devices = list(payload.get("device_snapshot") or [])
+            return self.devices
+
+        if delta is not None:
+            base = self._states.get(delta.get("base"))
+            if base is None:
+                return None
+            state = dict(base)
+            for device in delta.get("upsert", []):
+                state[device_key(device)] = device
+            for key in delta.get("removed", []):
+                state.pop(key, None)
+        else:
+            state = {device_key(d): d for d in payload.get("device_snapshot") or []}
+
+        self._states[version] = state
+        while len(self._states) > self.history:
+            self._states.popitem(last=False)
+        self.version = version
+        self.devices = list(state.values())
+        return self.devices
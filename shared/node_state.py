@@ -0,0 +1,173 @@
+"""
+🗂️ DoAi.Me 노드 상태 테이블
+버전이 붙은 노드 상태 + 틱 단위로 합친 변경분(delta) 생성
+
+왜 이 구조인가?
+- 기존에는 하트비트마다 NODE_UPDATE 전체를 모든 대시보드에 Push
+  → 노드 600대면 대시보드당 초당 20개, 대부분 값은 그대로
+- 상태 변경은 테이블에만 반영하고, 틱마다 take_delta()로 바뀐 필드만 모아 프레임 1개로 전송
+  → 틱 사이에 같은 노드가 여러 번 바뀌어도 마지막 값만 전송
+- 변경마다 전역 버전을 올리고 필드별 버전을 기록
+  → 재연결한 대시보드는 since(N)으로 N 이후 바뀐 필드만 받음 (전체 덤프 불필요)
+- epoch은 프로세스마다 새로 생성 → 게이트웨이 재시작 후의 since 요청은 전체 스냅샷으로 응답
+- 제거된 노드는 tombstone(버전)으로 기억, 상한을 넘으면 오래된 것부터 잊음
+  → 잊은 구간 이전 버전의 since 요청은 전체 스냅샷
+
+프레임 형식:
+    {"type": "INIT", "epoch": "...", "version": 42, "nodes": [{...}, ...]}
+    {"type": "NODE_DELTA", "epoch": "...", "from_version": 40, "version": 42,
+     "changed": {"node_01": {"status": "BUSY"}}, "removed": ["node_07"]}
+
+클라이언트 규칙:
+- INIT을 받으면 테이블을 교체하고 version 저장
+- NODE_DELTA는 from_version <= 내 version < version일 때 removed → changed 순서로 적용
+  (제거 후 다시 연결된 노드는 양쪽에 모두 나옴 → 이전 행의 필드가 남지 않음)
+  (값은 절대값이라 같은 변경을 두 번 적용해도 결과 동일)
+- from_version > 내 version이면 빠진 구간이 있으므로 since(내 version) 요청
+
+사용 예:
+    from shared.node_state import NodeStateTable
+
+    table = NodeStateTable()
+    table.update("node_01", {"status": "READY", "device_count": 20})
+    table.remove("node_07")
+
+    frame = table.take_delta()   # 틱마다, 변경이 없으면 None
+    frame = table.since(40, epoch)  # 재연결 시
+"""
+
+import uuid
+from typing import Any, Dict, List, Optional, Set
+
+_MISSING = object()
+
+
+class NodeStateTable:
+    """
+    버전 관리 노드 상태 테이블
+
+    Args:
+        max_tombstones: 기억할 제거 노드 수 (초과 시 오래된 것부터 잊고 since 가능 범위 축소)
+    """
+
+    def __init__(self, max_tombstones: int = 10000):
+        self.epoch = uuid.uuid4().hex[:12]
+        self.version = 0
+        self.max_tombstones = max_tombstones
+
+        self._rows: Dict[str, Dict[str, Any]] = {}
+        self._field_versions: Dict[str, Dict[str, int]] = {}
+        self._tombstones: Dict[str, int] = {}  # 삽입 순서 = 제거 순서
+        self._horizon = 0  # 이 버전 이하의 since 요청은 전체 스냅샷
+
+        # 마지막 take_delta 이후 변경분 (노드별로 합침)
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._pending_removed: Set[str] = set()
+        self._delta_version = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get(self, node_id: str) -> Optional[Dict[str, Any]]:
+        row = self._rows.get(node_id)
+        return dict(row) if row is not None else None
+
+    def update(self, node_id: str, fields: Dict[str, Any]) -> bool:
+        """
+        노드 필드 갱신 (값이 바뀐 필드만 반영)
+
+        Returns:
+            바뀐 필드가 있었는지
+        """
+        row = self._rows.get(node_id)
+        if row is None:
+            row = self._rows[node_id] = {"node_id": node_id}
+            self._field_versions[node_id] = {}
+            changed = dict(row, **fields)
+        else:
+            changed = {k: v for k, v in fields.items() if row.get(k, _MISSING) != v}
+            if not changed:
+                return False
+
+        self.version += 1
+        row.update(changed)
+        versions = self._field_versions[node_id]
+        for key in changed:
+            versions[key] = self.version
+        self._pending.setdefault(node_id, {}).update(changed)
+        return True
+
+    def remove(self, node_id: str) -> bool:
+        """노드 제거 (tombstone 기록)"""
+        if self._rows.pop(node_id, None) is None:
+            return False
+
+        self.version += 1
+        del self._field_versions[node_id]
+        self._pending.pop(node_id, None)
+        self._pending_removed.add(node_id)
+
+        self._tombstones.pop(node_id, None)  # 다시 제거된 노드는 맨 뒤로
+        self._tombstones[node_id] = self.version
+        while len(self._tombstones) > self.max_tombstones:
+            oldest = next(iter(self._tombstones))
+            self._horizon = max(self._horizon, self._tombstones.pop(oldest))
+        return True
+
+    def take_delta(self) -> Optional[Dict[str, Any]]:
+        """마지막 호출 이후 변경분을 프레임 1개로 (변경이 없으면 None)"""
+        if not self._pending and not self._pending_removed:
+            return None
+
+        frame = {
+            "type": "NODE_DELTA",
+            "epoch": self.epoch,
+            "from_version": self._delta_version,
+            "version": self.version,
+            "changed": self._pending,
+            "removed": sorted(self._pending_removed),
+        }
+        self._pending = {}
+        self._pending_removed = set()
+        self._delta_version = self.version
+        return frame
+
+    def snapshot(self) -> Dict[str, Any]:
+        """전체 상태 (INIT 프레임)"""
+        nodes = [dict(row) for row in self._rows.values()]
+        return {"type": "INIT", "epoch": self.epoch, "version": self.version, "nodes": nodes}
+
+    def since(self, version: int, epoch: Optional[str] = None) -> Dict[str, Any]:
+        """
+        version 이후 변경분 (재연결용)
+
+        epoch이 다르거나 version이 기억 범위 밖이면 전체 스냅샷(INIT)
+        """
+        if epoch != self.epoch or version < self._horizon or version > self.version:
+            return self.snapshot()
+
+        changed: Dict[str, Dict[str, Any]] = {}
+        for node_id, versions in self._field_versions.items():
+            row = self._rows[node_id]
+            fields = {key: row[key] for key, v in versions.items() if v > version}
+            if fields:
+                changed[node_id] = fields
+        removed: List[str] = sorted(
+            node_id for node_id, v in self._tombstones.items() if v > version
+        )
+        return {
+            "type": "NODE_DELTA",
+            "epoch": self.epoch,
+            "from_version": version,
+            "version": self.version,
+            "changed": changed,
+            "removed": removed,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "nodes": len(self._rows),
+            "version": self.version,
+            "pending": len(self._pending) + len(self._pending_removed),
+            "tombstones": len(self._tombstones),
+        }
@@ -0,0 +1,208 @@
+"""
+📡 DoAi.Me OOB 메트릭 전달기
+Cloud Gateway가 받은 노드 메트릭을 OOB API로 모아서 전달
+
+왜 이 구조인가?
+- 기존에는 하트비트마다 aiohttp.ClientSession을 새로 만들어 POST
+  → 하트비트 1회 = TCP(+TLS) 연결 1회, 그동안 하트비트 핸들러도 대기
+- 세션 1개를 재사용 (커넥션 풀 + keep-alive)
+- submit()은 await 없이 큐에 넣기만 함 → 하트비트 처리 경로에서 네트워크 제거
+- 여러 노드의 메트릭을 POST 1회로 전송 (OOB /oob/metrics/bulk)
+- 큐는 크기 제한 deque → OOB가 느리거나 죽으면 가장 오래된 항목부터 버림
+  → OOB 메트릭은 최신 값만 의미 있고, 다음 하트비트가 곧 다시 채움
+- 전송 실패 시 재시도하지 않음 (같은 이유)
+
+사용 예:
+    from shared.oob_forwarder import OOBForwarder
+
+    forwarder = OOBForwarder("http://oob:8000/oob/metrics/bulk")
+    await forwarder.start()
+    forwarder.submit("node_01", {"device_count": 20, "status": "READY"})
+    ...
+    await forwarder.stop()  # 남은 항목 전송 후 세션 종료
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+
+    logger = logging.getLogger(__name__)
+    logging.basicConfig(level=logging.INFO)
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from shared.monitoring.metrics import (
+    oob_forward_batch_size,
+    oob_forward_batches_total,
+    oob_forward_dropped_total,
+    oob_forward_lag_seconds,
+    oob_forward_queue_depth,
+)
+
+
+class OOBForwarder:
+    """
+    OOB 메트릭 일괄 전달기
+
+    Args:
+        url: 일괄 수신 엔드포인트 (POST {"nodes": [...]})
+        max_batch: POST 1회당 최대 노드 메트릭 수
+        max_delay: 첫 항목이 들어온 뒤 전송까지 최대 대기 (초)
+        max_queue: 큐 최대 길이 (초과 시 가장 오래된 항목 버림)
+        timeout: POST 1회 타임아웃 (초)
+        session: 외부에서 관리하는 aiohttp 세션 (없으면 start()에서 생성, stop()에서 종료)
+    """
+
+    def __init__(
+        self,
+        url: Optional[str],
+        max_batch: int = 200,
+        max_delay: float = 1.0,
+        max_queue: int = 5000,
+        timeout: float = 5.0,
+        session: Any = None,
+    ):
+        self.url = url
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.timeout = timeout
+
+        self._queue: Deque[Tuple[float, Dict[str, Any]]] = deque(maxlen=max_queue)
+        self._session = session
+        self._owns_session = session is None
+        self._wakeup = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        self.sent = 0
+        self.dropped = 0
+        self.failed_batches = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.url) and (self._session is not None or aiohttp is not None)
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def submit(self, node_id: str, metrics: Dict[str, Any]) -> None:
+        """메트릭 추가 (await 없음, 큐가 가득 차면 가장 오래된 항목을 밀어냄)"""
+        if not self.enabled:
+            return
+
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+            oob_forward_dropped_total.labels(reason="queue_full").inc()
+
+        self._queue.append((time.monotonic(), {"node_id": node_id, **metrics}))
+        oob_forward_queue_depth.set(len(self._queue))
+        if len(self._queue) >= self.max_batch:
+            self._full.set()
+        self._wakeup.set()
+
+    async def start(self) -> None:
+        """세션 생성 + 전송 루프 시작"""
+        if not self.enabled:
+            logger.info("OOB 메트릭 전달 비활성화 (URL 없음 또는 aiohttp 미설치)")
+            return
+
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=4, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """전송 루프 종료 → 남은 항목 전송 → 세션 종료"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._session is not None:
+            try:
+                await asyncio.wait_for(self.flush_all(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"OOB 메트릭 전달기 종료: {len(self._queue)}개 미전송")
+
+            if self._owns_session:
+                await self._session.close()
+                self._session = None
+
+    async def flush_all(self) -> None:
+        """큐가 빌 때까지 즉시 전송"""
+        while self._queue:
+            await self._send(self._take())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": len(self._queue),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "failed_batches": self.failed_batches,
+        }
+
+    # ---------- internals ----------
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+
+            # OOB는 지연에 둔감 → max_delay 동안 모아서 전송, max_batch가 차면 바로
+            if len(self._queue) < self.max_batch:
+                self._full.clear()
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.max_delay)
+                except asyncio.TimeoutError:
+                    pass
+
+            batch = self._take()
+            if batch:
+                await self._send(batch)
+
+    def _take(self) -> List[Tuple[float, Dict[str, Any]]]:
+        count = min(self.max_batch, len(self._queue))
+        batch = [self._queue.popleft() for _ in range(count)]
+        if not self._queue:
+            self._wakeup.clear()
+        oob_forward_queue_depth.set(len(self._queue))
+        return batch
+
+    async def _send(self, batch: List[Tuple[float, Dict[str, Any]]]) -> None:
+        if not batch:
+            return
+
+        payload = {"nodes": [metrics for _, metrics in batch]}
+        oob_forward_batch_size.observe(len(batch))
+        try:
+            async with self._session.post(self.url, json=payload) as resp:
+                if resp.status >= 400:
+                    raise RuntimeError(f"HTTP {resp.status}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            result = "http_error" if isinstance(e, RuntimeError) else "error"
+            oob_forward_batches_total.labels(result=result).inc()
+            oob_forward_dropped_total.labels(reason="send_error").inc(len(batch))
+            self.failed_batches += 1
+            self.dropped += len(batch)
+            logger.debug(f"OOB 메트릭 전송 실패 ({len(batch)}개): {e}")
+            return
+
+        oob_forward_batches_total.labels(result="ok").inc()
+        oob_forward_lag_seconds.observe(time.monotonic() - batch[0][0])
+        self.sent += len(batch)
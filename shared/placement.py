@@ -0,0 +1,257 @@
+"""
+⚖️ DoAi.Me 명령 배치 스케줄러
+노드 부하 점수 기반으로 명령을 보낼 노드 선택
+
+왜 이 구조인가?
+- 기존 /api/broadcast는 get_ready_nodes()의 앞쪽 target_node_count개 (= 먼저 연결된 노드)
+  → 부하가 먼저 연결된 노드에 몰림
+- 노드 점수 (낮을수록 여유) = 태스크 슬롯 사용률 + CPU + 메모리 + 최근 실패율 - 디바이스 수 보너스
+  → 하트비트 resources(cpu_percent, memory_percent)와 RESULT 성공/실패를 그대로 사용
+- 선택 전략
+  - p2c (power of two choices): 임의의 두 노드 중 점수가 낮은 쪽
+    → 하트비트 주기(30초) 동안 부하 정보가 낡아도 한 노드로 몰리지 않음 (기본값)
+  - least_loaded: 점수가 가장 낮은 노드 (동점은 무작위)
+- 브로드캐스트의 디바이스 수는 점수 순으로 균등 분배 (노드별 할당 차이 최대 1, 디바이스 수 상한)
+- 최근 결정과 입력값을 decisions()로 노출 (디버깅용 /api/placement)
+
+사용 예:
+    from shared.placement import NodeLoad, PlacementScheduler
+
+    scheduler = PlacementScheduler(strategy="p2c")
+    loads = [NodeLoad("node_01", active_tasks=1, max_tasks=5, device_count=20, cpu=35.0)]
+    node = scheduler.pick(loads)                # 1개
+    nodes = scheduler.select(loads, 10)         # 점수 순 10개
+    plan = scheduler.spread(loads, devices=300) # [(NodeLoad, 디바이스 수), ...]
+    scheduler.record_result("node_01", success=False)
+"""
+
+import random
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from shared.monitoring.metrics import placement_chosen_score, placement_decisions_total
+
+STRATEGIES = ("p2c", "least_loaded")
+
+DEFAULT_WEIGHTS = {
+    "tasks": 1.0,  # active_tasks / max_tasks
+    "cpu": 0.5,  # cpu_percent / 100
+    "memory": 0.3,  # memory_percent / 100
+    "failures": 1.0,  # 최근 실패율
+    "devices": 0.3,  # 디바이스 수 / 후보 중 최대 (보너스)
+}
+
+
+@dataclass
+class NodeLoad:
+    """점수 계산 입력"""
+
+    node_id: str
+    active_tasks: int = 0
+    max_tasks: int = 5
+    device_count: int = 0
+    cpu: Optional[float] = None  # %
+    memory: Optional[float] = None  # %
+
+
+class PlacementScheduler:
+    """
+    부하 기반 노드 선택
+
+    Args:
+        strategy: p2c | least_loaded
+        weights: 점수 가중치 (DEFAULT_WEIGHTS 일부만 덮어써도 됨)
+        failure_window: 실패율 계산 구간 (초)
+        failure_history: 노드별 보관할 최근 결과 수
+        max_decisions: 보관할 최근 결정 수
+        rng: 테스트용 난수 생성기
+    """
+
+    def __init__(
+        self,
+        strategy: str = "p2c",
+        weights: Optional[Dict[str, float]] = None,
+        failure_window: float = 600.0,
+        failure_history: int = 50,
+        max_decisions: int = 100,
+        rng: Optional[random.Random] = None,
+    ):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown placement strategy: {strategy} (expected {STRATEGIES})")
+        self.strategy = strategy
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self.failure_window = failure_window
+        self.failure_history = failure_history
+        self._rng = rng or random.Random()
+        self._results: Dict[str, Deque[Tuple[float, bool]]] = {}
+        self._decisions: Deque[Dict[str, Any]] = deque(maxlen=max_decisions)
+
+    # ---------- inputs ----------
+
+    def record_result(self, node_id: str, success: bool) -> None:
+        """명령 결과 기록 (실패율 입력)"""
+        history = self._results.get(node_id)
+        if history is None:
+            history = self._results[node_id] = deque(maxlen=self.failure_history)
+        history.append((time.monotonic(), success))
+
+    def forget(self, node_id: str) -> None:
+        self._results.pop(node_id, None)
+
+    def failure_rate(self, node_id: str) -> float:
+        """failure_window 안의 실패 비율 (기록 없으면 0)"""
+        history = self._results.get(node_id)
+        if not history:
+            return 0.0
+        cutoff = time.monotonic() - self.failure_window
+        recent = [ok for at, ok in history if at >= cutoff]
+        if not recent:
+            return 0.0
+        return recent.count(False) / len(recent)
+
+    def score(self, load: NodeLoad, max_devices: int = 0) -> Tuple[float, Dict[str, float]]:
+        """
+        노드 점수 (낮을수록 여유)
+
+        Returns:
+            (점수, 항목별 입력값 0~1)
+        """
+        inputs = {
+            "tasks": min(load.active_tasks / load.max_tasks, 1.0) if load.max_tasks > 0 else 1.0,
+            "cpu": _percent(load.cpu),
+            "memory": _percent(load.memory),
+            "failures": self.failure_rate(load.node_id),
+            "devices": load.device_count / max_devices if max_devices > 0 else 0.0,
+        }
+        w = self.weights
+        total = (
+            w["tasks"] * inputs["tasks"]
+            + w["cpu"] * inputs["cpu"]
+            + w["memory"] * inputs["memory"]
+            + w["failures"] * inputs["failures"]
+            - w["devices"] * inputs["devices"]
+        )
+        return round(total, 6), inputs
+
+    # ---------- selection ----------
+
+    def pick(self, candidates: Iterable[NodeLoad]) -> Optional[NodeLoad]:
+        """노드 1개 선택 (strategy에 따라 p2c 또는 최소 점수)"""
+        scored = self._score_all(candidates)
+        if not scored:
+            return None
+
+        if self.strategy == "p2c" and len(scored) > 2:
+            pair = self._rng.sample(scored, 2)
+            chosen = min(pair, key=lambda item: item[1])
+            considered = pair
+        else:
+            best = min(item[1] for item in scored)
+            chosen = self._rng.choice([item for item in scored if item[1] == best])
+            considered = scored
+
+        self._record("pick", considered, [(chosen[0], None)])
+        return chosen[0]
+
+    def select(self, candidates: Iterable[NodeLoad], count: int) -> List[NodeLoad]:
+        """점수가 낮은 순으로 최대 count개 (count <= 0이면 전체)"""
+        scored = sorted(self._score_all(candidates), key=lambda item: item[1])
+        chosen = scored[:count] if count > 0 else scored
+        self._record("select", scored, [(load, None) for load, _, _ in chosen])
+        return [load for load, _, _ in chosen]
+
+    def spread(self, candidates: Iterable[NodeLoad], devices: int) -> List[Tuple[NodeLoad, int]]:
+        """
+        디바이스 devices개를 노드에 균등 분배
+
+        점수 순으로 돌아가며 채움 → 노드별 할당 차이 최대 1 (디바이스 수가 모자란 노드 제외),
+        나머지는 점수가 낮은 노드부터
+
+        Returns:
+            [(노드, 할당 디바이스 수)] - 할당 0인 노드 제외, 점수 순
+        """
+        scored = sorted(self._score_all(candidates), key=lambda item: item[1])
+        quotas = {load.node_id: 0 for load, _, _ in scored}
+        active = [load for load, _, _ in scored if load.device_count > 0]
+        remaining = max(devices, 0)
+
+        while remaining > 0 and active:
+            share = max(1, remaining // len(active))
+            still_open = []
+            for load in active:
+                if remaining == 0:
+                    break
+                give = min(share, load.device_count - quotas[load.node_id], remaining)
+                quotas[load.node_id] += give
+                remaining -= give
+                if quotas[load.node_id] < load.device_count:
+                    still_open.append(load)
+            active = still_open
+
+        plan = [(load, quotas[load.node_id]) for load, _, _ in scored if quotas[load.node_id] > 0]
+        self._record("spread", scored, plan, requested=devices)
+        return plan
+
+    # ---------- debugging ----------
+
+    def decisions(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """최근 결정 (최신 순)"""
+        return list(self._decisions)[::-1][:limit]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "strategy": self.strategy,
+            "weights": dict(self.weights),
+            "failure_rates": {
+                node_id: round(self.failure_rate(node_id), 3) for node_id in self._results
+            },
+        }
+
+    # ---------- internals ----------
+
+    def _score_all(self, candidates: Iterable[NodeLoad]) -> List[Tuple[NodeLoad, float, Dict]]:
+        loads = list(candidates)
+        max_devices = max((load.device_count for load in loads), default=0)
+        return [(load, *self.score(load, max_devices)) for load in loads]
+
+    def _record(
+        self,
+        kind: str,
+        considered: List[Tuple[NodeLoad, float, Dict]],
+        chosen: List[Tuple[NodeLoad, Optional[int]]],
+        max_candidates: int = 20,
+        **extra: Any,
+    ) -> None:
+        """결정 기록 (후보는 점수 낮은 순 max_candidates개만)"""
+        placement_decisions_total.labels(kind=kind, strategy=self.strategy).inc()
+        scores = {load.node_id: score for load, score, _ in considered}
+        for load, _ in chosen:
+            placement_chosen_score.observe(scores[load.node_id])
+
+        top = sorted(considered, key=lambda item: item[1])[:max_candidates]
+        self._decisions.append(
+            {
+                "at": datetime.now(timezone.utc).isoformat(),
+                "kind": kind,
+                "strategy": self.strategy,
+                "candidates_total": len(considered),
+                "candidates": [
+                    {**asdict(load), "score": score, "inputs": inputs}
+                    for load, score, inputs in top
+                ],
+                "chosen": [
+                    {"node_id": load.node_id, **({"devices": n} if n is not None else {})}
+                    for load, n in chosen
+                ],
+                **extra,
+            }
+        )
+
+
+def _percent(value: Optional[float]) -> float:
+    if value is None:
+        return 0.0
+    return min(max(float(value), 0.0), 100.0) / 100.0
@@ -0,0 +1,167 @@
+"""
+🗄️ DoAi.Me Read-through 쿼리 캐시
+대시보드가 같은 파라미터로 반복 호출하는 조회 메서드를 shared.cache 위에서 캐싱
+
+왜 이 구조인가?
+- 대시보드 폴링은 같은 목록 조회를 수 초 간격으로 반복 → 대부분 같은 결과
+- 데코레이터로 붙여 조회 메서드 본문은 그대로 유지
+- 태그 버전 방식 무효화
+  - 캐시 키에 태그별 버전 번호를 포함
+  - 쓰기 메서드는 태그 버전만 증가 → 이전 키는 더 이상 조회되지 않고 TTL로 소멸
+  - Redis SCAN/KEYS 없이 태그 수만큼의 연산으로 무효화, 메모리 백엔드에서도 동일하게 동작
+- 다른 프로세스(PC Agent 등)의 쓰기는 무효화되지 않으므로 TTL을 짧게 유지
+
+사용 예:
+    from shared.query_cache import cached, invalidates
+
+    class DeviceRepository:
+        @cached("devices.get_all", ttl=5, tags=["devices"])
+        async def get_all(self, status=None): ...
+
+        @invalidates("devices")
+        async def update_status(self, serial_number, status): ...
+
+환경 변수:
+- QUERY_CACHE_ENABLED: 0이면 캐시를 거치지 않음 (기본 1)
+"""
+
+import copy
+import functools
+import hashlib
+import inspect
+import json
+import os
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, TypeVar
+
+from shared.cache import CacheKey, get_cache
+from shared.monitoring.metrics import (
+    query_cache_hits_total,
+    query_cache_invalidations_total,
+    query_cache_misses_total,
+)
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+# 태그 버전 키 수명 (캐시 항목 TTL보다 충분히 길어야 버전 재사용으로 인한 오조회가 없음)
+TAG_VERSION_TTL = 7 * 24 * 3600
+
+
+def is_enabled() -> bool:
+    """캐시 사용 여부 (호출 시점에 평가하여 테스트/운영 중 전환 가능)"""
+    return os.getenv("QUERY_CACHE_ENABLED", "1") != "0"
+
+
+def make_args_key(signature: inspect.Signature, args: tuple, kwargs: Dict[str, Any]) -> str:
+    """
+    호출 인자를 정규화하여 해시 생성
+
+    - 위치/키워드 인자 구분 없이 파라미터 이름으로 바인딩
+    - 기본값을 채워 get_all() 과 get_all(status=None) 이 같은 키가 되도록 함
+    - self/cls는 제외 (인스턴스가 달라도 같은 조회)
+    """
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+
+    arguments = {
+        name: value for name, value in bound.arguments.items() if name not in ("self", "cls")
+    }
+    payload = json.dumps(arguments, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+async def _tag_versions(tags: Sequence[str]) -> List[int]:
+    if not tags:
+        return []
+    versions = await get_cache().get_many(CacheKey.QUERY_TAG, tags)
+    return [int(versions.get(tag) or 0) for tag in tags]
+
+
+async def invalidate_tags(*tags: str) -> None:
+    """
+    태그에 속한 모든 캐시 항목 무효화
+
+    데코레이터를 붙일 수 없는 쓰기 경로(라우터 내부 쿼리 등)에서 직접 호출
+    """
+    if not tags:
+        return
+    await get_cache().incr_many(CacheKey.QUERY_TAG, tags, ttl=TAG_VERSION_TTL)
+    for tag in tags:
+        query_cache_invalidations_total.labels(tag=tag).inc()
+
+
+def cached(
+    name: str,
+    ttl: int = 30,
+    tags: Iterable[str] = (),
+    unless: Optional[Callable[[Any], bool]] = None,
+) -> Callable[[F], F]:
+    """
+    Read-through 캐시 데코레이터
+
+    Args:
+        name: 캐시 이름 (키 접두사 및 메트릭 레이블)
+        ttl: 캐시 유지 시간 (초)
+        tags: 무효화 태그 목록
+        unless: True를 반환하면 결과를 캐싱하지 않음 (예: 실패 응답)
+
+    Note:
+        결과는 JSON 직렬화 가능한 값이어야 함 (Redis 백엔드)
+        None/빈 목록도 그대로 캐싱
+    """
+    tags = tuple(tags)
+
+    def decorator(func: F) -> F:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not is_enabled():
+                return await func(*args, **kwargs)
+
+            cache = get_cache()
+            versions = ".".join(str(v) for v in await _tag_versions(tags))
+            args_key = make_args_key(signature, args, kwargs)
+
+            # {"value": ...}로 감싸 None 결과와 캐시 미스를 구분
+            # 메모리 백엔드는 객체를 그대로 보관하므로 저장/반환 시 복사하여 호출자 변경이 번지지 않게 함
+            entry = await cache.get(CacheKey.QUERY, name, versions, args_key)
+            if entry is not None:
+                query_cache_hits_total.labels(query=name).inc()
+                return copy.deepcopy(entry["value"])
+
+            query_cache_misses_total.labels(query=name).inc()
+            value = await func(*args, **kwargs)
+            if unless is not None and unless(value):
+                return value
+
+            await cache.set(
+                CacheKey.QUERY, name, versions, args_key, {"value": copy.deepcopy(value)}, ttl=ttl
+            )
+            return value
+
+        wrapper.cache_name = name
+        wrapper.cache_tags = tags
+        return wrapper
+
+    return decorator
+
+
+def invalidates(*tags: str) -> Callable[[F], F]:
+    """
+    쓰기 메서드 데코레이터: 실행 후 태그 무효화
+
+    쓰기가 예외로 끝나도 일부 반영되었을 수 있으므로 항상 무효화
+    """
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                if is_enabled():
+                    await invalidate_tags(*tags)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,538 @@
+"""
+🚦 DoAi.Me 레이트 리미터
+슬라이딩 윈도우 / 슬라이딩 로그 / 토큰 버킷 (Redis Lua + 메모리)
+
+왜 이 구조인가?
+- 고정 윈도우(INCR + EXPIRE)는 윈도우 경계 직전/직후에 한도의 2배를 허용하고,
+  요청마다 EXPIRE가 TTL을 다시 설정하여 윈도우가 끝나지 않고 계속 밀림
+- Redis 모드: 판정(읽기 → 계산 → 쓰기)이 Lua 스크립트 하나
+  → 여러 프로세스/게이트웨이 인스턴스가 동시에 호출해도 원자적
+  → 시각은 Redis TIME 기준이라 서버 간 시계 차이와 무관
+- 메모리 모드: 판정이 await 없는 동기 코드 → 이벤트 루프 위에서 원자적 (락 불필요)
+  메모리 판정은 Lua와 같은 계산식을 사용하여 두 모드의 결과가 같음
+- Redis 장애 시 프로세스 로컬 판정으로 대체 (제어 평면 전체가 막히지 않음)
+  → 판정 1회는 RATE_LIMIT_REDIS_TIMEOUT 안에 끝남 (멈춘 Redis가 요청을 붙잡지 않음)
+  → 연속 실패 시 쿨다운 동안 Redis를 호출하지 않고 로컬 판정 (요청마다 타임아웃 대기 방지)
+
+알고리즘:
+- SlidingWindowLimiter: 이전/현재 윈도우 카운터의 가중 합 (키당 O(1), 근사치)
+- SlidingLogLimiter: 요청 시각 기록 (정확, 키당 O(limit) → 작은 한도용)
+- TokenBucketLimiter: 초당 rate개 충전, 최대 capacity개까지 버스트 허용
+
+사용 예:
+    from shared.rate_limit import SlidingWindowLimiter, rate_limit_dependency
+
+    limiter = SlidingWindowLimiter("api", limit=100, window=60, redis=redis_client)
+    result = await limiter.hit(client_ip)
+    if not result.allowed:
+        return JSONResponse(status_code=429, headers=result.headers())
+
+    # FastAPI 의존성 (초과 시 429)
+    @app.post("/api/command", dependencies=[Depends(rate_limit_dependency(limiter))])
+
+환경 변수:
+- RATE_LIMIT_TRUST_PROXY: true면 X-Forwarded-For의 마지막 주소를 클라이언트로 사용
+  (리버스 프록시 뒤에서만 사용, 기본 false)
+- RATE_LIMIT_MAX_KEYS: 메모리 모드 리미터당 최대 키 수 (기본 100000, 초과 시 LRU 제거)
+- RATE_LIMIT_REDIS_TIMEOUT: Redis 판정 1회 제한 시간 (초, 기본 0.5)
+- RATE_LIMIT_FAILURE_THRESHOLD: 연속 실패 몇 번에 Redis 호출을 멈출지 (기본 3)
+- RATE_LIMIT_COOLDOWN: Redis 호출을 멈추는 시간 (초, 기본 10)
+"""
+
+import asyncio
+import hashlib
+import math
+import os
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+
+    logger = logging.getLogger(__name__)
+    logging.basicConfig(level=logging.INFO)
+
+from shared.monitoring.metrics import rate_limit_requests_total
+
+TRUST_PROXY_HEADERS = os.getenv("RATE_LIMIT_TRUST_PROXY", "false").lower() == "true"
+MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+REDIS_TIMEOUT = float(os.getenv("RATE_LIMIT_REDIS_TIMEOUT", "0.5"))
+FAILURE_THRESHOLD = int(os.getenv("RATE_LIMIT_FAILURE_THRESHOLD", "3"))
+COOLDOWN = float(os.getenv("RATE_LIMIT_COOLDOWN", "10"))
+
+KEY_PREFIX = "ratelimit"
+
+# Redis 장애 경고 로그 간격 (초) - 요청마다 로그가 쌓이지 않도록
+_WARN_INTERVAL = 30.0
+
+# (허용 여부, 남은 수, 재시도 대기 ms)
+Decision = Tuple[bool, int, int]
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    """레이트 리밋 판정 결과"""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float  # 초 (허용 시 0)
+
+    def headers(self) -> Dict[str, str]:
+        """X-RateLimit-* / Retry-After 응답 헤더"""
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
+
+class RateLimiterBase:
+    """
+    리미터 공통 동작 (Redis 스크립트 실행, 메모리 상태 관리, 메트릭)
+
+    Args:
+        name: 리미터 이름 (Redis 키/메트릭 레이블)
+        redis: redis.asyncio 클라이언트 (None이면 메모리 모드)
+        max_keys: 메모리 모드 최대 키 수
+        redis_timeout: Redis 판정 1회 제한 시간 (초)
+        failure_threshold: 연속 실패 몇 번에 Redis 호출을 멈출지
+        cooldown: Redis 호출을 멈추는 시간 (초)
+        clock: 메모리 모드 / 쿨다운 시계 (초, 테스트용)
+    """
+
+    SCRIPT = ""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        redis: Optional[Any] = None,
+        max_keys: int = MAX_KEYS,
+        redis_timeout: float = REDIS_TIMEOUT,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        cooldown: float = COOLDOWN,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.redis = redis
+        self.max_keys = max_keys
+        self.redis_timeout = redis_timeout
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self._clock = clock
+        self._state: "OrderedDict[str, Any]" = OrderedDict()
+        self._sha = hashlib.sha1(self.SCRIPT.encode()).hexdigest()
+        self._warned_at = 0.0
+        self._failures = 0
+        self._skip_until = 0.0
+
+    @property
+    def limit(self) -> int:
+        raise NotImplementedError
+
+    async def hit(self, key: str, cost: int = 1) -> RateLimitResult:
+        """
+        요청 1건(cost개) 판정 및 기록
+
+        거부된 요청은 기록하지 않음 (재시도가 한도를 더 소모하지 않음)
+        """
+        decision = None
+        if self.redis is not None and self._clock() >= self._skip_until:
+            try:
+                decision = self._parse(await self._eval(key, cost))
+                self._failures = 0
+            except Exception as e:
+                self._record_failure(e)
+
+        if decision is None:
+            decision = self._hit_local(key, cost, int(self._clock() * 1000))
+
+        allowed, remaining, retry_ms = decision
+        if cost:
+            rate_limit_requests_total.labels(
+                limiter=self.name, result="allowed" if allowed else "limited"
+            ).inc()
+        return RateLimitResult(allowed, self.limit, max(0, remaining), retry_ms / 1000)
+
+    async def peek(self, key: str) -> RateLimitResult:
+        """한도를 소모하지 않고 현재 상태 조회"""
+        return await self.hit(key, cost=0)
+
+    def reset(self, key: Optional[str] = None) -> None:
+        """메모리 상태 초기화 (key 생략 시 전체)"""
+        if key is None:
+            self._state.clear()
+        else:
+            self._state.pop(key, None)
+
+    # --- 알고리즘별 구현 ---
+
+    def _script_args(self, cost: int) -> List[Any]:
+        raise NotImplementedError
+
+    def _new_state(self, now: int) -> Any:
+        raise NotImplementedError
+
+    def _decide(self, state: Any, now: int, cost: int) -> Tuple[Decision, Any]:
+        raise NotImplementedError
+
+    # --- 내부 ---
+
+    async def _eval(self, key: str, cost: int) -> Any:
+        # NOSCRIPT 재시도까지 포함해 redis_timeout 안에 끝냄
+        return await asyncio.wait_for(self._run_script(key, cost), self.redis_timeout)
+
+    async def _run_script(self, key: str, cost: int) -> Any:
+        redis_key = f"{KEY_PREFIX}:{self.name}:{key}"
+        args = self._script_args(cost)
+        try:
+            return await self.redis.evalsha(self._sha, 1, redis_key, *args)
+        except Exception as e:
+            # 최초 실행 / Redis 재시작 후에는 스크립트 캐시가 비어 있음
+            if "NOSCRIPT" not in str(e):
+                raise
+            return await self.redis.eval(self.SCRIPT, 1, redis_key, *args)
+
+    @staticmethod
+    def _parse(reply: Any) -> Decision:
+        allowed, remaining, retry_ms = (int(value) for value in reply[:3])
+        return bool(allowed), remaining, retry_ms
+
+    def _hit_local(self, key: str, cost: int, now: int) -> Decision:
+        state = self._state.get(key)
+        if state is None:
+            state = self._new_state(now)
+        decision, state = self._decide(state, now, cost)
+
+        self._state[key] = state
+        self._state.move_to_end(key)
+        if len(self._state) > self.max_keys:
+            self._state.popitem(last=False)
+        return decision
+
+    def _record_failure(self, error: Exception) -> None:
+        self._failures += 1
+        if self._failures >= self.failure_threshold:
+            # 쿨다운이 끝나면 다음 요청 1건이 다시 Redis를 시도 (실패 시 곧바로 쿨다운)
+            self._failures = self.failure_threshold - 1
+            self._skip_until = self._clock() + self.cooldown
+        self._warn(error)
+
+    def _warn(self, error: Exception) -> None:
+        now = time.monotonic()
+        if now - self._warned_at >= _WARN_INTERVAL:
+            self._warned_at = now
+            logger.warning(
+                f"[RateLimit] {self.name}: Redis 판정 실패, 로컬 판정 사용 "
+                f"({type(error).__name__}: {error})"
+            )
+
+
+# =============================================================================
+# 슬라이딩 윈도우 카운터
+# =============================================================================
+
+_SLIDING_WINDOW_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local start = now - (now % window)
+
+local state = redis.call('HMGET', KEYS[1], 'w', 'c', 'p')
+local w = tonumber(state[1])
+local c = tonumber(state[2]) or 0
+local p = tonumber(state[3]) or 0
+if w ~= start then
+    if w == start - window then p = c else p = 0 end
+    c = 0
+end
+
+local elapsed = now - start
+local estimated = p * (window - elapsed) / window + c
+local allowed = 1
+local retry = 0
+if estimated + cost > limit then
+    allowed = 0
+    if cost > limit then
+        retry = window
+    elseif c + cost <= limit then
+        retry = math.ceil(window * (1 - (limit - c - cost) / p)) - elapsed
+    else
+        retry = (window - elapsed) + math.max(0, math.ceil(window * (1 - (limit - cost) / c)))
+    end
+    retry = math.max(1, retry)
+else
+    c = c + cost
+end
+
+redis.call('HSET', KEYS[1], 'w', start, 'c', c, 'p', p)
+redis.call('PEXPIRE', KEYS[1], window * 2)
+return {allowed, math.floor(limit - estimated - cost * allowed), retry}
+"""
+
+
+class SlidingWindowLimiter(RateLimiterBase):
+    """
+    슬라이딩 윈도우 카운터
+
+    추정 요청 수 = 이전 윈도우 수 x (현재 윈도우에서 남은 비율) + 현재 윈도우 수
+    → 경계에서의 2배 버스트 없이 키당 카운터 2개만 유지
+
+    Args:
+        name: 리미터 이름
+        limit: 윈도우당 최대 요청 수
+        window: 윈도우 길이 (초)
+    """
+
+    SCRIPT = _SLIDING_WINDOW_SCRIPT
+
+    def __init__(self, name: str, limit: int, window: float, **kwargs: Any):
+        super().__init__(name, **kwargs)
+        self.limit_count = limit
+        self.window_ms = max(1, int(window * 1000))
+
+    @property
+    def limit(self) -> int:
+        return self.limit_count
+
+    def _script_args(self, cost: int) -> List[Any]:
+        return [self.limit_count, self.window_ms, cost]
+
+    def _new_state(self, now: int) -> Any:
+        return (None, 0, 0)
+
+    def _decide(self, state: Any, now: int, cost: int) -> Tuple[Decision, Any]:
+        limit, window = self.limit_count, self.window_ms
+        start = now - now % window
+        w, c, p = state
+        if w != start:
+            p = c if w == start - window else 0
+            c = 0
+
+        elapsed = now - start
+        estimated = p * (window - elapsed) / window + c
+        if estimated + cost > limit:
+            if cost > limit:
+                retry = window
+            elif c + cost <= limit:
+                retry = math.ceil(window * (1 - (limit - c - cost) / p)) - elapsed
+            else:
+                retry = (window - elapsed) + max(0, math.ceil(window * (1 - (limit - cost) / c)))
+            return (False, math.floor(limit - estimated), max(1, retry)), (start, c, p)
+
+        return (True, math.floor(limit - estimated - cost), 0), (start, c + cost, p)
+
+
+# =============================================================================
+# 슬라이딩 로그
+# =============================================================================
+
+_SLIDING_LOG_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+local count = redis.call('ZCARD', KEYS[1])
+if count + cost > limit then
+    local retry = window
+    if cost <= limit then
+        local oldest = redis.call('ZRANGE', KEYS[1], count + cost - limit - 1,
+                                  count + cost - limit - 1, 'WITHSCORES')
+        retry = tonumber(oldest[2]) + window - now
+    end
+    return {0, limit - count, math.max(1, retry)}
+end
+
+for i = 1, cost do
+    redis.call('ZADD', KEYS[1], now, ARGV[4] .. ':' .. i)
+end
+redis.call('PEXPIRE', KEYS[1], window)
+return {1, limit - count - cost, 0}
+"""
+
+
+class SlidingLogLimiter(RateLimiterBase):
+    """
+    슬라이딩 로그 (정확한 윈도우)
+
+    허용된 요청 시각을 모두 기록 → 키당 메모리가 limit에 비례하므로
+    노드 WebSocket 연결 시도처럼 한도가 작은 곳에 사용
+
+    Args:
+        name: 리미터 이름
+        limit: 윈도우당 최대 요청 수
+        window: 윈도우 길이 (초)
+    """
+
+    SCRIPT = _SLIDING_LOG_SCRIPT
+
+    def __init__(self, name: str, limit: int, window: float, **kwargs: Any):
+        super().__init__(name, **kwargs)
+        self.limit_count = limit
+        self.window_ms = max(1, int(window * 1000))
+
+    @property
+    def limit(self) -> int:
+        return self.limit_count
+
+    def _script_args(self, cost: int) -> List[Any]:
+        # ZSET 멤버 중복 방지용 요청 ID
+        return [self.limit_count, self.window_ms, cost, uuid.uuid4().hex]
+
+    def _new_state(self, now: int) -> Any:
+        return deque()
+
+    def _decide(self, state: Any, now: int, cost: int) -> Tuple[Decision, Any]:
+        limit, window = self.limit_count, self.window_ms
+        while state and state[0] <= now - window:
+            state.popleft()
+
+        count = len(state)
+        if count + cost > limit:
+            retry = window
+            if cost <= limit:
+                retry = state[count + cost - limit - 1] + window - now
+            return (False, limit - count, max(1, retry)), state
+
+        state.extend([now] * cost)
+        return (True, limit - count - cost, 0), state
+
+
+# =============================================================================
+# 토큰 버킷
+# =============================================================================
+
+_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+
+local state = redis.call('HMGET', KEYS[1], 't', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate / 1000)
+
+local allowed = 0
+local retry = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry = math.max(1, math.ceil((cost - tokens) * 1000 / rate))
+end
+
+redis.call('HSET', KEYS[1], 't', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity * 1000 / rate) + 1000)
+return {allowed, math.floor(tokens), retry}
+"""
+
+
+class TokenBucketLimiter(RateLimiterBase):
+    """
+    토큰 버킷
+
+    평균 rate/초를 유지하면서 capacity개까지 순간 버스트 허용
+    → 평소 조용하다가 RESULT를 몰아 보내는 노드 메시지에 적합
+
+    Args:
+        name: 리미터 이름
+        rate: 초당 충전 토큰 수
+        capacity: 버킷 크기 (최대 버스트)
+    """
+
+    SCRIPT = _TOKEN_BUCKET_SCRIPT
+
+    def __init__(self, name: str, rate: float, capacity: int, **kwargs: Any):
+        super().__init__(name, **kwargs)
+        self.rate = rate
+        self.capacity = capacity
+
+    @property
+    def limit(self) -> int:
+        return self.capacity
+
+    def _script_args(self, cost: int) -> List[Any]:
+        return [self.rate, self.capacity, cost]
+
+    def _new_state(self, now: int) -> Any:
+        return (float(self.capacity), now)
+
+    def _decide(self, state: Any, now: int, cost: int) -> Tuple[Decision, Any]:
+        tokens, ts = state
+        tokens = min(self.capacity, tokens + max(0, now - ts) * self.rate / 1000)
+
+        if tokens >= cost:
+            tokens -= cost
+            return (True, math.floor(tokens), 0), (tokens, now)
+
+        retry = max(1, math.ceil((cost - tokens) * 1000 / self.rate))
+        return (False, math.floor(tokens), retry), (tokens, now)
+
+
+# =============================================================================
+# FastAPI 연동
+# =============================================================================
+
+
+def client_key(connection: Any) -> str:
+    """
+    요청/WebSocket의 클라이언트 식별자
+
+    인증된 API 키 → (RATE_LIMIT_TRUST_PROXY) X-Forwarded-For 마지막 주소 → 접속 IP
+    (X-Forwarded-For의 앞쪽 주소는 클라이언트가 위조할 수 있으므로
+    프록시가 추가한 마지막 주소만 사용)
+
+    왜 X-API-Key 헤더를 바로 쓰지 않는가?
+    - 검증 전 헤더는 요청마다 바꿔 새 버킷을 받을 수 있음 (한도 우회)
+    - 원문 키가 Redis 키 이름과 키스페이스 샘플 메트릭에 남음
+    → 인증 단계가 connection.state.api_key에 넣어 둔 키만, sha256 앞 16자로 사용
+    """
+    api_key = getattr(getattr(connection, "state", None), "api_key", None)
+    if api_key:
+        return f"key:{hashlib.sha256(api_key.encode()).hexdigest()[:16]}"
+
+    if TRUST_PROXY_HEADERS:
+        forwarded = connection.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[-1].strip()
+
+    return connection.client.host if connection.client else "unknown"
+
+
+def rate_limit_dependency(
+    limiter: RateLimiterBase,
+    key_func: Callable[[Any], str] = client_key,
+    cost: int = 1,
+) -> Callable:
+    """
+    FastAPI 의존성 생성 (초과 시 429 + Retry-After)
+
+    Usage:
+        @app.post("/api/broadcast", dependencies=[Depends(rate_limit_dependency(limiter))])
+    """
+    from fastapi import HTTPException, Request
+
+    async def dependency(request: Request) -> RateLimitResult:
+        result = await limiter.hit(key_func(request), cost)
+        if not result.allowed:
+            raise HTTPException(
+                status_code=429, detail="Rate limit exceeded", headers=result.headers()
+            )
+        return result
+
+    return dependency
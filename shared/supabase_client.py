@@ -28,6 +28,7 @@ try:
 except ImportError:
     raise ImportError("supabase 패키지가 필요합니다. 설치: pip install supabase")
 
+from shared.async_db import bulk_upsert, run_query
 
 # ===========================================
 # Environment Configuration
@@ -123,8 +124,8 @@ class DeviceSync:
                 data["model"] = model
 
             # Supabase upsert - serial_number 충돌 시 UPDATE
-            result = (
-                self.client.table(self.table).upsert(data, on_conflict="serial_number").execute()
+            result = await run_query(
+                self.client.table(self.table).upsert(data, on_conflict="serial_number")
             )
 
             if result.data and len(result.data) > 0:
@@ -146,23 +147,41 @@ class DeviceSync:
         """
         여러 기기 일괄 Upsert
 
+        기기별 upsert 대신 다중 행 upsert 한 문장으로 처리
+        (대규모 팜은 DB_UPSERT_CHUNK_SIZE 단위로 분할)
+
         Args:
             devices: [{"serial_number": "xxx", "model": "Galaxy S9"}, ...]
 
         Returns:
             Upsert된 기기 목록
         """
-        results = []
+        now = datetime.now(timezone.utc).isoformat()
+        rows = []
 
         for device in devices:
             serial = device.get("serial_number")
-            model = device.get("model")
-            status = device.get("status", "idle")
+            if not serial:
+                continue
+
+            row = {
+                "serial_number": serial,
+                "pc_id": self.pc_id,
+                "status": device.get("status", "idle"),
+                "last_seen": now,
+            }
+            if device.get("model"):
+                row["model"] = device["model"]
+            rows.append(row)
 
-            if serial:
-                result = await self.upsert_device(serial, status, model)
-                if result:
-                    results.append(result)
+        if not rows:
+            return []
+
+        try:
+            results = await bulk_upsert(self.client, self.table, rows, on_conflict="serial_number")
+        except Exception as e:
+            logger.error(f"[PC{self.pc_id}] 기기 일괄 동기화 실패: {len(rows)}대 - {e}")
+            return []
 
         logger.info(f"[PC{self.pc_id}] {len(results)}대 기기 일괄 동기화 완료")
         return results
@@ -190,12 +209,11 @@ class DeviceSync:
             now = datetime.now(timezone.utc).isoformat()
 
             # 먼저 현재 기기 상태 조회
-            current = (
+            current = await run_query(
                 self.client.table(self.table)
                 .select("status")
                 .eq("serial_number", serial_number)
                 .single()
-                .execute()
             )
 
             current_status = current.data.get("status") if current.data else None
@@ -209,11 +227,8 @@ class DeviceSync:
                 update_data["status"] = "idle"
             # else: busy 상태는 그대로 유지 (status 필드 업데이트 안함)
 
-            result = (
-                self.client.table(self.table)
-                .update(update_data)
-                .eq("serial_number", serial_number)
-                .execute()
+            result = await run_query(
+                self.client.table(self.table).update(update_data).eq("serial_number", serial_number)
             )
 
             success = result.data is not None and len(result.data) > 0
@@ -239,6 +254,56 @@ class DeviceSync:
             logger.error(f"[PC{self.pc_id}] 하트비트 실패: {serial_number} - {e}")
             return False
 
+    async def heartbeat_many(
+        self, serials: List[str], health: Optional[Dict[str, Dict]] = None
+    ) -> Dict[str, str]:
+        """
+        여러 기기 하트비트 일괄 전송
+
+        heartbeat_devices RPC 한 번으로 처리 (supabase 마이그레이션 20261019_device_heartbeat_bulk)
+
+        왜 이렇게 작성했는가?
+        - 기기당 heartbeat()는 SELECT + UPDATE (+ 미등록 시 UPSERT) 왕복
+          → 100대 PC는 라운드당 200회 이상 HTTP 호출
+        - busy 보존 규칙은 DB의 조건부 UPDATE ... RETURNING으로 동일하게 유지
+        - 미등록 시리얼은 같은 문장에서 자동 등록
+
+        Args:
+            serials: 시리얼 번호 목록
+            health: 시리얼별 헬스 정보 {"serial": {"battery_level": 80, ...}}
+
+        Returns:
+            시리얼별 결과 {"serial": "updated" | "busy" | "registered" | "failed"}
+        """
+        if not serials:
+            return {}
+
+        try:
+            result = await run_query(
+                self.client.rpc(
+                    "heartbeat_devices",
+                    {
+                        "p_pc_id": str(self.pc_id),
+                        "p_serials": list(serials),
+                        "p_health": health or {},
+                    },
+                )
+            )
+
+            outcomes = {serial: "failed" for serial in serials}
+            for row in result.data or []:
+                outcomes[row["serial_number"]] = row["outcome"]
+
+            registered = sum(1 for o in outcomes.values() if o == "registered")
+            logger.debug(
+                f"[PC{self.pc_id}] 일괄 하트비트: {len(serials)}대 " f"(신규 등록 {registered}대)"
+            )
+            return outcomes
+
+        except Exception as e:
+            logger.error(f"[PC{self.pc_id}] 일괄 하트비트 실패: {len(serials)}대 - {e}")
+            return {serial: "failed" for serial in serials}
+
     async def set_status(self, serial_number: str, status: str) -> bool:
         """
         기기 상태 변경
@@ -253,11 +318,10 @@ class DeviceSync:
         try:
             now = datetime.now(timezone.utc).isoformat()
 
-            result = (
+            result = await run_query(
                 self.client.table(self.table)
                 .update({"status": status, "last_seen": now})
                 .eq("serial_number", serial_number)
-                .execute()
             )
 
             success = result.data is not None and len(result.data) > 0
@@ -281,11 +345,8 @@ class DeviceSync:
             업데이트된 기기 수
         """
         try:
-            result = (
-                self.client.table(self.table)
-                .update({"status": "offline"})
-                .eq("pc_id", self.pc_id)
-                .execute()
+            result = await run_query(
+                self.client.table(self.table).update({"status": "offline"}).eq("pc_id", self.pc_id)
             )
 
             count = len(result.data) if result.data else 0
@@ -305,7 +366,9 @@ class DeviceSync:
             기기 목록
         """
         try:
-            result = self.client.table(self.table).select("*").eq("pc_id", self.pc_id).execute()
+            result = await run_query(
+                self.client.table(self.table).select("*").eq("pc_id", self.pc_id)
+            )
 
             return result.data or []
 
@@ -342,14 +405,13 @@ class JobSync:
             작업 데이터 또는 None
         """
         try:
-            result = (
+            result = await run_query(
                 self.client.table(self.table)
                 .select("*, videos(*)")
                 .eq("device_id", device_id)
                 .eq("status", "pending")
                 .order("created_at", desc=False)
                 .limit(1)
-                .execute()
             )
 
             if result.data and len(result.data) > 0:
@@ -361,16 +423,60 @@ class JobSync:
             logger.error(f"[PC{self.pc_id}] 작업 조회 실패: device={device_id} - {e}")
             return None
 
+    async def claim_jobs(
+        self, device_ids: List[Any], limit: Optional[int] = None
+    ) -> Dict[Any, Dict]:
+        """
+        idle 기기들에 대기 작업 일괄 배정 (claim_jobs RPC)
+
+        왜 이렇게 작성했는가?
+        - get_pending_job()은 기기당 1회 폴링 → 100대 PC는 폴링당 100회 왕복
+        - 조회와 start_job() 사이에 다른 Agent가 같은 작업을 가져갈 수 있음
+        - RPC가 기기/작업 행을 FOR UPDATE SKIP LOCKED로 잠그고 한 트랜잭션에서
+          running으로 전환 → 반환된 작업은 이 Agent 소유가 보장됨
+
+        Args:
+            device_ids: 후보 기기 ID 목록 (우선순위 순)
+            limit: 최대 배정 수 (생략 시 기기 수)
+
+        Returns:
+            {device_id: 작업 데이터(videos 포함)} - 작업을 받은 기기만 포함
+        """
+        if not device_ids:
+            return {}
+
+        params = {
+            "p_pc_id": str(self.pc_id),
+            "p_device_ids": [str(device_id) for device_id in device_ids],
+            "p_limit": limit,
+        }
+
+        try:
+            result = await run_query(self.client.rpc("claim_jobs", params).select("*, videos(*)"))
+        except Exception as e:
+            logger.error(f"[PC{self.pc_id}] 작업 일괄 클레임 실패: {len(device_ids)}대 - {e}")
+            return {}
+
+        # RPC는 ID를 문자열로 비교하므로 호출자가 넘긴 ID 그대로 키로 사용
+        by_key = {str(device_id): device_id for device_id in device_ids}
+        claimed = {
+            by_key.get(str(job["device_id"]), job["device_id"]): job for job in result.data or []
+        }
+
+        if claimed:
+            logger.info(f"[PC{self.pc_id}] 작업 {len(claimed)}개 클레임 ({len(device_ids)}대 중)")
+
+        return claimed
+
     async def start_job(self, job_id: int) -> bool:
         """작업 시작 처리"""
         try:
             now = datetime.now(timezone.utc).isoformat()
 
-            result = (
+            result = await run_query(
                 self.client.table(self.table)
                 .update({"status": "running", "started_at": now})
                 .eq("id", job_id)
-                .execute()
             )
 
             success = result.data is not None and len(result.data) > 0
@@ -396,7 +502,9 @@ class JobSync:
             if screenshot_url:
                 update_data["screenshot_url"] = screenshot_url
 
-            result = self.client.table(self.table).update(update_data).eq("id", job_id).execute()
+            result = await run_query(
+                self.client.table(self.table).update(update_data).eq("id", job_id)
+            )
 
             success = result.data is not None and len(result.data) > 0
 
@@ -414,11 +522,10 @@ class JobSync:
         try:
             now = datetime.now(timezone.utc).isoformat()
 
-            result = (
+            result = await run_query(
                 self.client.table(self.table)
                 .update({"status": "failed", "completed_at": now, "error_message": error_message})
                 .eq("id", job_id)
-                .execute()
             )
 
             success = result.data is not None and len(result.data) > 0
@@ -438,6 +545,64 @@ class JobSync:
 # ===========================================
 
 
+ADB_CONCURRENCY = int(os.getenv("ADB_CONCURRENCY", "16"))
+
+
+async def _run_adb(*args: str, timeout: float) -> str:
+    """
+    adb 명령을 비동기 서브프로세스로 실행
+
+    Returns:
+        stdout 문자열 (타임아웃 시 프로세스 종료 후 TimeoutError)
+    """
+    proc = await asyncio.create_subprocess_exec(
+        "adb",
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    return stdout.decode(errors="replace")
+
+
+async def get_device_models(
+    serials: List[str], concurrency: int = ADB_CONCURRENCY
+) -> Dict[str, str]:
+    """
+    여러 기기의 모델명 동시 조회
+
+    getprop을 기기당 순차 실행하면 100대 기준 수십 초 이상 소요
+    → 동시 실행 수를 제한하여 병렬 조회
+
+    Args:
+        serials: ADB 시리얼 목록
+        concurrency: 동시에 실행할 adb 프로세스 수
+
+    Returns:
+        {serial: model} (조회 실패 시 "Unknown")
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(serial: str) -> str:
+        async with semaphore:
+            try:
+                output = await _run_adb(
+                    "-s", serial, "shell", "getprop", "ro.product.model", timeout=5
+                )
+                return output.strip() or "Unknown"
+            except Exception as e:
+                logger.debug(f"모델명 조회 실패: {serial} - {e}")
+                return "Unknown"
+
+    models = await asyncio.gather(*(fetch(serial) for serial in serials))
+    return dict(zip(serials, models))
+
+
 async def sync_devices_from_adb(pc_id: int) -> List[Dict]:
     """
     ADB 연결된 기기를 Supabase에 동기화
@@ -450,34 +615,21 @@ async def sync_devices_from_adb(pc_id: int) -> List[Dict]:
     Returns:
         동기화된 기기 목록
     """
-    import subprocess
-
     try:
         # ADB 기기 목록 가져오기
-        result = subprocess.run(["adb", "devices"], capture_output=True, text=True, timeout=10)
+        output = await _run_adb("devices", timeout=10)
 
-        lines = result.stdout.strip().split("\n")[1:]  # 헤더 제외
-        devices = []
+        lines = output.strip().split("\n")[1:]  # 헤더 제외
+        serials = [line.split("\t")[0] for line in lines if "\tdevice" in line]
 
-        for line in lines:
-            if "\tdevice" in line:
-                serial = line.split("\t")[0]
-
-                # 모델명 가져오기
-                model_result = subprocess.run(
-                    ["adb", "-s", serial, "shell", "getprop", "ro.product.model"],
-                    capture_output=True,
-                    text=True,
-                    timeout=5,
-                )
-                model = model_result.stdout.strip() or "Unknown"
-
-                devices.append({"serial_number": serial, "model": model})
-
-        if not devices:
+        if not serials:
             logger.warning(f"[PC{pc_id}] ADB 연결된 기기 없음")
             return []
 
+        # 모델명 병렬 조회
+        models = await get_device_models(serials)
+        devices = [{"serial_number": serial, "model": models[serial]} for serial in serials]
+
         # Supabase에 동기화
         sync = DeviceSync(pc_id)
         return await sync.bulk_upsert(devices)
@@ -24,6 +24,7 @@ except ImportError:
 
     logger = logging.getLogger(__name__)
 
+from shared.async_db import apply_keyset, run_query
 from shared.batch_executor import (
     BatchExecutionContext,
     BatchExecutor,
@@ -156,7 +157,7 @@ class WorkloadEngine:
             "updated_at": now,
         }
 
-        result = self.client.table("workloads").insert(data).execute()
+        result = await run_query(self.client.table("workloads").insert(data))
 
         if not result.data:
             raise Exception("워크로드 생성 실패")
@@ -172,8 +173,8 @@ class WorkloadEngine:
     async def get_workload(self, workload_id: str) -> Optional[WorkloadResponse]:
         """워크로드 조회"""
         try:
-            result = (
-                self.client.table("workloads").select("*").eq("id", workload_id).single().execute()
+            result = await run_query(
+                self.client.table("workloads").select("*").eq("id", workload_id).single()
             )
 
             if result.data:
@@ -192,7 +193,7 @@ class WorkloadEngine:
             if status:
                 query = query.eq("status", status.value)
 
-            result = query.order("created_at", desc=True).limit(limit).execute()
+            result = await run_query(query.order("created_at", desc=True).limit(limit))
 
             return [self._to_response(w) for w in (result.data or [])]
         except Exception as e:
@@ -210,8 +211,8 @@ class WorkloadEngine:
             }
             update_data.update(kwargs)
 
-            result = (
-                self.client.table("workloads").update(update_data).eq("id", workload_id).execute()
+            result = await run_query(
+                self.client.table("workloads").update(update_data).eq("id", workload_id)
             )
 
             return bool(result.data)
@@ -490,7 +491,9 @@ class WorkloadEngine:
     async def _get_video_info(self, video_id: str) -> Optional[VideoTarget]:
         """영상 정보 조회"""
         try:
-            result = self.client.table("videos").select("*").eq("id", video_id).single().execute()
+            result = await run_query(
+                self.client.table("videos").select("*").eq("id", video_id).single()
+            )
 
             if result.data:
                 return VideoTarget(
@@ -514,22 +517,26 @@ class WorkloadEngine:
         """사이클 결과를 DB에 기록"""
         try:
             # 영상 완료 카운트 업데이트
-            self.client.table("videos").update(
-                {
-                    "completed_count": (
-                        self.client.rpc(
-                            "increment",
-                            {
-                                "row_id": video_id,
-                                "column": "completed_count",
-                                "amount": cycle_result.total_success,
-                            },
-                        )
-                        if False
-                        else cycle_result.total_success
-                    )  # RPC 대신 직접 업데이트
-                }
-            ).eq("id", video_id).execute()
+            await run_query(
+                self.client.table("videos")
+                .update(
+                    {
+                        "completed_count": (
+                            self.client.rpc(
+                                "increment",
+                                {
+                                    "row_id": video_id,
+                                    "column": "completed_count",
+                                    "amount": cycle_result.total_success,
+                                },
+                            )
+                            if False
+                            else cycle_result.total_success
+                        )  # RPC 대신 직접 업데이트
+                    }
+                )
+                .eq("id", video_id)
+            )
 
             # 개별 결과 기록 (results 테이블)
             for batch in cycle_result.batch_results:
@@ -545,7 +552,7 @@ class WorkloadEngine:
                         "error_message": device_result.error_message,
                     }
 
-                    self.client.table("results").insert(result_data).execute()
+                    await run_query(self.client.table("results").insert(result_data))
 
             # 명령 히스토리 기록
             for batch in cycle_result.batch_results:
@@ -574,7 +581,7 @@ class WorkloadEngine:
                         "duration_ms": device_result.duration_ms,
                     }
 
-                    self.client.table("command_history").insert(history_data).execute()
+                    await run_query(self.client.table("command_history").insert(history_data))
 
         except Exception as e:
             logger.error(f"결과 기록 실패: {workload_id}/{video_id} - {e}")
@@ -606,21 +613,34 @@ class WorkloadEngine:
                 "created_at": datetime.now(timezone.utc).isoformat(),
             }
 
-            self.client.table("workload_logs").insert(log_data).execute()
+            await run_query(self.client.table("workload_logs").insert(log_data))
         except Exception as e:
             logger.error(f"워크로드 로그 기록 실패: {e}")
 
     async def get_workload_logs(
-        self, workload_id: str, level: Optional[LogLevel] = None, limit: int = 100
+        self,
+        workload_id: str,
+        level: Optional[LogLevel] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
-        """워크로드 로그 조회"""
-        try:
-            query = self.client.table("workload_logs").select("*").eq("workload_id", workload_id)
+        """
+        워크로드 로그 조회 (최신순)
+
+        Args:
+            cursor: 이전 페이지 마지막 행의 커서 (page_cursor)
 
+        Raises:
+            ValueError: 잘못된 커서
+        """
+        query = self.client.table("workload_logs").select("*").eq("workload_id", workload_id)
+        query = apply_keyset(query, cursor)
+
+        try:
             if level:
                 query = query.eq("level", level.value)
 
-            result = query.order("created_at", desc=True).limit(limit).execute()
+            result = await run_query(query.limit(limit))
 
             return result.data or []
         except Exception as e:
@@ -22,6 +22,7 @@ except ImportError:
 
     logger = logging.getLogger(__name__)
 
+from shared.async_db import apply_keyset, page_cursor, run_query
 from shared.schemas.youtube_queue import (
     CommentPoolCreate,
     CommentPoolInDB,
@@ -117,7 +118,7 @@ class YouTubeQueueService:
             "updated_at": now.isoformat(),
         }
 
-        result = self.client.table("video_queue").insert(data).execute()
+        result = await run_query(self.client.table("video_queue").insert(data))
 
         if not result.data:
             raise Exception("대기열 항목 생성 실패")
@@ -168,8 +169,8 @@ class YouTubeQueueService:
     async def get_queue_item(self, item_id: str) -> Optional[VideoQueueResponse]:
         """대기열 항목 조회"""
         try:
-            result = (
-                self.client.table("video_queue").select("*").eq("id", item_id).single().execute()
+            result = await run_query(
+                self.client.table("video_queue").select("*").eq("id", item_id).single()
             )
 
             if result.data:
@@ -193,11 +194,8 @@ class YouTubeQueueService:
             if source:
                 query = query.eq("source", source.value)
 
-            result = (
-                query.order("priority", desc=True)
-                .order("created_at", desc=False)
-                .limit(limit)
-                .execute()
+            result = await run_query(
+                query.order("priority", desc=True).order("created_at", desc=False).limit(limit)
             )
 
             return [self._to_response(item) for item in (result.data or [])]
@@ -216,8 +214,8 @@ class YouTubeQueueService:
             }
             update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
 
-            result = (
-                self.client.table("video_queue").update(update_data).eq("id", item_id).execute()
+            result = await run_query(
+                self.client.table("video_queue").update(update_data).eq("id", item_id)
             )
 
             if result.data:
@@ -230,7 +228,7 @@ class YouTubeQueueService:
     async def cancel_queue_item(self, item_id: str) -> bool:
         """대기열 항목 취소"""
         try:
-            result = (
+            result = await run_query(
                 self.client.table("video_queue")
                 .update(
                     {
@@ -239,7 +237,6 @@ class YouTubeQueueService:
                     }
                 )
                 .eq("id", item_id)
-                .execute()
             )
 
             logger.info(f"대기열 항목 취소: {item_id}")
@@ -251,7 +248,7 @@ class YouTubeQueueService:
     async def delete_queue_item(self, item_id: str) -> bool:
         """대기열 항목 삭제"""
         try:
-            self.client.table("video_queue").delete().eq("id", item_id).execute()
+            await run_query(self.client.table("video_queue").delete().eq("id", item_id))
             logger.info(f"대기열 항목 삭제: {item_id}")
             return True
         except Exception as e:
@@ -278,19 +275,21 @@ class YouTubeQueueService:
             now = datetime.now(timezone.utc).isoformat()
 
             # 먼저 pending 상태 중 예약 시간이 도래한 항목들을 ready로 변경
-            self.client.table("video_queue").update({"status": QueueStatus.READY.value}).eq(
-                "status", QueueStatus.PENDING.value
-            ).lte("scheduled_at", now).execute()
+            await run_query(
+                self.client.table("video_queue")
+                .update({"status": QueueStatus.READY.value})
+                .eq("status", QueueStatus.PENDING.value)
+                .lte("scheduled_at", now)
+            )
 
             # 실행 가능한 항목 조회
-            result = (
+            result = await run_query(
                 self.client.table("video_queue")
                 .select("*")
                 .eq("status", QueueStatus.READY.value)
                 .order("priority", desc=True)
                 .order("created_at", desc=False)
                 .limit(1)
-                .execute()
             )
 
             if result.data:
@@ -299,9 +298,11 @@ class YouTubeQueueService:
                 # 목표 달성 여부 체크
                 if item["completed_executions"] >= item["target_executions"]:
                     # 이미 완료된 항목 - 상태 업데이트 후 다음 항목 검색
-                    self.client.table("video_queue").update(
-                        {"status": QueueStatus.COMPLETED.value, "completed_at": now}
-                    ).eq("id", item["id"]).execute()
+                    await run_query(
+                        self.client.table("video_queue")
+                        .update({"status": QueueStatus.COMPLETED.value, "completed_at": now})
+                        .eq("id", item["id"])
+                    )
                     return await self.get_next_ready_item()
 
                 return self._to_response(item)
@@ -314,7 +315,7 @@ class YouTubeQueueService:
     async def mark_executing(self, item_id: str) -> bool:
         """대기열 항목을 실행 중 상태로 변경"""
         try:
-            result = (
+            result = await run_query(
                 self.client.table("video_queue")
                 .update(
                     {
@@ -324,7 +325,6 @@ class YouTubeQueueService:
                     }
                 )
                 .eq("id", item_id)
-                .execute()
             )
 
             return bool(result.data)
@@ -335,7 +335,7 @@ class YouTubeQueueService:
     async def mark_ready(self, item_id: str) -> bool:
         """대기열 항목을 다시 ready 상태로 변경 (재시도용)"""
         try:
-            result = (
+            result = await run_query(
                 self.client.table("video_queue")
                 .update(
                     {
@@ -344,7 +344,6 @@ class YouTubeQueueService:
                     }
                 )
                 .eq("id", item_id)
-                .execute()
             )
 
             return bool(result.data)
@@ -355,12 +354,11 @@ class YouTubeQueueService:
     async def has_ready_items(self) -> bool:
         """실행 가능한 항목이 있는지 확인"""
         try:
-            result = (
+            result = await run_query(
                 self.client.table("video_queue")
                 .select("id", count="exact")
                 .eq("status", QueueStatus.READY.value)
                 .limit(1)
-                .execute()
             )
 
             return result.count is not None and result.count > 0
@@ -417,7 +415,7 @@ class YouTubeQueueService:
             "completed_at": now.isoformat(),
         }
 
-        result = self.client.table("execution_logs").insert(data).execute()
+        result = await run_query(self.client.table("execution_logs").insert(data))
 
         if not result.data:
             raise Exception("실행 로그 저장 실패")
@@ -439,11 +437,27 @@ class YouTubeQueueService:
         device_id: Optional[str] = None,
         status: Optional[ExecutionStatus] = None,
         limit: int = 100,
-    ) -> List[ExecutionLogInDB]:
-        """실행 로그 조회"""
-        try:
-            query = self.client.table("execution_logs").select("*")
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[ExecutionLogInDB], Optional[str]]:
+        """
+        실행 로그 조회 (최신순, (completed_at, id) 키셋 - execution_logs는 created_at 없음)
+
+        completed_at이 NULL인 행은 제외 (DESC 정렬에서 NULLS FIRST로 맨 앞에 오고,
+        커서 값으로 인코딩할 수 없어 다음 페이지가 누락/중복됨)
+
+        Args:
+            cursor: 이전 호출이 반환한 next_cursor (None이면 첫 페이지)
 
+        Returns:
+            (로그 목록, 다음 페이지 커서 - 마지막 페이지면 None)
+
+        Raises:
+            ValueError: 잘못된 커서
+        """
+        query = self.client.table("execution_logs").select("*")
+        query = apply_keyset(query.not_.is_("completed_at", "null"), cursor, column="completed_at")
+
+        try:
             if queue_item_id:
                 query = query.eq("queue_item_id", queue_item_id)
             if device_id:
@@ -451,12 +465,15 @@ class YouTubeQueueService:
             if status:
                 query = query.eq("status", status.value)
 
-            result = query.order("completed_at", desc=True).limit(limit).execute()
+            result = await run_query(query.limit(limit))
 
-            return [self._log_to_schema(log) for log in (result.data or [])]
+            rows = result.data or []
+            return [self._log_to_schema(log) for log in rows], page_cursor(
+                rows, limit, "completed_at"
+            )
         except Exception as e:
             logger.error(f"실행 로그 조회 실패: {e}")
-            return []
+            return [], None
 
     # =========================================
     # 댓글 풀
@@ -489,7 +506,7 @@ class YouTubeQueueService:
             if language != "mixed":
                 query = query.or_(f"language.eq.{language},language.eq.mixed")
 
-            result = query.order("weight", desc=True).limit(20).execute()
+            result = await run_query(query.order("weight", desc=True).limit(20))
 
             if not result.data:
                 return None
@@ -531,7 +548,7 @@ class YouTubeQueueService:
             "created_at": now.isoformat(),
         }
 
-        result = self.client.table("comment_pool").insert(data).execute()
+        result = await run_query(self.client.table("comment_pool").insert(data))
 
         if not result.data:
             raise Exception("댓글 추가 실패")
@@ -547,17 +564,16 @@ class YouTubeQueueService:
     async def get_queue_summary(self) -> QueueSummary:
         """대기열 상태 요약"""
         try:
-            self.client.table("video_queue").select("status", count="exact").execute()
+            await run_query(self.client.table("video_queue").select("status", count="exact"))
 
             # 상태별 집계
             summary = QueueSummary()
 
             for status in QueueStatus:
-                count_result = (
+                count_result = await run_query(
                     self.client.table("video_queue")
                     .select("id", count="exact")
                     .eq("status", status.value)
-                    .execute()
                 )
 
                 count = count_result.count or 0
@@ -572,7 +588,9 @@ class YouTubeQueueService:
     async def get_daily_stats(self, days: int = 7) -> List[DailyExecutionStats]:
         """일별 실행 통계"""
         try:
-            result = self.client.table("daily_execution_stats").select("*").limit(days).execute()
+            result = await run_query(
+                self.client.table("daily_execution_stats").select("*").limit(days)
+            )
 
             return [DailyExecutionStats(**stat) for stat in (result.data or [])]
         except Exception as e:
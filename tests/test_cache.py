@@ -6,12 +6,14 @@ rate limiting, and system stats.
 """
 
 import asyncio
+import json
 import os
 import sys
-from datetime import datetime, timezone
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from prometheus_client import REGISTRY
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -22,11 +24,29 @@ from shared.cache import (
     MemoryBackend,
     RateLimiter,
     RedisBackend,
+    TieredBackend,
+    cache_node_health_many,
     get_cache,
+    get_node_health_many,
+    key_prefix,
     reset_cache,
+    summarize_keyspace,
 )
 
 
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
 class TestCacheKey:
     """Test CacheKey enum"""
 
@@ -92,16 +112,17 @@ class TestMemoryBackend:
         assert count3 == 3
 
     @pytest.mark.asyncio
-    async def test_ttl_expiration(self, backend):
+    async def test_ttl_expiration(self):
         """Test TTL expiration (simulated)"""
-        # Set with 0 TTL (already expired)
-        backend._cache["expired_key"] = {
-            "value": "old",
-            "expires_at": datetime.now(timezone.utc).timestamp() - 1,  # 1 second ago
-        }
+        clock = FakeClock()
+        backend = MemoryBackend(max_size=100, clock=clock)
+
+        await backend.set("expired_key", "old", ttl=10)
+        clock.advance(11)
 
         result = await backend.get("expired_key")
         assert result is None
+        assert len(backend) == 0
 
     @pytest.mark.asyncio
     async def test_max_size_eviction(self):
@@ -119,6 +140,86 @@ class TestMemoryBackend:
         # One of the first 3 should be evicted
         assert await backend.get("key4") == "value4"
 
+    @pytest.mark.asyncio
+    async def test_lru_eviction_order(self):
+        """Test least recently used key is evicted, reads refresh recency"""
+        backend = MemoryBackend(max_size=3)
+
+        await backend.set("key1", "value1", ttl=60)
+        await backend.set("key2", "value2", ttl=60)
+        await backend.set("key3", "value3", ttl=60)
+        await backend.get("key1")
+        await backend.set("key4", "value4", ttl=60)
+
+        assert await backend.get("key2") is None
+        assert await backend.get("key1") == "value1"
+
+    @pytest.mark.asyncio
+    async def test_expired_evicted_before_lru(self):
+        """Test expired keys are dropped before live ones at capacity"""
+        clock = FakeClock()
+        backend = MemoryBackend(max_size=3, clock=clock)
+
+        await backend.set("live1", "a", ttl=60)
+        await backend.set("short", "b", ttl=5)
+        await backend.set("live2", "c", ttl=60)
+        clock.advance(10)
+        await backend.set("live3", "d", ttl=60)
+
+        assert len(backend) == 3
+        assert await backend.get("live1") == "a"
+        assert await backend.get("short") is None
+
+    @pytest.mark.asyncio
+    async def test_max_bytes(self):
+        """Test byte budget evicts LRU keys"""
+        backend = MemoryBackend(max_size=100, max_bytes=100)
+
+        for i in range(5):
+            await backend.set(f"k{i}", "x" * 30, ttl=60)
+
+        assert backend.size_bytes <= 100
+        assert await backend.get("k4") == "x" * 30
+        assert await backend.get("k0") is None
+
+    @pytest.mark.asyncio
+    async def test_sweep(self):
+        """Test sweep removes expired keys without reads"""
+        clock = FakeClock()
+        backend = MemoryBackend(max_size=100, sweep_interval=0, clock=clock)
+
+        for i in range(10):
+            await backend.set(f"k{i}", i, ttl=5 if i % 2 else 60)
+        await backend.set("k1", "rewritten", ttl=60)
+        clock.advance(10)
+
+        assert backend.sweep() == 4
+        assert len(backend) == 6
+        assert await backend.get("k1") == "rewritten"
+
+    @pytest.mark.asyncio
+    async def test_background_sweep(self):
+        """Test periodic sweep runs on the event loop"""
+        backend = MemoryBackend(max_size=100, sweep_interval=0.01)
+
+        await backend.set("short", "value", ttl=0)
+        await asyncio.sleep(0.05)
+
+        assert len(backend) == 0
+        await backend.close()
+
+    @pytest.mark.asyncio
+    async def test_incr_keeps_window_expiry(self):
+        """Test incr does not extend the counter window"""
+        clock = FakeClock()
+        backend = MemoryBackend(max_size=100, clock=clock)
+
+        await backend.incr("counter", ttl=10)
+        clock.advance(6)
+        assert await backend.incr("counter", ttl=10) == 2
+        clock.advance(6)
+        assert await backend.incr("counter", ttl=10) == 1
+
 
 class TestCache:
     """Test Cache unified interface"""
@@ -355,5 +456,835 @@ class TestRedisBackendMocked:
         assert result is None
 
 
+class FakeRedisBus:
+    """In-process stand-in for a Redis server: shared keys and pub/sub fan-out"""
+
+    def __init__(self):
+        self.store = {}
+        self.subscribers = []
+        self.get_calls = 0
+
+    def client(self):
+        return FakeRedisClient(self)
+
+
+class FakeRedisClient:
+    def __init__(self, bus: FakeRedisBus):
+        self.bus = bus
+
+    async def get(self, key):
+        self.bus.get_calls += 1
+        return self.bus.store.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.bus.store[key] = value
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.bus.store:
+            return None
+        self.bus.store[key] = value
+        return True
+
+    async def eval(self, script, numkeys, key, token):
+        # Only the lock release script is used
+        if self.bus.store.get(key) == token:
+            del self.bus.store[key]
+            return 1
+        return 0
+
+    async def mget(self, keys):
+        self.bus.get_calls += 1
+        return [self.bus.store.get(key) for key in keys]
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.bus.store.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def scan(self, cursor, count=10):
+        return 0, list(self.bus.store)
+
+    async def dbsize(self):
+        return len(self.bus.store)
+
+    async def publish(self, channel, message):
+        for queue in self.bus.subscribers:
+            queue.put_nowait({"type": "message", "channel": channel, "data": message})
+
+    def pubsub(self):
+        return FakePubSub(self.bus)
+
+    async def close(self):
+        pass
+
+
+class FakePipeline:
+    def __init__(self, client: FakeRedisClient):
+        self.client = client
+        self.commands = []
+
+    def setex(self, key, ttl, value):
+        self.commands.append(("setex", key, value))
+
+    def incr(self, key):
+        self.commands.append(("incr", key, None))
+
+    def expire(self, key, ttl):
+        self.commands.append(("expire", key, None))
+
+    def memory_usage(self, key):
+        self.commands.append(("memory_usage", key, None))
+
+    def pttl(self, key):
+        self.commands.append(("pttl", key, None))
+
+    async def execute(self):
+        store = self.client.bus.store
+        results = []
+        for command, key, value in self.commands:
+            if command == "setex":
+                store[key] = value
+                results.append(True)
+            elif command == "incr":
+                store[key] = str(int(store.get(key) or 0) + 1)
+                results.append(int(store[key]))
+            elif command == "memory_usage":
+                results.append(len(store[key]) + 50 if key in store else None)
+            elif command == "pttl":
+                results.append(30000 if key in store else -2)
+            else:
+                results.append(True)
+        return results
+
+
+class FakePubSub:
+    def __init__(self, bus: FakeRedisBus):
+        self.bus = bus
+        self.queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.bus.subscribers.append(self.queue)
+
+    async def listen(self):
+        while True:
+            yield await self.queue.get()
+
+    async def aclose(self):
+        if self.queue in self.bus.subscribers:
+            self.bus.subscribers.remove(self.queue)
+
+
+class TestTieredBackend:
+    """Test TieredBackend (memory L1 + Redis L2)"""
+
+    @staticmethod
+    def make_backend(bus: FakeRedisBus, l1_ttl: float = 60) -> TieredBackend:
+        redis_backend = RedisBackend("redis://localhost:6379")
+        redis_backend._redis = bus.client()
+        return TieredBackend(redis_backend, l1_max_size=100, l1_ttl=l1_ttl)
+
+    @pytest.mark.asyncio
+    async def test_read_served_from_l1(self):
+        """Test repeated reads do not reach Redis"""
+        bus = FakeRedisBus()
+        backend = self.make_backend(bus)
+
+        await backend.set("node:health:n1", {"status": "ok"}, ttl=60)
+        for _ in range(5):
+            assert await backend.get("node:health:n1") == {"status": "ok"}
+
+        assert bus.get_calls == 0
+        assert backend.stats()["l1"]["hits"] == 5
+        await backend.close()
+
+    @pytest.mark.asyncio
+    async def test_l2_hit_fills_l1(self):
+        """Test an L1 miss reads Redis once and then serves from L1"""
+        bus = FakeRedisBus()
+        writer, reader = self.make_backend(bus), self.make_backend(bus)
+
+        await writer.set("stats:system", {"nodes": 3}, ttl=60)
+        assert await reader.get("stats:system") == {"nodes": 3}
+        assert await reader.get("stats:system") == {"nodes": 3}
+
+        stats = reader.stats()
+        assert bus.get_calls == 1
+        assert stats["l1"] == {"hits": 1, "misses": 1, "hit_ratio": 0.5, "keys": 1}
+        assert stats["l2"]["hit_ratio"] == 1.0
+        await writer.close()
+        await reader.close()
+
+    @pytest.mark.asyncio
+    async def test_peer_write_invalidates_l1(self):
+        """Test a write in one process drops the stale L1 copy in another"""
+        bus = FakeRedisBus()
+        first, second = self.make_backend(bus), self.make_backend(bus)
+
+        await first.set("node:health:n1", {"status": "ok"}, ttl=60)
+        assert await second.get("node:health:n1") == {"status": "ok"}
+        # Let both subscriber tasks connect
+        await asyncio.sleep(0.01)
+
+        await first.set("node:health:n1", {"status": "down"}, ttl=60)
+        await asyncio.sleep(0.01)
+        assert await second.get("node:health:n1") == {"status": "down"}
+
+        await first.delete("node:health:n1")
+        await asyncio.sleep(0.01)
+        assert await second.get("node:health:n1") is None
+        await first.close()
+        await second.close()
+
+    @pytest.mark.asyncio
+    async def test_peer_incr_many_invalidates_l1(self):
+        """Test a version bump in one process drops the L1 copy read by another"""
+        bus = FakeRedisBus()
+        first, second = self.make_backend(bus), self.make_backend(bus)
+
+        assert await first.incr_many(["query:tag:videos"], ttl=60) == [1]
+        assert await second.get_many(["query:tag:videos"]) == [1]
+        await asyncio.sleep(0.01)
+
+        assert await first.incr_many(["query:tag:videos"], ttl=60) == [2]
+        await asyncio.sleep(0.01)
+        assert await second.get_many(["query:tag:videos"]) == [2]
+        await first.close()
+        await second.close()
+
+    @pytest.mark.asyncio
+    async def test_own_messages_ignored(self):
+        """Test a process keeps its own freshly written L1 entry"""
+        bus = FakeRedisBus()
+        backend = self.make_backend(bus)
+
+        await backend.set("key", "value", ttl=60)
+        message = json.dumps({"origin": backend.origin, "keys": ["key"]})
+
+        assert backend.handle_invalidation(message) is False
+        assert backend.handle_invalidation(json.dumps({"origin": "peer", "keys": ["key"]})) is True
+        assert backend.handle_invalidation("not json") is False
+        await backend.close()
+
+    @pytest.mark.asyncio
+    async def test_l1_ttl_capped(self):
+        """Test L1 copies expire after l1_ttl even if the Redis TTL is longer"""
+        bus = FakeRedisBus()
+        backend = self.make_backend(bus, l1_ttl=0)
+
+        await backend.set("key", "value", ttl=60)
+        assert await backend.get("key") == "value"
+
+        assert bus.get_calls == 1
+        await backend.close()
+
+    @pytest.mark.asyncio
+    async def test_incr_bypasses_l1(self):
+        """Test counters are always incremented in Redis"""
+        redis_backend = RedisBackend("redis://localhost:6379")
+        redis_backend.incr = AsyncMock(return_value=7)
+        backend = TieredBackend(redis_backend)
+
+        await backend.l1.set("ratelimit:ip", 3, ttl=60)
+        assert await backend.incr("ratelimit:ip", ttl=60) == 7
+        assert len(backend.l1) == 0
+
+
+class TestBulkOperations:
+    """Test get_many/set_many/delete_many/incr_many on every backend"""
+
+    @pytest.fixture(params=["memory", "redis", "tiered"])
+    def backend(self, request):
+        if request.param == "memory":
+            return MemoryBackend(max_size=100)
+        bus = FakeRedisBus()
+        redis_backend = RedisBackend("redis://localhost:6379")
+        redis_backend._redis = bus.client()
+        if request.param == "redis":
+            return redis_backend
+        return TieredBackend(redis_backend, l1_max_size=100, l1_ttl=60)
+
+    @pytest.mark.asyncio
+    async def test_round_trip(self, backend):
+        """Test bulk set/get/delete keep key order and report misses as None"""
+        assert await backend.set_many({"a": {"n": 1}, "b": [2], "c": "3"}, ttl=60) is True
+        assert await backend.get_many(["c", "missing", "a"]) == ["3", None, {"n": 1}]
+
+        assert await backend.delete_many(["a", "c"]) is True
+        assert await backend.get_many(["a", "b", "c"]) == [None, [2], None]
+        await backend.close()
+
+    @pytest.mark.asyncio
+    async def test_incr_many(self, backend):
+        """Test counters increment independently"""
+        assert await backend.incr_many(["x", "y"], ttl=60) == [1, 1]
+        assert await backend.incr_many(["x", "z"], ttl=60) == [2, 1]
+        await backend.close()
+
+    @pytest.mark.asyncio
+    async def test_empty(self, backend):
+        """Test empty inputs are no-ops"""
+        assert await backend.get_many([]) == []
+        assert await backend.set_many({}) is True
+        assert await backend.delete_many([]) is True
+        assert await backend.incr_many([]) == []
+        await backend.close()
+
+    @pytest.mark.asyncio
+    async def test_redis_single_round_trip(self):
+        """Test Redis maps get_many to one MGET and set_many to one pipeline"""
+        backend = RedisBackend("redis://localhost:6379")
+        mock_pipe = MagicMock()
+        mock_pipe.execute = AsyncMock(return_value=[True, True])
+        mock_client = MagicMock()
+        mock_client.mget = AsyncMock(return_value=['{"v": 1}', None])
+        mock_client.pipeline.return_value = mock_pipe
+        backend._redis = mock_client
+
+        assert await backend.get_many(["k1", "k2"]) == [{"v": 1}, None]
+        mock_client.mget.assert_awaited_once_with(["k1", "k2"])
+
+        assert await backend.set_many({"k1": 1, "k2": 2}, ttl=30) is True
+        assert mock_pipe.setex.call_count == 2
+        mock_pipe.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_return_safe_values(self):
+        """Test Redis bulk failures degrade like single-key operations"""
+        backend = RedisBackend("redis://localhost:6379")
+        mock_client = MagicMock()
+        mock_client.mget = AsyncMock(side_effect=Exception("Connection refused"))
+        mock_client.pipeline.side_effect = Exception("Connection refused")
+        backend._redis = mock_client
+
+        assert await backend.get_many(["a", "b"]) == [None, None]
+        assert await backend.set_many({"a": 1}) is False
+        assert await backend.incr_many(["a"]) == [0]
+
+    @pytest.mark.asyncio
+    async def test_tiered_fetches_only_l1_misses(self):
+        """Test tiered get_many sends only L1 misses to Redis"""
+        bus = FakeRedisBus()
+        writer = TestTieredBackend.make_backend(bus)
+        reader = TestTieredBackend.make_backend(bus)
+
+        await writer.set_many({"a": 1, "b": 2, "c": 3}, ttl=60)
+        await reader.get("a")
+        bus.get_calls = 0
+
+        assert await reader.get_many(["a", "b", "c"]) == [1, 2, 3]
+        assert await reader.get_many(["a", "b", "c"]) == [1, 2, 3]
+        assert bus.get_calls == 1
+        await writer.close()
+        await reader.close()
+
+
+class TestCacheBulkApi:
+    """Test Cache bulk methods and node health helpers"""
+
+    @pytest.fixture
+    def cache(self):
+        reset_cache()
+        return Cache(backend=MemoryBackend())
+
+    @pytest.mark.asyncio
+    async def test_prefixed_keys(self, cache):
+        """Test bulk methods apply the prefix to every id"""
+        await cache.set_many(CacheKey.NODE_HEALTH, {"n1": {"ok": True}, "n2": {"ok": False}})
+
+        assert await cache.get(CacheKey.NODE_HEALTH, "n1") == {"ok": True}
+        assert await cache.get_many(CacheKey.NODE_HEALTH, ["n1", "n2", "n3"]) == {
+            "n1": {"ok": True},
+            "n2": {"ok": False},
+        }
+
+        await cache.delete_many(CacheKey.NODE_HEALTH, ["n1"])
+        assert await cache.get_many(CacheKey.NODE_HEALTH, ["n1", "n2"]) == {"n2": {"ok": False}}
+
+        assert await cache.incr_many(CacheKey.RATE_LIMIT, ["ip1", "ip2"]) == {"ip1": 1, "ip2": 1}
+
+    @pytest.mark.asyncio
+    async def test_node_health_helpers(self, cache):
+        """Test bulk node health helpers"""
+        with patch("shared.cache.get_cache", return_value=cache):
+            await cache_node_health_many({f"node_{i:03d}": {"i": i} for i in range(600)})
+            health = await get_node_health_many(["node_000", "node_599", "node_600"])
+
+        assert health == {"node_000": {"i": 0}, "node_599": {"i": 599}}
+
+
+class TestGetOrSetStampede:
+    """Test get_or_set single-flight, stale-while-revalidate and cross-process lock"""
+
+    @pytest.fixture
+    def cache(self):
+        reset_cache()
+        return Cache(backend=MemoryBackend())
+
+    @staticmethod
+    def counting_factory(delay: float = 0.02):
+        calls = []
+
+        async def factory():
+            calls.append(1)
+            await asyncio.sleep(delay)
+            return {"version": len(calls)}
+
+        return factory, calls
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_factory(self, cache):
+        """Test concurrent misses on one key run the factory once"""
+        factory, calls = self.counting_factory()
+
+        results = await asyncio.gather(
+            *[cache.get_or_set(CacheKey.SYSTEM_STATS, "oob", factory=factory) for _ in range(20)]
+        )
+
+        assert len(calls) == 1
+        assert results == [{"version": 1}] * 20
+        assert cache._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_factory_error_reaches_every_caller(self, cache):
+        """Test a failed factory is not cached and the next call retries"""
+        attempts = []
+
+        async def failing():
+            attempts.append(1)
+            await asyncio.sleep(0.01)
+            raise RuntimeError("db down")
+
+        results = await asyncio.gather(
+            *[cache.get_or_set(CacheKey.JOB_STATS, factory=failing) for _ in range(3)],
+            return_exceptions=True,
+        )
+
+        assert len(attempts) == 1
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert await cache.get_or_set(CacheKey.JOB_STATS, factory=lambda: 1) == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self, cache):
+        """Test cancelling one waiter leaves the shared computation running"""
+        factory, calls = self.counting_factory(delay=0.05)
+
+        first = asyncio.ensure_future(cache.get_or_set(CacheKey.JOB_STATS, factory=factory))
+        second = asyncio.ensure_future(cache.get_or_set(CacheKey.JOB_STATS, factory=factory))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert await second == {"version": 1}
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_value_served_while_one_refresh_runs(self, cache):
+        """Test entries past the soft TTL return immediately and refresh once"""
+        factory, calls = self.counting_factory()
+        # ttl=0: every entry is stale as soon as it is written
+        assert await cache.get_or_set(
+            CacheKey.SYSTEM_STATS, ttl=0, stale_ttl=30, factory=factory
+        ) == {"version": 1}
+
+        stale = await asyncio.gather(
+            *[
+                cache.get_or_set(CacheKey.SYSTEM_STATS, ttl=0, stale_ttl=30, factory=factory)
+                for _ in range(10)
+            ]
+        )
+        assert stale == [{"version": 1}] * 10
+
+        await asyncio.sleep(0.05)
+        assert len(calls) == 2
+        stored = await cache.get(CacheKey.SYSTEM_STATS)
+        assert stored["value"] == {"version": 2}
+
+    @pytest.mark.asyncio
+    async def test_fresh_envelope_skips_refresh(self, cache):
+        """Test entries inside the soft TTL do not start a refresh"""
+        factory, calls = self.counting_factory()
+
+        for _ in range(3):
+            result = await cache.get_or_set(
+                CacheKey.SYSTEM_STATS, ttl=30, stale_ttl=30, factory=factory
+            )
+
+        await asyncio.sleep(0.05)
+        assert result == {"version": 1}
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_lock_coalesces_across_processes(self):
+        """Test two processes sharing Redis compute the value once"""
+        bus = FakeRedisBus()
+        caches = []
+        for _ in range(2):
+            backend = RedisBackend("redis://localhost:6379")
+            backend._redis = bus.client()
+            caches.append(Cache(backend=backend))
+        factory, calls = self.counting_factory(delay=0.1)
+
+        results = await asyncio.gather(
+            *[c.get_or_set(CacheKey.SYSTEM_STATS, lock_ttl=5, factory=factory) for c in caches]
+        )
+
+        assert len(calls) == 1
+        assert results == [{"version": 1}] * 2
+        assert "lock:stats:system" not in bus.store
+
+    @pytest.mark.asyncio
+    async def test_lock_wait_times_out_and_computes(self):
+        """Test a lock that is never released only delays the caller by lock_ttl"""
+        bus = FakeRedisBus()
+        bus.store["lock:stats:jobs"] = "other-process"
+        backend = RedisBackend("redis://localhost:6379")
+        backend._redis = bus.client()
+        cache = Cache(backend=backend)
+
+        assert await cache.get_or_set(CacheKey.JOB_STATS, lock_ttl=0.1, factory=lambda: 7) == 7
+        # Someone else's lock is left alone
+        assert bus.store["lock:stats:jobs"] == "other-process"
+
+    @pytest.mark.asyncio
+    async def test_miss_does_not_join_refresh_that_gave_up(self):
+        """Test a miss during a refresh blocked by a peer's lock still gets a value"""
+        bus = FakeRedisBus()
+        backend = RedisBackend("redis://localhost:6379")
+        backend._redis = bus.client()
+        cache = Cache(backend=backend)
+        factory, calls = self.counting_factory()
+        options = dict(ttl=0, stale_ttl=30, lock_ttl=0.1, factory=factory)
+
+        assert await cache.get_or_set(CacheKey.SYSTEM_STATS, **options) == {"version": 1}
+        bus.store["lock:stats:system"] = "other-process"
+        # Stale hit starts a refresh, then the entry disappears before it reads Redis
+        assert await cache.get_or_set(CacheKey.SYSTEM_STATS, **options) == {"version": 1}
+        del bus.store["stats:system"]
+
+        assert await cache.get_or_set(CacheKey.SYSTEM_STATS, **options) == {"version": 2}
+        assert len(calls) == 2
+
+
+class TestCacheObservability:
+    """Tests for per-prefix cache metrics and key-space sampling"""
+
+    @staticmethod
+    def metric(name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0.0
+
+    def test_key_prefix(self):
+        """Test keys are labelled by the longest CacheKey prefix, else the first segment"""
+        assert key_prefix("node:health:node_01") == "node:health"
+        assert key_prefix("query:tag:devices") == "query:tag"
+        assert key_prefix("query:3f2a") == "query"
+        assert key_prefix("stats:system") == "stats:system"
+        assert key_prefix("node:healthy:x") == "node"
+        assert key_prefix("custom:42") == "custom"
+
+    @pytest.mark.asyncio
+    async def test_hits_misses_and_sets(self):
+        """Test Cache API calls are counted per prefix"""
+        cache = Cache(backend=MemoryBackend())
+        before = {
+            name: self.metric(name, prefix="device:status")
+            for name in ("cache_hits_total", "cache_misses_total", "cache_sets_total")
+        }
+
+        await cache.set(CacheKey.DEVICE_STATUS, "d1", {"ok": True})
+        await cache.get(CacheKey.DEVICE_STATUS, "d1")
+        await cache.get(CacheKey.DEVICE_STATUS, "d2")
+        await cache.set_many(CacheKey.DEVICE_STATUS, {"d3": 1, "d4": 2})
+        await cache.get_many(CacheKey.DEVICE_STATUS, ["d3", "d4", "d5"])
+
+        def delta(name):
+            return self.metric(name, prefix="device:status") - before[name]
+
+        assert delta("cache_hits_total") == 3
+        assert delta("cache_misses_total") == 2
+        assert delta("cache_sets_total") == 3
+        assert (
+            self.metric("cache_operation_duration_seconds_count", prefix="device:status", op="get")
+            >= 2
+        )
+
+    @pytest.mark.asyncio
+    async def test_evictions_by_reason(self):
+        """Test LRU and TTL removals are counted with the backend name"""
+        clock = FakeClock()
+        backend = MemoryBackend(max_size=2, sweep_interval=0, clock=clock, name="test")
+
+        await backend.set("node:metrics:a", 1, ttl=5)
+        await backend.set("node:metrics:b", 2, ttl=60)
+        await backend.set("node:metrics:c", 3, ttl=60)  # evicts a (LRU)
+        clock.advance(61)
+        backend.sweep()
+
+        labels = {"backend": "test", "prefix": "node:metrics"}
+        assert self.metric("cache_evictions_total", reason="lru", **labels) == 1
+        assert self.metric("cache_evictions_total", reason="expired", **labels) == 2
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_counted(self):
+        """Test failed Redis calls increment cache_backend_errors_total"""
+        backend = RedisBackend("redis://localhost:6379")
+        backend._redis = AsyncMock()
+        backend._redis.get.side_effect = ConnectionError("down")
+        before = self.metric("cache_backend_errors_total", backend="redis", op="get")
+
+        assert await backend.get("node:health:x") is None
+        assert self.metric("cache_backend_errors_total", backend="redis", op="get") == before + 1
+
+    @pytest.mark.asyncio
+    async def test_keyspace_sample(self):
+        """Test key-space summary groups keys by prefix with sizes and TTL buckets"""
+        cache = Cache(backend=MemoryBackend(sweep_interval=0))
+        await cache.set_many(CacheKey.NODE_HEALTH, {f"n{i}": {"i": i} for i in range(6)}, ttl=30)
+        await cache.set(CacheKey.SYSTEM_STATS, {"jobs": 1}, ttl=7200)
+
+        summary = await cache.keyspace(sample=100)
+
+        assert summary["backend"] == "memory"
+        assert summary["total_keys"] == 7
+        assert list(summary["prefixes"]) == ["node:health", "stats:system"]
+        health = summary["prefixes"]["node:health"]
+        assert health["sampled"] == 6
+        assert health["ttl"]["<1m"] == 6
+        assert health["bytes"]["max"] > 0
+        assert summary["prefixes"]["stats:system"]["ttl"][">=1h"] == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_keyspace_sample(self):
+        """Test the Redis sample reads sizes/TTLs in one pipeline and reports tier stats"""
+        bus = FakeRedisBus()
+        bus.store = {b"node:health:a": b"{}", b"query:x": b"[1,2,3]"}
+        backend = RedisBackend("redis://localhost:6379")
+        backend._redis = bus.client()
+        cache = Cache(backend=TieredBackend(backend))
+        cache._backend._ensure_subscriber = lambda: None
+
+        summary = await cache.keyspace(sample=10)
+
+        assert summary["total_keys"] == 2
+        assert summary["prefixes"]["query"]["ttl"]["<1m"] == 1
+        assert cache.backend_stats()["l1"]["keys"] == 0
+        assert Cache(backend=MemoryBackend()).backend_stats() is None
+
+    def test_summary_scales_to_total(self):
+        """Test estimates scale the sample up to the total key count"""
+        samples = [("node:health:a", 100, 5.0), ("query:x", 300, None)]
+
+        summary = summarize_keyspace(samples, total_keys=1000)
+
+        assert summary["prefixes"]["node:health"]["estimated_keys"] == 500
+        assert summary["prefixes"]["query"]["estimated_bytes"] == 150000
+        assert summary["prefixes"]["query"]["ttl"]["none"] == 1
+        assert summary["prefixes"]["node:health"]["ttl"]["<10s"] == 1
+
+
+class FlakyRedisClient(FakeRedisClient):
+    """FakeRedisClient that raises connection errors (or hangs) while the server is down"""
+
+    def __init__(self, bus: FakeRedisBus):
+        super().__init__(bus)
+        self.down = False
+        self.hang = False
+        self.calls = 0
+
+    async def _check(self):
+        self.calls += 1
+        if self.hang:
+            await asyncio.sleep(10)
+        if self.down:
+            raise ConnectionError("Connection refused")
+
+    async def ping(self):
+        await self._check()
+        return True
+
+    async def get(self, key):
+        await self._check()
+        return await super().get(key)
+
+    async def setex(self, key, ttl, value):
+        await self._check()
+        await super().setex(key, ttl, value)
+
+    async def scan(self, cursor, count=10):
+        await self._check()
+        return await super().scan(cursor, count)
+
+    async def evalsha(self, sha, numkeys, *args):
+        await self._check()
+        return [1, 9, 0]
+
+
+class TestCircuitBreaker:
+    """Tests for the Redis circuit breaker and degraded in-memory mode"""
+
+    def make_backend(self, threshold=3, timeout=0.5):
+        backend = RedisBackend("redis://localhost:6379", timeout=timeout)
+        backend.breaker.failure_threshold = threshold
+        backend.breaker.probe_interval = 0.01
+        client = FlakyRedisClient(FakeRedisBus())
+        backend._redis = client
+        return backend, client
+
+    @pytest.mark.asyncio
+    async def test_opens_after_consecutive_failures(self):
+        """Test the circuit opens and stops calling Redis"""
+        backend, client = self.make_backend(threshold=3)
+        client.down = True
+        backend.breaker.probe_interval = 60
+
+        for _ in range(3):
+            assert await backend.get("node:health:a") is None
+        assert backend.breaker.is_open
+
+        calls = client.calls
+        await backend.get("node:health:a")
+        assert client.calls == calls
+        await backend.close()
+
+    @pytest.mark.asyncio
+    async def test_success_resets_failure_count(self):
+        """Test only consecutive failures count"""
+        backend, client = self.make_backend(threshold=2)
+        client.down = True
+        await backend.get("k")
+        client.down = False
+        await backend.get("k")
+        client.down = True
+        await backend.get("k")
+
+        assert not backend.breaker.is_open
+
+    @pytest.mark.asyncio
+    async def test_other_errors_do_not_trip(self):
+        """Test undecodable values are misses, not outages"""
+        backend, client = self.make_backend(threshold=1)
+        client.bus.store["k"] = b"\x07garbage"
+
+        assert await backend.get("k") is None
+        assert not backend.breaker.is_open
+
+    @pytest.mark.asyncio
+    async def test_degraded_mode_serves_from_memory(self):
+        """Test reads and writes keep working from process memory while open"""
+        backend, client = self.make_backend(threshold=1)
+        backend.breaker.probe_interval = 60
+        client.down = True
+        await backend.get("k")
+
+        assert await backend.set("node:health:a", {"ok": True}, ttl=60) is True
+        assert await backend.get("node:health:a") == {"ok": True}
+        assert "node:health:a" not in client.bus.store
+        await backend.close()
+
+    @pytest.mark.asyncio
+    async def test_probe_closes_circuit_and_drops_degraded_entries(self):
+        """Test the background probe switches back once Redis answers again"""
+        backend, client = self.make_backend(threshold=1)
+        client.down = True
+        await backend.get("k")
+        await backend.set("k", "degraded", ttl=60)
+
+        client.down = False
+        client.bus.store["k"] = b'"redis"'
+        for _ in range(50):
+            if not backend.breaker.is_open:
+                break
+            await asyncio.sleep(0.01)
+
+        assert not backend.breaker.is_open
+        assert len(backend.degraded) == 0
+        assert await backend.get("k") == "redis"
+
+    @pytest.mark.asyncio
+    async def test_latency_bounded_during_outage(self):
+        """Test a hanging Redis costs at most the command timeout, then nothing"""
+        backend, client = self.make_backend(threshold=2, timeout=0.05)
+        backend.breaker.probe_interval = 60
+        client.hang = True
+
+        started = time.monotonic()
+        for _ in range(2):
+            assert await backend.get("k") is None
+        assert time.monotonic() - started < 0.5
+        assert backend.breaker.is_open
+
+        started = time.monotonic()
+        for _ in range(100):
+            await backend.get("k")
+        assert time.monotonic() - started < 0.05
+        await backend.close()
+
+    @pytest.mark.asyncio
+    async def test_keyspace_sample_bounded(self):
+        """Test a hanging SCAN is cut at the sample budget and counts as an outage"""
+        backend, client = self.make_backend(threshold=1, timeout=0.05)
+        backend.breaker.probe_interval = 60
+        client.hang = True
+
+        with patch("shared.cache.CACHE_SAMPLE_TIMEOUT", 0.05):
+            started = time.monotonic()
+            assert await backend.sample_keys(100) == ([], None)
+        assert time.monotonic() - started < 0.5
+        assert backend.breaker.is_open
+        await backend.close()
+
+    @pytest.mark.asyncio
+    async def test_rate_limiter_goes_through_breaker(self):
+        """Test a hung Redis trips the breaker and the limiter then decides locally"""
+        backend, client = self.make_backend(threshold=2, timeout=0.05)
+        backend.breaker.probe_interval = 60
+        limiter = RateLimiter(Cache(backend=backend), max_requests=3, window_seconds=60)
+
+        assert await limiter.is_allowed("ip")  # Redis decision
+        client.hang = True
+        started = time.monotonic()
+        assert await limiter.is_allowed("ip")
+        assert await limiter.is_allowed("ip")
+        assert time.monotonic() - started < 0.5
+        assert backend.breaker.is_open
+
+        calls = client.calls
+        results = [await limiter.is_allowed("ip") for _ in range(4)]
+        assert client.calls == calls
+        assert results == [True, False, False, False]  # local window: 2 earlier + 1
+        await backend.close()
+
+    @pytest.mark.asyncio
+    async def test_unreachable_at_startup(self):
+        """Test check() opens the circuit and the cache reports degraded mode"""
+        backend, client = self.make_backend()
+        backend.breaker.probe_interval = 60
+        client.down = True
+
+        assert await backend.check() is False
+        cache = Cache(backend=backend)
+        await cache.set(CacheKey.SYSTEM_STATS, {"jobs": 1})
+
+        assert cache.backend_name == "degraded"
+        assert await cache.get(CacheKey.SYSTEM_STATS) == {"jobs": 1}
+        await backend.close()
+
+    @pytest.mark.asyncio
+    async def test_tiered_skips_publish_while_open(self):
+        """Test invalidations are not published while Redis is unreachable"""
+        backend, client = self.make_backend(threshold=1)
+        backend.breaker.probe_interval = 60
+        tiered = TieredBackend(backend)
+        tiered._ensure_subscriber = lambda: None
+        client.down = True
+        await backend.get("k")
+
+        with patch.object(backend, "_get_client") as get_client:
+            await tiered.set("k", 1)
+        get_client.assert_not_called()
+        assert await tiered.get("k") == 1
+        await backend.close()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
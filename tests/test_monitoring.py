@@ -143,6 +143,34 @@ class TestSearchLogs:
             result = await search_logs()
             assert result == []
 
+    @pytest.mark.asyncio
+    async def test_search_logs_invalid_cursor(self):
+        """잘못된 커서는 ValueError로 전파"""
+        from shared.monitoring.log_collector import search_logs
+
+        with pytest.raises(ValueError):
+            await search_logs(cursor="not-a-cursor")
+
+    @pytest.mark.asyncio
+    async def test_search_logs_keyset(self):
+        """커서가 있으면 offset 대신 (created_at, id) 키셋 조건 적용"""
+        from shared.async_db import encode_cursor
+        from shared.monitoring.log_collector import search_logs
+
+        client = MagicMock()
+        query = client.table.return_value.select.return_value
+        query.or_.return_value = query
+        query.order.return_value = query
+        query.limit.return_value = query
+        query.execute.return_value = MagicMock(data=[{"id": "b"}])
+
+        with patch("shared.supabase_client.get_client", return_value=client):
+            result = await search_logs(cursor=encode_cursor("2026-01-09T00:00:00", "a"), offset=50)
+
+        assert result == [{"id": "b"}]
+        query.or_.assert_called_once()
+        query.offset.assert_not_called()
+
 
 class TestGetLogStats:
     """로그 통계 함수 테스트"""
@@ -0,0 +1,298 @@
+"""
+async_db 단위 테스트
+
+테스트 대상:
+- run_query() - 스레드 풀 실행, 결과 반환, 예외 전파
+- 타임아웃/취소 전파
+- describe_query() - 메트릭 레이블 생성
+- 쿼리 지연 시간 메트릭 기록
+- bulk_upsert() - 키 구성별 그룹화, 청크 분할
+- 키셋 페이지네이션 - 커서 인코딩, apply_keyset(), iter_keyset()
+"""
+
+import asyncio
+import re
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from shared.async_db import (
+    apply_keyset,
+    bulk_upsert,
+    decode_cursor,
+    describe_query,
+    encode_cursor,
+    iter_keyset,
+    page_cursor,
+    run_query,
+)
+from shared.monitoring.metrics import db_queries_total
+
+
+class FakeQuery:
+    """execute()만 가진 가짜 쿼리 빌더"""
+
+    def __init__(self, result=None, delay: float = 0.0, error: Exception = None):
+        self.result = result
+        self.delay = delay
+        self.error = error
+
+    def execute(self):
+        if self.delay:
+            time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.result
+
+
+def _count(name: str, status: str) -> float:
+    return db_queries_total.labels(query=name, status=status)._value.get()
+
+
+class TestRunQuery:
+    """run_query 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_returns_execute_result(self):
+        """execute() 결과 반환"""
+        result = await run_query(FakeQuery(result={"data": [1]}), name="test.ok")
+        assert result == {"data": [1]}
+
+    @pytest.mark.asyncio
+    async def test_does_not_block_event_loop(self):
+        """쿼리 실행 중에도 이벤트 루프가 다른 작업을 처리"""
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        await run_query(FakeQuery(delay=0.2), name="test.slow")
+        task.cancel()
+
+        assert ticks >= 5
+
+    @pytest.mark.asyncio
+    async def test_error_propagates(self):
+        """execute() 예외가 호출자에게 전파"""
+        before = _count("test.error", "error")
+
+        with pytest.raises(ValueError):
+            await run_query(FakeQuery(error=ValueError("boom")), name="test.error")
+
+        assert _count("test.error", "error") == before + 1
+
+    @pytest.mark.asyncio
+    async def test_timeout(self):
+        """타임아웃 초과 시 asyncio.TimeoutError"""
+        before = _count("test.timeout", "timeout")
+
+        with pytest.raises(asyncio.TimeoutError):
+            await run_query(FakeQuery(delay=0.5), name="test.timeout", timeout=0.05)
+
+        assert _count("test.timeout", "timeout") == before + 1
+
+    @pytest.mark.asyncio
+    async def test_cancellation_propagates(self):
+        """호출 태스크 취소 시 CancelledError 전파"""
+        before = _count("test.cancel", "cancelled")
+
+        task = asyncio.create_task(run_query(FakeQuery(delay=0.5), name="test.cancel"))
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert _count("test.cancel", "cancelled") == before + 1
+
+    @pytest.mark.asyncio
+    async def test_success_counted(self):
+        """성공 쿼리 카운트"""
+        before = _count("test.count", "ok")
+        await run_query(FakeQuery(), name="test.count")
+        assert _count("test.count", "ok") == before + 1
+
+
+class TestDescribeQuery:
+    """describe_query 테스트"""
+
+    def test_unknown_builder(self):
+        """PostgREST 빌더가 아니면 기본 레이블"""
+        assert describe_query(FakeQuery()) == "query"
+
+    def test_postgrest_select(self):
+        """PostgREST 빌더에서 메서드 + 리소스 추출"""
+        from postgrest import SyncPostgrestClient
+
+        client = SyncPostgrestClient("http://localhost:3000")
+        query = client.from_("devices").select("*").eq("pc_id", 1)
+
+        assert describe_query(query) == "GET devices"
+
+    def test_postgrest_rpc(self):
+        """RPC 레이블"""
+        from postgrest import SyncPostgrestClient
+
+        client = SyncPostgrestClient("http://localhost:3000")
+        query = client.rpc("process_heartbeat", {})
+
+        assert describe_query(query) == "POST rpc/process_heartbeat"
+
+
+class TestBulkUpsert:
+    """bulk_upsert 테스트"""
+
+    @staticmethod
+    def _client():
+        """upsert한 행을 그대로 돌려주는 Mock 클라이언트"""
+        client = MagicMock()
+
+        def upsert(rows, on_conflict):
+            query = MagicMock()
+            query.execute.return_value = MagicMock(data=list(rows))
+            return query
+
+        client.table.return_value.upsert.side_effect = upsert
+        return client
+
+    @pytest.mark.asyncio
+    async def test_single_statement(self):
+        """같은 키 구성은 요청 1회"""
+        client = self._client()
+        rows = [{"serial_number": f"S{i}", "status": "idle"} for i in range(10)]
+
+        result = await bulk_upsert(client, "devices", rows, on_conflict="serial_number")
+
+        assert result == rows
+        client.table.return_value.upsert.assert_called_once_with(rows, on_conflict="serial_number")
+
+    @pytest.mark.asyncio
+    async def test_groups_by_keys(self):
+        """키 구성이 다른 행은 별도 요청 (누락 키로 기존 값 덮어쓰기 방지)"""
+        client = self._client()
+        rows = [
+            {"serial_number": "A", "model": "SM-G960"},
+            {"serial_number": "B"},
+            {"model": "SM-G965", "serial_number": "C"},
+        ]
+
+        result = await bulk_upsert(client, "devices", rows, on_conflict="serial_number")
+
+        assert sorted(r["serial_number"] for r in result) == ["A", "B", "C"]
+        assert client.table.return_value.upsert.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_chunking(self):
+        """chunk_size 단위로 분할"""
+        client = self._client()
+        rows = [{"serial_number": f"S{i}"} for i in range(5)]
+
+        result = await bulk_upsert(
+            client, "devices", rows, on_conflict="serial_number", chunk_size=2
+        )
+
+        assert result == rows
+        sizes = [len(c.args[0]) for c in client.table.return_value.upsert.call_args_list]
+        assert sizes == [2, 2, 1]
+
+
+class FakeKeysetQuery:
+    """키셋 조건을 메모리 행에 적용하는 가짜 select 빌더"""
+
+    def __init__(self, rows, log):
+        self.rows = rows
+        self.log = log
+        self.after = None
+        self.desc = True
+        self.size = None
+
+    def or_(self, filters):
+        self.log.append(filters)
+        # 'created_at.lt."<ts>",and(created_at.eq."<ts>",id.lt."<id>")'
+        created_at, _, row_id = re.findall(r'"([^"]*)"', filters)
+        self.after = (created_at, row_id)
+        return self
+
+    def order(self, column, desc=False):
+        self.desc = desc
+        return self
+
+    def limit(self, size):
+        self.size = size
+        return self
+
+    def execute(self):
+        rows = sorted(self.rows, key=lambda r: (r["created_at"], r["id"]), reverse=self.desc)
+        if self.after:
+            key = tuple(self.after)
+            if self.desc:
+                rows = [r for r in rows if (r["created_at"], r["id"]) < key]
+            else:
+                rows = [r for r in rows if (r["created_at"], r["id"]) > key]
+        return MagicMock(data=rows[: self.size])
+
+
+class TestKeyset:
+    """키셋 페이지네이션 테스트"""
+
+    def test_cursor_roundtrip(self):
+        """커서 인코딩/디코딩"""
+        cursor = encode_cursor("2026-01-09T10:30:00+00:00", "log-001")
+        assert decode_cursor(cursor) == ["2026-01-09T10:30:00+00:00", "log-001"]
+
+    @pytest.mark.parametrize("cursor", ["not-base64!", encode_cursor("only-one"), "e30"])
+    def test_invalid_cursor(self, cursor):
+        """잘못된 커서는 ValueError"""
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+    def test_page_cursor(self):
+        """결과가 limit만큼 차면 마지막 행 커서, 아니면 None"""
+        rows = [{"id": "a", "created_at": "t2"}, {"id": "b", "created_at": "t1"}]
+
+        assert decode_cursor(page_cursor(rows, 2)) == ["t1", "b"]
+        assert page_cursor(rows, 3) is None
+        assert page_cursor([], 3) is None
+
+    def test_apply_keyset_postgrest(self):
+        """PostgREST 빌더에 (created_at, id) 조건과 정렬 적용"""
+        from postgrest import SyncPostgrestClient
+
+        client = SyncPostgrestClient("http://localhost:3000")
+        cursor = encode_cursor("2026-01-09T10:30:00+00:00", "abc")
+        query = apply_keyset(client.from_("monitoring_logs").select("*"), cursor)
+        params = query.request.params
+
+        assert params["order"] == "created_at.desc,id.desc"
+        assert params["or"] == (
+            '(created_at.lt."2026-01-09T10:30:00+00:00",'
+            'and(created_at.eq."2026-01-09T10:30:00+00:00",id.lt."abc"))'
+        )
+
+    def test_apply_keyset_first_page(self):
+        """커서가 없으면 정렬만 적용"""
+        from postgrest import SyncPostgrestClient
+
+        client = SyncPostgrestClient("http://localhost:3000")
+        query = apply_keyset(client.from_("workload_logs").select("*"), None, desc=False)
+
+        assert "or" not in query.request.params
+        assert query.request.params["order"] == "created_at.asc,id.asc"
+
+    @pytest.mark.asyncio
+    async def test_iter_keyset_pages(self):
+        """페이지 단위로 전체 순회, 같은 시각 행도 누락/중복 없음"""
+        rows = [{"id": f"{i:02d}", "created_at": f"t{i // 3}"} for i in range(10)]
+        log = []
+
+        seen = [
+            row["id"] async for row in iter_keyset(lambda: FakeKeysetQuery(rows, log), page_size=4)
+        ]
+
+        assert seen == [f"{i:02d}" for i in reversed(range(10))]
+        assert len(log) == 2  # 첫 페이지는 커서 없음
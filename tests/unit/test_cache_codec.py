@@ -0,0 +1,179 @@
+"""
+cache_codec 단위 테스트
+
+테스트 대상:
+- json/orjson - 기존 JSON 텍스트와 호환 (태그 없음)
+- msgpack - datetime 보존 (패키지가 있을 때만)
+- zstd/lz4 - 임계값 이상만 압축 (패키지가 있을 때만)
+- 태그 기반 디코딩 - 설정과 다른 코덱으로 쓴 값도 읽음
+- get_codec() - 패키지 누락 시 대체
+- RedisBackend - 바이너리 값 저장/조회
+"""
+
+import json
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+from shared import cache_codec
+from shared.cache import RedisBackend
+from shared.cache_codec import CacheCodec, CodecError, get_codec, reset_codec
+
+SAMPLE = {
+    "node_id": "node_01",
+    "devices": [{"slot": i, "serial": f"R58M{i:08d}", "status": "idle"} for i in range(50)],
+    "ok": True,
+    "battery": None,
+}
+
+
+@pytest.fixture(autouse=True)
+def fresh_codec():
+    reset_codec()
+    yield
+    reset_codec()
+
+
+def available(serializer: str = "json", compression=None) -> bool:
+    try:
+        CacheCodec(serializer, compression)
+        return True
+    except ImportError:
+        return False
+
+
+class TestJson:
+    """JSON 계열 코덱"""
+
+    def test_stdlib_round_trip(self):
+        """기존 json.dumps(default=str) 형식 그대로 저장"""
+        codec = CacheCodec("json")
+        data = codec.dumps(SAMPLE)
+
+        assert json.loads(data) == SAMPLE
+        assert codec.loads(data) == SAMPLE
+
+    def test_reads_legacy_text(self):
+        """decode_responses=True 시절의 문자열 값도 읽음"""
+        assert CacheCodec("json").loads(json.dumps(SAMPLE)) == SAMPLE
+
+    @pytest.mark.skipif(not available("orjson"), reason="orjson not installed")
+    def test_orjson_is_plain_json(self):
+        """orjson 출력은 태그 없는 JSON (이전 버전 리더 호환)"""
+        codec = CacheCodec("orjson")
+        data = codec.dumps({**SAMPLE, "at": datetime(2026, 1, 1, tzinfo=timezone.utc), 1: "x"})
+
+        decoded = json.loads(data)
+        assert decoded["at"] == "2026-01-01T00:00:00+00:00"
+        assert decoded["1"] == "x"
+        assert CacheCodec("json").loads(data)["devices"] == SAMPLE["devices"]
+
+    @pytest.mark.skipif(not available("orjson"), reason="orjson not installed")
+    def test_orjson_big_int_falls_back(self):
+        """64비트를 넘는 정수는 표준 json으로 처리"""
+        codec = CacheCodec("orjson")
+        assert codec.loads(codec.dumps({"n": 2**70})) == {"n": 2**70}
+
+    def test_unknown_tag(self):
+        """알 수 없는 태그는 CodecError"""
+        with pytest.raises(CodecError):
+            CacheCodec("json").loads(b"\x07abc")
+
+    def test_unknown_serializer(self):
+        with pytest.raises(ValueError):
+            CacheCodec("pickle")
+
+
+@pytest.mark.skipif(not available("msgpack"), reason="msgpack not installed")
+class TestMsgpack:
+    """msgpack 코덱"""
+
+    def test_datetime_preserved(self):
+        """datetime은 문자열이 아닌 datetime으로 복원 (naive는 UTC로 간주)"""
+        codec = CacheCodec("msgpack")
+        value = {"aware": datetime(2026, 1, 1, tzinfo=timezone.utc), "naive": datetime(2026, 1, 1)}
+
+        decoded = codec.loads(codec.dumps(value))
+
+        assert decoded["aware"] == value["aware"]
+        assert decoded["naive"] == datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    def test_readable_by_json_codec(self):
+        """설정이 json인 프로세스도 태그로 msgpack 값을 읽음"""
+        assert CacheCodec("json").loads(CacheCodec("msgpack").dumps(SAMPLE)) == SAMPLE
+
+
+@pytest.mark.parametrize("compression", ["zstd", "lz4"])
+class TestCompression:
+    """압축"""
+
+    def test_threshold(self, compression):
+        """임계값 미만은 압축하지 않음"""
+        if not available("json", compression):
+            pytest.skip(f"{compression} not installed")
+        codec = CacheCodec("json", compression, threshold=256)
+
+        small = codec.dumps({"a": 1})
+        large = codec.dumps(SAMPLE)
+
+        assert small == b'{"a": 1}'
+        assert large[0] in (cache_codec.TAG_ZSTD, cache_codec.TAG_LZ4)
+        assert len(large) < len(json.dumps(SAMPLE))
+        assert codec.loads(large) == SAMPLE
+        assert CacheCodec("json").loads(large) == SAMPLE
+
+
+class TestGetCodec:
+    """환경 변수 기반 코덱 선택"""
+
+    def test_missing_packages_fall_back(self):
+        """패키지가 없으면 json / 무압축으로 대체"""
+        with (
+            patch.object(cache_codec, "CACHE_CODEC", "msgpack"),
+            patch.object(cache_codec, "CACHE_COMPRESSION", "zstd"),
+            patch.object(cache_codec, "msgpack", None),
+            patch.object(cache_codec, "zstandard", None),
+        ):
+            codec = get_codec()
+
+        assert codec.name == "json"
+        assert get_codec() is codec
+
+
+class FakeBinaryRedis:
+    """바이트만 저장하는 가짜 Redis"""
+
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def setex(self, key, ttl, value):
+        assert isinstance(value, bytes)
+        self.store[key] = value
+
+
+class TestRedisBackend:
+    """RedisBackend + 코덱"""
+
+    @pytest.mark.asyncio
+    async def test_values_stored_as_bytes(self):
+        """값은 코덱 바이트로 저장되고 그대로 복원"""
+        backend = RedisBackend(codec=CacheCodec("json"))
+        backend._redis = FakeBinaryRedis()
+
+        await backend.set("node:health:node_01", SAMPLE, ttl=60)
+
+        assert backend._redis.store["node:health:node_01"].startswith(b"{")
+        assert await backend.get("node:health:node_01") == SAMPLE
+
+    @pytest.mark.asyncio
+    async def test_corrupt_value_is_a_miss(self):
+        """디코딩할 수 없는 값은 캐시 미스로 처리"""
+        backend = RedisBackend(codec=CacheCodec("json"))
+        backend._redis = FakeBinaryRedis()
+        backend._redis.store["k"] = b"\x07garbage"
+
+        assert await backend.get("k") is None
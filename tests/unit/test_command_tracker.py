@@ -0,0 +1,169 @@
+"""
+command_tracker 단위 테스트
+
+테스트 대상:
+- 크기 제한 (가득 차면 track 거부)
+- 타이머 휠 만료 (여러 바퀴, 밀린 틱 따라잡기)
+- 여러 대기자에게 결과 전달, 대기자별 취소/timeout
+- RESULT가 wait보다 먼저 온 경우
+- 나이 백분위
+"""
+
+import asyncio
+
+import pytest
+
+from shared.command_tracker import CommandTracker
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make(**kwargs):
+    clock = Clock()
+    return CommandTracker(clock=clock, **kwargs), clock
+
+
+class TestTrack:
+    """track / 크기 제한"""
+
+    def test_bounded(self):
+        tracker, _ = make(max_inflight=2)
+        assert tracker.track("a", "n1", timeout=10)
+        assert tracker.track("b", "n1", timeout=10)
+        assert not tracker.track("c", "n1", timeout=10)
+        assert not tracker.track("a", "n1", timeout=10)  # 중복
+
+        tracker.cancel("a")
+        assert tracker.track("c", "n1", timeout=10)
+        assert tracker.stats()["rejected"] == 1
+
+
+class TestExpiry:
+    """타이머 휠 만료"""
+
+    def test_expires_at_deadline(self):
+        expired = []
+        tracker, clock = make(tick=1.0, on_expire=lambda e: expired.append(e.command_id))
+        tracker.track("short", "n1", timeout=2)
+        tracker.track("long", "n1", timeout=30)
+
+        clock.now += 1.5
+        assert tracker.advance() == 0
+        clock.now += 1
+        assert tracker.advance() == 1
+        assert expired == ["short"]
+        assert "long" in tracker
+        assert tracker.lookup("short")["status"] == "expired"
+
+    def test_deadline_beyond_one_revolution(self):
+        """tick * wheel_size보다 긴 마감은 여러 바퀴 뒤에 만료"""
+        tracker, clock = make(tick=1.0, wheel_size=8)
+        tracker.track("a", "n1", timeout=20)
+
+        for _ in range(19):
+            clock.now += 1
+            tracker.advance()
+        assert "a" in tracker
+
+        clock.now += 1
+        tracker.advance()
+        assert "a" not in tracker
+
+    def test_catches_up_after_stall(self):
+        """루프가 한 바퀴 이상 밀려도 마감 지난 명령은 모두 만료"""
+        tracker, clock = make(tick=1.0, wheel_size=8)
+        for i in range(20):
+            tracker.track(f"c{i}", "n1", timeout=i + 1)
+
+        clock.now += 15
+        assert tracker.advance() == 15
+        assert len(tracker) == 5
+
+    def test_resolved_command_leaves_the_wheel(self):
+        tracker, clock = make(tick=1.0)
+        tracker.track("a", "n1", timeout=1)
+        assert tracker.resolve("a", {"status": "SUCCESS"})
+        assert not tracker.resolve("a", {"status": "SUCCESS"})  # 늦은 중복 RESULT
+
+        clock.now += 5
+        assert tracker.advance() == 0
+        assert tracker.stats()["completed"] == 1
+
+
+class TestWait:
+    """wait / 여러 대기자"""
+
+    @pytest.mark.asyncio
+    async def test_result_to_all_waiters(self):
+        tracker, _ = make()
+        tracker.track("a", "n1", timeout=10)
+
+        waiters = [asyncio.create_task(tracker.wait("a")) for _ in range(3)]
+        await asyncio.sleep(0.02)
+        tracker.resolve("a", {"status": "SUCCESS"})
+
+        assert await asyncio.gather(*waiters) == [{"status": "SUCCESS"}] * 3
+
+    @pytest.mark.asyncio
+    async def test_waiter_timeout_and_cancel_are_independent(self):
+        tracker, _ = make()
+        tracker.track("a", "n1", timeout=10)
+
+        impatient = asyncio.create_task(tracker.wait("a", timeout=0.01))
+        gone = asyncio.create_task(tracker.wait("a"))
+        patient = asyncio.create_task(tracker.wait("a"))
+        await asyncio.sleep(0.02)
+        gone.cancel()
+        await asyncio.sleep(0.02)
+
+        assert await impatient is None
+        assert tracker.lookup("a")["waiters"] == 1
+        tracker.resolve("a", {"status": "FAILED"})
+        assert await patient == {"status": "FAILED"}
+
+    @pytest.mark.asyncio
+    async def test_expired_waiter_gets_none(self):
+        tracker, clock = make(tick=1.0)
+        tracker.track("a", "n1", timeout=1)
+        waiter = asyncio.create_task(tracker.wait("a"))
+        await asyncio.sleep(0.02)
+
+        clock.now += 2
+        tracker.advance()
+        assert await waiter is None
+
+    @pytest.mark.asyncio
+    async def test_result_before_wait(self):
+        """RESULT가 wait 등록보다 먼저 와도 최근 결과로 전달"""
+        tracker, _ = make()
+        tracker.track("a", "n1", timeout=10)
+        tracker.resolve("a", {"status": "SUCCESS"})
+
+        assert await tracker.wait("a") == {"status": "SUCCESS"}
+        assert await tracker.wait("unknown") is None
+
+
+class TestStats:
+    """나이 백분위 / inflight 목록"""
+
+    def test_age_percentiles(self):
+        tracker, clock = make()
+        for i in range(101):
+            tracker.track(f"c{i}", "n1", timeout=1000)
+            clock.now += 1
+
+        ages = tracker.age_percentiles()
+
+        assert ages == {"p50": 51.0, "p90": 91.0, "p99": 100.0, "max": 101.0}
+        assert [c["command_id"] for c in tracker.inflight(limit=2)] == ["c0", "c1"]
+        assert tracker.stats()["inflight"] == 101
+
+    def test_empty(self):
+        tracker, _ = make()
+        assert tracker.age_percentiles()["max"] == 0.0
@@ -0,0 +1,92 @@
+"""
+connection_table 단위 테스트
+
+테스트 대상:
+- READY 인덱스 (상태/슬롯 변경 시 갱신)
+- pick_ready 라운드로빈
+- 재연결로 대체된 연결의 remove 무시
+- snapshot 재사용 / 순회 중 변경 안전
+"""
+
+from shared.connection_table import ConnectionTable
+
+
+class Conn:
+    def __init__(self, node_id: str, status: str = "READY", active_tasks: int = 0):
+        self.node_id = node_id
+        self.status = status
+        self.active_tasks = active_tasks
+
+
+class TestConnectionTable:
+    """ConnectionTable"""
+
+    def test_ready_index_follows_updates(self):
+        """READY + 여유 슬롯인 노드만 인덱스에"""
+        table = ConnectionTable(max_tasks=2)
+        for node_id in ("a", "b", "c"):
+            table.add(Conn(node_id))
+
+        table.update("a", status="BUSY")
+        table.update("b", active_tasks=2)
+        assert [c.node_id for c in table.ready()] == ["c"]
+
+        table.update("a", status="READY", active_tasks=1)
+        table.update("b", active_tasks=1)
+        assert sorted(c.node_id for c in table.ready()) == ["a", "b", "c"]
+        assert table.ready_count == 3
+
+        table.remove("c")
+        assert table.ready_count == 2
+
+    def test_update_sets_fields_at_once(self):
+        """update는 여러 필드를 한 번에 반영, 없는 노드는 False"""
+        table = ConnectionTable()
+        conn = Conn("a")
+        table.add(conn)
+
+        assert table.update("a", status="BUSY", active_tasks=3, device_count=20) is True
+        assert (conn.status, conn.active_tasks, conn.device_count) == ("BUSY", 3, 20)
+        assert table.update("missing", status="READY") is False
+
+    def test_pick_ready_round_robin(self):
+        """pick_ready는 READY 노드를 돌아가며 선택"""
+        table = ConnectionTable()
+        for node_id in ("a", "b", "c"):
+            table.add(Conn(node_id))
+        table.update("b", status="BUSY")
+
+        picks = [table.pick_ready().node_id for _ in range(4)]
+        assert picks == ["a", "c", "a", "c"]
+
+        table.update("a", status="BUSY")
+        table.update("c", status="BUSY")
+        assert table.pick_ready() is None
+
+    def test_replaced_connection_is_not_removed(self):
+        """재연결 후 이전 핸들러의 remove는 새 연결을 지우지 않음"""
+        table = ConnectionTable()
+        old, new = Conn("a"), Conn("a")
+        table.add(old)
+
+        assert table.add(new) is old
+        assert table.remove("a", old) is None
+        assert table.get("a") is new
+        assert table.pick_ready() is new
+
+        assert table.remove("a", new) is new
+        assert "a" not in table
+
+    def test_snapshot_reused_until_membership_changes(self):
+        """상태 변경은 스냅샷을 새로 만들지 않고, 추가/제거 시에만 갱신"""
+        table = ConnectionTable()
+        table.add(Conn("a"))
+        first = table.snapshot()
+
+        table.update("a", status="BUSY")
+        assert table.snapshot() is first
+
+        for conn in table:  # 순회 중 변경
+            table.add(Conn("b"))
+            table.remove(conn.node_id)
+        assert [c.node_id for c in table.snapshot()] == ["b"]
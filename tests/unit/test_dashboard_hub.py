@@ -0,0 +1,181 @@
+"""
+dashboard_hub 단위 테스트
+
+테스트 대상:
+- publish 1회 = 직렬화 1회, 모든 구독자에게 같은 프레임
+- 느린 구독자가 다른 구독자를 막지 않음
+- coalesce 키 / 큐 상한 초과 시 오래된 프레임 제거
+- 전송 타임아웃/실패 시 연결 종료
+"""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+
+from shared import dashboard_hub as hub_module
+from shared.dashboard_hub import DashboardHub
+
+
+class FakeSocket:
+    """send_text/close만 기록하는 가짜 WebSocket"""
+
+    def __init__(self, block: bool = False, error: Exception = None):
+        self.frames = []
+        self.closed = False
+        self.error = error
+        self.gate = asyncio.Event()
+        if not block:
+            self.gate.set()
+
+    async def send_text(self, frame: str):
+        await self.gate.wait()
+        if self.error:
+            raise self.error
+        self.frames.append(frame)
+
+    async def close(self):
+        self.closed = True
+
+    def messages(self):
+        return [json.loads(frame) for frame in self.frames]
+
+
+async def settle():
+    """writer 태스크가 큐를 비울 때까지 양보"""
+    await asyncio.sleep(0.02)
+
+
+class TestDashboardHub:
+    """DashboardHub"""
+
+    @pytest.mark.asyncio
+    async def test_serializes_once_for_all_subscribers(self):
+        """구독자 수와 무관하게 publish 1회당 직렬화 1회"""
+        hub = DashboardHub()
+        sockets = [FakeSocket() for _ in range(3)]
+        for ws in sockets:
+            hub.subscribe(ws.send_text, ws.close)
+
+        with patch.object(hub_module, "encode", wraps=hub_module.encode) as encode:
+            assert hub.publish({"type": "NODE_CONNECTED", "node_id": "n1"}) == 3
+        await settle()
+
+        assert encode.call_count == 1
+        assert all(ws.frames == sockets[0].frames for ws in sockets)
+        assert sockets[0].frames[0] is sockets[1].frames[0]
+        await hub.close()
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_does_not_block_others(self):
+        """느린 구독자는 자기 큐에만 쌓임"""
+        hub = DashboardHub()
+        slow, fast = FakeSocket(block=True), FakeSocket()
+        hub.subscribe(slow.send_text, slow.close)
+        hub.subscribe(fast.send_text, fast.close)
+
+        for i in range(3):
+            hub.publish({"type": "COMMAND_RESULT", "seq": i})
+        await settle()
+
+        assert [m["seq"] for m in fast.messages()] == [0, 1, 2]
+        assert slow.frames == []
+        assert hub.stats()["queued"] == 2  # 하나는 전송 중
+
+        slow.gate.set()
+        await settle()
+        assert [m["seq"] for m in slow.messages()] == [0, 1, 2]
+        await hub.close()
+
+    @pytest.mark.asyncio
+    async def test_coalesce_keeps_latest_in_place(self):
+        """같은 키 프레임은 큐 위치를 유지한 채 최신 값으로 교체"""
+        hub = DashboardHub()
+        ws = FakeSocket(block=True)
+        hub.subscribe(ws.send_text, ws.close)
+
+        hub.publish({"type": "PING"})  # writer가 붙잡고 있는 프레임
+        await settle()
+        hub.publish({"type": "NODE_UPDATE", "node_id": "n1", "v": 1}, key="NODE_UPDATE:n1")
+        hub.publish({"type": "NODE_UPDATE", "node_id": "n2", "v": 1}, key="NODE_UPDATE:n2")
+        hub.publish({"type": "NODE_UPDATE", "node_id": "n1", "v": 2}, key="NODE_UPDATE:n1")
+
+        ws.gate.set()
+        await settle()
+
+        assert [(m.get("node_id"), m.get("v")) for m in ws.messages()] == [
+            (None, None),
+            ("n1", 2),
+            ("n2", 1),
+        ]
+        assert hub.stats()["coalesced"] == 1
+        await hub.close()
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_oldest(self):
+        """큐 상한 초과 시 가장 오래된 프레임부터 제거"""
+        hub = DashboardHub(max_queue=2)
+        ws = FakeSocket(block=True)
+        hub.subscribe(ws.send_text, ws.close)
+
+        hub.publish({"seq": 0})
+        await settle()  # seq 0 전송 중
+        for i in range(1, 5):
+            hub.publish({"seq": i})
+
+        ws.gate.set()
+        await settle()
+
+        assert [m["seq"] for m in ws.messages()] == [0, 3, 4]
+        assert hub.stats()["dropped"] == 2
+        await hub.close()
+
+    @pytest.mark.asyncio
+    async def test_send_timeout_closes_subscriber(self):
+        """전송이 send_timeout을 넘기면 연결 종료 후 구독 해제"""
+        hub = DashboardHub(send_timeout=0.01)
+        ws = FakeSocket(block=True)
+        sub = hub.subscribe(ws.send_text, ws.close)
+
+        hub.publish({"type": "NODE_CONNECTED"})
+        await asyncio.sleep(0.05)
+
+        assert ws.closed is True
+        assert sub.closed is True
+        assert hub.publish({"type": "NODE_CONNECTED"}) == 0
+        assert len(hub) == 0
+
+    @pytest.mark.asyncio
+    async def test_send_error_closes_subscriber(self):
+        """전송 실패 구독자는 제거되고 다른 구독자는 계속 수신"""
+        hub = DashboardHub()
+        broken, ok = FakeSocket(error=RuntimeError("closed")), FakeSocket()
+        hub.subscribe(broken.send_text, broken.close)
+        hub.subscribe(ok.send_text, ok.close)
+
+        hub.publish({"seq": 0})
+        await settle()
+        hub.publish({"seq": 1})
+        await settle()
+
+        assert broken.closed is True
+        assert [m["seq"] for m in ok.messages()] == [0, 1]
+        assert len(hub) == 1
+        await hub.close()
+
+    @pytest.mark.asyncio
+    async def test_unsubscribe(self):
+        """구독 해제 후에는 큐에 넣지 않음"""
+        hub = DashboardHub()
+        ws = FakeSocket()
+        sub = hub.subscribe(ws.send_text, ws.close)
+        sub.send({"type": "INIT"})
+        await settle()
+
+        await hub.unsubscribe(sub)
+        hub.publish({"type": "NODE_CONNECTED"})
+        await settle()
+
+        assert [m["type"] for m in ws.messages()] == ["INIT"]
+        assert len(hub) == 0
@@ -0,0 +1,93 @@
+"""
+YouTubeQueueService.get_execution_logs() 단위 테스트
+
+테스트 대상:
+- (completed_at, id) 키셋 페이지 + 다음 커서
+- completed_at이 NULL인 행 제외
+
+shared.schemas 패키지는 아직 없는 shared.schemas.gateway를 임포트하므로,
+서비스 모듈을 임포트하는 동안만 빈 스텁 모듈을 끼워 넣는다
+(patch.dict가 끝나면 sys.modules는 원래대로 돌아가 다른 테스트에 영향 없음)
+"""
+
+import re
+import sys
+import types
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+_gateway_stub = types.ModuleType("shared.schemas.gateway")
+_gateway_stub.__getattr__ = lambda name: type(name, (), {})
+
+with patch.dict(sys.modules, {"shared.schemas.gateway": _gateway_stub}):
+    from shared.youtube_queue_service import YouTubeQueueService
+
+
+class FakeLogQuery:
+    """execution_logs select 빌더 흉내 (NULL 필터 + 키셋 조건을 메모리 행에 적용)"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.not_null = None
+        self.after = None
+        self.size = None
+
+    @property
+    def not_(self):
+        return self
+
+    def is_(self, column, value):
+        assert value == "null"
+        self.not_null = column
+        return self
+
+    def or_(self, filters):
+        completed_at, _, row_id = re.findall(r'"([^"]*)"', filters)
+        self.after = (completed_at, row_id)
+        return self
+
+    def order(self, column, desc=False):
+        return self
+
+    def limit(self, size):
+        self.size = size
+        return self
+
+    def execute(self):
+        rows = [r for r in self.rows if self.not_null is None or r[self.not_null] is not None]
+        rows = sorted(rows, key=lambda r: (r["completed_at"], r["id"]), reverse=True)
+        if self.after:
+            rows = [r for r in rows if (r["completed_at"], r["id"]) < self.after]
+        return MagicMock(data=rows[: self.size])
+
+
+class TestExecutionLogPages:
+    """실행 로그 키셋 페이지"""
+
+    @pytest.mark.asyncio
+    async def test_pages_through_logs(self):
+        """두 페이지를 누락/중복 없이 순회, NULL completed_at 행은 제외"""
+        rows = [
+            {
+                "id": f"log-{i}",
+                "queue_item_id": "q1",
+                "device_id": "d1",
+                "status": "success",
+                "completed_at": f"2026-01-0{1 + i // 2}T00:00:00+00:00",  # 같은 시각 2개씩
+            }
+            for i in range(5)
+        ]
+        rows.append({**rows[0], "id": "log-null", "completed_at": None})
+
+        service = YouTubeQueueService.__new__(YouTubeQueueService)
+        service.client = MagicMock()
+        service.client.table.return_value.select.side_effect = lambda *_: FakeLogQuery(rows)
+
+        first, cursor = await service.get_execution_logs(limit=3)
+        assert [log.id for log in first] == ["log-4", "log-3", "log-2"]
+        assert cursor is not None
+
+        second, cursor = await service.get_execution_logs(limit=3, cursor=cursor)
+        assert [log.id for log in second] == ["log-1", "log-0"]
+        assert cursor is None
@@ -0,0 +1,76 @@
+"""
+fanout 단위 테스트
+
+테스트 대상:
+- 모든 노드에 동시 전송 (멈춘 노드가 다른 노드를 지연시키지 않음)
+- 노드별 outcome (sent / timeout / error / not_connected)
+- 같은 직렬화 프레임 공유
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from shared.fanout import ERROR, NOT_CONNECTED, SENT, TIMEOUT, encode, send_all
+
+
+class FakeSocket:
+    def __init__(self, delay: float = 0.0, error: Exception = None):
+        self.delay = delay
+        self.error = error
+        self.frames = []
+        self.delivered_at = None
+
+    async def send_text(self, frame: str):
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        self.frames.append(frame)
+        self.delivered_at = time.perf_counter()
+
+
+class TestSendAll:
+    """send_all"""
+
+    @pytest.mark.asyncio
+    async def test_stalled_node_does_not_delay_others(self):
+        """멈춘 노드는 timeout, 나머지는 거의 동시에 전달"""
+        sockets = {f"n{i}": FakeSocket(delay=0.001) for i in range(50)}
+        sockets["n0"].delay = 10  # 첫 번째 대상이 멈춤
+
+        started = time.perf_counter()
+        results = await send_all(
+            {node_id: ws.send_text for node_id, ws in sockets.items()}, "{}", timeout=0.05
+        )
+
+        assert time.perf_counter() - started < 1
+        assert results["n0"] == TIMEOUT
+        assert [results[f"n{i}"] for i in range(1, 50)] == [SENT] * 49
+        delivered = [ws.delivered_at for ws in sockets.values() if ws.delivered_at]
+        assert max(delivered) - min(delivered) < 0.04
+
+    @pytest.mark.asyncio
+    async def test_outcomes_per_node(self):
+        """노드별 결과, 입력 순서 유지"""
+        ok, broken = FakeSocket(), FakeSocket(error=ConnectionResetError("reset"))
+
+        results = await send_all({"b": broken.send_text, "gone": None, "a": ok.send_text}, "{}")
+
+        assert list(results.items()) == [("b", ERROR), ("gone", NOT_CONNECTED), ("a", SENT)]
+
+    @pytest.mark.asyncio
+    async def test_frame_is_shared(self):
+        """모든 노드가 같은 문자열 객체를 받음"""
+        sockets = [FakeSocket() for _ in range(3)]
+        frame = encode({"type": "COMMAND", "payload": {"command_id": "c1"}})
+
+        await send_all({str(i): ws.send_text for i, ws in enumerate(sockets)}, frame)
+
+        assert all(ws.frames[0] is frame for ws in sockets)
+        assert json.loads(frame)["payload"]["command_id"] == "c1"
+
+    @pytest.mark.asyncio
+    async def test_empty(self):
+        assert await send_all({}, "{}") == {}
@@ -0,0 +1,377 @@
+"""
+gateway_cluster 단위 테스트
+
+테스트 대상:
+- 노드 레지스트리 (등록/해제, 재연결된 노드 보호, 갱신 모아서 기록)
+- 응답 없는 백엔드 (등록은 기다리지 않음, 조회/해제는 backend_timeout 안에 끝남)
+- 인스턴스 간 request/reply (처리 함수 결과, 응답 없음, 모르는 action)
+- 이벤트 발행 (다른 인스턴스만 수신)
+- 죽은 인스턴스 감지 + 노드 기록 정리
+- Redis 백엔드 키/채널 구성
+"""
+
+import asyncio
+
+import pytest
+
+from shared.gateway_cluster import GatewayCluster, MemoryClusterBackend, RedisClusterBackend
+
+
+class Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_pair(**kwargs):
+    """같은 메모리 백엔드를 공유하는 두 인스턴스"""
+    backend = MemoryClusterBackend()
+    return (
+        GatewayCluster("gw-a", backend, sync_interval=3600, **kwargs),
+        GatewayCluster("gw-b", backend, sync_interval=3600, **kwargs),
+    )
+
+
+class TestRegistry:
+    """노드 레지스트리"""
+
+    @pytest.mark.asyncio
+    async def test_owner_and_remote_nodes(self):
+        """등록한 노드는 다른 인스턴스에서 담당 인스턴스와 기록으로 조회"""
+        a, b = make_pair()
+        await a.start()
+        await b.start()
+        try:
+            a.register_node("node_01", {"node_id": "node_01", "status": "READY"})
+            await a.sync()
+
+            assert await b.owner("node_01") == "gw-a"
+            assert await a.owner("node_01") == "gw-a"
+            assert await b.owner("missing") is None
+
+            remote = await b.remote_nodes()
+            assert remote["node_01"]["instance"] == "gw-a"
+            assert remote["node_01"]["status"] == "READY"
+            assert await a.remote_nodes() == {}  # 자기 노드는 제외
+
+            await a.unregister_node("node_01")
+            assert await b.owner("node_01") is None
+        finally:
+            await a.stop()
+            await b.stop()
+
+    @pytest.mark.asyncio
+    async def test_reconnected_node_is_not_removed(self):
+        """다른 인스턴스로 재연결된 노드는 이전 인스턴스의 해제가 지우지 않음"""
+        a, b = make_pair()
+        await a.start()
+        await b.start()
+        try:
+            a.register_node("node_01", {"node_id": "node_01"})
+            await a.sync()
+            b.register_node("node_01", {"node_id": "node_01"})
+            await b.sync()
+            await a.unregister_node("node_01")
+
+            assert await a.owner("node_01") == "gw-b"
+        finally:
+            await a.stop()
+            await b.stop()
+
+    @pytest.mark.asyncio
+    async def test_updates_are_batched_until_sync(self):
+        """update_node는 sync 때 한 번에 기록 (마지막 값)"""
+        a, b = make_pair()
+        await a.start()
+        try:
+            a.register_node("node_01", {"node_id": "node_01", "active_tasks": 0})
+            await a.sync()
+            a.update_node("node_01", {"node_id": "node_01", "active_tasks": 1})
+            a.update_node("node_01", {"node_id": "node_01", "active_tasks": 2})
+            a.update_node("other", {"node_id": "other"})  # 등록되지 않은 노드는 무시
+            assert (await b.remote_nodes())["node_01"]["active_tasks"] == 0
+
+            await a.sync()
+            remote = await b.remote_nodes()
+            assert remote["node_01"]["active_tasks"] == 2
+            assert "other" not in remote
+        finally:
+            await a.stop()
+
+    @pytest.mark.asyncio
+    async def test_stale_records_are_ignored(self):
+        """node_ttl 동안 갱신 없는 기록은 조회에서 제외"""
+        clock = Clock()
+        backend = MemoryClusterBackend(clock=clock)
+        a = GatewayCluster("gw-a", backend, node_ttl=90, sync_interval=3600, clock=clock)
+        b = GatewayCluster("gw-b", backend, node_ttl=90, sync_interval=3600, clock=clock)
+        a.instance_ttl = b.instance_ttl = 1000
+        await a.start()
+        try:
+            a.register_node("node_01", {"node_id": "node_01"})
+            await a.sync()
+            clock.now += 91
+            assert await b.owner("node_01") is None
+            assert await b.remote_nodes() == {}
+        finally:
+            await a.stop()
+
+
+class HangingBackend(MemoryClusterBackend):
+    """hang=True면 레지스트리 호출이 끝나지 않는 메모리 백엔드 (멈춘 Redis)"""
+
+    def __init__(self):
+        super().__init__()
+        self.hang = False
+
+    async def _stall(self):
+        if self.hang:
+            await asyncio.Event().wait()
+
+    async def set_nodes(self, instance_id, records):
+        await self._stall()
+        await super().set_nodes(instance_id, records)
+
+    async def remove_node(self, node_id, instance_id):
+        await self._stall()
+        return await super().remove_node(node_id, instance_id)
+
+    async def get_node(self, node_id):
+        await self._stall()
+        return await super().get_node(node_id)
+
+    async def all_nodes(self):
+        await self._stall()
+        return await super().all_nodes()
+
+
+class TestHungBackend:
+    """응답 없는 백엔드"""
+
+    @pytest.mark.asyncio
+    async def test_register_wakes_sync(self):
+        """등록은 await 없이 끝나고, sync 루프가 바로 깨어나 기록"""
+        backend = HangingBackend()
+        a = GatewayCluster("gw-a", backend, sync_interval=3600)
+        b = GatewayCluster("gw-b", backend, sync_interval=3600)
+        await a.start()
+        try:
+            a.register_node("node_01", {"node_id": "node_01"})
+            for _ in range(50):
+                if await b.owner("node_01"):
+                    break
+                await asyncio.sleep(0.01)
+            assert await b.owner("node_01") == "gw-a"
+        finally:
+            await a.stop()
+
+    @pytest.mark.asyncio
+    async def test_calls_are_bounded(self):
+        """멈춘 백엔드: 조회는 빈 결과, 해제/동기화는 backend_timeout 후 반환, 기록은 재시도 대기"""
+        backend = HangingBackend()
+        a = GatewayCluster("gw-a", backend, sync_interval=3600, backend_timeout=0.02)
+        b = GatewayCluster("gw-b", backend, sync_interval=3600, backend_timeout=0.02)
+        await a.start()
+        await b.start()
+        backend.hang = True
+        try:
+            a.register_node("node_01", {"node_id": "node_01"})
+            assert await a.owner("node_01") == "gw-a"  # 로컬 노드는 그대로
+
+            assert await asyncio.wait_for(b.owner("node_01"), 1) is None
+            assert await asyncio.wait_for(b.remote_nodes(), 1) == {}
+            with pytest.raises(TimeoutError):
+                await asyncio.wait_for(a.sync(), 1)
+            assert "node_01" in a._dirty
+
+            await asyncio.wait_for(a.unregister_node("other"), 1)
+        finally:
+            backend.hang = False
+            await asyncio.wait_for(a.stop(), 2)
+            await asyncio.wait_for(b.stop(), 2)
+
+
+class TestRequests:
+    """인스턴스 간 request/reply"""
+
+    @pytest.mark.asyncio
+    async def test_request_is_served_by_owner(self):
+        """담당 인스턴스의 처리 함수 결과가 요청한 인스턴스로 돌아옴"""
+        a, b = make_pair()
+        seen = []
+
+        async def serve(payload):
+            seen.append(payload)
+            return {"sent": True, "node_id": payload["node_id"]}
+
+        b.handle("direct", serve)
+        await a.start()
+        await b.start()
+        try:
+            reply = await a.request("gw-b", "direct", {"node_id": "node_01"}, timeout=1)
+            assert reply == {"sent": True, "node_id": "node_01"}
+            assert seen == [{"node_id": "node_01"}]
+            assert (a.forwarded, b.served) == (1, 1)
+        finally:
+            await a.stop()
+            await b.stop()
+
+    @pytest.mark.asyncio
+    async def test_slow_handler_does_not_block_other_requests(self):
+        """처리가 긴 요청(RESULT 대기) 중에도 다른 요청은 바로 처리"""
+        a, b = make_pair()
+        release = asyncio.Event()
+
+        async def slow(payload):
+            await release.wait()
+            return {"slow": True}
+
+        async def fast(payload):
+            return {"fast": True}
+
+        b.handle("command", slow)
+        b.handle("send", fast)
+        await a.start()
+        await b.start()
+        try:
+            pending = asyncio.create_task(a.request("gw-b", "command", {}, timeout=1))
+            assert await a.request("gw-b", "send", {}, timeout=1) == {"fast": True}
+            release.set()
+            assert await pending == {"slow": True}
+        finally:
+            await a.stop()
+            await b.stop()
+
+    @pytest.mark.asyncio
+    async def test_missing_instance_or_action_returns_none(self):
+        """응답 없는 인스턴스, 모르는 action, 처리 중 예외는 None"""
+        a, b = make_pair()
+
+        async def broken(payload):
+            raise RuntimeError("boom")
+
+        b.handle("broken", broken)
+        await a.start()
+        await b.start()
+        try:
+            assert await a.request("gw-gone", "command", {}, timeout=0.05) is None
+            assert await a.request("gw-b", "unknown", {}, timeout=1) is None
+            assert await a.request("gw-b", "broken", {}, timeout=1) is None
+        finally:
+            await a.stop()
+            await b.stop()
+
+
+class TestEvents:
+    """대시보드 이벤트"""
+
+    @pytest.mark.asyncio
+    async def test_events_reach_other_instances_only(self):
+        """발행한 인스턴스는 자기 이벤트를 받지 않음"""
+        a, b = make_pair()
+        received = {"gw-a": [], "gw-b": []}
+        a.on_event = lambda source, event: received["gw-a"].append((source, event))
+        b.on_event = lambda source, event: received["gw-b"].append((source, event))
+        await a.start()
+        await b.start()
+        try:
+            a.publish_event({"type": "dashboard", "message": {"type": "NODE_CONNECTED"}})
+            a.publish_event({"type": "node_removed", "node_id": "node_01"})
+            await asyncio.sleep(0.02)
+
+            assert received["gw-a"] == []
+            assert [event["type"] for _, event in received["gw-b"]] == [
+                "dashboard",
+                "node_removed",
+            ]
+            assert received["gw-b"][0][0] == "gw-a"
+        finally:
+            await a.stop()
+            await b.stop()
+
+    @pytest.mark.asyncio
+    async def test_publish_before_start_is_ignored(self):
+        """시작 전 발행은 무시 (단일 인스턴스 테스트/스크립트에서 안전)"""
+        cluster = GatewayCluster("gw-a")
+        cluster.publish_event({"type": "dashboard"})
+        assert cluster.stats()["events_published"] == 0
+
+
+class TestInstanceLoss:
+    """죽은 인스턴스 감지"""
+
+    @pytest.mark.asyncio
+    async def test_lost_instance_nodes_are_pruned(self):
+        """생존 키가 만료된 인스턴스의 노드는 조회에서 빠지고 다음 sync에 삭제"""
+        clock = Clock()
+        backend = MemoryClusterBackend(clock=clock)
+        a = GatewayCluster("gw-a", backend, instance_ttl=15, sync_interval=3600, clock=clock)
+        b = GatewayCluster("gw-b", backend, instance_ttl=15, sync_interval=3600, clock=clock)
+        lost = []
+        a.on_instance_lost = lost.append
+        await a.start()
+        await b.start()
+        try:
+            b.register_node("node_01", {"node_id": "node_01"})
+            await b.sync()
+            await a.sync()
+            assert a.peers() == ["gw-a", "gw-b"]
+
+            # gw-b 비정상 종료 (생존 키 갱신 없음)
+            clock.now += 16
+            assert await a.owner("node_01") is None
+
+            await a.sync()
+            assert lost == ["gw-b"]
+            assert a.peers() == ["gw-a"]
+            assert await backend.all_nodes() == {}
+        finally:
+            await a.stop()
+
+
+class FakePipeline:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+    async def execute(self):
+        return []
+
+
+class FakeRedis:
+    """파이프라인/EVAL 호출만 기록하는 가짜 Redis"""
+
+    def __init__(self):
+        self.calls = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self.calls)
+
+    async def eval(self, script, numkeys, *args):
+        self.calls.append(("eval", args, {}))
+        return 1
+
+
+class TestRedisBackend:
+    """Redis 백엔드 키 구성"""
+
+    @pytest.mark.asyncio
+    async def test_keys_use_prefix(self):
+        """레지스트리/생존 키는 prefix 아래, 노드 삭제는 소유자 확인 스크립트"""
+        redis = FakeRedis()
+        backend = RedisClusterBackend(redis, prefix="gw")
+
+        await backend.touch_instance("gw-a", ttl=15)
+        await backend.set_nodes("gw-a", {"node_01": {"status": "READY"}})
+        assert await backend.remove_node("node_01", "gw-a") is True
+
+        names = [(name, args[0] if args else kwargs) for name, args, kwargs in redis.calls]
+        assert names[0] == ("set", "gw:alive:gw-a")
+        assert names[1] == ("sadd", "gw:instances")
+        assert names[2] == ("hset", "gw:owners")
+        assert names[3] == ("hset", "gw:nodes")
+        assert redis.calls[4] == ("eval", ("gw:owners", "gw:nodes", "node_01", "gw-a"), {})
@@ -0,0 +1,182 @@
+"""
+heartbeat_aggregator 단위 테스트
+
+테스트 대상:
+- max_batch / max_delay 기준 플러시
+- 같은 노드 하트비트 합치기, 버퍼 상한
+- 노드별 결과 전달 (누락/실패 포함)
+- stop() 시 남은 하트비트 플러시
+- discard() - 버퍼에서 제거, 플러시 중인 배치는 DB 반영까지 대기
+"""
+
+import asyncio
+
+import pytest
+
+from shared.heartbeat_aggregator import HeartbeatAggregator
+
+
+class Recorder:
+    """flush/deliver 호출 기록"""
+
+    def __init__(self, fail: bool = False, delay: float = 0.0):
+        self.fail = fail
+        self.delay = delay
+        self.batches = []
+        self.completed = []
+        self.delivered = {}
+
+    async def flush(self, heartbeats):
+        self.batches.append([hb["node_id"] for hb in heartbeats])
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("db down")
+        self.completed.append([hb["node_id"] for hb in heartbeats])
+        return [
+            {"node_id": hb["node_id"], "success": True, "pending_commands": [hb["status"]]}
+            for hb in heartbeats
+        ]
+
+    async def deliver(self, node_id, result):
+        self.delivered[node_id] = result
+
+
+def heartbeat(node_id: str, status: str = "READY") -> dict:
+    return {"node_id": node_id, "status": status}
+
+
+class TestHeartbeatAggregator:
+    """HeartbeatAggregator"""
+
+    @pytest.mark.asyncio
+    async def test_flush_after_max_delay(self):
+        """배치가 차지 않아도 max_delay 후 한 번에 플러시"""
+        rec = Recorder()
+        agg = HeartbeatAggregator(rec.flush, rec.deliver, max_batch=100, max_delay=0.05)
+        await agg.start()
+
+        for i in range(3):
+            assert agg.submit(f"n{i}", heartbeat(f"n{i}")) is True
+        await asyncio.sleep(0.01)
+        assert rec.batches == []
+
+        await asyncio.sleep(0.1)
+        assert rec.batches == [["n0", "n1", "n2"]]
+        assert rec.delivered["n1"]["pending_commands"] == ["READY"]
+        await agg.stop()
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushes_immediately(self):
+        """max_batch개가 모이면 max_delay를 기다리지 않음"""
+        rec = Recorder()
+        agg = HeartbeatAggregator(rec.flush, rec.deliver, max_batch=2, max_delay=10)
+        await agg.start()
+
+        for i in range(5):
+            agg.submit(f"n{i}", heartbeat(f"n{i}"))
+        await asyncio.sleep(0.05)
+
+        assert rec.batches == [["n0", "n1"], ["n2", "n3"], ["n4"]]
+        await agg.stop()
+
+    @pytest.mark.asyncio
+    async def test_coalesces_same_node(self):
+        """플러시 전 같은 노드의 하트비트는 최신 것만 남음"""
+        rec = Recorder()
+        agg = HeartbeatAggregator(rec.flush, rec.deliver, max_batch=100, max_delay=10)
+
+        agg.submit("n1", heartbeat("n1", "READY"))
+        agg.submit("n2", heartbeat("n2"))
+        agg.submit("n1", heartbeat("n1", "BUSY"))
+        await agg.flush_all()
+
+        assert rec.batches == [["n1", "n2"]]
+        assert rec.delivered["n1"]["pending_commands"] == ["BUSY"]
+        assert agg.stats()["coalesced"] == 1
+
+    def test_drops_new_nodes_when_full(self):
+        """버퍼 상한 초과 시 새 노드는 버리고 기존 노드는 교체 허용"""
+        rec = Recorder()
+        agg = HeartbeatAggregator(rec.flush, rec.deliver, max_pending=2)
+
+        assert agg.submit("n1", heartbeat("n1")) is True
+        assert agg.submit("n2", heartbeat("n2")) is True
+        assert agg.submit("n3", heartbeat("n3")) is False
+        assert agg.submit("n1", heartbeat("n1", "BUSY")) is True
+        assert len(agg) == 2
+        assert agg.stats()["dropped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_flush_error_reports_failure_per_node(self):
+        """RPC 실패 시 노드별로 실패 결과를 전달하고 루프는 계속 동작"""
+        rec = Recorder(fail=True)
+        agg = HeartbeatAggregator(rec.flush, rec.deliver, max_batch=1, max_delay=10)
+        await agg.start()
+
+        agg.submit("n1", heartbeat("n1"))
+        await asyncio.sleep(0.02)
+        rec.fail = False
+        agg.submit("n2", heartbeat("n2"))
+        await asyncio.sleep(0.02)
+
+        assert rec.delivered["n1"]["success"] is False
+        assert rec.delivered["n2"]["success"] is True
+        await agg.stop()
+
+    @pytest.mark.asyncio
+    async def test_submit_during_flush(self):
+        """플러시 중 들어온 하트비트는 다음 배치로"""
+        rec = Recorder(delay=0.05)
+        agg = HeartbeatAggregator(rec.flush, rec.deliver, max_batch=100, max_delay=0.01)
+        await agg.start()
+
+        agg.submit("n1", heartbeat("n1"))
+        await asyncio.sleep(0.03)  # 첫 플러시 진행 중
+        agg.submit("n2", heartbeat("n2"))
+        await asyncio.sleep(0.15)
+
+        assert rec.batches == [["n1"], ["n2"]]
+        await agg.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop_drains(self):
+        """stop()은 남은 하트비트를 모두 플러시"""
+        rec = Recorder()
+        agg = HeartbeatAggregator(rec.flush, rec.deliver, max_batch=2, max_delay=10)
+        for i in range(3):
+            agg.submit(f"n{i}", heartbeat(f"n{i}"))
+
+        await agg.stop()
+
+        assert sorted(rec.delivered) == ["n0", "n1", "n2"]
+        assert len(agg) == 0
+
+    @pytest.mark.asyncio
+    async def test_discard_removes_buffered_heartbeat(self):
+        """버퍼에만 있는 하트비트는 바로 제거되어 플러시되지 않음"""
+        rec = Recorder()
+        agg = HeartbeatAggregator(rec.flush, rec.deliver, max_batch=100, max_delay=10)
+        agg.submit("n1", heartbeat("n1"))
+        agg.submit("n2", heartbeat("n2"))
+
+        await agg.discard("n1")
+        await agg.discard("unknown")
+        await agg.stop()
+
+        assert rec.batches == [["n2"]]
+
+    @pytest.mark.asyncio
+    async def test_discard_waits_for_in_flight_flush(self):
+        """플러시 중인 배치에 있는 노드는 DB 반영이 끝난 뒤에 discard가 반환"""
+        rec = Recorder(delay=0.05)
+        agg = HeartbeatAggregator(rec.flush, rec.deliver, max_batch=100, max_delay=0.01)
+        await agg.start()
+
+        agg.submit("n1", heartbeat("n1"))
+        await asyncio.sleep(0.03)  # 첫 플러시 진행 중
+        await agg.discard("n1")
+
+        assert rec.completed == [["n1"]]
+        assert agg._flushing == {}
+        await agg.stop()
@@ -0,0 +1,258 @@
+"""
+LocalSupabase 단위 테스트
+
+테스트 대상:
+- 쿼리 빌더 - 필터, 정렬, 범위, single, 임베드
+- 쓰기 - insert, upsert(on_conflict), update, delete
+- or_() / apply_keyset() - 키셋 페이지네이션 호환
+- RPC - heartbeat_devices, claim_jobs, 사용자 등록
+- 왕복 집계 / 지연 주입
+- use_local_supabase() - DeviceSync/JobSync를 수정 없이 실행
+"""
+
+import time
+
+import pytest
+
+from shared.async_db import iter_keyset, run_query
+from shared.local_supabase import APIError, LocalSupabase, use_local_supabase
+from shared.supabase_client import DeviceSync, JobSync
+
+
+@pytest.fixture
+def db():
+    client = LocalSupabase()
+    client.seed(
+        "devices",
+        [
+            {"serial_number": "A", "status": "idle", "pc_id": 1, "battery": 80},
+            {"serial_number": "B", "status": "busy", "pc_id": 1, "battery": None},
+            {"serial_number": "C", "status": "offline", "pc_id": 2, "battery": 20},
+        ],
+    )
+    yield client
+    client.close()
+
+
+class TestQuery:
+    """조회 빌더 테스트"""
+
+    def test_filters(self, db):
+        """eq/neq/in_/lt 조합"""
+        rows = db.table("devices").select("serial_number").eq("pc_id", "1").execute().data
+        assert [r["serial_number"] for r in rows] == ["A", "B"]
+
+        rows = db.table("devices").select("*").neq("status", "busy").lt("battery", 50).execute()
+        assert [r["serial_number"] for r in rows.data] == ["C"]
+
+        rows = db.table("devices").select("*").in_("serial_number", ["A", "C"]).execute().data
+        assert len(rows) == 2
+
+        assert db.table("devices").select("*").is_("battery", "null").execute().data[0]["id"] == 2
+
+    def test_order_nulls_like_postgres(self, db):
+        """ASC는 NULL 마지막, DESC는 NULL 처음"""
+        asc = db.table("devices").select("battery").order("battery").execute().data
+        desc = db.table("devices").select("battery").order("battery", desc=True).execute().data
+
+        assert [r["battery"] for r in asc] == [20, 80, None]
+        assert [r["battery"] for r in desc] == [None, 80, 20]
+
+    def test_range_and_count(self, db):
+        """range()는 양끝 포함, count는 limit 이전 전체 수"""
+        result = db.table("devices").select("*", count="exact").order("id").range(1, 1).execute()
+
+        assert [r["serial_number"] for r in result.data] == ["B"]
+        assert result.count == 3
+
+    def test_single(self, db):
+        """single()은 1행이 아니면 PGRST116"""
+        row = db.table("devices").select("*").eq("serial_number", "A").single().execute()
+        assert row.data["status"] == "idle"
+
+        with pytest.raises(APIError) as exc:
+            db.table("devices").select("*").eq("serial_number", "Z").single().execute()
+        assert exc.value.code == "PGRST116"
+
+        assert db.table("devices").select("*").eq("id", 99).maybe_single().execute() is None
+
+    def test_embed(self, db):
+        """{단수형}_id 외래 키로 1단계 임베드"""
+        db.seed("videos", [{"title": "v1"}])
+        db.seed("jobs", [{"video_id": 1, "status": "pending"}])
+
+        job = db.table("jobs").select("*, videos(*)").single().execute().data
+        assert job["videos"]["title"] == "v1"
+
+        video = db.table("videos").select("title, jobs(status)").single().execute().data
+        assert video == {"title": "v1", "jobs": [{"status": "pending"}]}
+
+    def test_unknown_table(self, db):
+        """없는 테이블 조회는 빈 결과"""
+        assert db.table("nothing").select("*").eq("id", 1).execute().data == []
+
+
+class TestWrite:
+    """쓰기 빌더 테스트"""
+
+    def test_insert_json_and_bool(self, db):
+        """dict/bool 값은 조회 시 원래 타입으로 복원"""
+        row = db.table("logs").insert({"meta": {"a": [1, 2]}, "ok": True}).execute().data[0]
+
+        assert row["meta"] == {"a": [1, 2]}
+        assert row["ok"] is True
+        assert row["created_at"]
+
+    def test_upsert_on_conflict(self, db):
+        """on_conflict 컬럼 기준으로 갱신, 명시하지 않은 컬럼은 유지"""
+        result = (
+            db.table("devices")
+            .upsert(
+                [
+                    {"serial_number": "A", "status": "busy"},
+                    {"serial_number": "D", "status": "idle"},
+                ],
+                on_conflict="serial_number",
+            )
+            .execute()
+        )
+
+        assert [r["serial_number"] for r in result.data] == ["A", "D"]
+        row = db.table("devices").select("*").eq("serial_number", "A").single().execute().data
+        assert row["status"] == "busy"
+        assert row["battery"] == 80
+        assert len(db.rows("devices")) == 4
+
+    def test_update_and_delete_return_rows(self, db):
+        """update/delete는 변경된 행 반환"""
+        updated = db.table("devices").update({"status": "idle"}).eq("pc_id", 1).execute()
+        assert len(updated.data) == 2
+
+        deleted = db.table("devices").delete().eq("serial_number", "C").execute()
+        assert deleted.data[0]["serial_number"] == "C"
+        assert len(db.rows("devices")) == 2
+
+    def test_failed_request_rolls_back(self, db):
+        """실패한 요청의 부분 쓰기는 되돌림"""
+        db.table("devices").upsert({"serial_number": "A"}, on_conflict="serial_number").execute()
+
+        with pytest.raises(APIError):
+            db.table("devices").insert([{"serial_number": "E"}, {"serial_number": "A"}]).execute()
+
+        assert len(db.rows("devices")) == 3
+
+
+class TestKeyset:
+    """async_db 키셋 헬퍼와의 호환"""
+
+    @pytest.mark.asyncio
+    async def test_iter_keyset(self, db):
+        """같은 시각 행이 있어도 중복/누락 없이 순회"""
+        db.seed(
+            "workload_logs",
+            [{"created_at": f"2026-01-01T00:00:0{i // 2}+00:00", "n": i} for i in range(7)],
+        )
+
+        rows = [
+            row
+            async for row in iter_keyset(lambda: db.table("workload_logs").select("*"), page_size=3)
+        ]
+
+        assert [r["n"] for r in rows] == [6, 5, 4, 3, 2, 1, 0]
+
+
+class TestRpc:
+    """RPC 테스트"""
+
+    def test_heartbeat_devices(self, db):
+        """busy 유지, 나머지 idle, 미등록 자동 등록, 기존 기기의 pc_id는 유지"""
+        rows = (
+            db.rpc("heartbeat_devices", {"p_pc_id": "1", "p_serials": ["A", "B", "C", "N"]})
+            .execute()
+            .data
+        )
+
+        outcomes = {r["serial_number"]: r["outcome"] for r in rows}
+        assert outcomes == {"A": "updated", "B": "busy", "C": "updated", "N": "registered"}
+        statuses = {r["serial_number"]: r["status"] for r in db.rows("devices")}
+        assert statuses == {"A": "idle", "B": "busy", "C": "idle", "N": "idle"}
+        pc_ids = {r["serial_number"]: str(r["pc_id"]) for r in db.rows("devices")}
+        assert pc_ids == {"A": "1", "B": "1", "C": "2", "N": "1"}
+
+    def test_claim_jobs(self, db):
+        """지정 작업 우선, 남은 idle 기기에 미지정 작업 배정"""
+        db.seed("devices", [{"serial_number": "D", "status": "idle", "pc_id": 1}])
+        db.seed(
+            "jobs",
+            [
+                {"device_id": None, "status": "pending"},
+                {"device_id": 4, "status": "pending"},
+            ],
+        )
+
+        claimed = db.rpc("claim_jobs", {"p_pc_id": "1", "p_device_ids": ["1", "2", "4"]}).execute()
+
+        assert {(j["id"], j["device_id"]) for j in claimed.data} == {(2, 4), (1, 1)}
+        assert all(j["status"] == "running" for j in db.rows("jobs"))
+        again = db.rpc("claim_jobs", {"p_pc_id": "1", "p_device_ids": ["1", "4"]}).execute()
+        assert again.data == []
+
+    def test_custom_rpc(self, db):
+        """등록한 Python 함수 호출, 미등록은 PGRST202"""
+        db.register_rpc("count_devices", lambda d, p: len(d.rows("devices")))
+
+        assert db.rpc("count_devices", {}).execute().data == 3
+        with pytest.raises(APIError) as exc:
+            db.rpc("missing", {}).execute()
+        assert exc.value.code == "PGRST202"
+
+
+class TestRoundTrips:
+    """왕복 집계/지연 주입 테스트"""
+
+    def test_stats(self, db):
+        """execute() 1회 = 왕복 1회, seed/rows는 제외"""
+        db.table("devices").select("*").execute()
+        db.table("devices").update({"status": "idle"}).eq("id", 1).execute()
+        db.rpc("heartbeat_devices", {"p_serials": ["A"]}).execute()
+
+        assert db.stats.total == 3
+        assert db.stats.by_label == {
+            "GET devices": 1,
+            "PATCH devices": 1,
+            "POST rpc/heartbeat_devices": 1,
+        }
+
+    def test_latency(self):
+        """설정한 지연만큼 execute()가 느려짐"""
+        db = LocalSupabase(latency=0.05)
+        started = time.perf_counter()
+        db.table("devices").select("*").execute()
+
+        assert time.perf_counter() - started >= 0.05
+        db.close()
+
+
+class TestInstall:
+    """use_local_supabase 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_repositories_use_local_client(self):
+        """get_client()를 쓰는 기존 코드가 로컬 클라이언트로 실행"""
+        from shared import supabase_client
+
+        previous = supabase_client._client
+
+        with use_local_supabase() as db:
+            sync = DeviceSync(pc_id=1)
+            assert await sync.heartbeat("A") is True
+            assert await sync.heartbeat_many(["A", "B"]) == {"A": "updated", "B": "registered"}
+
+            db.seed("jobs", [{"device_id": None, "status": "pending"}])
+            claimed = await JobSync(pc_id=1).claim_jobs([1])
+            assert claimed[1]["status"] == "running"
+
+            result = await run_query(db.table("devices").select("*").eq("pc_id", 1))
+            assert len(result.data) == 2
+
+        assert supabase_client._client is previous
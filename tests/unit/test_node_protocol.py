@@ -0,0 +1,139 @@
+"""
+node_protocol 단위 테스트
+
+테스트 대상:
+- HELLO 협상 (v2 제안 없음 → v1, 인코딩 선택)
+- 프레임 인코딩 (JSON 텍스트 / msgpack 바이너리)
+- 스냅샷 델타 (마지막 ACK 버전 기준, ACK 유실, resync)
+- v1 payload 호환
+"""
+
+import pytest
+
+from shared.node_protocol import (
+    JSON,
+    JSON_CODEC,
+    PROTOCOL_V2,
+    FrameCodec,
+    SnapshotDecoder,
+    SnapshotEncoder,
+    hello_offer,
+    negotiate,
+)
+
+
+def devices(count: int, **overrides):
+    return [
+        {"slot": i + 1, "serial": f"s{i}", "status": "idle", **overrides.get(f"s{i}", {})}
+        for i in range(count)
+    ]
+
+
+class TestNegotiate:
+    """negotiate"""
+
+    def test_v1_node(self):
+        assert negotiate(None) is None
+        assert negotiate({"versions": ["1.0"]}) is None
+
+    def test_v2_offer(self):
+        protocol = negotiate(hello_offer())
+        assert protocol["version"] == PROTOCOL_V2
+        assert protocol["snapshot_deltas"] is True
+
+    def test_unknown_encoding_falls_back_to_json(self):
+        protocol = negotiate({"versions": ["2.0"], "encodings": ["cbor"]})
+        assert protocol == {"version": "2.0", "encoding": JSON, "snapshot_deltas": False}
+
+
+class TestFrameCodec:
+    """FrameCodec"""
+
+    def test_json_roundtrip(self):
+        frame = JSON_CODEC.encode({"type": "HEARTBEAT", "payload": {"n": 1}})
+        assert isinstance(frame, str)
+        assert JSON_CODEC.decode(frame) == {"type": "HEARTBEAT", "payload": {"n": 1}}
+
+    def test_msgpack_roundtrip(self):
+        pytest.importorskip("msgpack")
+        codec = FrameCodec("msgpack")
+        message = {"type": "HEARTBEAT", "payload": {"device_snapshot": devices(3)}}
+
+        frame = codec.encode(message)
+
+        assert isinstance(frame, bytes) and codec.binary
+        assert codec.decode(frame) == message
+        assert codec.decode(JSON_CODEC.encode(message)) == message  # 텍스트 프레임도 처리
+
+    def test_unknown_encoding(self):
+        with pytest.raises(ValueError):
+            FrameCodec("cbor")
+
+
+class TestSnapshots:
+    """SnapshotEncoder / SnapshotDecoder"""
+
+    def test_first_full_then_delta(self):
+        encoder, decoder = SnapshotEncoder(), SnapshotDecoder()
+
+        first = encoder.encode(devices(3))
+        assert len(first["device_snapshot"]) == 3
+        assert decoder.apply(first) == devices(3)
+        encoder.ack(first["device_snapshot_version"])
+
+        current = devices(2, s1={"status": "busy"})  # s1 변경, s2 제거
+        delta = encoder.encode(current)
+
+        assert "device_snapshot" not in delta
+        assert delta["device_delta"] == {
+            "base": 1,
+            "upsert": [{"slot": 2, "serial": "s1", "status": "busy"}],
+            "removed": ["s2"],
+        }
+        assert decoder.apply(delta) == current
+
+    def test_delta_against_last_acked_version(self):
+        """ACK가 유실되면 이전 기준으로 계속 델타 - 게이트웨이는 최근 버전 보관"""
+        encoder, decoder = SnapshotEncoder(), SnapshotDecoder()
+        decoder.apply(encoder.encode(devices(3)))
+        encoder.ack(1)
+
+        decoder.apply(encoder.encode(devices(3, s0={"status": "busy"})))  # v2 ACK 유실
+        v3 = encoder.encode(devices(3, s0={"status": "busy"}, s1={"status": "busy"}))
+
+        assert v3["device_delta"]["base"] == 1
+        assert len(v3["device_delta"]["upsert"]) == 2
+        assert decoder.apply(v3) == devices(3, s0={"status": "busy"}, s1={"status": "busy"})
+
+        encoder.ack(3)
+        assert encoder.encode(decoder.devices)["device_delta"]["upsert"] == []
+
+    def test_missing_base_requests_resync(self):
+        """게이트웨이에 기준이 없으면 None → 노드는 reset 후 전체 전송"""
+        encoder = SnapshotEncoder()
+        encoder.encode(devices(2))
+        encoder.ack(1)
+        decoder = SnapshotDecoder()  # 게이트웨이 재시작 등
+
+        assert decoder.apply(encoder.encode(devices(2))) is None
+
+        encoder.reset()
+        full = encoder.encode(devices(2))
+        assert decoder.apply(full) == devices(2)
+
+    def test_encoder_keeps_its_own_copy(self):
+        """노드가 스냅샷 dict를 나중에 바꿔도 기준이 오염되지 않음"""
+        encoder = SnapshotEncoder()
+        current = devices(1)
+        encoder.encode(current)
+        encoder.ack(1)
+
+        current[0]["status"] = "busy"
+
+        assert encoder.encode(current)["device_delta"]["upsert"] == current
+
+    def test_v1_payload(self):
+        decoder = SnapshotDecoder()
+        snapshot = [{"x": 1}, {"x": 2}]  # 키 없는 디바이스도 그대로
+        assert decoder.apply({"device_snapshot": snapshot}) == snapshot
+        assert decoder.apply({}) == []
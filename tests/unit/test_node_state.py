@@ -0,0 +1,117 @@
+"""
+node_state 단위 테스트
+
+테스트 대상:
+- 바뀐 필드만 기록, 틱 사이 변경은 노드별로 합침
+- 연속된 NODE_DELTA의 from_version/version 연결
+- since(N) 재개 - 필드 단위 변경분, 제거 노드
+- epoch 불일치 / 기억 범위 밖 → 전체 스냅샷
+"""
+
+from shared.node_state import NodeStateTable
+
+
+def apply(state: dict, frame: dict) -> dict:
+    """클라이언트 규칙대로 프레임 적용"""
+    if frame["type"] == "INIT":
+        return {row["node_id"]: dict(row) for row in frame["nodes"]}
+    state = {node_id: dict(row) for node_id, row in state.items()}
+    for node_id in frame["removed"]:
+        state.pop(node_id, None)
+    for node_id, fields in frame["changed"].items():
+        state.setdefault(node_id, {}).update(fields)
+    return state
+
+
+class TestNodeStateTable:
+    """NodeStateTable"""
+
+    def test_unchanged_fields_are_not_recorded(self):
+        """값이 그대로면 버전도 프레임도 없음"""
+        table = NodeStateTable()
+        assert table.update("n1", {"status": "READY", "device_count": 20}) is True
+        table.take_delta()
+
+        assert table.update("n1", {"status": "READY", "device_count": 20}) is False
+        assert table.version == 1
+        assert table.take_delta() is None
+
+    def test_delta_coalesces_changes_between_ticks(self):
+        """틱 사이 여러 변경 → 노드별 마지막 값, 바뀐 필드만"""
+        table = NodeStateTable()
+        table.update("n1", {"status": "READY", "device_count": 20})
+        table.update("n2", {"status": "READY", "device_count": 20})
+        first = table.take_delta()
+
+        table.update("n1", {"status": "BUSY", "device_count": 20})
+        table.update("n1", {"status": "READY", "active_tasks": 1})
+        table.update("n1", {"status": "BUSY"})
+        second = table.take_delta()
+
+        assert first["from_version"] == 0
+        assert second["from_version"] == first["version"]
+        assert second["changed"] == {"n1": {"status": "BUSY", "active_tasks": 1}}
+        assert second["removed"] == []
+
+    def test_remove_and_readd_in_one_tick(self):
+        """제거 후 재등록된 노드는 removed와 changed 양쪽 → 이전 필드가 남지 않음"""
+        table = NodeStateTable()
+        table.update("n1", {"status": "READY", "hostname": "old"})
+        state = apply({}, table.snapshot())
+        table.take_delta()
+
+        table.remove("n1")
+        table.update("n1", {"status": "READY"})
+        delta = table.take_delta()
+
+        assert delta["removed"] == ["n1"]
+        assert apply(state, delta) == {"n1": {"node_id": "n1", "status": "READY"}}
+
+    def test_since_returns_fields_changed_after_version(self):
+        """재연결 시 N 이후 바뀐 필드와 제거된 노드만"""
+        table = NodeStateTable()
+        table.update("n1", {"status": "READY", "device_count": 20})
+        table.update("n2", {"status": "READY", "device_count": 20})
+        table.update("n3", {"status": "READY"})
+        snapshot = table.snapshot()
+        state = apply({}, snapshot)
+
+        table.update("n1", {"device_count": 19})
+        table.remove("n3")
+        frame = table.since(snapshot["version"], table.epoch)
+
+        assert frame["type"] == "NODE_DELTA"
+        assert frame["changed"] == {"n1": {"device_count": 19}}
+        assert frame["removed"] == ["n3"]
+        assert apply(state, frame) == apply({}, table.snapshot())
+
+    def test_since_falls_back_to_snapshot(self):
+        """epoch 불일치, 미래 버전, 잊은 tombstone 이전 → INIT"""
+        table = NodeStateTable(max_tombstones=1)
+        table.update("n1", {"status": "READY"})
+        table.update("n2", {"status": "READY"})
+        table.update("n3", {"status": "READY"})
+
+        assert table.since(1, "other-epoch")["type"] == "INIT"
+        assert table.since(99, table.epoch)["type"] == "INIT"
+
+        table.remove("n1")  # version 4
+        table.remove("n2")  # version 5 → n1 tombstone 잊음
+        assert table.since(3, table.epoch)["type"] == "INIT"
+        assert table.since(4, table.epoch)["removed"] == ["n2"]
+
+    def test_client_replay_matches_snapshot(self):
+        """INIT + 연속 NODE_DELTA 적용 결과 = 현재 스냅샷"""
+        table = NodeStateTable()
+        table.update("n1", {"status": "READY"})
+        state = apply({}, table.snapshot())
+
+        for i in range(20):
+            table.update(f"n{i % 4}", {"status": "BUSY" if i % 3 else "READY", "active_tasks": i})
+            if i % 7 == 0:
+                table.remove(f"n{(i + 1) % 4}")
+            if i % 5 == 0:
+                state = apply(state, table.take_delta())
+        state = apply(state, table.take_delta())
+
+        assert state == apply({}, table.snapshot())
@@ -0,0 +1,133 @@
+"""
+oob_forwarder 단위 테스트
+
+테스트 대상:
+- 여러 노드 메트릭을 POST 1회로 전송 (세션 재사용)
+- 큐 상한 초과 시 가장 오래된 항목 버림
+- 전송 실패 시 재시도 없이 버림
+- stop() 시 남은 항목 전송
+"""
+
+import asyncio
+
+import pytest
+
+from shared.oob_forwarder import OOBForwarder
+
+
+class FakeResponse:
+    def __init__(self, status: int):
+        self.status = status
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    """POST 본문만 기록하는 가짜 aiohttp 세션"""
+
+    def __init__(self, status: int = 200, error: Exception = None):
+        self.status = status
+        self.error = error
+        self.posts = []
+
+    def post(self, url, json=None):
+        self.posts.append((url, json))
+        if self.error:
+            raise self.error
+        return FakeResponse(self.status)
+
+    def node_ids(self):
+        return [[m["node_id"] for m in body["nodes"]] for _, body in self.posts]
+
+
+URL = "http://oob/oob/metrics/bulk"
+
+
+class TestOOBForwarder:
+    """OOBForwarder"""
+
+    @pytest.mark.asyncio
+    async def test_batches_nodes_into_one_post(self):
+        """max_delay 동안 모인 메트릭은 POST 1회"""
+        session = FakeSession()
+        forwarder = OOBForwarder(URL, max_delay=0.05, session=session)
+        await forwarder.start()
+
+        for i in range(3):
+            forwarder.submit(f"n{i}", {"device_count": i})
+        await asyncio.sleep(0.1)
+
+        assert session.node_ids() == [["n0", "n1", "n2"]]
+        assert session.posts[0][0] == URL
+        assert session.posts[0][1]["nodes"][2] == {"node_id": "n2", "device_count": 2}
+        assert forwarder.stats()["sent"] == 3
+        await forwarder.stop()
+
+    @pytest.mark.asyncio
+    async def test_full_batch_sent_immediately(self):
+        """max_batch개가 모이면 max_delay를 기다리지 않음"""
+        session = FakeSession()
+        forwarder = OOBForwarder(URL, max_batch=2, max_delay=10, session=session)
+        await forwarder.start()
+
+        for i in range(4):
+            forwarder.submit(f"n{i}", {})
+        await asyncio.sleep(0.05)
+
+        assert session.node_ids() == [["n0", "n1"], ["n2", "n3"]]
+        await forwarder.stop()
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_when_full(self):
+        """큐가 가득 차면 가장 오래된 항목부터 밀려남"""
+        session = FakeSession()
+        forwarder = OOBForwarder(URL, max_queue=3, session=session)
+
+        for i in range(5):
+            forwarder.submit(f"n{i}", {})
+        assert len(forwarder) == 3
+        assert forwarder.stats()["dropped"] == 2
+
+        await forwarder.flush_all()
+        assert session.node_ids() == [["n2", "n3", "n4"]]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "session", [FakeSession(status=503), FakeSession(error=ConnectionError("refused"))]
+    )
+    async def test_send_failure_drops_batch(self, session):
+        """HTTP 오류/연결 실패 시 재시도 없이 버림"""
+        forwarder = OOBForwarder(URL, session=session)
+        forwarder.submit("n1", {})
+        forwarder.submit("n2", {})
+
+        await forwarder.flush_all()
+
+        assert len(session.posts) == 1
+        assert len(forwarder) == 0
+        assert forwarder.stats() == {"queued": 0, "sent": 0, "dropped": 2, "failed_batches": 1}
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_and_keeps_external_session(self):
+        """stop()은 남은 항목을 보내고, 외부 세션은 닫지 않음"""
+        session = FakeSession()
+        forwarder = OOBForwarder(URL, max_delay=10, session=session)
+        await forwarder.start()
+        forwarder.submit("n1", {})
+
+        await forwarder.stop()
+
+        assert session.node_ids() == [["n1"]]
+        assert forwarder._session is session
+
+    def test_disabled_without_url(self):
+        """URL이 없으면 submit은 아무것도 하지 않음"""
+        forwarder = OOBForwarder("", session=FakeSession())
+        forwarder.submit("n1", {})
+
+        assert forwarder.enabled is False
+        assert len(forwarder) == 0
@@ -0,0 +1,148 @@
+"""
+placement 단위 테스트
+
+테스트 대상:
+- 부하 점수 (태스크 슬롯, CPU/메모리, 실패율, 디바이스 수)
+- p2c / least_loaded 선택
+- select 점수 순 선택
+- spread 디바이스 균등 분배 (노드 디바이스 수 상한)
+- 결정 기록 (디버깅용)
+"""
+
+import random
+from collections import Counter
+
+import pytest
+
+from shared.placement import NodeLoad, PlacementScheduler
+
+
+def loads(*specs):
+    return [NodeLoad(node_id, **fields) for node_id, fields in specs]
+
+
+class TestScore:
+    """score"""
+
+    def test_busier_node_scores_higher(self):
+        scheduler = PlacementScheduler()
+        idle, _ = scheduler.score(NodeLoad("a", active_tasks=0, cpu=10, memory=20))
+        busy, inputs = scheduler.score(NodeLoad("b", active_tasks=4, cpu=90, memory=80))
+
+        assert busy > idle
+        assert inputs == {"tasks": 0.8, "cpu": 0.9, "memory": 0.8, "failures": 0.0, "devices": 0.0}
+
+    def test_failures_raise_score(self):
+        scheduler = PlacementScheduler()
+        before, _ = scheduler.score(NodeLoad("a"))
+        scheduler.record_result("a", success=True)
+        scheduler.record_result("a", success=False)
+
+        after, inputs = scheduler.score(NodeLoad("a"))
+        assert inputs["failures"] == 0.5
+        assert after > before
+
+    def test_more_devices_is_a_bonus(self):
+        scheduler = PlacementScheduler()
+        small, _ = scheduler.score(NodeLoad("a", device_count=5), max_devices=20)
+        large, _ = scheduler.score(NodeLoad("b", device_count=20), max_devices=20)
+        assert large < small
+
+    def test_unknown_strategy(self):
+        with pytest.raises(ValueError):
+            PlacementScheduler(strategy="random")
+
+
+class TestPick:
+    """pick"""
+
+    def test_least_loaded(self):
+        scheduler = PlacementScheduler(strategy="least_loaded")
+        candidates = loads(
+            ("a", {"active_tasks": 3}), ("b", {"active_tasks": 1}), ("c", {"cpu": 90})
+        )
+        assert scheduler.pick(candidates).node_id == "b"
+        assert scheduler.pick([]) is None
+
+    def test_p2c_never_picks_the_worst(self):
+        """p2c는 두 후보 중 낮은 쪽 → 가장 바쁜 노드는 선택되지 않고 고르게 분산"""
+        scheduler = PlacementScheduler(strategy="p2c", rng=random.Random(1))
+        candidates = loads(*[(f"n{i}", {"active_tasks": i}) for i in range(5)])
+
+        picks = Counter(scheduler.pick(candidates).node_id for _ in range(500))
+
+        assert picks["n4"] == 0
+        assert picks["n0"] > picks["n1"] > picks["n2"] > picks["n3"] > 0
+
+
+class TestSelect:
+    """select"""
+
+    def test_lowest_scores_first(self):
+        scheduler = PlacementScheduler()
+        candidates = loads(
+            ("first", {"active_tasks": 4}),  # 먼저 연결됐지만 바쁨
+            ("b", {"active_tasks": 0}),
+            ("c", {"active_tasks": 2}),
+        )
+        assert [n.node_id for n in scheduler.select(candidates, 2)] == ["b", "c"]
+        assert len(scheduler.select(candidates, 0)) == 3
+
+
+class TestSpread:
+    """spread"""
+
+    def test_even_split(self):
+        """할당 차이 최대 1, 나머지는 점수가 낮은 노드부터"""
+        scheduler = PlacementScheduler()
+        candidates = loads(
+            ("a", {"device_count": 20, "active_tasks": 2}),
+            ("b", {"device_count": 20}),
+            ("c", {"device_count": 20, "active_tasks": 1}),
+        )
+
+        plan = scheduler.spread(candidates, devices=31)
+
+        assert [(n.node_id, quota) for n, quota in plan] == [("b", 11), ("c", 10), ("a", 10)]
+
+    def test_capped_by_device_count(self):
+        """디바이스가 적은 노드의 부족분은 다른 노드가 채움"""
+        scheduler = PlacementScheduler()
+        candidates = loads(("a", {"device_count": 3}), ("b", {"device_count": 20}))
+
+        plan = dict((n.node_id, quota) for n, quota in scheduler.spread(candidates, devices=20))
+
+        assert plan == {"a": 3, "b": 17}
+
+    def test_more_devices_than_available(self):
+        scheduler = PlacementScheduler()
+        candidates = loads(("a", {"device_count": 2}), ("b", {"device_count": 0}))
+
+        plan = scheduler.spread(candidates, devices=10)
+
+        assert [(n.node_id, quota) for n, quota in plan] == [("a", 2)]
+
+
+class TestDecisions:
+    """decisions / stats"""
+
+    def test_decisions_record_inputs(self):
+        scheduler = PlacementScheduler(strategy="least_loaded")
+        scheduler.select(loads(("a", {"cpu": 50}), ("b", {})), 1)
+        scheduler.spread(loads(("a", {"device_count": 4})), devices=2)
+
+        spread, select = scheduler.decisions()
+        assert spread["kind"] == "spread"
+        assert spread["requested"] == 2
+        assert spread["chosen"] == [{"node_id": "a", "devices": 2}]
+        assert select["chosen"] == [{"node_id": "b"}]
+        assert [c["node_id"] for c in select["candidates"]] == ["b", "a"]
+        assert select["candidates"][1]["inputs"]["cpu"] == 0.5
+
+    def test_stats(self):
+        scheduler = PlacementScheduler(weights={"cpu": 2.0})
+        scheduler.record_result("a", success=False)
+
+        stats = scheduler.stats()
+        assert stats["weights"]["cpu"] == 2.0
+        assert stats["failure_rates"] == {"a": 1.0}
@@ -0,0 +1,205 @@
+"""
+query_cache 단위 테스트
+
+테스트 대상:
+- cached() - read-through 캐싱, 인자 정규화, None 결과 캐싱, unless
+- invalidates() / invalidate_tags() - 태그 버전 무효화
+- 히트/미스 메트릭
+- QUERY_CACHE_ENABLED=0 우회
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from shared.cache import Cache, MemoryBackend
+from shared.monitoring.metrics import query_cache_hits_total, query_cache_misses_total
+from shared.query_cache import cached, invalidate_tags, invalidates
+
+
+@pytest.fixture(autouse=True)
+def memory_cache():
+    """테스트마다 독립된 메모리 캐시 사용"""
+    cache = Cache(backend=MemoryBackend())
+    with patch("shared.query_cache.get_cache", return_value=cache):
+        yield cache
+
+
+class FakeRepository:
+    """호출 횟수를 세는 가짜 리포지토리"""
+
+    def __init__(self):
+        self.calls = 0
+        self.rows = [{"id": 1, "status": "idle"}]
+
+    @cached("test.list", ttl=60, tags=["items"])
+    async def list(self, status=None, limit: int = 10):
+        self.calls += 1
+        return [row for row in self.rows if status is None or row["status"] == status][:limit]
+
+    @cached("test.find", ttl=60, tags=["items"])
+    async def find(self, item_id):
+        self.calls += 1
+        return None
+
+    @cached("test.safe", ttl=60, tags=["items"], unless=lambda r: not r["success"])
+    async def safe_list(self):
+        self.calls += 1
+        return {"success": False, "items": []}
+
+    @invalidates("items")
+    async def add(self, row):
+        self.rows.append(row)
+
+
+def _hits(name: str) -> float:
+    return query_cache_hits_total.labels(query=name)._value.get()
+
+
+def _misses(name: str) -> float:
+    return query_cache_misses_total.labels(query=name)._value.get()
+
+
+class TestCached:
+    """cached 데코레이터 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_read_through(self):
+        """두 번째 호출은 캐시에서 응답"""
+        repo = FakeRepository()
+        hits, misses = _hits("test.list"), _misses("test.list")
+
+        first = await repo.list()
+        second = await repo.list()
+
+        assert first == second == [{"id": 1, "status": "idle"}]
+        assert repo.calls == 1
+        assert _misses("test.list") == misses + 1
+        assert _hits("test.list") == hits + 1
+
+    @pytest.mark.asyncio
+    async def test_normalized_arguments(self):
+        """위치/키워드/기본값 표기가 달라도 같은 키"""
+        repo = FakeRepository()
+
+        await repo.list()
+        await repo.list(None)
+        await repo.list(status=None, limit=10)
+        await repo.list(limit=10)
+
+        assert repo.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_different_arguments(self):
+        """인자가 다르면 별도 캐시"""
+        repo = FakeRepository()
+
+        await repo.list(status="idle")
+        await repo.list(status="busy")
+
+        assert repo.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_shared_across_instances(self):
+        """self는 키에서 제외"""
+        first, second = FakeRepository(), FakeRepository()
+
+        await first.list()
+        await second.list()
+
+        assert first.calls + second.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_none_cached(self):
+        """None 결과도 캐싱"""
+        repo = FakeRepository()
+
+        assert await repo.find(1) is None
+        assert await repo.find(1) is None
+        assert repo.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_unless_skips_caching(self):
+        """unless가 True면 캐싱하지 않음"""
+        repo = FakeRepository()
+
+        await repo.safe_list()
+        await repo.safe_list()
+
+        assert repo.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_result_isolated_from_caller(self):
+        """반환값을 변경해도 캐시에 영향 없음"""
+        repo = FakeRepository()
+
+        result = await repo.list()
+        result.append({"id": 99})
+        cached_result = await repo.list()
+        cached_result[0]["status"] = "mutated"
+
+        assert await repo.list() == [{"id": 1, "status": "idle"}]
+
+    @pytest.mark.asyncio
+    async def test_disabled(self, monkeypatch):
+        """QUERY_CACHE_ENABLED=0이면 항상 원본 호출"""
+        monkeypatch.setenv("QUERY_CACHE_ENABLED", "0")
+        repo = FakeRepository()
+
+        await repo.list()
+        await repo.list()
+
+        assert repo.calls == 2
+
+
+class TestInvalidation:
+    """태그 무효화 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_write_invalidates(self):
+        """쓰기 메서드 실행 후 다시 조회"""
+        repo = FakeRepository()
+
+        assert len(await repo.list()) == 1
+        await repo.add({"id": 2, "status": "idle"})
+
+        assert len(await repo.list()) == 2
+        assert repo.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_tags(self):
+        """invalidate_tags로 직접 무효화"""
+        repo = FakeRepository()
+
+        await repo.list()
+        await invalidate_tags("items")
+        await repo.list()
+
+        assert repo.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_other_tag_untouched(self):
+        """다른 태그 무효화는 영향 없음"""
+        repo = FakeRepository()
+
+        await repo.list()
+        await invalidate_tags("videos")
+        await repo.list()
+
+        assert repo.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidates_on_error(self):
+        """쓰기가 실패해도 무효화"""
+        repo = FakeRepository()
+
+        @invalidates("items")
+        async def failing_write():
+            raise RuntimeError("write failed")
+
+        await repo.list()
+        with pytest.raises(RuntimeError):
+            await failing_write()
+        await repo.list()
+
+        assert repo.calls == 2
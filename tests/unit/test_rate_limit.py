@@ -0,0 +1,300 @@
+"""
+rate_limit 단위 테스트
+
+테스트 대상:
+- SlidingWindowLimiter - 경계 버스트 차단, 가중 합, Retry-After
+- SlidingLogLimiter - 정확한 윈도우
+- TokenBucketLimiter - 버스트 후 충전 속도
+- Redis 모드 - EVALSHA/NOSCRIPT 재시도, 장애/타임아웃 시 로컬 판정, 연속 실패 쿨다운
+- rate_limit_dependency - 429 + 헤더
+- cache.RateLimiter - 기존 인터페이스 유지
+"""
+
+import asyncio
+import hashlib
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from shared.cache import Cache, MemoryBackend, RateLimiter
+from shared.rate_limit import (
+    SlidingLogLimiter,
+    SlidingWindowLimiter,
+    TokenBucketLimiter,
+    rate_limit_dependency,
+)
+
+
+class FakeClock:
+    """수동으로 진행하는 시계 (초)"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+async def hits(limiter, key: str, count: int) -> list:
+    return [(await limiter.hit(key)).allowed for _ in range(count)]
+
+
+class TestSlidingWindow:
+    """슬라이딩 윈도우 카운터"""
+
+    @pytest.mark.asyncio
+    async def test_no_double_burst_at_window_edge(self):
+        """윈도우 끝에서 한도를 채우면 다음 윈도우 시작에 다시 한도만큼 허용하지 않음"""
+        clock = FakeClock(1079.9)  # 윈도우 [1020, 1080) 끝 무렵
+        limiter = SlidingWindowLimiter("t", limit=10, window=60, clock=clock)
+
+        assert await hits(limiter, "k", 10) == [True] * 10
+
+        clock.advance(0.2)  # 다음 윈도우 직후: 이전 윈도우 가중치 ~100%
+        assert (await limiter.hit("k")).allowed is False
+
+        clock.advance(30)  # 절반 지남: 이전 10 x 0.5 = 5 → 5개 더 허용
+        assert await hits(limiter, "k", 6) == [True] * 5 + [False]
+
+    @pytest.mark.asyncio
+    async def test_retry_after(self):
+        """거부 시 Retry-After는 허용 가능해지는 시점"""
+        clock = FakeClock(1020.0)
+        limiter = SlidingWindowLimiter("t", limit=2, window=60, clock=clock)
+        await hits(limiter, "k", 2)
+
+        result = await limiter.hit("k")
+        assert result.allowed is False
+        assert result.remaining == 0
+        # 다음 윈도우(60s) + 이전 2개 중 1개 분량이 빠질 때까지(30s)
+        assert result.retry_after == pytest.approx(90, abs=0.01)
+        assert result.headers()["Retry-After"] == "90"
+
+        clock.advance(90)
+        assert (await limiter.hit("k")).allowed is True
+
+    @pytest.mark.asyncio
+    async def test_rejected_requests_not_counted(self):
+        """거부된 요청은 한도를 소모하지 않음"""
+        clock = FakeClock(1020.0)
+        limiter = SlidingWindowLimiter("t", limit=1, window=10, clock=clock)
+        await hits(limiter, "k", 50)
+
+        clock.advance(20)  # 두 윈도우 지남
+        assert (await limiter.hit("k")).allowed is True
+
+    @pytest.mark.asyncio
+    async def test_peek_does_not_consume(self):
+        """peek은 남은 수만 조회"""
+        limiter = SlidingWindowLimiter("t", limit=3, window=60, clock=FakeClock(1020.0))
+        await limiter.hit("k")
+
+        assert (await limiter.peek("k")).remaining == 2
+        assert (await limiter.peek("k")).remaining == 2
+
+    @pytest.mark.asyncio
+    async def test_keys_are_bounded(self):
+        """메모리 모드는 max_keys 초과 시 오래된 키부터 제거"""
+        limiter = SlidingWindowLimiter("t", limit=1, window=60, max_keys=2, clock=FakeClock())
+        for key in ("a", "b", "c"):
+            await limiter.hit(key)
+
+        assert list(limiter._state) == ["b", "c"]
+
+
+class TestSlidingLog:
+    """슬라이딩 로그"""
+
+    @pytest.mark.asyncio
+    async def test_exact_window(self):
+        """가장 오래된 요청이 윈도우를 벗어나는 시점에 정확히 1개 허용"""
+        clock = FakeClock()
+        limiter = SlidingLogLimiter("t", limit=3, window=10, clock=clock)
+
+        await limiter.hit("k")
+        clock.advance(4)
+        await hits(limiter, "k", 2)
+
+        result = await limiter.hit("k")
+        assert result.allowed is False
+        assert result.retry_after == pytest.approx(6)
+
+        clock.advance(6)
+        assert await hits(limiter, "k", 2) == [True, False]
+
+    @pytest.mark.asyncio
+    async def test_cost_above_limit(self):
+        """한도보다 큰 cost는 항상 거부"""
+        limiter = SlidingLogLimiter("t", limit=2, window=10, clock=FakeClock())
+        result = await limiter.hit("k", cost=3)
+
+        assert result.allowed is False
+        assert result.retry_after == pytest.approx(10)
+
+
+class TestTokenBucket:
+    """토큰 버킷"""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_refill(self):
+        """capacity만큼 버스트 후 rate 속도로 충전"""
+        clock = FakeClock()
+        limiter = TokenBucketLimiter("t", rate=2, capacity=5, clock=clock)
+
+        assert await hits(limiter, "k", 6) == [True] * 5 + [False]
+        assert (await limiter.hit("k")).retry_after == pytest.approx(0.5)
+
+        clock.advance(1)  # 2개 충전
+        assert await hits(limiter, "k", 3) == [True, True, False]
+
+        clock.advance(100)  # capacity 초과 충전 없음
+        assert (await limiter.peek("k")).remaining == 5
+
+
+class FakeRedis:
+    """EVALSHA/EVAL 호출만 기록하는 가짜 Redis"""
+
+    def __init__(self, reply=None, error=None, hang=False):
+        self.reply = reply or [1, 9, 0]
+        self.error = error
+        self.hang = hang
+        self.scripts = set()
+        self.calls = []
+
+    async def evalsha(self, sha, numkeys, key, *args):
+        self.calls.append(("evalsha", key, args))
+        if self.hang:
+            await asyncio.Event().wait()
+        if self.error:
+            raise self.error
+        if sha not in self.scripts:
+            raise Exception("NOSCRIPT No matching script. Please use EVAL.")
+        return self.reply
+
+    async def eval(self, script, numkeys, key, *args):
+        self.calls.append(("eval", key, args))
+        self.scripts.add(hashlib.sha1(script.encode()).hexdigest())
+        return self.reply
+
+
+class TestRedisMode:
+    """Redis Lua 모드"""
+
+    @pytest.mark.asyncio
+    async def test_noscript_falls_back_to_eval_once(self):
+        """스크립트 캐시가 비어 있으면 EVAL 후 다음부터 EVALSHA"""
+        redis = FakeRedis(reply=[0, 0, 1500])
+        limiter = SlidingWindowLimiter("api", limit=10, window=60, redis=redis)
+
+        result = await limiter.hit("1.2.3.4")
+        await limiter.hit("1.2.3.4")
+
+        assert [c[0] for c in redis.calls] == ["evalsha", "eval", "evalsha"]
+        assert redis.calls[0][1] == "ratelimit:api:1.2.3.4"
+        assert redis.calls[0][2] == (10, 60000, 1)
+        assert result.allowed is False
+        assert result.retry_after == pytest.approx(1.5)
+
+    @pytest.mark.asyncio
+    async def test_redis_error_uses_local_decision(self):
+        """Redis 장애 시 프로세스 로컬 판정"""
+        redis = FakeRedis(error=ConnectionError("down"))
+        limiter = TokenBucketLimiter("node", rate=1, capacity=2, redis=redis, clock=FakeClock())
+
+        assert await hits(limiter, "node_01", 3) == [True, True, False]
+
+    @pytest.mark.asyncio
+    async def test_hung_redis_times_out(self):
+        """응답 없는 Redis는 redis_timeout 후 로컬 판정"""
+        redis = FakeRedis(hang=True)
+        limiter = SlidingWindowLimiter("api", limit=1, window=60, redis=redis, redis_timeout=0.01)
+
+        result = await asyncio.wait_for(limiter.hit("1.2.3.4"), 1)
+        assert result.allowed is True
+        assert len(redis.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_repeated_failures_skip_redis_during_cooldown(self):
+        """연속 실패 후 쿨다운 동안 Redis를 호출하지 않고, 끝나면 1건만 다시 시도"""
+        clock = FakeClock()
+        redis = FakeRedis(error=ConnectionError("down"))
+        limiter = SlidingWindowLimiter(
+            "api", limit=100, window=60, redis=redis, failure_threshold=2, cooldown=10, clock=clock
+        )
+
+        await hits(limiter, "ip", 5)
+        assert len(redis.calls) == 2
+
+        clock.advance(10)
+        await hits(limiter, "ip", 3)
+        assert len(redis.calls) == 3  # 재시도 1건 실패 → 다시 쿨다운
+
+        clock.advance(10)
+        redis.error = None
+        redis.scripts.add(limiter._sha)
+        await hits(limiter, "ip", 3)
+        assert len(redis.calls) == 6  # 복구 후 매 요청 Redis 판정
+
+
+class TestDependency:
+    """FastAPI 의존성"""
+
+    def test_429_with_headers(self):
+        """초과 시 429 + Retry-After, 허용 시 핸들러 실행"""
+        limiter = SlidingWindowLimiter("t", limit=2, window=60, clock=FakeClock(1020.0))
+        app = FastAPI()
+
+        @app.post("/api/broadcast", dependencies=[Depends(rate_limit_dependency(limiter))])
+        async def broadcast():
+            return {"ok": True}
+
+        client = TestClient(app)
+        assert [client.post("/api/broadcast").status_code for _ in range(2)] == [200, 200]
+
+        response = client.post("/api/broadcast")
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "90"
+        assert response.headers["X-RateLimit-Remaining"] == "0"
+
+        # 검증되지 않은 API 키는 IP 한도를 그대로 받음
+        assert client.post("/api/broadcast", headers={"X-API-Key": "forged"}).status_code == 429
+
+    def test_authenticated_api_key_bucket(self):
+        """인증된 API 키만 별도 한도, 키는 해시로만 사용"""
+        limiter = SlidingWindowLimiter("t", limit=1, window=60, clock=FakeClock(1020.0))
+        app = FastAPI()
+
+        @app.middleware("http")
+        async def authenticate(request, call_next):
+            if request.headers.get("x-api-key") == "secret":
+                request.state.api_key = "secret"
+            return await call_next(request)
+
+        @app.post("/api/broadcast", dependencies=[Depends(rate_limit_dependency(limiter))])
+        async def broadcast():
+            return {"ok": True}
+
+        client = TestClient(app)
+        assert client.post("/api/broadcast").status_code == 200
+        assert client.post("/api/broadcast", headers={"X-API-Key": "secret"}).status_code == 200
+        assert client.post("/api/broadcast", headers={"X-API-Key": "secret"}).status_code == 429
+
+        hashed = f"key:{hashlib.sha256(b'secret').hexdigest()[:16]}"
+        assert set(limiter._state) == {"testclient", hashed}
+
+
+class TestCacheRateLimiter:
+    """shared.cache.RateLimiter (슬라이딩 윈도우 기반)"""
+
+    @pytest.mark.asyncio
+    async def test_memory_cache_uses_local_limiter(self):
+        """메모리 캐시에서는 Redis 없이 로컬 판정"""
+        limiter = RateLimiter(Cache(backend=MemoryBackend()), max_requests=3, window_seconds=60)
+
+        assert [await limiter.is_allowed("ip") for _ in range(4)] == [True, True, True, False]
+        assert await limiter.get_remaining("ip") == 0
+        assert limiter._limiter.redis is None
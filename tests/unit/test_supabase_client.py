@@ -0,0 +1,166 @@
+"""
+DeviceSync / JobSync 단위 테스트
+
+테스트 대상:
+- DeviceSync.heartbeat_many() - 일괄 하트비트 RPC 호출 및 결과 매핑
+- DeviceSync.bulk_upsert() - 다중 행 upsert 단일 요청
+- JobSync.claim_jobs() - 일괄 작업 클레임 RPC 및 기기별 매핑
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from shared.supabase_client import DeviceSync, JobSync
+
+
+@pytest.fixture
+def mock_client():
+    """RPC 응답을 설정할 수 있는 Mock 클라이언트"""
+    return MagicMock()
+
+
+@pytest.fixture
+def device_sync(mock_client):
+    with patch("shared.supabase_client.get_client", return_value=mock_client):
+        return DeviceSync(pc_id=1)
+
+
+@pytest.fixture
+def job_sync(mock_client):
+    with patch("shared.supabase_client.get_client", return_value=mock_client):
+        return JobSync(pc_id=1)
+
+
+class TestHeartbeatMany:
+    """heartbeat_many 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_single_rpc_call(self, device_sync, mock_client):
+        """시리얼 수와 관계없이 RPC 1회 호출"""
+        mock_client.rpc.return_value.execute.return_value.data = [
+            {"serial_number": "A", "outcome": "busy", "status": "busy"},
+            {"serial_number": "B", "outcome": "updated", "status": "idle"},
+            {"serial_number": "C", "outcome": "registered", "status": "idle"},
+        ]
+
+        outcomes = await device_sync.heartbeat_many(
+            ["A", "B", "C"], health={"A": {"battery_level": 80}}
+        )
+
+        assert outcomes == {"A": "busy", "B": "updated", "C": "registered"}
+        mock_client.rpc.assert_called_once_with(
+            "heartbeat_devices",
+            {
+                "p_pc_id": "1",
+                "p_serials": ["A", "B", "C"],
+                "p_health": {"A": {"battery_level": 80}},
+            },
+        )
+        mock_client.table.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_missing_rows_marked_failed(self, device_sync, mock_client):
+        """RPC 결과에 없는 시리얼은 failed"""
+        mock_client.rpc.return_value.execute.return_value.data = [
+            {"serial_number": "A", "outcome": "updated", "status": "idle"},
+        ]
+
+        outcomes = await device_sync.heartbeat_many(["A", "B"])
+
+        assert outcomes == {"A": "updated", "B": "failed"}
+
+    @pytest.mark.asyncio
+    async def test_rpc_error(self, device_sync, mock_client):
+        """RPC 실패 시 전체 failed"""
+        mock_client.rpc.return_value.execute.side_effect = Exception("connection reset")
+
+        outcomes = await device_sync.heartbeat_many(["A", "B"])
+
+        assert outcomes == {"A": "failed", "B": "failed"}
+
+    @pytest.mark.asyncio
+    async def test_empty_serials(self, device_sync, mock_client):
+        """빈 목록은 호출 없이 반환"""
+        assert await device_sync.heartbeat_many([]) == {}
+        mock_client.rpc.assert_not_called()
+
+
+class TestBulkUpsert:
+    """DeviceSync.bulk_upsert 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_single_upsert_call(self, device_sync, mock_client):
+        """기기 수와 관계없이 upsert 1회 호출"""
+        mock_client.table.return_value.upsert.return_value.execute.return_value.data = [
+            {"serial_number": "A"},
+            {"serial_number": "B"},
+        ]
+
+        result = await device_sync.bulk_upsert(
+            [
+                {"serial_number": "A", "model": "SM-G960"},
+                {"serial_number": "B", "model": "SM-G965"},
+                {"model": "no-serial"},
+            ]
+        )
+
+        assert len(result) == 2
+        mock_client.table.return_value.upsert.assert_called_once()
+        rows = mock_client.table.return_value.upsert.call_args.args[0]
+        assert [r["serial_number"] for r in rows] == ["A", "B"]
+        assert all(r["pc_id"] == 1 and r["status"] == "idle" for r in rows)
+
+    @pytest.mark.asyncio
+    async def test_upsert_error(self, device_sync, mock_client):
+        """upsert 실패 시 빈 목록"""
+        mock_client.table.return_value.upsert.return_value.execute.side_effect = Exception(
+            "connection reset"
+        )
+
+        assert await device_sync.bulk_upsert([{"serial_number": "A"}]) == []
+
+
+class TestClaimJobs:
+    """JobSync.claim_jobs 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_single_rpc_call(self, job_sync, mock_client):
+        """기기 수와 관계없이 RPC 1회 호출, 기기별로 작업 매핑"""
+        rpc = mock_client.rpc.return_value.select.return_value
+        rpc.execute.return_value.data = [
+            {"id": 10, "device_id": 2, "status": "running", "videos": {"id": 1}},
+            {"id": 11, "device_id": 5, "status": "running", "videos": {"id": 1}},
+        ]
+
+        claimed = await job_sync.claim_jobs([2, 3, 5], limit=2)
+
+        assert set(claimed) == {2, 5}
+        assert claimed[2]["id"] == 10
+        mock_client.rpc.assert_called_once_with(
+            "claim_jobs", {"p_pc_id": "1", "p_device_ids": ["2", "3", "5"], "p_limit": 2}
+        )
+        mock_client.rpc.return_value.select.assert_called_once_with("*, videos(*)")
+
+    @pytest.mark.asyncio
+    async def test_keys_match_caller_ids(self, job_sync, mock_client):
+        """UUID 문자열 ID도 호출자가 넘긴 값 그대로 키로 사용"""
+        rpc = mock_client.rpc.return_value.select.return_value
+        rpc.execute.return_value.data = [{"id": 1, "device_id": "a1b2"}]
+
+        claimed = await job_sync.claim_jobs(["a1b2", "c3d4"])
+
+        assert list(claimed) == ["a1b2"]
+
+    @pytest.mark.asyncio
+    async def test_rpc_error(self, job_sync, mock_client):
+        """RPC 실패 시 빈 결과"""
+        mock_client.rpc.return_value.select.return_value.execute.side_effect = Exception("timeout")
+
+        assert await job_sync.claim_jobs([1, 2]) == {}
+
+    @pytest.mark.asyncio
+    async def test_empty_devices(self, job_sync, mock_client):
+        """빈 목록은 호출 없이 반환"""
+        assert await job_sync.claim_jobs([]) == {}
+        mock_client.rpc.assert_not_called()